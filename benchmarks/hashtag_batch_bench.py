@@ -0,0 +1,118 @@
+"""
+해시태그 마이크로배칭 벤치마크
+
+건별 요청 경로와 마이크로배칭 경로의 처리량(req/s)과 p50/p99 지연을 비교합니다.
+
+기본은 시뮬레이션 LLM 서버(prefill 비용 + 토큰당 decode 비용, 동시 처리 슬롯 제한)를
+사용하고, --base-url을 주면 실제 DIGITS 서버로 요청합니다.
+
+    python -m benchmarks.hashtag_batch_bench --requests 200 --concurrency 50
+    python -m benchmarks.hashtag_batch_bench --base-url http://digits:8000
+"""
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import time
+
+os.environ.setdefault("TOUR_API_KEY", "bench")
+os.environ.setdefault("KORSERVICE_URL", "http://localhost")
+os.environ.setdefault("TARRLTE_URL", "http://localhost")
+
+from config import get_settings  # noqa: E402
+from services import llm_client as llm_module  # noqa: E402
+from services.llm_batcher import MicroBatcher  # noqa: E402
+
+DESCRIPTIONS = [
+    "오늘 강릉 바다 왔어요 날씨 좋고 커피도 맛있음",
+    "제주도 올레길 걷다가 귤밭에서 사진 한 장",
+    "부산 광안리 야경 보면서 친구들이랑 치맥",
+    "전주 한옥마을에서 한복 입고 데이트",
+    "속초 중앙시장 닭강정 먹으러 당일치기",
+]
+
+
+class SimulatedLLM:
+    """
+    단순한 LLM 서버 비용 모델
+
+    - prefill: 프롬프트 글자 수에 비례 (시스템 프롬프트 포함)
+    - decode: 요청당 해시태그 5개 분량의 출력 토큰
+    - slots: 서버가 동시에 처리할 수 있는 요청 수
+    """
+
+    def __init__(self, slots: int, prefill_ms_per_char: float, decode_ms_per_item: float):
+        self.semaphore = asyncio.Semaphore(slots)
+        self.prefill_ms_per_char = prefill_ms_per_char
+        self.decode_ms_per_item = decode_ms_per_item
+
+    async def generate(self, prompt: str, system_prompt=None, *args, **kwargs) -> str:
+        items = max(1, len(re.findall(r"^\d+\. ", prompt, re.MULTILINE)))
+        chars = len(prompt) + len(system_prompt or "")
+        async with self.semaphore:
+            await asyncio.sleep((chars * self.prefill_ms_per_char + items * self.decode_ms_per_item) / 1000)
+        one = '["#여행스타그램", "#벤치마크", "#바다", "#커피", "#인생샷"]'
+        if items == 1:
+            return one
+        return "[" + ", ".join([one] * items) + "]"
+
+
+async def _run(label: str, call, total: int, concurrency: int) -> None:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await call(DESCRIPTIONS[i % len(DESCRIPTIONS)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:<12} {total / elapsed:8.1f} req/s   p50 {p50:8.1f} ms   p99 {p99:8.1f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--window-ms", type=int, default=10)
+    parser.add_argument("--base-url", default=None, help="실제 LLM 서버 주소 (없으면 시뮬레이션)")
+    parser.add_argument("--slots", type=int, default=4, help="시뮬레이션 서버 동시 처리 수")
+    parser.add_argument("--prefill-ms-per-char", type=float, default=0.2)
+    parser.add_argument("--decode-ms-per-item", type=float, default=40.0)
+    args = parser.parse_args()
+
+    client = llm_module.LLMClient()
+    if args.base_url:
+        client.base_url = args.base_url
+    else:
+        # 시뮬레이션 서버는 비스트리밍 generate()만 흉내냄
+        client.settings = client.settings.model_copy(update={"llm_stream_json": False})
+        client.generate = SimulatedLLM(
+            args.slots, args.prefill_ms_per_char, args.decode_ms_per_item
+        ).generate
+
+    batcher = MicroBatcher(
+        client.generate_hashtags_batch,
+        max_batch_size=args.batch_size,
+        max_wait_ms=args.window_ms,
+    )
+
+    mode = args.base_url or "simulated"
+    print(f"# {args.requests} requests, concurrency {args.concurrency}, "
+          f"batch {args.batch_size}/{args.window_ms}ms, server: {mode}")
+    await _run("per-request", client._generate_hashtags_single, args.requests, args.concurrency)
+    await _run("batched", batcher.submit, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    get_settings()
+    asyncio.run(main())
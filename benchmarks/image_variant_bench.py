@@ -0,0 +1,66 @@
+"""
+이미지 파생본 생성 처리량 벤치마크
+
+합성 JPEG(휴대폰 사진 크기)에 대해 render_variants를
+단일 프로세스 순차 실행 / ProcessPoolExecutor 병렬 실행으로 비교합니다.
+S3 입출력은 제외하고 디코딩 + 리사이즈 + WebP 인코딩만 측정합니다.
+
+    python -m benchmarks.image_variant_bench
+    python -m benchmarks.image_variant_bench --images 32 --workers 4 --size 4032x3024
+"""
+import argparse
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("TOUR_API_KEY", "bench")
+os.environ.setdefault("KORSERVICE_URL", "http://localhost")
+os.environ.setdefault("TARRLTE_URL", "http://localhost")
+
+from PIL import Image  # noqa: E402
+
+from services.image_variants import VARIANTS, render_variants  # noqa: E402
+
+
+def make_jpeg(width: int, height: int, seed: int) -> bytes:
+    """그라디언트 + 노이즈가 섞인 합성 사진"""
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 40 + seed % 20)
+    image = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=16, help="이미지 수")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="프로세스 풀 크기")
+    parser.add_argument("--size", default="4032x3024", help="원본 해상도 WxH")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.split("x"))
+    images = [make_jpeg(width, height, i) for i in range(args.images)]
+    avg_kb = sum(len(b) for b in images) / len(images) / 1024
+    print(f"# {args.images} images, {width}x{height} JPEG (avg {avg_kb:.0f} KB), variants={VARIANTS}")
+
+    started = time.perf_counter()
+    outputs = [render_variants(data, VARIANTS) for data in images]
+    serial = time.perf_counter() - started
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pool.submit(render_variants, images[0], VARIANTS).result()  # 워커 기동 비용 제외
+        started = time.perf_counter()
+        list(pool.map(render_variants, images, [VARIANTS] * len(images)))
+        parallel = time.perf_counter() - started
+
+    out_kb = {name: sum(len(o[name]) for o in outputs) / len(outputs) / 1024 for name in VARIANTS}
+    print(f"{'mode':<20}{'seconds':>10}{'images/s':>12}")
+    print(f"{'serial':<20}{serial:>10.2f}{args.images / serial:>12.1f}")
+    print(f"{f'process x{args.workers}':<20}{parallel:>10.2f}{args.images / parallel:>12.1f}")
+    print("avg output: " + ", ".join(f"{name}={kb:.0f} KB" for name, kb in out_kb.items()))
+
+
+if __name__ == "__main__":
+    main()
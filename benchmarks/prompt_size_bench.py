@@ -0,0 +1,136 @@
+"""
+프롬프트 크기 벤치마크 (압축 전/후)
+
+extract_search_params / curate_and_explain의 기존 프롬프트 생성 방식과
+prompt_builder 기반 방식의 user 메시지 토큰 수를 비교합니다.
+
+기본은 prompt_builder.estimate_tokens 근사치를 사용하고,
+transformers가 설치되어 있으면 --tokenizer로 실제 토크나이저를 지정할 수 있습니다.
+
+    python -m benchmarks.prompt_size_bench
+    python -m benchmarks.prompt_size_bench --tokenizer LGAI-EXAONE/EXAONE-3.5-32B-Instruct
+"""
+import argparse
+import json
+import os
+
+os.environ.setdefault("TOUR_API_KEY", "bench")
+os.environ.setdefault("KORSERVICE_URL", "http://localhost")
+os.environ.setdefault("TARRLTE_URL", "http://localhost")
+
+from services import prompt_builder  # noqa: E402
+from services.llm_client import CURATION_SYSTEM_PROMPT, SEARCH_PARAMS_SYSTEM_PROMPT  # noqa: E402
+
+QUERY = "강릉 바다 근처 맛집이랑 카페 추천해줘"
+PARSED = {"destination": "강릉", "keyword": "바다", "style": "연인", "content_types": ["음식점", "카페"]}
+PREFERENCES = {"theme": "바다", "with_whom": "연인", "style": "여유롭게"}
+SESSION_CONTEXT = "이전 설명: 오늘 강릉 바다 왔어요 날씨 좋고 커피도 맛있음, 해시태그: ['#강릉여행', '#바다스타그램', '#커피는사랑', '#여기어디게', '#인생뷰']"
+
+_NAMES = ["경포해변", "안목해변 커피거리", "주문진항", "정동진", "오죽헌", "강문해변", "초당순두부마을",
+          "사천해변", "선교장", "경포호", "중앙시장", "하슬라아트월드"]
+
+API_RESULTS = {
+    "keyword_results": [
+        {
+            "title": name,
+            "addr1": f"강원특별자치도 강릉시 해안로 {100 + i * 7}",
+            "contenttypeid": "12" if i % 3 else "39",
+            "overview": f"{name}은(는) 강릉을 대표하는 바다 명소로 사계절 내내 많은 관광객이 찾는 곳입니다. "
+                        "주변에 카페와 맛집이 많고 산책로가 잘 조성되어 있어 연인과 함께 걷기 좋습니다.",
+        }
+        for i, name in enumerate(_NAMES)
+    ],
+    "related_results": [
+        {"rlteTatsNm": name, "rlteCtgrySclsNm": "해수욕장" if "해변" in name else "기타관광", "rlteRank": str(i + 1)}
+        for i, name in enumerate(reversed(_NAMES))
+    ],
+}
+
+
+def legacy_search_prompt() -> str:
+    return f"""이전 대화 컨텍스트: {SESSION_CONTEXT}
+목적지: 강릉
+선호사항: {PREFERENCES}
+
+위 정보를 바탕으로 관광 API 검색 파라미터를 추출해주세요."""
+
+
+def legacy_curation_prompt() -> str:
+    spots_summary = []
+    for item in API_RESULTS["keyword_results"][:10]:
+        spots_summary.append({
+            "name": item.get("title", ""),
+            "addr": item.get("addr1", ""),
+            "type": item.get("contenttypeid", ""),
+            "overview": item.get("overview", "")[:100] if item.get("overview") else ""
+        })
+    for item in API_RESULTS["related_results"][:10]:
+        spots_summary.append({
+            "name": item.get("rlteTatsNm", ""),
+            "category": item.get("rlteCtgrySclsNm", ""),
+            "rank": item.get("rlteRank", "")
+        })
+    return f"""사용자 요청: {QUERY}
+
+분석된 정보:
+- 목적지: {PARSED.get('destination', '미정')}
+- 키워드: {PARSED.get('keyword', '')}
+- 스타일: {PARSED.get('style', '일반')}
+- 원하는 장소 유형: {PARSED.get('content_types', ['관광지'])}
+
+API에서 찾은 장소들:
+{json.dumps(spots_summary, ensure_ascii=False, indent=2)}
+
+위 데이터를 바탕으로 최적의 여행 코스를 설계해주세요."""
+
+
+def compact_search_prompt() -> str:
+    context = prompt_builder.compact_context(SESSION_CONTEXT)
+    return (
+        f"이전 대화: {context}\n목적지: 강릉\n선호: {prompt_builder.format_preferences(PREFERENCES)}"
+        "\n\n위 정보로 관광 API 검색 파라미터를 추출해주세요."
+    )
+
+
+def compact_curation_prompt(budget: int) -> str:
+    table = prompt_builder.build_spots_table(API_RESULTS, keyword=PARSED["keyword"], query=QUERY, token_budget=budget)
+    return f"""사용자 요청: {QUERY}
+목적지: 강릉 / 키워드: 바다 / 스타일: 연인 / 장소 유형: 음식점/카페
+
+API에서 찾은 장소들:
+{table}
+
+위 데이터를 바탕으로 최적의 여행 코스를 설계해주세요."""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer", default=None, help="HuggingFace 토크나이저 이름 (선택)")
+    parser.add_argument("--budget", type=int, default=1200, help="장소 표 토큰 예산")
+    parser.add_argument("--show", action="store_true", help="압축 프롬프트 출력")
+    args = parser.parse_args()
+
+    count = prompt_builder.estimate_tokens
+    label = "estimated"
+    if args.tokenizer:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(args.tokenizer, trust_remote_code=True)
+        count = lambda text: len(tokenizer.encode(text, add_special_tokens=False))  # noqa: E731
+        label = args.tokenizer
+
+    cases = [
+        ("extract_search_params", SEARCH_PARAMS_SYSTEM_PROMPT, legacy_search_prompt(), compact_search_prompt()),
+        ("curate_and_explain", CURATION_SYSTEM_PROMPT, legacy_curation_prompt(), compact_curation_prompt(args.budget)),
+    ]
+
+    print(f"# tokens ({label}); system prompt is unchanged and prefix-cached")
+    print(f"{'operation':<24}{'system':>8}{'user before':>13}{'user after':>12}{'saved':>8}")
+    for name, system, before, after in cases:
+        b, a = count(before), count(after)
+        print(f"{name:<24}{count(system):>8}{b:>13}{a:>12}{(b - a) / b:>8.0%}")
+        if args.show:
+            print(after, end="\n\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+리뷰 쓰기 경로 벤치마크 (기존 ORM 방식 vs RETURNING 방식)
+
+실제 PostgreSQL에 리뷰 생성 → 수정 → 삭제를 반복하며
+초당 처리량(writes/s)과 작업당 SQL 문장 수(왕복 횟수)를 비교합니다.
+실행 후 벤치마크 데이터(place_id가 bench-로 시작)는 삭제됩니다.
+
+    python -m benchmarks.review_write_bench --database-url postgresql+asyncpg://user:pw@localhost/travel
+    python -m benchmarks.review_write_bench --ops 2000 --concurrency 16 --images 3
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("TOUR_API_KEY", "bench")
+os.environ.setdefault("KORSERVICE_URL", "http://localhost")
+os.environ.setdefault("TARRLTE_URL", "http://localhost")
+
+from sqlalchemy import event, select, delete  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import selectinload, sessionmaker  # noqa: E402
+
+from config import get_settings  # noqa: E402
+from database import Base  # noqa: E402
+from models.db_models import Review, ReviewImage, PlaceRatingStats  # noqa: E402
+from crud import review_crud  # noqa: E402
+
+
+# === 기존 방식 (flush → commit → refresh → selectinload 재조회, 수정/삭제 전 전체 로드) ===
+
+async def legacy_get(db: AsyncSession, review_id: str):
+    result = await db.execute(
+        select(Review)
+        .options(selectinload(Review.images))
+        .where(Review.id == review_id, Review.is_deleted == False)  # noqa: E712
+    )
+    return result.scalar_one_or_none()
+
+
+async def legacy_create(db: AsyncSession, place_id: str, rating: int, image_urls: list[str]) -> Review:
+    review = Review(place_id=place_id, place_name="벤치마크", rating=rating, content="좋아요", user_id="bench")
+    db.add(review)
+    await db.flush()
+    for i, url in enumerate(image_urls):
+        db.add(ReviewImage(review_id=review.id, image_url=url, image_order=i))
+    await review_crud._apply_rating_delta(db, place_id, added=rating)
+    await db.commit()
+    await db.refresh(review)
+    return await legacy_get(db, review.id)
+
+
+async def legacy_update(db: AsyncSession, review_id: str, rating: int) -> None:
+    review = await legacy_get(db, review_id)
+    if rating != review.rating:
+        await review_crud._apply_rating_delta(db, review.place_id, added=rating, removed=review.rating)
+        review.rating = rating
+    review.content = "수정된 내용"
+    await db.commit()
+    await db.refresh(review)
+
+
+async def legacy_delete(db: AsyncSession, review_id: str) -> None:
+    review = await legacy_get(db, review_id)
+    await review_crud._apply_rating_delta(db, review.place_id, removed=review.rating)
+    review.is_deleted = True
+    await db.commit()
+
+
+# === 새 방식 (crud.review_crud) ===
+
+async def lean_create(db: AsyncSession, place_id: str, rating: int, image_urls: list[str]) -> Review:
+    return await review_crud.create_review(db, place_id, "벤치마크", rating, "좋아요", image_urls, user_id="bench")
+
+
+async def lean_update(db: AsyncSession, review_id: str, rating: int) -> None:
+    await review_crud.update_review(db, review_id, rating=rating, content="수정된 내용")
+
+
+async def lean_delete(db: AsyncSession, review_id: str) -> None:
+    await review_crud.delete_review(db, review_id)
+
+
+MODES = {
+    "legacy": (legacy_create, legacy_update, legacy_delete),
+    "returning": (lean_create, lean_update, lean_delete),
+}
+
+
+async def run_mode(session_factory, counter: dict, mode: str, ops: int, concurrency: int, images: int) -> tuple[float, float]:
+    create, update, delete_ = MODES[mode]
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(ops):
+        queue.put_nowait(i)
+
+    async def worker():
+        async with session_factory() as db:
+            while not queue.empty():
+                i = queue.get_nowait()
+                place_id = f"bench-{mode}-{i % 50}"
+                urls = [f"https://bench.example.com/reviews/{mode}-{i}-{n}.jpg" for n in range(images)]
+                review = await create(db, place_id, i % 5 + 1, urls)
+                await update(db, review.id, (i + 2) % 5 + 1)
+                await delete_(db, review.id)
+
+    counter["statements"] = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    # 작업 1회 = 생성 + 수정 + 삭제 3회 쓰기
+    return ops * 3 / elapsed, counter["statements"] / (ops * 3)
+
+
+async def cleanup(session_factory) -> None:
+    async with session_factory() as db:
+        await db.execute(delete(Review).where(Review.place_id.like("bench-%")))
+        await db.execute(delete(PlaceRatingStats).where(PlaceRatingStats.place_id.like("bench-%")))
+        await db.commit()
+
+
+async def main_async(args) -> None:
+    engine = create_async_engine(args.database_url, pool_size=args.concurrency, max_overflow=0)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    counter = {"statements": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*_):
+        counter["statements"] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    await cleanup(session_factory)
+    print(f"# {args.ops} x (create + update + delete), concurrency={args.concurrency}, images={args.images}")
+    print(f"{'mode':<12}{'writes/s':>12}{'stmts/write':>14}")
+    try:
+        for mode in ("legacy", "returning"):
+            # 워밍업 (커넥션/prepared statement 캐시)
+            await run_mode(session_factory, counter, mode, min(50, args.ops), args.concurrency, args.images)
+            throughput, statements = await run_mode(
+                session_factory, counter, mode, args.ops, args.concurrency, args.images
+            )
+            print(f"{mode:<12}{throughput:>12.1f}{statements:>14.2f}")
+    finally:
+        await cleanup(session_factory)
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="기본값: 설정의 database_url")
+    parser.add_argument("--ops", type=int, default=500, help="생성/수정/삭제 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 작업 수 (세션 수)")
+    parser.add_argument("--images", type=int, default=2, help="리뷰당 이미지 수")
+    args = parser.parse_args()
+    args.database_url = args.database_url or get_settings().database_url
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,21 @@
 from .photo_card_crud import (
     create_photo_card,
+    create_photo_card_with_session,
+    create_photo_cards_with_sessions,
     get_photo_card,
     verify_photo_card,
+    count_active_photo_cards,
+    stream_active_photo_card_ids,
 )
 from .session_crud import (
     create_session,
     get_session_by_photo_card_id,
     get_session_by_id,
+    get_unfinished_sessions,
     update_session_status,
     update_last_accessed,
+    copy_session_result,
+    requeue_compacted_session,
 )
 from .review_crud import (
     create_review,
@@ -16,30 +23,133 @@ from .review_crud import (
     get_reviews_by_place,
     get_reviews_by_user,
     get_all_reviews,
+    encode_review_cursor,
+    decode_review_cursor,
     get_place_average_rating,
+    get_place_rating_stats,
+    get_place_ratings,
+    rebuild_place_rating_stats,
     update_review,
     delete_review,
     add_review_images,
+    record_image_uploads,
+    attach_uploaded_images,
     delete_review_image,
 )
+from .review_search_crud import (
+    search_reviews,
+    get_reviews_by_ids,
+    encode_search_cursor,
+    decode_search_cursor,
+    rebuild_review_search_vectors,
+)
+from .partition_crud import (
+    created_at_window,
+    ensure_partitions,
+    list_partitions,
+)
+from .sweep_crud import (
+    deactivate_expired_photo_cards,
+    session_sweep_targets,
+    purge_idle_sessions,
+    compact_idle_sessions,
+    purge_expired_idempotency_keys,
+    purge_expired_image_uploads,
+    purge_orphan_review_images,
+)
+from .idempotency_crud import (
+    claim_idempotency_key,
+    get_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key,
+)
+from .recommendation_job_crud import (
+    enqueue_recommendation_job,
+    enqueue_recommendation_jobs,
+    claim_recommendation_jobs,
+    renew_recommendation_jobs,
+    complete_recommendation_job,
+    fail_recommendation_job,
+    release_recommendation_jobs,
+    count_recommendation_jobs,
+)
+from .lock_crud import (
+    try_advisory_lock,
+    advisory_unlock,
+)
+from .s3_deletion_crud import (
+    enqueue_s3_deletions,
+    get_due_s3_deletions,
+    remove_s3_deletions,
+    reschedule_s3_deletions,
+    get_referenced_image_urls,
+)
 
 __all__ = [
     "create_photo_card",
+    "create_photo_card_with_session",
+    "create_photo_cards_with_sessions",
     "get_photo_card",
     "verify_photo_card",
+    "count_active_photo_cards",
+    "stream_active_photo_card_ids",
     "create_session",
     "get_session_by_photo_card_id",
     "get_session_by_id",
+    "get_unfinished_sessions",
     "update_session_status",
     "update_last_accessed",
+    "copy_session_result",
+    "requeue_compacted_session",
     "create_review",
     "get_review_by_id",
     "get_reviews_by_place",
     "get_reviews_by_user",
     "get_all_reviews",
+    "encode_review_cursor",
+    "decode_review_cursor",
     "get_place_average_rating",
+    "get_place_rating_stats",
+    "get_place_ratings",
+    "rebuild_place_rating_stats",
     "update_review",
     "delete_review",
     "add_review_images",
+    "record_image_uploads",
+    "attach_uploaded_images",
     "delete_review_image",
+    "search_reviews",
+    "get_reviews_by_ids",
+    "encode_search_cursor",
+    "decode_search_cursor",
+    "rebuild_review_search_vectors",
+    "created_at_window",
+    "ensure_partitions",
+    "list_partitions",
+    "deactivate_expired_photo_cards",
+    "session_sweep_targets",
+    "purge_idle_sessions",
+    "compact_idle_sessions",
+    "purge_expired_idempotency_keys",
+    "purge_expired_image_uploads",
+    "purge_orphan_review_images",
+    "claim_idempotency_key",
+    "get_idempotency_key",
+    "complete_idempotency_key",
+    "release_idempotency_key",
+    "enqueue_recommendation_job",
+    "enqueue_recommendation_jobs",
+    "claim_recommendation_jobs",
+    "renew_recommendation_jobs",
+    "complete_recommendation_job",
+    "fail_recommendation_job",
+    "release_recommendation_jobs",
+    "count_recommendation_jobs",
+    "try_advisory_lock",
+    "advisory_unlock",
+    "enqueue_s3_deletions",
+    "get_due_s3_deletions",
+    "remove_s3_deletions",
+    "reschedule_s3_deletions",
+    "get_referenced_image_urls",
 ]
@@ -0,0 +1,89 @@
+"""
+Idempotency-Key 저장소 CRUD 함수
+
+키 하나는 (메서드, 경로, 클라이언트, 헤더 값)의 해시로 저장합니다.
+JSON 요청은 본문의 해시(request_hash)도 저장해 같은 키의 다른 요청을 구분합니다.
+- processing: 첫 요청 처리 중 (locked_at 이후 lock_seconds가 지나면 중단된 것으로 보고 다른 요청이 이어받음)
+- completed: 응답(상태 코드, Content-Type, 본문) 저장됨 → 같은 키 재요청에 그대로 재생
+만료(expires_at)된 행은 새 요청이 다시 차지하고, 만료 정리(sweeper)가 배치로 삭제합니다.
+"""
+from typing import Optional
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.db_models import IdempotencyKey
+
+
+async def claim_idempotency_key(
+    db: AsyncSession,
+    key: str,
+    ttl_seconds: int,
+    lock_seconds: int,
+    request_hash: Optional[str] = None,
+) -> bool:
+    """
+    키 선점 (INSERT ... ON CONFLICT 한 문장)
+
+    새 키, 만료된 키, 처리 중 멈춘(lock_seconds 초과) 키면 processing으로 차지하고 True.
+    다른 요청이 처리 중이거나 완료된 키면 False.
+    """
+    result = await db.execute(
+        text("""
+            INSERT INTO idempotency_keys (key, status, request_hash, locked_at, expires_at)
+            VALUES (:key, 'processing', :request_hash, now(), now() + make_interval(secs => :ttl))
+            ON CONFLICT (key) DO UPDATE
+            SET status = 'processing', locked_at = now(), expires_at = EXCLUDED.expires_at,
+                request_hash = EXCLUDED.request_hash,
+                response_status = NULL, content_type = NULL, response_body = NULL
+            WHERE idempotency_keys.expires_at < now()
+               OR (idempotency_keys.status = 'processing'
+                   AND idempotency_keys.locked_at < now() - make_interval(secs => :lock))
+            RETURNING key
+        """),
+        {"key": key, "request_hash": request_hash, "ttl": ttl_seconds, "lock": lock_seconds},
+    )
+    claimed = result.scalar_one_or_none() is not None
+    await db.commit()
+    return claimed
+
+
+async def get_idempotency_key(db: AsyncSession, key: str) -> Optional[IdempotencyKey]:
+    """저장된 키 조회 (만료된 키는 없는 것으로)"""
+    result = await db.execute(
+        select(IdempotencyKey).where(
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at >= func.now(),
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+async def complete_idempotency_key(
+    db: AsyncSession,
+    key: str,
+    response_status: int,
+    content_type: Optional[str],
+    response_body: bytes,
+) -> None:
+    """첫 요청의 응답 저장 (processing → completed)"""
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .values(
+            status="completed",
+            response_status=response_status,
+            content_type=content_type,
+            response_body=response_body,
+        )
+    )
+    await db.commit()
+
+
+async def release_idempotency_key(db: AsyncSession, key: str) -> None:
+    """첫 요청이 실패(5xx/예외)하면 키 삭제 → 재시도가 새로 처리됨"""
+    await db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.key == key,
+            IdempotencyKey.status == "processing",
+        )
+    )
+    await db.commit()
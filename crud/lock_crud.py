@@ -0,0 +1,24 @@
+"""
+PostgreSQL advisory lock - 여러 서버 프로세스 중 하나만 실행해야 하는 백그라운드 작업용
+
+세션 수준 잠금이라 잡은 연결에서 풀어야 하고, 연결이 끊기면 자동으로 풀립니다.
+"""
+from sqlalchemy import text
+
+# 작업별 잠금 키 (pg_try_advisory_lock의 bigint, 다른 작업과 겹치지 않게 여기서만 정의)
+ADVISORY_LOCK_KEYS = {
+    "partition_archive": 4_510_001,
+    "s3_orphan_sweep": 4_510_002,
+}
+
+
+async def try_advisory_lock(conn, name: str) -> bool:
+    """잠금 시도 (기다리지 않음), 다른 프로세스가 잡고 있으면 False"""
+    result = await conn.execute(
+        text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEYS[name]}
+    )
+    return bool(result.scalar())
+
+
+async def advisory_unlock(conn, name: str) -> None:
+    await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEYS[name]})
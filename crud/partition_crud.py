@@ -0,0 +1,199 @@
+"""
+월별 파티션 관리 / 파티션 프루닝 헬퍼
+
+reviews, meeting_platform_sessions는 created_at 기준 월별 RANGE 파티션입니다.
+    reviews_p202610 = [2026-10-01, 2026-11-01)
+
+- 파티션 이름은 {테이블}_pYYYYMM 규칙 (목록/보관 작업이 이 규칙으로 범위를 계산)
+- DEFAULT 파티션은 두지 않음 (DETACH ... CONCURRENTLY 불가) → 앞으로 몇 달치를 미리 생성
+- 새 ID는 UUIDv7(앞 48비트가 생성 시각 ms)이라 ID만으로 created_at 범위를 알 수 있고,
+  ID 조회에 created_at 조건을 붙여 해당 월 파티션만 읽습니다 (created_at_window)
+"""
+import re
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import text
+from config import get_settings
+from models.ids import id_timestamp
+
+PARTITIONED_TABLES = ("reviews", "meeting_platform_sessions")
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})(?P<month>\d{2})$")
+
+
+# === 프루닝 ===
+
+def created_at_window(column, *ids: str) -> list:
+    """
+    ID 조회에 붙일 created_at 범위 조건 (파티션 프루닝용)
+
+    ID 생성 시각 ± partition_prune_slack_hours (앱/DB 시계 차이, 요청 처리 시간 여유).
+    하나라도 v7이 아닌 ID가 있으면 [] → 모든 파티션 검색 (기존 데이터 호환).
+    """
+    stamps = [id_timestamp(value) for value in ids]
+    if not stamps or any(stamp is None for stamp in stamps):
+        return []
+    slack = timedelta(hours=get_settings().partition_prune_slack_hours)
+    return [column >= min(stamps) - slack, column < max(stamps) + slack]
+
+
+# === 파티션 관리 ===
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def parse_partition_name(name: str) -> Optional[tuple[str, date]]:
+    """파티션 이름 → (부모 테이블, 월 시작일), 규칙에 맞지 않으면 None"""
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return match["table"], date(int(match["year"]), int(match["month"]), 1)
+
+
+async def is_partitioned(db, table: str) -> bool:
+    """테이블이 파티션 테이블인지 (마이그레이션 적용 전이면 False)"""
+    result = await db.execute(
+        text("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)
+            )
+        """),
+        {"table": table},
+    )
+    return bool(result.scalar())
+
+
+async def list_partitions(db, table: str) -> list[tuple[str, date]]:
+    """[(파티션 이름, 월 시작일)] - 오래된 순, 이름 규칙에 맞는 파티션만"""
+    result = await db.execute(
+        text("""
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(:table)
+        """),
+        {"table": table},
+    )
+    partitions = []
+    for (name,) in result.all():
+        parsed = parse_partition_name(name)
+        if parsed is not None and parsed[0] == table:
+            partitions.append((name, parsed[1]))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+async def ensure_partitions(
+    db,
+    table: str,
+    since: Optional[date] = None,
+    months_ahead: int = 3,
+) -> list[str]:
+    """
+    since(기본: 이번 달)부터 months_ahead개월 뒤까지 빠진 월 파티션 생성
+
+    Returns:
+        새로 만든 파티션 이름 목록
+    """
+    this_month = month_start(date.today())
+    month = month_start(since or this_month)
+    last = add_months(this_month, months_ahead)
+    existing = {name for name, _ in await list_partitions(db, table)}
+
+    created = []
+    while month <= last:
+        name = partition_name(table, month)
+        if name not in existing:
+            await db.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def list_detached_partitions(db, table: str) -> list[str]:
+    """분리됐지만 아직 삭제되지 않은 파티션 테이블 (보관 중 중단된 경우)"""
+    result = await db.execute(
+        text("""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND NOT relispartition
+              AND relnamespace = current_schema()::regnamespace
+              AND relname LIKE :pattern
+        """),
+        {"pattern": f"{table}\\_p%"},
+    )
+    return sorted(
+        name for (name,) in result.all()
+        if (parse_partition_name(name) or (None,))[0] == table
+    )
+
+
+async def detach_partition(conn, table: str, name: str, finalize: bool = False) -> None:
+    """
+    파티션 분리 (CONCURRENTLY: 부모 테이블 쓰기를 막지 않음)
+
+    트랜잭션 안에서 실행할 수 없어 AUTOCOMMIT 연결이 필요합니다.
+    finalize=True는 중단된 CONCURRENTLY 분리를 마무리합니다.
+    """
+    mode = "FINALIZE" if finalize else "CONCURRENTLY"
+    await conn.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}" {mode}'))
+
+
+async def attach_partition(conn, table: str, name: str) -> None:
+    """분리했던 파티션 다시 연결 (보관 실패 시 복구)"""
+    _, month = parse_partition_name(name)
+    await conn.execute(text(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+
+
+async def release_session_guards(conn, name: str) -> None:
+    """보관하는 세션 파티션의 카드 → 세션 가드(session_by_card) 행 삭제 (DROP 전)"""
+    await conn.execute(text(
+        f'DELETE FROM session_by_card g USING "{name}" s WHERE g.session_id = s.id'
+    ))
+
+
+async def subtract_review_ratings(conn, name: str) -> None:
+    """
+    보관하는 리뷰 파티션의 별점을 장소 평점 집계(place_rating_stats)에서 뺌 (DROP과 같은 트랜잭션)
+
+    삭제된(is_deleted) 리뷰는 삭제할 때 이미 뺐으므로 제외
+    """
+    counts = ",\n".join(
+        f"count_{r} = GREATEST(p.count_{r} - r.count_{r}, 0)" for r in range(1, 6)
+    )
+    filters = ",\n".join(
+        f"count(*) FILTER (WHERE rating = {r}) AS count_{r}" for r in range(1, 6)
+    )
+    await conn.execute(text(f"""
+        UPDATE place_rating_stats p
+        SET rating_sum = GREATEST(p.rating_sum - r.rating_sum, 0),
+            rating_count = GREATEST(p.rating_count - r.rating_count, 0),
+            {counts},
+            updated_at = now()
+        FROM (
+            SELECT place_id, sum(rating) AS rating_sum, count(*) AS rating_count,
+                   {filters}
+            FROM "{name}"
+            WHERE is_deleted = FALSE
+            GROUP BY place_id
+        ) r
+        WHERE p.place_id = r.place_id
+    """))
+
+
+async def drop_table(conn, name: str) -> None:
+    await conn.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
@@ -1,29 +1,163 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from models.db_models import PhotoCard
+from datetime import timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncScalarResult
+from sqlalchemy import select, insert
+from sqlalchemy.sql import func
+from config import get_settings
+from models.db_models import PhotoCard, MeetingPlatformSession, SessionByCard
+from models.ids import uuid7
 from schemas.models import PhotoCardCreate
 from typing import Optional
-import uuid
+from .recommendation_job_crud import enqueue_recommendation_job, enqueue_recommendation_jobs
+
+
+def _photo_card_values(photo_card: PhotoCardCreate) -> dict:
+    values = {
+        "id": uuid7(),
+        "user_id": photo_card.user_id,
+        "province": photo_card.province,
+        "city": photo_card.city,
+        "message": photo_card.message,
+        "hashtags": photo_card.hashtags,
+        "ai_quote": photo_card.ai_quote,
+        "image_path": photo_card.image_path,
+        "is_active": True,
+    }
+    ttl_days = get_settings().photo_card_ttl_days
+    if ttl_days > 0:
+        # DB 시각 기준 (만료 정리도 DB now()와 비교)
+        values["expires_at"] = func.now() + timedelta(days=ttl_days)
+    return values
 
 
 async def create_photo_card(db: AsyncSession, photo_card: PhotoCardCreate) -> PhotoCard:
     """PhotoCard 생성"""
-    db_photo_card = PhotoCard(
-        id=str(uuid.uuid4()),
-        user_id=photo_card.user_id,
-        province=photo_card.province,
-        city=photo_card.city,
-        message=photo_card.message,
-        hashtags=photo_card.hashtags,
-        ai_quote=photo_card.ai_quote,
-        image_path=photo_card.image_path,
-    )
+    db_photo_card = PhotoCard(**_photo_card_values(photo_card))
     db.add(db_photo_card)
     await db.commit()
     await db.refresh(db_photo_card)
     return db_photo_card
 
 
+async def create_photo_card_with_session(
+    db: AsyncSession,
+    photo_card: PhotoCardCreate,
+    query: str,
+) -> tuple[PhotoCard, Optional[str]]:
+    """
+    포토카드 + 추천 세션 + 추천 작업(outbox)을 한 트랜잭션으로 생성
+
+    INSERT ... RETURNING(서버 기본값) → 세션/가드(session_by_card)/작업 INSERT → COMMIT 한 번.
+    세션은 area_code, sigungu_code가 모두 있을 때만 만들고,
+    커밋되면 작업이 반드시 남아 있으므로 서버가 죽어도 디스패처가 이어서 처리합니다.
+
+    Returns:
+        (응답용 PhotoCard(세션에 추가하지 않음), 세션 ID 또는 None)
+    """
+    values = _photo_card_values(photo_card)
+    table = PhotoCard.__table__
+    result = await db.execute(
+        insert(table).values(**values).returning(table.c.created_at, table.c.expires_at)
+    )
+    created_at, expires_at = result.one()
+
+    session_id = None
+    if photo_card.area_code and photo_card.sigungu_code:
+        session_id = uuid7()
+        # 세션 created_at(now())은 카드와 같은 트랜잭션 시각 → 카드 ID 시각의 파티션
+        await db.execute(
+            insert(MeetingPlatformSession.__table__).values(
+                id=session_id,
+                photo_card_id=values["id"],
+                status="pending",
+                query=query,
+                area_code=photo_card.area_code,
+                sigungu_code=photo_card.sigungu_code,
+            )
+        )
+        # 새 카드라 충돌할 수 없음 (카드당 세션 하나 가드)
+        await db.execute(
+            insert(SessionByCard.__table__).values(photo_card_id=values["id"], session_id=session_id)
+        )
+        await enqueue_recommendation_job(
+            db, session_id, query, photo_card.area_code, photo_card.sigungu_code
+        )
+    await db.commit()
+
+    return PhotoCard(**{**values, "created_at": created_at, "expires_at": expires_at}), session_id
+
+
+async def create_photo_cards_with_sessions(
+    db: AsyncSession,
+    photo_cards: list[PhotoCardCreate],
+    queries: list[str],
+) -> tuple[list[tuple[PhotoCard, Optional[str]]], int]:
+    """
+    포토카드 여러 장 + 세션 + 추천 작업을 한 트랜잭션으로 일괄 생성
+
+    - 카드/세션/가드/작업 각각 multi-row INSERT 한 문장 (카드만 RETURNING으로 서버 기본값 회수)
+    - (쿼리, area_code, sigungu_code)가 같은 카드들은 추천 작업 하나로 묶고
+      첫 세션의 결과를 나머지 세션에 복사 (shared_session_ids)
+
+    Args:
+        queries: photo_cards와 같은 순서의 추천 쿼리
+
+    Returns:
+        ([(응답용 PhotoCard, 세션 ID 또는 None)] - 입력 순서, 기록한 추천 작업 수)
+    """
+    rows = [_photo_card_values(photo_card) for photo_card in photo_cards]
+    table = PhotoCard.__table__
+    result = await db.execute(
+        insert(table).values(rows).returning(table.c.id, table.c.created_at, table.c.expires_at)
+    )
+    # RETURNING 순서에 기대지 않고 ID로 매칭
+    returned = {row.id: (row.created_at, row.expires_at) for row in result.all()}
+
+    sessions = []
+    session_ids: list[Optional[str]] = []
+    jobs: dict[tuple, dict] = {}
+    for photo_card, query, values in zip(photo_cards, queries, rows):
+        if not (photo_card.area_code and photo_card.sigungu_code):
+            session_ids.append(None)
+            continue
+        session_id = uuid7()
+        session_ids.append(session_id)
+        sessions.append({
+            "id": session_id,
+            "photo_card_id": values["id"],
+            "status": "pending",
+            "query": query,
+            "area_code": photo_card.area_code,
+            "sigungu_code": photo_card.sigungu_code,
+        })
+        key = (query, photo_card.area_code, photo_card.sigungu_code)
+        if key in jobs:
+            jobs[key]["shared_session_ids"].append(session_id)
+        else:
+            jobs[key] = {
+                "session_id": session_id,
+                "query": query,
+                "area_code": photo_card.area_code,
+                "sigungu_code": photo_card.sigungu_code,
+                "shared_session_ids": [],
+            }
+
+    if sessions:
+        await db.execute(insert(MeetingPlatformSession.__table__).values(sessions))
+        await db.execute(insert(SessionByCard.__table__).values([
+            {"photo_card_id": session["photo_card_id"], "session_id": session["id"]} for session in sessions
+        ]))
+        await enqueue_recommendation_jobs(db, [
+            {**job, "shared_session_ids": job["shared_session_ids"] or None} for job in jobs.values()
+        ])
+    await db.commit()
+
+    created = []
+    for values, session_id in zip(rows, session_ids):
+        created_at, expires_at = returned[values["id"]]
+        created.append((PhotoCard(**{**values, "created_at": created_at, "expires_at": expires_at}), session_id))
+    return created, len(jobs)
+
+
 async def get_photo_card(db: AsyncSession, photo_card_id: str) -> Optional[PhotoCard]:
     """PhotoCard 조회"""
     result = await db.execute(
@@ -36,6 +170,26 @@ async def get_photo_card(db: AsyncSession, photo_card_id: str) -> Optional[Photo
 
 
 async def verify_photo_card(db: AsyncSession, photo_card_id: str) -> bool:
-    """PhotoCard 존재 및 활성 상태 검증"""
-    photo_card = await get_photo_card(db, photo_card_id)
-    return photo_card is not None
+    """PhotoCard 존재 및 활성 상태 검증 (ID만 조회 → 부분 인덱스 index-only scan)"""
+    result = await db.execute(
+        select(PhotoCard.id).where(
+            PhotoCard.id == photo_card_id,
+            PhotoCard.is_active == True
+        )
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def count_active_photo_cards(db: AsyncSession) -> int:
+    """활성 포토카드 수 (검증 캐시 필터 크기 계산용)"""
+    result = await db.execute(
+        select(func.count()).select_from(PhotoCard).where(PhotoCard.is_active == True)
+    )
+    return result.scalar() or 0
+
+
+async def stream_active_photo_card_ids(db: AsyncSession) -> AsyncScalarResult:
+    """활성 포토카드 ID 전체 (서버측 커서, idx_photo_cards_active_id index-only scan)"""
+    return await db.stream_scalars(
+        select(PhotoCard.id).where(PhotoCard.is_active == True)
+    )
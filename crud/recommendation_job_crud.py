@@ -0,0 +1,157 @@
+"""
+추천 작업 outbox CRUD 함수
+
+작업은 포토카드/세션과 같은 트랜잭션에 기록되고(enqueue_recommendation_job, commit 없음),
+디스패처가 임대(lease) 방식으로 가져갑니다.
+- claim: next_attempt_at이 지난 작업을 FOR UPDATE SKIP LOCKED로 잡고 next_attempt_at = now() + lease
+  → 여러 프로세스가 같은 작업을 동시에 가져가지 않음
+- 실행 중에는 renew로 임대를 연장 (느린 작업이 임대 만료로 두 번 실행되지 않게)
+- 처리가 끝나면 complete로 삭제, 처리 중 서버가 죽으면 임대가 끝난 뒤 다시 가져감
+- 처리 중 오류는 fail로 last_error에 기록하고 잠시 뒤 재시도,
+  정상 종료로 중단한 작업은 release로 바로 다시 가져갈 수 있게 되돌림
+"""
+from typing import Optional, Sequence
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.db_models import RecommendationJob
+
+
+async def enqueue_recommendation_job(
+    db: AsyncSession,
+    session_id: str,
+    query: str,
+    area_code: Optional[str] = None,
+    sigungu_code: Optional[str] = None,
+    shared_session_ids: Optional[list[str]] = None,
+) -> None:
+    """
+    추천 작업 기록 (호출자의 트랜잭션에 포함, 커밋하지 않음)
+
+    shared_session_ids: 같은 추천 결과를 복사받을 세션 (같은 쿼리의 일괄 생성 카드)
+    """
+    await enqueue_recommendation_jobs(db, [{
+        "session_id": session_id,
+        "query": query,
+        "area_code": area_code,
+        "sigungu_code": sigungu_code,
+        "shared_session_ids": shared_session_ids,
+    }])
+
+
+async def enqueue_recommendation_jobs(db: AsyncSession, jobs: list[dict]) -> None:
+    """추천 작업 여러 개를 multi-row INSERT 한 문장으로 기록 (커밋하지 않음)"""
+    if not jobs:
+        return
+    await db.execute(
+        insert(RecommendationJob.__table__)
+        .values(jobs)
+        .on_conflict_do_nothing(index_elements=["session_id"])
+    )
+
+
+async def claim_recommendation_jobs(
+    db: AsyncSession,
+    limit: int,
+    lease_seconds: int,
+    running: Sequence[str] = (),
+) -> list[dict]:
+    """
+    처리할 작업을 최대 limit개 가져오고 lease_seconds 동안 다른 프로세스가 못 가져가게 표시
+
+    running: 이 프로세스에서 아직 실행 중인 작업 (임대 연장이 늦어 만료됐어도 다시 가져가지 않음)
+
+    Returns:
+        [{"session_id", "query", "area_code", "sigungu_code", "shared_session_ids", "attempts", "last_error"}]
+        (attempts는 이번 시도 포함, last_error는 이전 시도의 오류)
+    """
+    result = await db.execute(
+        text("""
+            UPDATE recommendation_jobs
+            SET attempts = attempts + 1,
+                next_attempt_at = now() + make_interval(secs => :lease)
+            WHERE session_id = ANY(ARRAY(
+                SELECT session_id FROM recommendation_jobs
+                WHERE next_attempt_at <= now()
+                  AND NOT (session_id = ANY(:running))
+                ORDER BY next_attempt_at
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            ))
+            RETURNING session_id, query, area_code, sigungu_code, shared_session_ids, attempts, last_error
+        """),
+        {"limit": limit, "lease": lease_seconds, "running": list(running)},
+    )
+    jobs = [dict(row._mapping) for row in result.all()]
+    await db.commit()
+    return jobs
+
+
+async def renew_recommendation_jobs(db: AsyncSession, session_ids: Sequence[str], lease_seconds: int) -> None:
+    """실행 중인 작업의 임대를 지금부터 lease_seconds로 연장 (heartbeat)"""
+    if not session_ids:
+        return
+    await db.execute(
+        text("""
+            UPDATE recommendation_jobs
+            SET next_attempt_at = now() + make_interval(secs => :lease)
+            WHERE session_id = ANY(:session_ids)
+        """),
+        {"session_ids": list(session_ids), "lease": lease_seconds},
+    )
+    await db.commit()
+
+
+async def complete_recommendation_job(db: AsyncSession, session_id: str) -> None:
+    """처리 끝난 작업 삭제 (성공/실패 모두 세션에 결과가 기록된 뒤)"""
+    await db.execute(delete(RecommendationJob).where(RecommendationJob.session_id == session_id))
+    await db.commit()
+
+
+async def fail_recommendation_job(
+    db: AsyncSession,
+    session_id: str,
+    error: str,
+    retry_seconds: int,
+) -> None:
+    """처리 중 오류난 작업: last_error 기록, retry_seconds 뒤 다시 가져가게 임대 단축"""
+    await db.execute(
+        text("""
+            UPDATE recommendation_jobs
+            SET last_error = :error, next_attempt_at = now() + make_interval(secs => :retry)
+            WHERE session_id = :session_id
+        """),
+        {"session_id": session_id, "error": error[:500], "retry": retry_seconds},
+    )
+    await db.commit()
+
+
+async def release_recommendation_jobs(db: AsyncSession, session_ids: list[str], reason: str) -> None:
+    """
+    서버 정상 종료로 중단한 작업을 임대 만료를 기다리지 않고 바로 다시 가져갈 수 있게 되돌림
+
+    중단은 작업 실패가 아니므로 이번 시도는 attempts에서 뺍니다 (배포가 잦아도 포기되지 않음).
+    """
+    if not session_ids:
+        return
+    await db.execute(
+        text("""
+            UPDATE recommendation_jobs
+            SET attempts = GREATEST(attempts - 1, 0), next_attempt_at = now(), last_error = :reason
+            WHERE session_id = ANY(:session_ids)
+        """),
+        {"session_ids": session_ids, "reason": reason},
+    )
+    await db.commit()
+
+
+async def count_recommendation_jobs(db: AsyncSession) -> dict:
+    """대기/처리 중 작업 수 (디버그용)"""
+    result = await db.execute(
+        text("""
+            SELECT count(*) FILTER (WHERE next_attempt_at <= now()) AS due,
+                   count(*) FILTER (WHERE next_attempt_at > now()) AS leased
+            FROM recommendation_jobs
+        """)
+    )
+    return dict(result.one()._mapping)
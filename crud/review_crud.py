@@ -1,11 +1,117 @@
 """
 리뷰 CRUD 함수
 """
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy import select, func, desc
+from sqlalchemy import select, func, desc, delete, update, case, text, tuple_, true, and_, Float
+from sqlalchemy.dialects.postgresql import insert, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from models.db_models import Review, ReviewImage
+from sqlalchemy.orm import selectinload, aliased
+from models.db_models import Review, ReviewImage, ReviewImageUpload, PlaceRatingStats
+from models.ids import uuid7
+from config import get_settings
+from .review_search_crud import search_vector_expr
+from .partition_crud import created_at_window
+
+RATING_VALUES = (1, 2, 3, 4, 5)
+
+# 목록 정렬 키: (created_at, id) 내림차순 - id로 같은 시각 리뷰의 순서를 고정
+REVIEW_LIST_ORDER = (desc(Review.created_at), desc(Review.id))
+
+
+def encode_review_cursor(review: Review) -> str:
+    """목록 마지막 리뷰 → 다음 페이지 커서 (불투명 문자열)"""
+    raw = json.dumps([review.created_at.isoformat(), review.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_review_cursor(cursor: str) -> tuple[datetime, str]:
+    """커서 → (created_at, id), 잘못된 커서면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, review_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(review_id)
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+
+def _paginate(stmt, limit: int, offset: int, cursor: Optional[tuple[datetime, str]]):
+    """cursor(decode_review_cursor 결과)가 있으면 keyset 조건, 없으면 기존 OFFSET (하위 호환)"""
+    stmt = stmt.order_by(*REVIEW_LIST_ORDER).limit(limit)
+    if cursor is not None:
+        return stmt.where(tuple_(Review.created_at, Review.id) < tuple_(*cursor))
+    return stmt.offset(offset)
+
+
+async def _apply_rating_delta(
+    db: AsyncSession,
+    place_id: str,
+    added: Optional[int] = None,
+    removed: Optional[int] = None,
+) -> None:
+    """
+    평점 집계 증분 갱신 (호출자의 트랜잭션 안에서 실행, 커밋하지 않음)
+
+    INSERT ... ON CONFLICT DO UPDATE로 행 단위 원자적 증감 → 동시 리뷰 작성에도 안전
+    """
+    delta = {"rating_sum": 0, "rating_count": 0, **{f"count_{r}": 0 for r in RATING_VALUES}}
+    if added is not None:
+        delta["rating_sum"] += added
+        delta["rating_count"] += 1
+        delta[f"count_{added}"] += 1
+    if removed is not None:
+        delta["rating_sum"] -= removed
+        delta["rating_count"] -= 1
+        delta[f"count_{removed}"] -= 1
+
+    table = PlaceRatingStats.__table__
+    stmt = insert(table).values(place_id=place_id, **delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.place_id],
+        set_={
+            **{col: table.c[col] + stmt.excluded[col] for col, value in delta.items() if value},
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+def _image_urls_column(review_id_column):
+    """RETURNING용 이미지 URL 배열 (image_order 순) - 응답 조립을 위한 재조회 없이 한 문장에서"""
+    return (
+        select(func.array_agg(aggregate_order_by(ReviewImage.image_url, ReviewImage.image_order)))
+        .where(ReviewImage.review_id == review_id_column)
+        .scalar_subquery()
+    )
+
+
+def _detached_review(values: dict, image_urls: list[str]) -> Review:
+    """이미 가진 값으로 응답용 Review 조립 (세션에 추가하지 않음)"""
+    review = Review(**values)
+    review.images = [
+        ReviewImage(review_id=review.id, image_url=url, image_order=i)
+        for i, url in enumerate(image_urls)
+    ]
+    return review
+
+
+async def _insert_images(
+    db: AsyncSession,
+    review_id: str,
+    image_urls: list[str],
+    start_order: int = 0,
+) -> list[dict]:
+    """이미지 여러 장을 multi-row INSERT 한 문장으로 추가"""
+    rows = [
+        {"id": str(uuid.uuid4()), "review_id": review_id, "image_url": url, "image_order": start_order + i}
+        for i, url in enumerate(image_urls)
+    ]
+    if rows:
+        await db.execute(insert(ReviewImage.__table__).values(rows))
+    return rows
 
 
 async def create_review(
@@ -18,37 +124,36 @@ async def create_review(
     user_id: Optional[str] = None,
     photo_card_id: Optional[str] = None,
 ) -> Review:
-    """리뷰 생성"""
-    review = Review(
-        place_id=place_id,
-        place_name=place_name,
-        rating=rating,
-        content=content,
-        user_id=user_id,
-        photo_card_id=photo_card_id,
-    )
-    db.add(review)
-    await db.flush()  # ID 생성을 위해 flush
-
-    # 이미지 추가
-    for i, url in enumerate(image_urls):
-        image = ReviewImage(
-            review_id=review.id,
-            image_url=url,
-            image_order=i,
-        )
-        db.add(image)
+    """
+    리뷰 생성
 
-    await db.commit()
-    await db.refresh(review)
-
-    # 이미지와 함께 다시 로드
+    INSERT ... RETURNING(서버 기본값) → 이미지 multi-row INSERT → 평점 집계 → COMMIT.
+    응답은 가진 값으로 조립하므로 refresh/재조회가 없습니다.
+    """
+    values = {
+        "id": uuid7(),
+        "place_id": place_id,
+        "place_name": place_name,
+        "rating": rating,
+        "content": content,
+        "user_id": user_id,
+        "photo_card_id": photo_card_id,
+        "is_deleted": False,
+    }
+    search = {}
+    if get_settings().review_search_backend == "postgres":
+        search["search_vector"] = search_vector_expr(place_name, content)
     result = await db.execute(
-        select(Review)
-        .options(selectinload(Review.images))
-        .where(Review.id == review.id)
+        insert(Review.__table__).values(**values, **search)
+        .returning(Review.__table__.c.created_at, Review.__table__.c.updated_at)
     )
-    return result.scalar_one()
+    created_at, updated_at = result.one()
+
+    await _insert_images(db, values["id"], image_urls)
+    await _apply_rating_delta(db, place_id, added=rating)
+    await db.commit()
+
+    return _detached_review({**values, "created_at": created_at, "updated_at": updated_at}, image_urls)
 
 
 async def get_review_by_id(
@@ -59,27 +164,80 @@ async def get_review_by_id(
     result = await db.execute(
         select(Review)
         .options(selectinload(Review.images))
-        .where(Review.id == review_id, Review.is_deleted == False)
+        .where(
+            Review.id == review_id,
+            Review.is_deleted == False,
+            *created_at_window(Review.created_at, review_id),
+        )
     )
     return result.scalar_one_or_none()
 
 
+async def _get_review_page(
+    db: AsyncSession,
+    conditions: list,
+    limit: int,
+    offset: int,
+    cursor: Optional[tuple[datetime, str]],
+    stats=None,
+) -> tuple[list[Review], int, float]:
+    """
+    리뷰 페이지 + 전체 개수 + 평균 별점을 한 번의 SQL로 조회
+
+    stats CTE(집계 1행) LEFT JOIN page → 페이지가 비어도 집계는 항상 반환됩니다.
+    이미지는 selectinload로 같은 execute 안에서 IN 조회 1회.
+    """
+    if stats is None:
+        stats = select(
+            func.count(Review.id).label("total_count"),
+            func.coalesce(func.avg(Review.rating), 0).label("average_rating"),
+        ).where(*conditions)
+    stats = stats.cte("stats")
+
+    page = _paginate(select(Review).where(*conditions), limit, offset, cursor).subquery("page")
+    page_review = aliased(Review, page)
+
+    result = await db.execute(
+        select(page_review, stats.c.total_count, stats.c.average_rating)
+        .select_from(stats)
+        .outerjoin(page, true())
+        .options(selectinload(page_review.images))
+        .order_by(page.c.created_at.desc(), page.c.id.desc())
+    )
+    rows = result.all()
+
+    reviews = [row[0] for row in rows if row[0] is not None]
+    total_count = rows[0].total_count if rows else 0
+    average_rating = float(rows[0].average_rating or 0) if rows else 0.0
+    return reviews, total_count, average_rating
+
+
 async def get_reviews_by_place(
     db: AsyncSession,
     place_id: str,
     limit: int = 50,
     offset: int = 0,
-) -> list[Review]:
-    """장소별 리뷰 목록 조회"""
-    result = await db.execute(
-        select(Review)
-        .options(selectinload(Review.images))
-        .where(Review.place_id == place_id, Review.is_deleted == False)
-        .order_by(desc(Review.created_at))
-        .limit(limit)
-        .offset(offset)
+    cursor: Optional[tuple[datetime, str]] = None,
+) -> tuple[list[Review], int, float]:
+    """
+    장소별 리뷰 목록 + 전체 개수 + 평균 별점
+
+    집계는 place_rating_stats 기본키 조회 (리뷰 스캔 없음, 보관한 파티션의 리뷰는 보관 시 빠짐)
+    """
+    count = func.coalesce(func.max(PlaceRatingStats.rating_count), 0)
+    stats = select(
+        count.label("total_count"),
+        func.coalesce(
+            func.max(PlaceRatingStats.rating_sum).cast(Float) / func.nullif(count, 0), 0
+        ).label("average_rating"),
+    ).where(PlaceRatingStats.place_id == place_id)
+
+    return await _get_review_page(
+        db,
+        [Review.place_id == place_id, Review.is_deleted == False],
+        limit, offset, cursor,
+        stats=stats,
     )
-    return list(result.scalars().all())
 
 
 async def get_reviews_by_user(
@@ -87,52 +245,126 @@ async def get_reviews_by_user(
     user_id: str,
     limit: int = 50,
     offset: int = 0,
-) -> list[Review]:
-    """사용자별 리뷰 목록 조회"""
-    result = await db.execute(
-        select(Review)
-        .options(selectinload(Review.images))
-        .where(Review.user_id == user_id, Review.is_deleted == False)
-        .order_by(desc(Review.created_at))
-        .limit(limit)
-        .offset(offset)
+    cursor: Optional[tuple[datetime, str]] = None,
+) -> tuple[list[Review], int, float]:
+    """사용자별 리뷰 목록 + 전체 개수 + 평균 별점"""
+    return await _get_review_page(
+        db,
+        [Review.user_id == user_id, Review.is_deleted == False],
+        limit, offset, cursor,
     )
-    return list(result.scalars().all())
 
 
 async def get_all_reviews(
     db: AsyncSession,
     limit: int = 50,
     offset: int = 0,
-) -> list[Review]:
-    """전체 리뷰 목록 조회"""
-    result = await db.execute(
-        select(Review)
-        .options(selectinload(Review.images))
-        .where(Review.is_deleted == False)
-        .order_by(desc(Review.created_at))
-        .limit(limit)
-        .offset(offset)
+    cursor: Optional[tuple[datetime, str]] = None,
+) -> tuple[list[Review], int, float]:
+    """
+    전체 리뷰 목록 + 전체 개수 + 평균 별점
+
+    집계는 place_rating_stats 합계 (장소 수만큼, 리뷰 스캔 없음, 보관한 파티션의 리뷰는 보관 시 빠짐)
+    """
+    count = func.coalesce(func.sum(PlaceRatingStats.rating_count), 0)
+    stats = select(
+        count.label("total_count"),
+        func.coalesce(
+            func.sum(PlaceRatingStats.rating_sum).cast(Float) / func.nullif(count, 0), 0
+        ).label("average_rating"),
+    )
+
+    return await _get_review_page(
+        db,
+        [Review.is_deleted == False],
+        limit, offset, cursor,
+        stats=stats,
     )
-    return list(result.scalars().all())
 
 
 async def get_place_average_rating(
     db: AsyncSession,
     place_id: str
 ) -> tuple[float, int]:
-    """장소별 평균 별점과 리뷰 수 조회"""
+    """장소별 평균 별점과 리뷰 수 조회 (집계 테이블 기본키 조회)"""
+    stats = await get_place_rating_stats(db, place_id)
+    if not stats or stats.rating_count <= 0:
+        return 0.0, 0
+    return stats.rating_sum / stats.rating_count, stats.rating_count
+
+
+async def get_place_rating_stats(
+    db: AsyncSession,
+    place_id: str
+) -> Optional[PlaceRatingStats]:
+    """장소별 평점 집계 (합계, 개수, 별점 분포)"""
+    return await db.get(PlaceRatingStats, place_id)
+
+
+async def get_place_ratings(
+    db: AsyncSession,
+    place_ids: list[str],
+) -> dict[str, tuple[float, int]]:
+    """
+    여러 장소의 평균 별점과 리뷰 수 일괄 조회 (집계 테이블 1회 조회)
+
+    Returns:
+        {place_id: (평균 별점, 리뷰 수)} - 리뷰가 없는 장소는 (0.0, 0)
+    """
+    ratings = {place_id: (0.0, 0) for place_id in place_ids}
+    if not place_ids:
+        return ratings
     result = await db.execute(
+        select(PlaceRatingStats.place_id, PlaceRatingStats.rating_sum, PlaceRatingStats.rating_count)
+        .where(PlaceRatingStats.place_id.in_(place_ids), PlaceRatingStats.rating_count > 0)
+    )
+    for place_id, rating_sum, rating_count in result.all():
+        ratings[place_id] = (rating_sum / rating_count, rating_count)
+    return ratings
+
+
+async def rebuild_place_rating_stats(
+    db: AsyncSession,
+    place_id: Optional[str] = None,
+) -> int:
+    """
+    reviews 테이블에서 평점 집계 재계산 (초기 백필/보정용)
+
+    Args:
+        place_id: 지정하면 해당 장소만, 없으면 전체
+
+    Returns:
+        재계산된 장소 수
+    """
+    table = PlaceRatingStats.__table__
+    clear = delete(table)
+    conditions = [Review.is_deleted == False]
+    if place_id is not None:
+        clear = clear.where(table.c.place_id == place_id)
+        conditions.append(Review.place_id == place_id)
+
+    aggregated = (
         select(
-            func.avg(Review.rating).label("avg_rating"),
-            func.count(Review.id).label("count")
+            Review.place_id,
+            func.sum(Review.rating),
+            func.count(Review.id),
+            *(func.count(case((Review.rating == r, 1))) for r in RATING_VALUES),
         )
-        .where(Review.place_id == place_id, Review.is_deleted == False)
+        .where(*conditions)
+        .group_by(Review.place_id)
     )
-    row = result.one()
-    avg_rating = float(row.avg_rating) if row.avg_rating else 0.0
-    count = row.count or 0
-    return avg_rating, count
+
+    # 재계산 중 들어오는 증분 갱신은 커밋 후로 대기 (증분이 재계산 결과에 덮이지 않도록)
+    await db.execute(text("LOCK TABLE place_rating_stats IN SHARE ROW EXCLUSIVE MODE"))
+    await db.execute(clear)
+    result = await db.execute(
+        insert(table).from_select(
+            ["place_id", "rating_sum", "rating_count", *(f"count_{r}" for r in RATING_VALUES)],
+            aggregated,
+        )
+    )
+    await db.commit()
+    return result.rowcount
 
 
 async def update_review(
@@ -141,39 +373,94 @@ async def update_review(
     rating: Optional[int] = None,
     content: Optional[str] = None,
 ) -> Optional[Review]:
-    """리뷰 수정"""
-    review = await get_review_by_id(db, review_id)
-    if not review:
-        return None
+    """
+    리뷰 수정 (UPDATE ... RETURNING 한 문장)
 
+    이전 별점은 FOR UPDATE 서브쿼리로 잠그고 함께 반환 → 평점 집계 증분 계산에 사용
+    """
+    changes = {}
     if rating is not None:
-        review.rating = rating
+        changes["rating"] = rating
     if content is not None:
-        review.content = content
+        changes["content"] = content
 
+    reviews = Review.__table__
+    window = created_at_window(reviews.c.created_at, review_id)
+    old = (
+        select(reviews.c.id, reviews.c.rating)
+        .where(reviews.c.id == review_id, reviews.c.is_deleted == False, *window)
+        .with_for_update()
+        .subquery("old")
+    )
+    result = await db.execute(
+        update(reviews)
+        .where(reviews.c.id == old.c.id, *window)
+        .values(**changes, updated_at=func.now())
+        .returning(
+            *(c for c in reviews.c if c.key != "search_vector"),
+            old.c.rating.label("old_rating"),
+            _image_urls_column(reviews.c.id).label("image_urls"),
+        )
+    )
+    row = result.mappings().one_or_none()
+    if row is None:
+        await db.rollback()
+        return None
+
+    if row["old_rating"] != row["rating"]:
+        await _apply_rating_delta(db, row["place_id"], added=row["rating"], removed=row["old_rating"])
+    if content is not None and get_settings().review_search_backend == "postgres":
+        await db.execute(
+            update(reviews)
+            .where(reviews.c.id == row["id"], reviews.c.created_at == row["created_at"])
+            .values(search_vector=search_vector_expr(row["place_name"], row["content"]))
+        )
     await db.commit()
-    await db.refresh(review)
-    return review
+
+    return _detached_review(
+        {c.key: row[c.name] for c in reviews.c if c.key != "search_vector"},
+        row["image_urls"] or [],
+    )
 
 
 async def delete_review(
     db: AsyncSession,
     review_id: str,
-    soft_delete: bool = True
-) -> bool:
-    """리뷰 삭제 (소프트 삭제)"""
-    review = await get_review_by_id(db, review_id)
-    if not review:
-        return False
+    soft_delete: bool = True,
+    commit: bool = True,
+) -> Optional[tuple[str, list[str]]]:
+    """
+    리뷰 삭제 (기본 소프트 삭제, UPDATE/DELETE ... RETURNING 한 문장)
+
+    commit=False면 호출자가 같은 트랜잭션에서 후속 작업(S3 삭제 대기열 기록 등) 후 커밋합니다.
+
+    Returns:
+        (place_id, 이미지 URL 목록), 리뷰가 없으면 None
+    """
+    reviews = Review.__table__
+    image_urls = _image_urls_column(reviews.c.id).label("image_urls")
+    condition = and_(
+        reviews.c.id == review_id,
+        reviews.c.is_deleted == False,
+        *created_at_window(reviews.c.created_at, review_id),
+    )
 
     if soft_delete:
-        review.is_deleted = True
-        await db.commit()
+        stmt = update(reviews).where(condition).values(is_deleted=True, updated_at=func.now())
     else:
-        await db.delete(review)
-        await db.commit()
+        stmt = delete(reviews).where(condition)
+    result = await db.execute(stmt.returning(reviews.c.place_id, reviews.c.rating, image_urls))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    if not soft_delete:
+        # 파티션 테이블(reviews)은 id 단독 FK 대상이 될 수 없어 이미지 행은 직접 삭제
+        await db.execute(delete(ReviewImage).where(ReviewImage.review_id == review_id))
 
-    return True
+    await _apply_rating_delta(db, row.place_id, removed=row.rating)
+    if commit:
+        await db.commit()
+    return row.place_id, list(row.image_urls or [])
 
 
 async def add_review_images(
@@ -182,19 +469,93 @@ async def add_review_images(
     image_urls: list[str],
     start_order: int = 0,
 ) -> list[ReviewImage]:
-    """리뷰에 이미지 추가"""
-    images = []
-    for i, url in enumerate(image_urls):
-        image = ReviewImage(
-            review_id=review_id,
-            image_url=url,
-            image_order=start_order + i,
-        )
-        db.add(image)
-        images.append(image)
+    """리뷰에 이미지 추가 (multi-row INSERT)"""
+    rows = await _insert_images(db, review_id, image_urls, start_order)
+    await db.commit()
+    return [ReviewImage(**row) for row in rows]
 
+
+async def record_image_uploads(
+    db: AsyncSession,
+    review_id: str,
+    uploads: list[tuple[str, str]],
+    valid_seconds: int,
+) -> None:
+    """presigned 업로드 발급 기록 [(S3 키, Content-Type)], valid_seconds 동안 finalize 가능"""
+    expires_at = func.now() + timedelta(seconds=valid_seconds)
+    await db.execute(
+        insert(ReviewImageUpload.__table__).values([
+            {"s3_key": key, "review_id": review_id, "content_type": content_type, "expires_at": expires_at}
+            for key, content_type in uploads
+        ])
+    )
     await db.commit()
-    return images
+
+
+async def attach_uploaded_images(
+    db: AsyncSession,
+    review_id: str,
+    uploads: dict[str, str],
+    max_images: int,
+) -> Optional[list[ReviewImage]]:
+    """
+    presigned로 올라온 이미지를 리뷰에 연결 (finalize), 리뷰가 없으면 None
+
+    uploads: {S3 키: 이미지 URL}
+    리뷰 행을 잠가(FOR UPDATE) 동시 finalize가 max_images를 넘지 못하게 하고,
+    이 리뷰에 발급된 만료 전 키만 발급 기록을 지우며 연결합니다 (1회용).
+
+    Raises:
+        ValueError: 발급되지 않은/만료된/이미 연결된 키, 이미지 수 초과
+    """
+    locked = await db.execute(
+        select(Review.id)
+        .where(
+            Review.id == review_id,
+            Review.is_deleted == False,
+            *created_at_window(Review.created_at, review_id)
+        )
+        .with_for_update()
+    )
+    if locked.scalar_one_or_none() is None:
+        await db.rollback()
+        return None
+
+    try:
+        claimed = await db.execute(
+            delete(ReviewImageUpload)
+            .where(
+                ReviewImageUpload.s3_key.in_(list(uploads)),
+                ReviewImageUpload.review_id == review_id,
+                ReviewImageUpload.expires_at > func.now(),
+            )
+            .returning(ReviewImageUpload.s3_key)
+        )
+        missing = set(uploads) - set(claimed.scalars().all())
+        if missing:
+            raise ValueError(f"이 리뷰에 발급되지 않았거나 만료된 이미지 키입니다: {sorted(missing)[0]}")
+
+        image_urls = list(uploads.values())
+        attached = await db.execute(
+            select(ReviewImage.image_url).where(ReviewImage.image_url.in_(image_urls)).limit(1)
+        )
+        if attached.scalar_one_or_none() is not None:
+            raise ValueError("이미 연결된 이미지입니다")
+
+        count, last_order = (await db.execute(
+            select(func.count(), func.max(ReviewImage.image_order))
+            .where(ReviewImage.review_id == review_id)
+        )).one()
+        if count + len(image_urls) > max_images:
+            raise ValueError(f"이미지는 최대 {max_images}장까지 업로드 가능합니다")
+
+        start_order = (last_order if last_order is not None else -1) + 1
+        rows = await _insert_images(db, review_id, image_urls, start_order)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return [ReviewImage(**row) for row in rows]
 
 
 async def delete_review_image(
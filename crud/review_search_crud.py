@@ -0,0 +1,178 @@
+"""
+리뷰 검색 CRUD 함수
+
+한국어는 띄어쓰기/조사 때문에 단어 단위 매칭이 잘 안 되므로
+place_name + content를 글자 bigram으로 쪼개 tsvector 컬럼(search_vector)에 저장합니다.
+    "주차 편해요" → 주차 편해 해요
+검색어도 같은 방식으로 쪼개 모든 bigram을 포함하는 리뷰를 GIN 인덱스로 찾습니다.
+tsvector/tsquery는 텍스트 검색 설정(파서)을 거치지 않고 만들어 로케일과 무관합니다.
+"""
+import base64
+import json
+import re
+import unicodedata
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select, func, desc, cast, literal, tuple_, update, Float
+from sqlalchemy.dialects.postgresql import TSQUERY, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from models.db_models import Review
+from .partition_crud import created_at_window
+
+_WORD = re.compile(r"\w+")
+
+
+# tsvector 위치 정보 최대값 (PostgreSQL 제한)
+_MAX_POSITION = 16383
+
+
+def text_grams(text: Optional[str]) -> list[str]:
+    """텍스트 → 글자 bigram 목록 (중복 포함, 등장 순서대로, 한 글자 단어는 그대로)"""
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    grams: list[str] = []
+    for word in _WORD.findall(normalized):
+        grams.extend([word] if len(word) == 1 else [word[i:i + 2] for i in range(len(word) - 1)])
+    return grams
+
+
+def search_terms(text: Optional[str]) -> list[str]:
+    """
+    검색어 → 검색 토큰 (중복 제거)
+
+    "웨이팅 30분!" → ["웨이", "이팅", "30", "0분"]
+    """
+    return list(dict.fromkeys(text_grams(text)))
+
+
+def _quote(term: str) -> str:
+    return "'" + term.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def search_vector_literal(place_name: str, content: str) -> str:
+    """
+    위치 정보가 있는 tsvector 리터럴 텍스트
+
+    - 이름 토큰은 가중치 A, 본문은 기본(D) → 이름 일치가 위로
+    - 같은 토큰이 여러 번 나오면 위치도 여러 개 → ts_rank가 빈도 반영
+    """
+    positions: dict[str, list[str]] = {}
+    grams = [(g, "A") for g in text_grams(place_name)] + [(g, "") for g in text_grams(content)]
+    for position, (gram, weight) in enumerate(grams[:_MAX_POSITION], start=1):
+        positions.setdefault(gram, []).append(f"{position}{weight}")
+    return " ".join(f"{_quote(gram)}:{','.join(p[:256])}" for gram, p in positions.items())
+
+
+def search_vector_expr(place_name: str, content: str):
+    """리뷰 저장 시 search_vector 컬럼 값 (리터럴을 직접 만들어 캐스팅)"""
+    return cast(literal(search_vector_literal(place_name, content)), TSVECTOR)
+
+
+def _tsquery(terms: list[str]):
+    """검색 토큰 → tsquery (모든 토큰 AND, 한 글자는 접두어 매칭)"""
+    parts = []
+    for term in terms:
+        quoted = _quote(term)
+        parts.append(quoted + ":*" if len(term) == 1 else quoted)
+    return cast(literal(" & ".join(parts)), TSQUERY)
+
+
+def encode_search_cursor(score: float, review: Review) -> str:
+    """검색 결과 마지막 항목 → 다음 페이지 커서"""
+    raw = json.dumps([score, review.created_at.isoformat(), review.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, datetime, str]:
+    """커서 → (점수, created_at, id), 잘못된 커서면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, created_at, review_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), datetime.fromisoformat(created_at), str(review_id)
+    except Exception as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+
+
+async def search_reviews(
+    db: AsyncSession,
+    terms: list[str],
+    place_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[tuple[float, datetime, str]] = None,
+) -> list[tuple[Review, float]]:
+    """
+    리뷰 검색 (search_vector GIN 인덱스, 관련도 → 최신순)
+
+    Returns:
+        [(리뷰, 점수)] - 점수는 ts_rank (이름 일치 > 본문 일치)
+    """
+    if not terms:
+        return []
+
+    query = _tsquery(terms)
+    score = func.ts_rank(Review.search_vector, query, type_=Float)
+    conditions = [Review.search_vector.op("@@")(query), Review.is_deleted == False]
+    if place_id:
+        conditions.append(Review.place_id == place_id)
+    if user_id:
+        conditions.append(Review.user_id == user_id)
+    if cursor is not None:
+        conditions.append(tuple_(score, Review.created_at, Review.id) < tuple_(*cursor))
+
+    result = await db.execute(
+        select(Review, score.label("score"))
+        .options(selectinload(Review.images))
+        .where(*conditions)
+        .order_by(desc(score), desc(Review.created_at), desc(Review.id))
+        .limit(limit)
+    )
+    return [(review, float(s)) for review, s in result.all()]
+
+
+async def get_reviews_by_ids(
+    db: AsyncSession,
+    review_ids: list[str],
+) -> list[Review]:
+    """여러 리뷰 조회 (요청 순서 유지, 삭제된 리뷰 제외)"""
+    if not review_ids:
+        return []
+    result = await db.execute(
+        select(Review)
+        .options(selectinload(Review.images))
+        .where(
+            Review.id.in_(review_ids),
+            Review.is_deleted == False,
+            *created_at_window(Review.created_at, *review_ids),
+        )
+    )
+    by_id = {review.id: review for review in result.scalars().all()}
+    return [by_id[review_id] for review_id in review_ids if review_id in by_id]
+
+
+async def rebuild_review_search_vectors(
+    db: AsyncSession,
+    batch_size: int = 500,
+) -> int:
+    """기존 리뷰의 search_vector 백필 (컬럼 추가 후 1회)"""
+    updated = 0
+    last_id = ""
+    while True:
+        result = await db.execute(
+            select(Review.id, Review.place_name, Review.content)
+            .where(Review.id > last_id)
+            .order_by(Review.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return updated
+        for review_id, place_name, content in rows:
+            await db.execute(
+                update(Review)
+                .where(Review.id == review_id)
+                .values(search_vector=search_vector_expr(place_name, content))
+            )
+        await db.commit()
+        updated += len(rows)
+        last_id = rows[-1].id
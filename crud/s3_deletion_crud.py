@@ -0,0 +1,113 @@
+"""
+S3 삭제 대기열 CRUD 함수
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, delete, update, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.db_models import S3PendingDeletion, Review, ReviewImage
+
+
+async def enqueue_s3_deletions(
+    db: AsyncSession,
+    s3_keys: list[str],
+    commit: bool = True,
+) -> None:
+    """
+    삭제할 S3 키 기록 (이미 있는 키는 무시)
+
+    commit=False면 호출자의 트랜잭션에 포함됩니다 (리뷰 삭제와 원자적으로 기록).
+    """
+    if not s3_keys:
+        return
+    stmt = insert(S3PendingDeletion).values(
+        [{"s3_key": key} for key in dict.fromkeys(s3_keys)]
+    ).on_conflict_do_nothing(index_elements=["s3_key"])
+    await db.execute(stmt)
+    if commit:
+        await db.commit()
+
+
+async def get_due_s3_deletions(
+    db: AsyncSession,
+    limit: int = 1000,
+) -> list[S3PendingDeletion]:
+    """
+    재시도 시각이 지난 삭제 대기 항목 조회 (오래된 순)
+
+    FOR UPDATE SKIP LOCKED: 호출자가 커밋할 때까지(삭제 결과 기록) 행을 잡아
+    여러 서버 프로세스의 워커가 같은 키를 동시에 삭제/재예약하지 않습니다.
+    """
+    result = await db.execute(
+        select(S3PendingDeletion)
+        .where(S3PendingDeletion.next_attempt_at <= func.now())
+        .order_by(S3PendingDeletion.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(result.scalars().all())
+
+
+async def remove_s3_deletions(
+    db: AsyncSession,
+    s3_keys: list[str],
+    commit: bool = True,
+) -> None:
+    """삭제 완료된 항목 제거 (commit=False면 호출자가 커밋)"""
+    if not s3_keys:
+        return
+    await db.execute(
+        delete(S3PendingDeletion).where(S3PendingDeletion.s3_key.in_(s3_keys))
+    )
+    if commit:
+        await db.commit()
+
+
+async def reschedule_s3_deletions(
+    db: AsyncSession,
+    failures: dict[str, str],
+    base_delay_seconds: float = 30,
+    max_delay_seconds: float = 3600,
+    commit: bool = True,
+) -> None:
+    """
+    삭제 실패 항목 재시도 예약 (지수 백오프)
+
+    Args:
+        failures: {S3 키: 에러 메시지}
+        commit: False면 호출자가 커밋
+    """
+    if not failures:
+        return
+    result = await db.execute(
+        select(S3PendingDeletion.s3_key, S3PendingDeletion.attempts)
+        .where(S3PendingDeletion.s3_key.in_(list(failures)))
+    )
+    now = datetime.now(timezone.utc)
+    for key, attempts in result.all():
+        delay = min(base_delay_seconds * (2 ** attempts), max_delay_seconds)
+        await db.execute(
+            update(S3PendingDeletion)
+            .where(S3PendingDeletion.s3_key == key)
+            .values(
+                attempts=attempts + 1,
+                last_error=failures[key][:500],
+                next_attempt_at=now + timedelta(seconds=delay),
+            )
+        )
+    if commit:
+        await db.commit()
+
+
+async def get_referenced_image_urls(db: AsyncSession) -> set[str]:
+    """
+    삭제되지 않은 리뷰가 참조하는 이미지 URL 전체 (고아 객체 정리용)
+
+    리뷰 행이 없는 이미지(보관된 오래된 파티션의 리뷰)도 참조 중으로 취급합니다.
+    """
+    result = await db.execute(
+        select(ReviewImage.image_url)
+        .outerjoin(Review, Review.id == ReviewImage.review_id)
+        .where(or_(Review.id.is_(None), Review.is_deleted == False))  # noqa: E712
+    )
+    return set(result.scalars().all())
@@ -1,9 +1,17 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import func
-from models.db_models import MeetingPlatformSession
+from models.db_models import MeetingPlatformSession, PhotoCard, SessionByCard
+from models.ids import uuid7
+from .partition_crud import created_at_window
+from .recommendation_job_crud import enqueue_recommendation_job
+from datetime import datetime
 from typing import Optional
-import uuid
+
+# 작업이 아직 끝나지 않은 상태 (idx_sessions_unfinished_created 부분 인덱스 조건과 동일)
+UNFINISHED_STATUSES = ("pending", "processing")
 
 
 async def create_session(
@@ -13,9 +21,28 @@ async def create_session(
     area_code: Optional[str] = None,
     sigungu_code: Optional[str] = None
 ) -> MeetingPlatformSession:
-    """세션 생성 (pending 상태)"""
+    """
+    세션 생성 (pending 상태), 카드에 이미 세션이 있으면 그 세션 반환
+
+    세션 테이블의 UNIQUE에는 파티션 키(created_at)가 들어가므로
+    카드당 하나는 session_by_card 가드 행(ON CONFLICT DO NOTHING)으로 보장합니다.
+    """
+    session_id = uuid7()
+    guard = await db.execute(
+        insert(SessionByCard.__table__)
+        .values(photo_card_id=photo_card_id, session_id=session_id)
+        .on_conflict_do_nothing(index_elements=["photo_card_id"])
+        .returning(SessionByCard.__table__.c.session_id)
+    )
+    if guard.scalar_one_or_none() is None:
+        await db.rollback()
+        existing = await db.execute(
+            select(SessionByCard.session_id).where(SessionByCard.photo_card_id == photo_card_id)
+        )
+        return await get_session_by_id(db, existing.scalar_one())
+
     session = MeetingPlatformSession(
-        id=str(uuid.uuid4()),
+        id=session_id,
         photo_card_id=photo_card_id,
         status="pending",
         query=query,
@@ -32,10 +59,11 @@ async def get_session_by_photo_card_id(
     db: AsyncSession,
     photo_card_id: str
 ) -> Optional[MeetingPlatformSession]:
-    """포토카드 ID로 세션 조회"""
+    """포토카드 ID로 세션 조회 (세션은 포토카드와 함께 생성 → 카드 ID 시각의 파티션만)"""
     result = await db.execute(
         select(MeetingPlatformSession).where(
-            MeetingPlatformSession.photo_card_id == photo_card_id
+            MeetingPlatformSession.photo_card_id == photo_card_id,
+            *created_at_window(MeetingPlatformSession.created_at, photo_card_id)
         )
     )
     return result.scalar_one_or_none()
@@ -48,20 +76,50 @@ async def get_session_by_id(
     """세션 ID로 조회"""
     result = await db.execute(
         select(MeetingPlatformSession).where(
-            MeetingPlatformSession.id == session_id
+            MeetingPlatformSession.id == session_id,
+            *created_at_window(MeetingPlatformSession.created_at, session_id)
         )
     )
     return result.scalar_one_or_none()
 
 
+async def get_unfinished_sessions(
+    db: AsyncSession,
+    created_before: Optional[datetime] = None,
+    limit: int = 100
+) -> list[MeetingPlatformSession]:
+    """
+    미완료(pending/processing) 세션 조회 (오래된 순, 작업 재시작/점검용)
+
+    상태 목록은 리터럴로 렌더링해야 플래너가 부분 인덱스 조건을 증명할 수 있습니다.
+    """
+    query = select(MeetingPlatformSession).where(
+        MeetingPlatformSession.status.in_(
+            bindparam("unfinished", UNFINISHED_STATUSES, expanding=True, literal_execute=True)
+        )
+    )
+    if created_before is not None:
+        query = query.where(MeetingPlatformSession.created_at < created_before)
+    result = await db.execute(
+        query.order_by(MeetingPlatformSession.created_at).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
 async def update_session_status(
     db: AsyncSession,
     session_id: str,
     status: str,
     recommendation_data: Optional[dict] = None,
-    error_message: Optional[str] = None
+    error_message: Optional[str] = None,
+    keep_completed: bool = False,
 ) -> Optional[MeetingPlatformSession]:
-    """세션 상태 업데이트"""
+    """
+    세션 상태 업데이트
+
+    keep_completed=True면 이미 completed인 세션은 바꾸지 않음
+    (추천 결과는 저장됐고 이후 단계만 실패한 작업을 포기할 때)
+    """
     update_data = {"status": status}
 
     if status == "completed" and recommendation_data:
@@ -72,7 +130,11 @@ async def update_session_status(
 
     await db.execute(
         update(MeetingPlatformSession)
-        .where(MeetingPlatformSession.id == session_id)
+        .where(
+            MeetingPlatformSession.id == session_id,
+            *created_at_window(MeetingPlatformSession.created_at, session_id),
+            *([MeetingPlatformSession.status != "completed"] if keep_completed else []),
+        )
         .values(**update_data)
     )
     await db.commit()
@@ -87,7 +149,84 @@ async def update_last_accessed(
     """마지막 접근 시간 업데이트"""
     await db.execute(
         update(MeetingPlatformSession)
-        .where(MeetingPlatformSession.id == session_id)
+        .where(
+            MeetingPlatformSession.id == session_id,
+            *created_at_window(MeetingPlatformSession.created_at, session_id)
+        )
         .values(last_accessed_at=func.now())
     )
     await db.commit()
+
+
+async def copy_session_result(
+    db: AsyncSession,
+    source_session_id: str,
+    target_session_ids: list[str],
+) -> None:
+    """
+    세션의 추천 결과(상태, 결과 데이터, 에러, 완료 시각)를 다른 세션들에 복사
+
+    일괄 생성에서 같은 쿼리로 묶인 세션들은 추천을 한 번만 실행하고 결과를 나눠 가집니다.
+    """
+    if not target_session_ids:
+        return
+    source = aliased(MeetingPlatformSession)
+    await db.execute(
+        update(MeetingPlatformSession)
+        .where(
+            source.id == source_session_id,
+            *created_at_window(source.created_at, source_session_id),
+            MeetingPlatformSession.id.in_(target_session_ids),
+            *created_at_window(MeetingPlatformSession.created_at, *target_session_ids)
+        )
+        .values(
+            status=source.status,
+            recommendation_data=source.recommendation_data,
+            error_message=source.error_message,
+            completed_at=source.completed_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def requeue_compacted_session(
+    db: AsyncSession,
+    session: MeetingPlatformSession,
+) -> bool:
+    """
+    추천 결과가 정리된(compact_idle_sessions) 완료 세션을 pending으로 되돌리고 추천 작업 다시 기록
+
+    카드가 활성 상태일 때만 되돌리며, 되돌렸으면 True (호출자가 outbox 디스패처를 깨움).
+    동시에 조회한 다른 요청이 먼저 되돌렸으면 False.
+    """
+    card_active = (
+        select(PhotoCard.id)
+        .where(
+            PhotoCard.id == MeetingPlatformSession.photo_card_id,
+            PhotoCard.is_active.is_(True),
+            (PhotoCard.expires_at.is_(None)) | (PhotoCard.expires_at > func.now()),
+        )
+        .exists()
+    )
+    result = await db.execute(
+        update(MeetingPlatformSession)
+        .where(
+            MeetingPlatformSession.id == session.id,
+            *created_at_window(MeetingPlatformSession.created_at, session.id),
+            MeetingPlatformSession.status == "completed",
+            MeetingPlatformSession.recommendation_data.is_(None),
+            card_active,
+        )
+        .values(status="pending", completed_at=None)
+        .returning(MeetingPlatformSession.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        await db.rollback()
+        return False
+    await enqueue_recommendation_job(
+        db, session.id, session.query, session.area_code, session.sigungu_code
+    )
+    await db.commit()
+    return True
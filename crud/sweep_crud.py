@@ -0,0 +1,203 @@
+"""
+만료 정리(sweeper)용 배치 쿼리
+
+모든 함수는 최대 limit행만 처리하고 처리한 행 수(또는 ID 목록)를 반환합니다 (limit 미만이면 더 없음).
+호출자가 배치마다 커밋하고 쉬어 가며 반복하므로 긴 잠금/트랜잭션이 생기지 않습니다.
+
+행 지정은 ctid(행의 물리 위치)로 합니다.
+    WHERE ctid = ANY(ARRAY(SELECT ctid ... LIMIT n FOR UPDATE SKIP LOCKED))
+- 하위 쿼리가 인덱스로 대상 n행만 찾고, 바깥 UPDATE/DELETE는 TID Scan으로 그 행만 건드림
+  (ctid IN (SELECT ...)는 조인으로 풀려 전체 스캔이 될 수 있음)
+- SKIP LOCKED: 요청 처리 중인 행은 건너뛰고 다음 실행 때 처리
+- 기준 시각은 DB의 now() (컬럼이 DB 시간대 기준 TIMESTAMP)
+- ctid는 파티션마다 따로 매겨지므로 파티션 테이블은 파티션 단위로 실행
+"""
+from sqlalchemy import null, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.db_models import MeetingPlatformSession
+from .partition_crud import created_at_window, is_partitioned, list_partitions
+
+
+async def deactivate_expired_photo_cards(
+    db: AsyncSession,
+    limit: int = 1000,
+) -> list[str]:
+    """
+    expires_at이 지난 활성 포토카드 비활성화 (idx_photo_cards_expiring), 비활성화한 카드 ID 반환
+
+    같은 트랜잭션에서 해당 카드 세션의 추천 결과(JSONB)도 비웁니다.
+    카드가 비활성화되면 추천 결과를 다시 볼 일이 없고, 세션 행은 작게 남았다가 유휴 기간이 지나면 삭제됩니다.
+    """
+    result = await db.execute(
+        text("""
+            UPDATE photo_cards SET is_active = FALSE
+            WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM photo_cards
+                WHERE is_active = TRUE AND expires_at <= now()
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            ))
+            RETURNING id
+        """),
+        {"limit": limit},
+    )
+    card_ids = list(result.scalars().all())
+    if card_ids:
+        # UNIQUE (photo_card_id, created_at) 인덱스 + 카드 ID 시각의 파티션만
+        await db.execute(
+            update(MeetingPlatformSession)
+            .where(
+                MeetingPlatformSession.photo_card_id.in_(card_ids),
+                MeetingPlatformSession.recommendation_data.isnot(None),
+                *created_at_window(MeetingPlatformSession.created_at, *card_ids)
+            )
+            # JSON null이 아닌 SQL NULL, 정리는 접근이 아니므로 last_accessed_at(onupdate) 유지
+            .values(
+                recommendation_data=null(),
+                last_accessed_at=MeetingPlatformSession.last_accessed_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+    return card_ids
+
+
+async def session_sweep_targets(db: AsyncSession) -> list[str]:
+    """세션 정리를 실행할 테이블 목록 (파티션 테이블이면 각 파티션, 아니면 테이블 자체)"""
+    table = "meeting_platform_sessions"
+    if not await is_partitioned(db, table):
+        return [table]
+    return [name for name, _ in await list_partitions(db, table)]
+
+
+async def purge_idle_sessions(
+    db: AsyncSession,
+    target: str,
+    idle_days: int,
+    limit: int = 1000,
+) -> int:
+    """
+    idle_days 동안 조회되지 않은 세션 중 카드가 비활성/만료(또는 삭제)된 세션 삭제
+    (target: session_sweep_targets의 테이블 하나)
+
+    활성 카드의 세션은 카드가 살아 있는 동안 남기고 compact_idle_sessions로 추천 결과만 비웁니다.
+    같은 문장에서 카드 → 세션 가드(session_by_card) 행도 지웁니다.
+    """
+    result = await db.execute(
+        text(f"""
+            WITH purged AS (
+                DELETE FROM "{target}"
+                WHERE ctid = ANY(ARRAY(
+                    SELECT s.ctid FROM "{target}" s
+                    WHERE s.last_accessed_at < now() - make_interval(days => :idle_days)
+                      AND NOT EXISTS (
+                          SELECT 1 FROM photo_cards c
+                          WHERE c.id = s.photo_card_id
+                            AND c.is_active = TRUE AND (c.expires_at IS NULL OR c.expires_at > now())
+                      )
+                    LIMIT :limit
+                    FOR UPDATE OF s SKIP LOCKED
+                ))
+                RETURNING id, photo_card_id
+            ), released AS (
+                DELETE FROM session_by_card g
+                USING purged p
+                WHERE g.photo_card_id = p.photo_card_id AND g.session_id = p.id
+            )
+            SELECT count(*) FROM purged
+        """),
+        {"idle_days": idle_days, "limit": limit},
+    )
+    return result.scalar()
+
+
+async def compact_idle_sessions(
+    db: AsyncSession,
+    target: str,
+    idle_days: int,
+    limit: int = 1000,
+) -> int:
+    """
+    idle_days 동안 조회되지 않은 세션의 추천 결과(JSONB)만 비움 (purge_idle_sessions 후 남은 활성 카드 세션)
+
+    세션 행과 카드 연결은 남고, 다시 조회하면 추천을 새로 만듭니다 (requeue_compacted_session).
+    정리는 접근이 아니므로 last_accessed_at은 그대로 둡니다.
+    """
+    result = await db.execute(
+        text(f"""
+            UPDATE "{target}" SET recommendation_data = NULL
+            WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM "{target}"
+                WHERE last_accessed_at < now() - make_interval(days => :idle_days)
+                  AND recommendation_data IS NOT NULL
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            ))
+        """),
+        {"idle_days": idle_days, "limit": limit},
+    )
+    return result.rowcount
+
+
+async def purge_expired_idempotency_keys(db: AsyncSession, limit: int = 1000) -> int:
+    """expires_at이 지난 Idempotency-Key 삭제 (idx_idempotency_keys_expires_at)"""
+    result = await db.execute(
+        text("""
+            DELETE FROM idempotency_keys
+            WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM idempotency_keys
+                WHERE expires_at < now()
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            ))
+        """),
+        {"limit": limit},
+    )
+    return result.rowcount
+
+
+async def purge_expired_image_uploads(db: AsyncSession, limit: int = 1000) -> int:
+    """finalize 없이 만료된 presigned 업로드 발급 기록 삭제 (S3 객체는 고아 객체 정리가 삭제)"""
+    result = await db.execute(
+        text("""
+            DELETE FROM review_image_uploads
+            WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM review_image_uploads
+                WHERE expires_at < now()
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            ))
+        """),
+        {"limit": limit},
+    )
+    return result.rowcount
+
+
+async def purge_orphan_review_images(db: AsyncSession, limit: int = 1000) -> list[str]:
+    """
+    리뷰가 없는 review_images 행 삭제, 지운 이미지 URL 반환 (호출자가 S3 삭제 대기열에 기록)
+
+    reviews가 파티션 테이블이라 review_images → reviews FK가 없습니다 (migrations/0007).
+    보관(archive)된 리뷰 파티션의 이미지는 남겨 두므로,
+    파티션 테이블이면 가장 오래된 리뷰 파티션 시작 이후에 만든 이미지만 봅니다.
+    """
+    since = None
+    if await is_partitioned(db, "reviews"):
+        partitions = await list_partitions(db, "reviews")
+        if not partitions:
+            return []
+        since = partitions[0][1]
+    result = await db.execute(
+        text("""
+            DELETE FROM review_images
+            WHERE ctid = ANY(ARRAY(
+                SELECT i.ctid FROM review_images i
+                WHERE (CAST(:since AS date) IS NULL OR i.created_at >= :since)
+                  AND NOT EXISTS (SELECT 1 FROM reviews r WHERE r.id = i.review_id)
+                LIMIT :limit
+                FOR UPDATE OF i SKIP LOCKED
+            ))
+            RETURNING image_url
+        """),
+        {"since": since, "limit": limit},
+    )
+    return list(result.scalars().all())
@@ -1,16 +1,125 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from fastapi import Request
+from sqlalchemy import text
+from typing import Optional
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from config import get_settings
 
 settings = get_settings()
 
+
+class PoolMetrics:
+    """커넥션 풀 대기 시간/타임아웃 통계 (체크아웃 수, 오버플로는 풀에서 실시간 조회)"""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_sum = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            self.wait_seconds_sum += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+
+    def _quantile(self, ordered: list[float], q: float):
+        if not ordered:
+            return None
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 4)
+
+    def summary(self, pool) -> dict:
+        with self._lock:
+            ordered = sorted(self._waits)
+            total = self.checkouts + self.timeouts
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds": {
+                    "avg": round(self.wait_seconds_sum / total, 4) if total else None,
+                    "p50": self._quantile(ordered, 0.5),
+                    "p99": self._quantile(ordered, 0.99),
+                    "max": round(self.wait_seconds_max, 4),
+                },
+            }
+
+    def prometheus(self, pool, name: str) -> str:
+        summary = self.summary(pool)
+        labels = f'{{engine="{name}"}}'
+        lines = [
+            f"db_pool_size{labels} {summary['pool_size']}",
+            f"db_pool_checked_out{labels} {summary['checked_out']}",
+            f"db_pool_overflow{labels} {summary['overflow']}",
+            f"db_pool_checkouts_total{labels} {summary['checkouts']}",
+            f"db_pool_timeouts_total{labels} {summary['timeouts']}",
+            f"db_pool_wait_seconds_sum{labels} {round(self.wait_seconds_sum, 6)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _instrumented_pool_class(metrics: PoolMetrics) -> type:
+    """체크아웃 대기 시간을 기록하는 풀 클래스 (recreate 시에도 같은 metrics 유지)"""
+
+    class InstrumentedPool(AsyncAdaptedQueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_wait(time.perf_counter() - started, timed_out=True)
+                raise
+            metrics.record_wait(time.perf_counter() - started)
+            return connection
+
+    return InstrumentedPool
+
+
+def _create_engine(url: str, metrics: PoolMetrics):
+    """설정의 풀/드라이버 프로파일로 엔진 생성"""
+    return create_async_engine(
+        url,
+        echo=settings.db_echo,  # debug와 분리 (운영에서 SQL 로깅 끔)
+        future=True,
+        poolclass=_instrumented_pool_class(metrics),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={
+            # asyncpg prepared statement 캐시 (PgBouncer transaction 모드면 0)
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "server_settings": {
+                "statement_timeout": str(settings.db_statement_timeout_ms),
+                "application_name": settings.app_name,
+            },
+        },
+    )
+
+
 # PostgreSQL Async Engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-)
+pool_metrics = PoolMetrics()
+engine = _create_engine(settings.database_url, pool_metrics)
 
 # Session factory
 AsyncSessionLocal = sessionmaker(
@@ -19,13 +128,205 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+# 읽기 전용 복제본 (database_read_url이 비어 있으면 모든 읽기도 primary)
+replica_pool_metrics = PoolMetrics()
+read_engine = (
+    _create_engine(settings.database_read_url, replica_pool_metrics)
+    if settings.database_read_url else None
+)
+ReadSessionLocal = (
+    sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None else AsyncSessionLocal
+)
+
 Base = declarative_base()
 
+logger = logging.getLogger("database")
+
+# 쓰기 직후 클라이언트 읽기를 primary로 보내는 쿠키 (값: 쓰기 시각 epoch 초)
+READ_YOUR_WRITES_COOKIE = "last_write_at"
+# 쿠키를 저장하지 않는 클라이언트(모바일 앱 HTTP 클라이언트 등)용: 쓰기 응답의 이 헤더 값을 다음 읽기 요청에 그대로 보냄
+READ_YOUR_WRITES_HEADER = "X-Last-Write-At"
+
+# primary면 0, 복제본이면 마지막 재생 트랜잭션 이후 경과 초 (받은 WAL을 모두 재생했으면 0)
+# WAL 수신이 끊긴 복제본은 receive = replay라 지연 0으로 보이므로, 수신 중(streaming)이 아니거나
+# 재생 시각을 모르면 NULL(지연 알 수 없음) → 사용하지 않음
+# (pg_stat_wal_receiver.status는 pg_read_all_stats/pg_monitor 권한이 있어야 보임)
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class ReplicaMonitor:
+    """
+    복제본 지연 확인 (백그라운드 작업이 db_replica_lag_check_seconds마다 갱신)
+
+    요청은 마지막 확인 결과만 읽으므로 복제본이 느려도 요청 경로에서 기다리지 않습니다.
+    지연이 db_replica_max_lag_seconds를 넘거나, 지연을 알 수 없거나(WAL 수신 중단),
+    확인에 실패하면 다음 확인 때까지 primary로 읽고,
+    확인 결과가 확인 주기의 3배보다 오래되면(작업 중단 등) 역시 primary로 읽습니다.
+    """
+
+    def __init__(self):
+        self.lag_seconds: Optional[float] = None
+        self.healthy = False
+        self.checked_at = 0.0
+        self.fallbacks = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def usable(self) -> bool:
+        if time.monotonic() - self.checked_at > settings.db_replica_lag_check_seconds * 3:
+            return False
+        return self.healthy and self.lag_seconds is not None and self.lag_seconds <= settings.db_replica_max_lag_seconds
+
+    async def _check(self) -> None:
+        async def query_lag():
+            async with read_engine.connect() as conn:
+                return await conn.scalar(_REPLICA_LAG_SQL)
+
+        try:
+            # 접속이 멈춘 복제본 때문에 요청이 오래 막히지 않도록 확인 전체에 타임아웃
+            lag = await asyncio.wait_for(query_lag(), timeout=settings.db_replica_lag_check_seconds)
+            if lag is None:
+                if self.healthy:
+                    logger.warning("복제본 WAL 수신 중단(또는 상태 조회 권한 없음), primary로 읽기 전환")
+                self.lag_seconds = None
+                self.healthy = False
+            else:
+                self.lag_seconds = float(lag)
+                self.healthy = True
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"복제본 확인 실패, primary로 읽기 전환: {e}")
+            self.healthy = False
+        finally:
+            self.checked_at = time.monotonic()
+
+    def available(self) -> bool:
+        """복제본으로 읽어도 되는지 (마지막 확인 결과 기준, DB 접속 없음)"""
+        if read_engine is None:
+            return False
+        if not self.usable:
+            self.fallbacks += 1
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self._check()
+            await asyncio.sleep(settings.db_replica_lag_check_seconds)
+
+    def start(self) -> None:
+        """지연 확인 작업 시작 (복제본이 설정된 경우만)"""
+        if read_engine is None:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> dict:
+        return {
+            "configured": read_engine is not None,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": settings.db_replica_max_lag_seconds,
+            "fallbacks": self.fallbacks,
+        }
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def get_pool_stats() -> dict:
+    """엔진별 풀 상태 (/debug/db-pool)"""
+    stats = {"primary": pool_metrics.summary(engine.sync_engine.pool)}
+    if read_engine is not None:
+        stats["replica"] = {
+            **replica_pool_metrics.summary(read_engine.sync_engine.pool),
+            **replica_monitor.summary(),
+        }
+    return stats
+
+
+def get_pool_prometheus() -> str:
+    output = pool_metrics.prometheus(engine.sync_engine.pool, "primary")
+    if read_engine is not None:
+        output += replica_pool_metrics.prometheus(read_engine.sync_engine.pool, "replica")
+        output += f'db_replica_lag_seconds {replica_monitor.lag_seconds if replica_monitor.lag_seconds is not None else "NaN"}\n'
+        output += f"db_replica_fallbacks_total {replica_monitor.fallbacks}\n"
+    return output
+
+
+def _recently_wrote(request: Request) -> bool:
+    """read-your-writes: 이 클라이언트가 최근 read_your_writes_seconds 안에 쓰기를 했는지 (쿠키 또는 헤더)"""
+    value = request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE, "")
+    try:
+        written_at = float(value)
+    except ValueError:
+        return False
+    return time.time() - written_at < settings.read_your_writes_seconds
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    return read_engine is not None and db.bind is read_engine
+
+
+@asynccontextmanager
+async def writable_session(db: AsyncSession):
+    """읽기 세션에서 예외적으로 쓰기가 필요할 때 (복제본 세션이면 짧은 primary 세션)"""
+    if not is_replica_session(db):
+        yield db
+        return
+    async with AsyncSessionLocal() as primary:
+        yield primary
+
 
 # Dependency
-async def get_db():
+async def get_db(request: Request):
+    # 쓰기 엔드포인트 표시 → 응답에 read-your-writes 쿠키 (main.py 미들웨어)
+    request.state.used_primary = True
     async with AsyncSessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+def read_session(request: Request) -> AsyncSession:
+    """
+    읽기 전용 세션 (복제본 또는 primary)
+
+    복제본이 설정돼 있고 지연이 허용 범위면 복제본, 아니면 primary.
+    클라이언트가 방금 쓰기를 했으면(read-your-writes 쿠키 또는 X-Last-Write-At 헤더) primary에서 읽습니다.
+    요청 일부에서만 DB를 쓰는 엔드포인트는 `async with read_session(request) as db:`로 필요한 구간만 엽니다.
+    """
+    use_replica = not _recently_wrote(request) and replica_monitor.available()
+    session_factory = ReadSessionLocal if use_replica else AsyncSessionLocal
+    return session_factory()
+
+
+async def get_read_db(request: Request):
+    """
+    읽기 전용 엔드포인트용 세션 (read_session 참고)
+
+    crud 읽기 함수는 어느 세션이든 그대로 사용합니다.
+    """
+    async with read_session(request) as session:
+        try:
+            yield session
+        finally:
+            await session.close()
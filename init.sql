@@ -15,60 +15,153 @@ CREATE TABLE IF NOT EXISTS photo_cards (
 
 CREATE INDEX idx_photo_cards_created_at ON photo_cards(created_at);
 CREATE INDEX idx_photo_cards_user_id ON photo_cards(user_id);
-CREATE INDEX idx_photo_cards_active ON photo_cards(is_active);
+-- 검증(verify)은 활성 카드만 조회 → 활성 카드 ID 부분 인덱스
+CREATE INDEX idx_photo_cards_active_id ON photo_cards(id) WHERE is_active = TRUE;
+-- 만료 정리(sweeper)는 만료 시각이 있는 활성 카드만 조회
+CREATE INDEX idx_photo_cards_expiring ON photo_cards(expires_at) WHERE is_active = TRUE AND expires_at IS NOT NULL;
 
 -- Meeting Platform Sessions 테이블
 -- status: pending, processing, completed, failed
+-- created_at 기준 월별 파티션 (meeting_platform_sessions_pYYYYMM)
+-- 파티션은 서버 시작 시/매일 앞으로 몇 달치를 생성 (services/partition_maintenance.py)
 CREATE TABLE IF NOT EXISTS meeting_platform_sessions (
-    id VARCHAR(36) PRIMARY KEY,
-    photo_card_id VARCHAR(36) NOT NULL UNIQUE,  -- 포토카드당 하나의 세션만
+    id VARCHAR(36) NOT NULL,
+    photo_card_id VARCHAR(36) NOT NULL,
     status VARCHAR(20) NOT NULL DEFAULT 'pending',
     query TEXT,
     area_code VARCHAR(10),
     sigungu_code VARCHAR(10),
     recommendation_data JSONB,
     error_message TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     completed_at TIMESTAMP,
     last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
+    -- 파티션 키(created_at)가 PK/UNIQUE에 포함되어야 함
+    PRIMARY KEY (id, created_at),
+    CONSTRAINT meeting_platform_sessions_photo_card_id_key UNIQUE (photo_card_id, created_at),  -- 조회용, 카드당 하나는 session_by_card가 보장
     FOREIGN KEY (photo_card_id) REFERENCES photo_cards(id) ON DELETE CASCADE
-);
+) PARTITION BY RANGE (created_at);
 
-CREATE INDEX idx_sessions_photo_card_id ON meeting_platform_sessions(photo_card_id);
-CREATE INDEX idx_sessions_status ON meeting_platform_sessions(status);
+-- photo_card_id 조회는 UNIQUE 제약 인덱스 사용
 CREATE INDEX idx_sessions_last_accessed ON meeting_platform_sessions(last_accessed_at);
+-- 미완료 작업 조회 (pending/processing만, 오래된 순)
+CREATE INDEX idx_sessions_unfinished_created ON meeting_platform_sessions(created_at)
+    WHERE status IN ('pending', 'processing');
+
+-- 포토카드당 세션 하나 보장 (파티션 테이블의 UNIQUE에는 created_at이 들어가 카드 단독 UNIQUE 불가)
+-- 세션 INSERT와 같은 트랜잭션에 ON CONFLICT (photo_card_id)로 기록, 세션 삭제/보관 시 함께 삭제
+CREATE TABLE IF NOT EXISTS session_by_card (
+    photo_card_id VARCHAR(36) PRIMARY KEY REFERENCES photo_cards(id) ON DELETE CASCADE,
+    session_id VARCHAR(36) NOT NULL
+);
 
--- Reviews 테이블
+-- Reviews 테이블 (created_at 기준 월별 파티션 reviews_pYYYYMM)
 CREATE TABLE IF NOT EXISTS reviews (
-    id VARCHAR(36) PRIMARY KEY,
+    id VARCHAR(36) NOT NULL,
     place_id VARCHAR(100) NOT NULL,       -- 장소 ID (관광 API content_id 또는 커스텀)
     place_name VARCHAR(200) NOT NULL,     -- 장소 이름
     rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),  -- 별점 1~5
     content TEXT NOT NULL,                -- 리뷰 내용
     user_id VARCHAR(100),                 -- 사용자 ID (선택)
     photo_card_id VARCHAR(36),            -- 연관 포토카드 (선택)
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     is_deleted BOOLEAN DEFAULT FALSE,
+    search_vector TSVECTOR,               -- 검색용 글자 bigram (place_name + content)
 
+    PRIMARY KEY (id, created_at),
     FOREIGN KEY (photo_card_id) REFERENCES photo_cards(id) ON DELETE SET NULL
-);
+) PARTITION BY RANGE (created_at);
 
 CREATE INDEX idx_reviews_place_id ON reviews(place_id);
 CREATE INDEX idx_reviews_user_id ON reviews(user_id);
 CREATE INDEX idx_reviews_created_at ON reviews(created_at DESC);
 CREATE INDEX idx_reviews_rating ON reviews(rating);
 
+-- 목록 커서 페이지네이션: WHERE ... AND (created_at, id) < (커서) ORDER BY created_at DESC, id DESC
+CREATE INDEX idx_reviews_place_created_id ON reviews(place_id, created_at DESC, id DESC) WHERE is_deleted = FALSE;
+CREATE INDEX idx_reviews_user_created_id ON reviews(user_id, created_at DESC, id DESC) WHERE is_deleted = FALSE;
+CREATE INDEX idx_reviews_created_id ON reviews(created_at DESC, id DESC) WHERE is_deleted = FALSE;
+
+-- 리뷰 검색: search_vector @@ '주차'::tsquery
+CREATE INDEX idx_reviews_search_vector ON reviews USING GIN (search_vector) WHERE is_deleted = FALSE;
+
+-- 장소별 평점 집계 (리뷰 생성/수정/삭제 시 같은 트랜잭션에서 증분 갱신)
+CREATE TABLE IF NOT EXISTS place_rating_stats (
+    place_id VARCHAR(100) PRIMARY KEY,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    count_1 INTEGER NOT NULL DEFAULT 0,       -- 별점 분포
+    count_2 INTEGER NOT NULL DEFAULT 0,
+    count_3 INTEGER NOT NULL DEFAULT 0,
+    count_4 INTEGER NOT NULL DEFAULT 0,
+    count_5 INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Review Images 테이블 (S3 URL 저장)
 CREATE TABLE IF NOT EXISTS review_images (
     id VARCHAR(36) PRIMARY KEY,
     review_id VARCHAR(36) NOT NULL,
     image_url VARCHAR(500) NOT NULL,      -- S3 URL
     image_order INTEGER DEFAULT 0,        -- 이미지 순서
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    -- reviews는 파티션 테이블이라 id 단독 FK 불가 → 리뷰 하드 삭제 시 delete_review가 함께 삭제,
+    -- 그 밖의 경로로 남은 고아 행은 만료 정리 작업이 삭제 (보관된 파티션의 리뷰 이미지는 제외)
+);
+
+CREATE INDEX idx_review_images_review_id ON review_images(review_id);
+-- finalize 시 이미 연결된 이미지인지 확인
+CREATE INDEX idx_review_images_image_url ON review_images(image_url);
+
+-- presigned 업로드 발급 기록 (finalize는 이 리뷰에 발급된 키만 연결, 연결 시 행 삭제)
+CREATE TABLE IF NOT EXISTS review_image_uploads (
+    s3_key VARCHAR(500) PRIMARY KEY,
+    review_id VARCHAR(36) NOT NULL,       -- 발급 대상 리뷰
+    content_type VARCHAR(50) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL         -- 이후 finalize 불가, 만료 정리 작업이 삭제
+);
 
-    FOREIGN KEY (review_id) REFERENCES reviews(id) ON DELETE CASCADE
+CREATE INDEX idx_review_image_uploads_expires_at ON review_image_uploads(expires_at);
+
+-- S3 삭제 대기열 (백그라운드 워커가 delete_objects로 최대 1000개씩 삭제)
+CREATE TABLE IF NOT EXISTS s3_pending_deletions (
+    s3_key VARCHAR(500) PRIMARY KEY,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_review_images_review_id ON review_images(review_id);
+CREATE INDEX idx_s3_pending_deletions_next_attempt ON s3_pending_deletions(next_attempt_at);
+
+-- 추천 작업 outbox (포토카드/세션 생성 트랜잭션에 함께 기록, 백그라운드 디스패처가 처리 후 삭제)
+CREATE TABLE IF NOT EXISTS recommendation_jobs (
+    session_id VARCHAR(36) PRIMARY KEY,
+    query TEXT NOT NULL,
+    area_code VARCHAR(10),
+    sigungu_code VARCHAR(10),
+    shared_session_ids VARCHAR(36)[],     -- 같은 추천 결과를 복사받을 세션 (일괄 생성에서 쿼리가 같은 카드)
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_recommendation_jobs_next_attempt ON recommendation_jobs(next_attempt_at);
+
+-- Idempotency-Key 저장소 (POST 재시도에 첫 응답 재생, 만료 행은 만료 정리 작업이 삭제)
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key VARCHAR(64) PRIMARY KEY,          -- SHA-256(메서드, 경로, 클라이언트, 헤더 값)
+    status VARCHAR(20) NOT NULL,          -- processing, completed
+    response_status INTEGER,
+    content_type VARCHAR(100),
+    response_body BYTEA,
+    locked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL,
+    request_hash VARCHAR(64)              -- JSON 요청 본문의 SHA-256 (multipart는 NULL)
+);
+
+CREATE INDEX idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
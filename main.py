@@ -1,12 +1,24 @@
 import logging
 import sys
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import get_settings
-from routers import hashtag_router, recommend_router, photo_card_router, session_router, review_router
+from routers import hashtag_router, recommend_router, photo_card_router, session_router, review_router, debug_router
+from services.s3_deletion import s3_deletion_queue
+from services.image_variants import image_variant_service
+from services.review_search import review_search_service
+from services.partition_maintenance import partition_maintenance
+from services.expiry_sweeper import expiry_sweeper
+from services.photo_card_cache import photo_card_cache
+from services.recommendation_outbox import recommendation_outbox
+from services.body_limit import BodySizeLimitMiddleware
+from services.idempotency import idempotency_store
+from database import AsyncSessionLocal, READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER, replica_monitor
 
 # ========== 로깅 설정 ==========
 # 포맷 설정: 시간 | 레벨 | 로거명 | 메시지
@@ -34,6 +46,9 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 logging.getLogger("uvicorn").setLevel(logging.INFO)
 logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+logging.getLogger("botocore").setLevel(logging.WARNING)
+logging.getLogger("boto3").setLevel(logging.WARNING)
+logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 logger = logging.getLogger("main")
 logger.info("=" * 60)
@@ -42,6 +57,38 @@ logger.info("=" * 60)
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # memory 검색 백엔드면 기존 리뷰 색인
+    if review_search_service.in_memory:
+        async with AsyncSessionLocal() as db:
+            await review_search_service.load(db)
+        logger.info(f"리뷰 검색 색인 (memory): {len(review_search_service.index)}개")
+
+    # 월별 파티션: 이번 달 이후 파티션이 없으면 INSERT가 실패하므로 요청 받기 전에 생성
+    try:
+        await partition_maintenance.ensure()
+    except Exception as e:
+        logger.error(f"파티션 생성 실패: {type(e).__name__}: {e}")
+
+    # 백그라운드 워커 시작/종료
+    replica_monitor.start()
+    s3_deletion_queue.start()
+    partition_maintenance.start()
+    expiry_sweeper.start()
+    photo_card_cache.start()
+    recommendation_outbox.start()
+    yield
+    await recommendation_outbox.stop()
+    await photo_card_cache.stop()
+    await expiry_sweeper.stop()
+    await partition_maintenance.stop()
+    await s3_deletion_queue.stop()
+    await image_variant_service.stop()
+    await replica_monitor.stop()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="""
@@ -62,23 +109,61 @@ app = FastAPI(
 - **PostgreSQL** - PhotoCard 저장소
     """,
     version="0.2.0",
+    lifespan=lifespan,
 )
 
-# CORS 설정 (모바일 앱 연동용)
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    """
+    쓰기 요청 성공 시 쿠키 + X-Last-Write-At 헤더 기록 → 잠시 동안 그 클라이언트의 읽기는 primary (get_read_db)
+
+    쿠키를 저장하지 않는 클라이언트는 응답 헤더 값을 다음 읽기 요청의 X-Last-Write-At 헤더로 보냅니다.
+    """
+    response = await call_next(request)
+    if (
+        request.method in ("POST", "PUT", "PATCH", "DELETE")
+        and response.status_code < 400
+        and getattr(request.state, "used_primary", False)
+    ):
+        written_at = str(int(time.time()))
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            written_at,
+            max_age=settings.read_your_writes_seconds,
+            httponly=True,
+        )
+        response.headers[READ_YOUR_WRITES_HEADER] = written_at
+    return response
+
+
+@app.middleware("http")
+async def idempotency(request: Request, call_next):
+    """Idempotency-Key 헤더가 있는 쓰기 요청은 첫 응답을 저장해 재요청에 재생 (read_your_writes 바깥)"""
+    return await idempotency_store.handle(request, call_next)
+
+
+# 요청 본문 크기 제한 (multipart가 임시 파일로 풀리기 전에 Content-Length/스트림 기준으로 413)
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=settings.request_max_body_mb * 1024 * 1024)
+
+
+# CORS 설정 (모바일 앱 연동용, 나중에 등록한 미들웨어가 바깥 → 재생 응답에도 CORS 헤더)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # 프로덕션에서는 특정 도메인만
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_YOUR_WRITES_HEADER],  # 브라우저 클라이언트도 read-your-writes 헤더를 읽을 수 있게
 )
 
+
 # 라우터 등록
 app.include_router(hashtag_router)
 app.include_router(recommend_router)
 app.include_router(photo_card_router)
 app.include_router(session_router)
 app.include_router(review_router)
+app.include_router(debug_router)
 
 
 @app.get("/")
@@ -92,6 +177,12 @@ async def root():
             "photo_cards": "/api/v1/photo_cards",
             "sessions": "/api/v1/sessions",
             "reviews": "/api/v1/reviews",
+            "llm_stats": "/debug/llm-stats",
+            "db_pool": "/debug/db-pool",
+            "sweeper": "/debug/sweeper",
+            "photo_card_cache": "/debug/photo-card-cache",
+            "recommendation_jobs": "/debug/recommendation-jobs",
+            "idempotency": "/debug/idempotency",
             "docs": "/docs",
         }
     }
@@ -0,0 +1,109 @@
+"""baseline: 최초 init.sql 스키마
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+리뷰/성능 작업 이전의 init.sql 스키마(photo_cards, meeting_platform_sessions, reviews, review_images)입니다.
+그 뒤의 스키마 변경은 모두 0002 이후 리비전에 있습니다.
+
+- 최초 init.sql로 만든 운영 DB: 적용 대신 표시만 하고 나머지를 적용
+
+    alembic stamp 0001
+    alembic upgrade head
+
+- 빈 DB: alembic upgrade head (이 리비전부터 전부 적용)
+- 현재 init.sql로 새로 만든 DB(docker-entrypoint-initdb.d)는 이미 최신 스키마: alembic stamp head
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS photo_cards (
+            id VARCHAR(36) PRIMARY KEY,
+            user_id VARCHAR(100),
+            province VARCHAR(50) NOT NULL,
+            city VARCHAR(50) NOT NULL,
+            message TEXT,
+            hashtags JSONB,
+            ai_quote TEXT,
+            image_path VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP,
+            is_active BOOLEAN DEFAULT TRUE
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_photo_cards_created_at ON photo_cards(created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_photo_cards_user_id ON photo_cards(user_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_photo_cards_active ON photo_cards(is_active)")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS meeting_platform_sessions (
+            id VARCHAR(36) PRIMARY KEY,
+            photo_card_id VARCHAR(36) NOT NULL UNIQUE,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            query TEXT,
+            area_code VARCHAR(10),
+            sigungu_code VARCHAR(10),
+            recommendation_data JSONB,
+            error_message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed_at TIMESTAMP,
+            last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (photo_card_id) REFERENCES photo_cards(id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_sessions_photo_card_id ON meeting_platform_sessions(photo_card_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_sessions_status ON meeting_platform_sessions(status)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_sessions_last_accessed ON meeting_platform_sessions(last_accessed_at)")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS reviews (
+            id VARCHAR(36) PRIMARY KEY,
+            place_id VARCHAR(100) NOT NULL,
+            place_name VARCHAR(200) NOT NULL,
+            rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
+            content TEXT NOT NULL,
+            user_id VARCHAR(100),
+            photo_card_id VARCHAR(36),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_deleted BOOLEAN DEFAULT FALSE,
+
+            FOREIGN KEY (photo_card_id) REFERENCES photo_cards(id) ON DELETE SET NULL
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reviews_place_id ON reviews(place_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reviews_user_id ON reviews(user_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reviews_created_at ON reviews(created_at DESC)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_reviews_rating ON reviews(rating)")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS review_images (
+            id VARCHAR(36) PRIMARY KEY,
+            review_id VARCHAR(36) NOT NULL,
+            image_url VARCHAR(500) NOT NULL,
+            image_order INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (review_id) REFERENCES reviews(id) ON DELETE CASCADE
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_review_images_review_id ON review_images(review_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS review_images")
+    op.execute("DROP TABLE IF EXISTS reviews")
+    op.execute("DROP TABLE IF EXISTS meeting_platform_sessions")
+    op.execute("DROP TABLE IF EXISTS photo_cards")
@@ -0,0 +1,38 @@
+"""S3 삭제 대기열 테이블
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+리뷰 삭제/실패한 업로드의 S3 객체를 여기에 기록하고
+백그라운드 워커(services/s3_deletion.py)가 delete_objects로 최대 1000개씩 삭제합니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS s3_pending_deletions (
+            s3_key VARCHAR(500) PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_s3_pending_deletions_next_attempt "
+        "ON s3_pending_deletions(next_attempt_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS s3_pending_deletions")
@@ -0,0 +1,50 @@
+"""장소별 평점 집계 테이블 + 기존 리뷰로 채우기
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+리뷰 생성/수정/삭제가 같은 트랜잭션에서 증분 갱신합니다 (crud.review_crud._apply_rating_delta).
+기존 리뷰의 집계는 여기서 한 번 계산해 넣습니다 (이후 보정은 scripts/rebuild_rating_stats.py).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS place_rating_stats (
+            place_id VARCHAR(100) PRIMARY KEY,
+            rating_sum INTEGER NOT NULL DEFAULT 0,
+            rating_count INTEGER NOT NULL DEFAULT 0,
+            count_1 INTEGER NOT NULL DEFAULT 0,
+            count_2 INTEGER NOT NULL DEFAULT 0,
+            count_3 INTEGER NOT NULL DEFAULT 0,
+            count_4 INTEGER NOT NULL DEFAULT 0,
+            count_5 INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute("""
+        INSERT INTO place_rating_stats (place_id, rating_sum, rating_count,
+                                        count_1, count_2, count_3, count_4, count_5)
+        SELECT place_id, sum(rating), count(*),
+               count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+               count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+               count(*) FILTER (WHERE rating = 5)
+        FROM reviews
+        WHERE is_deleted = FALSE
+        GROUP BY place_id
+        ON CONFLICT (place_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS place_rating_stats")
@@ -0,0 +1,44 @@
+"""리뷰 목록 커서 페이지네이션 인덱스
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+WHERE ... AND (created_at, id) < (커서) ORDER BY created_at DESC, id DESC 를 인덱스 순서로 읽습니다.
+- idx_reviews_place_created_id: 장소별 목록
+- idx_reviews_user_created_id: 사용자별 목록
+- idx_reviews_created_id: 전체 목록
+운영 중 테이블 잠금을 피하려고 CONCURRENTLY로 만들고 지웁니다 (트랜잭션 밖에서 실행).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_place_created_id "
+            "ON reviews (place_id, created_at DESC, id DESC) WHERE is_deleted = FALSE"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_user_created_id "
+            "ON reviews (user_id, created_at DESC, id DESC) WHERE is_deleted = FALSE"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_created_id "
+            "ON reviews (created_at DESC, id DESC) WHERE is_deleted = FALSE"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_created_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_user_created_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_place_created_id")
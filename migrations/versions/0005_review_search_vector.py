@@ -0,0 +1,60 @@
+"""리뷰 검색 컬럼(search_vector) + GIN 인덱스
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+place_name + content의 글자 bigram tsvector (crud/review_search_crud.py).
+tsvector 리터럴은 앱 코드(search_vector_literal)로 만들므로 기존 리뷰도 여기서 같은 함수로 채웁니다.
+--sql(오프라인)로 적용했다면 이후 `python -m scripts.rebuild_search_index`로 채우세요.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from crud.review_search_crud import search_vector_literal
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 500
+
+
+def _backfill() -> None:
+    if op.get_context().as_sql:
+        op.execute("-- 기존 리뷰 search_vector: python -m scripts.rebuild_search_index")
+        return
+    conn = op.get_bind()
+    last_id = ""
+    while True:
+        rows = conn.execute(
+            text("SELECT id, place_name, content FROM reviews WHERE id > :last ORDER BY id LIMIT :n"),
+            {"last": last_id, "n": BACKFILL_BATCH},
+        ).all()
+        if not rows:
+            return
+        conn.execute(
+            text("UPDATE reviews SET search_vector = CAST(:vector AS tsvector) WHERE id = :id"),
+            [{"id": row.id, "vector": search_vector_literal(row.place_name, row.content)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE reviews ADD COLUMN IF NOT EXISTS search_vector TSVECTOR")
+    _backfill()
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_reviews_search_vector "
+            "ON reviews USING GIN (search_vector) WHERE is_deleted = FALSE"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_reviews_search_vector")
+    op.execute("ALTER TABLE reviews DROP COLUMN IF EXISTS search_vector")
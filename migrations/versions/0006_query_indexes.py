@@ -0,0 +1,56 @@
+"""쿼리 맞춤 부분 인덱스 (포토카드 검증, 미완료 세션)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+- idx_photo_cards_active_id: verify_photo_card (활성 카드 ID만, index-only scan)
+- idx_sessions_unfinished_created: get_unfinished_sessions (pending/processing만, 오래된 순)
+- 제거: idx_photo_cards_active(불리언 단일 컬럼), idx_sessions_status(부분 인덱스로 대체),
+  idx_sessions_photo_card_id(UNIQUE 제약 인덱스와 중복)
+
+리뷰 목록용 (place_id|user_id, created_at DESC, id DESC) WHERE is_deleted = FALSE 인덱스는 0004에 있습니다.
+운영 중 테이블 잠금을 피하려고 CONCURRENTLY로 만들고 지웁니다 (트랜잭션 밖에서 실행).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_photo_cards_active_id "
+            "ON photo_cards (id) WHERE is_active = TRUE"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_unfinished_created "
+            "ON meeting_platform_sessions (created_at) WHERE status IN ('pending', 'processing')"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_photo_cards_active")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_sessions_status")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_sessions_photo_card_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_photo_card_id "
+            "ON meeting_platform_sessions (photo_card_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_status "
+            "ON meeting_platform_sessions (status)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_photo_cards_active "
+            "ON photo_cards (is_active)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_sessions_unfinished_created")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_photo_cards_active_id")
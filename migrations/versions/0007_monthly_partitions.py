@@ -0,0 +1,186 @@
+"""reviews / meeting_platform_sessions 월별 파티션 전환
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+created_at 기준 RANGE 파티션({테이블}_pYYYYMM)으로 테이블을 다시 만들고 데이터를 복사합니다.
+- 기존 데이터의 첫 달 ~ 이번 달 + 3개월 파티션 생성 (이후는 앱의 partition_maintenance가 생성)
+- 파티션 키가 모든 UNIQUE 제약에 들어가야 하므로
+  PK (id) → (id, created_at), 세션 UNIQUE (photo_card_id) → (photo_card_id, created_at)
+- review_images → reviews(id) FK는 제거 (파티션 테이블의 id 단독은 참조 대상이 될 수 없음,
+  하드 삭제 시 이미지 행은 delete_review가 직접 삭제)
+- init.sql로 이미 파티션 테이블을 만든 DB는 건너뜀
+
+테이블 전체를 복사하는 동안 쓰기가 막히므로 점검 시간에 적용하세요.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+REVIEW_COLUMNS = (
+    "id, place_id, place_name, rating, content, user_id, photo_card_id, "
+    "created_at, updated_at, is_deleted, search_vector"
+)
+REVIEW_COLUMNS_DDL = """
+    id VARCHAR(36) NOT NULL,
+    place_id VARCHAR(100) NOT NULL,
+    place_name VARCHAR(200) NOT NULL,
+    rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
+    content TEXT NOT NULL,
+    user_id VARCHAR(100),
+    photo_card_id VARCHAR(36),
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_deleted BOOLEAN DEFAULT FALSE,
+    search_vector TSVECTOR,
+    FOREIGN KEY (photo_card_id) REFERENCES photo_cards(id) ON DELETE SET NULL
+"""
+REVIEW_INDEXES = """
+    CREATE INDEX idx_reviews_place_id ON reviews(place_id);
+    CREATE INDEX idx_reviews_user_id ON reviews(user_id);
+    CREATE INDEX idx_reviews_created_at ON reviews(created_at DESC);
+    CREATE INDEX idx_reviews_rating ON reviews(rating);
+    CREATE INDEX idx_reviews_place_created_id ON reviews(place_id, created_at DESC, id DESC) WHERE is_deleted = FALSE;
+    CREATE INDEX idx_reviews_user_created_id ON reviews(user_id, created_at DESC, id DESC) WHERE is_deleted = FALSE;
+    CREATE INDEX idx_reviews_created_id ON reviews(created_at DESC, id DESC) WHERE is_deleted = FALSE;
+    CREATE INDEX idx_reviews_search_vector ON reviews USING GIN (search_vector) WHERE is_deleted = FALSE;
+"""
+
+SESSION_COLUMNS = (
+    "id, photo_card_id, status, query, area_code, sigungu_code, recommendation_data, "
+    "error_message, created_at, completed_at, last_accessed_at"
+)
+SESSION_COLUMNS_DDL = """
+    id VARCHAR(36) NOT NULL,
+    photo_card_id VARCHAR(36) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    query TEXT,
+    area_code VARCHAR(10),
+    sigungu_code VARCHAR(10),
+    recommendation_data JSONB,
+    error_message TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    last_accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (photo_card_id) REFERENCES photo_cards(id) ON DELETE CASCADE
+"""
+SESSION_INDEXES = """
+    CREATE INDEX idx_sessions_last_accessed ON meeting_platform_sessions(last_accessed_at);
+    CREATE INDEX idx_sessions_unfinished_created ON meeting_platform_sessions(created_at)
+        WHERE status IN ('pending', 'processing');
+"""
+
+
+def _to_partitioned(table: str, columns: str, columns_ddl: str, keys_ddl: str,
+                    rename: dict[str, str], indexes: str) -> str:
+    """기존 테이블 → 월별 파티션 테이블 (이미 파티션 테이블이면 아무것도 안 함)"""
+    renames = "\n    ".join(
+        f"ALTER TABLE {table}_unpartitioned RENAME CONSTRAINT {old} TO {new};" for old, new in rename.items()
+    )
+    index_names = [line.split()[2] for line in indexes.strip().splitlines() if line.strip().startswith("CREATE")]
+    return f"""
+DO $$
+DECLARE
+    m date;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('{table}')) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE {table} RENAME TO {table}_unpartitioned;
+    {renames}
+    DROP INDEX IF EXISTS {", ".join(index_names)};
+
+    CREATE TABLE {table} ({columns_ddl.rstrip()},
+    {keys_ddl}
+    ) PARTITION BY RANGE (created_at);
+
+    SELECT date_trunc('month', COALESCE(min(created_at), now()))::date INTO m FROM {table}_unpartitioned;
+    WHILE m <= (date_trunc('month', now()) + interval '3 months')::date LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+            '{table}_p' || to_char(m, 'YYYYMM'), m, (m + interval '1 month')::date
+        );
+        m := (m + interval '1 month')::date;
+    END LOOP;
+
+    INSERT INTO {table} ({columns})
+    SELECT {columns.replace("created_at,", "COALESCE(created_at, now()),", 1)} FROM {table}_unpartitioned;
+    DROP TABLE {table}_unpartitioned;
+
+    {indexes}
+END $$
+"""
+
+
+def _to_plain(table: str, columns: str, columns_ddl: str, keys_ddl: str, indexes: str) -> str:
+    """파티션 테이블 → 일반 테이블 (downgrade)"""
+    index_names = [line.split()[2] for line in indexes.strip().splitlines() if line.strip().startswith("CREATE")]
+    return f"""
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('{table}')) THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE {table} RENAME TO {table}_partitioned;
+    DROP INDEX IF EXISTS {", ".join(index_names)};
+    ALTER TABLE {table}_partitioned DROP CONSTRAINT IF EXISTS {table}_pkey;
+    ALTER TABLE {table}_partitioned DROP CONSTRAINT IF EXISTS {table}_photo_card_id_key;
+
+    CREATE TABLE {table} ({columns_ddl.rstrip()},
+    {keys_ddl}
+    );
+    INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned;
+    DROP TABLE {table}_partitioned;
+
+    {indexes}
+END $$
+"""
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE review_images DROP CONSTRAINT IF EXISTS review_images_review_id_fkey")
+    op.execute(_to_partitioned(
+        "reviews", REVIEW_COLUMNS, REVIEW_COLUMNS_DDL,
+        "PRIMARY KEY (id, created_at)",
+        {
+            "reviews_pkey": "reviews_unpartitioned_pkey",
+            "reviews_photo_card_id_fkey": "reviews_unpartitioned_photo_card_id_fkey",
+            "reviews_rating_check": "reviews_unpartitioned_rating_check",
+        },
+        REVIEW_INDEXES,
+    ))
+    op.execute(_to_partitioned(
+        "meeting_platform_sessions", SESSION_COLUMNS, SESSION_COLUMNS_DDL,
+        "PRIMARY KEY (id, created_at), "
+        "CONSTRAINT meeting_platform_sessions_photo_card_id_key UNIQUE (photo_card_id, created_at)",
+        {
+            "meeting_platform_sessions_pkey": "meeting_platform_sessions_unpartitioned_pkey",
+            "meeting_platform_sessions_photo_card_id_key": "meeting_platform_sessions_unpartitioned_photo_card_id_key",
+            "meeting_platform_sessions_photo_card_id_fkey": "meeting_platform_sessions_unpartitioned_photo_card_id_fkey",
+        },
+        SESSION_INDEXES,
+    ))
+
+
+def downgrade() -> None:
+    op.execute(_to_plain(
+        "meeting_platform_sessions", SESSION_COLUMNS, SESSION_COLUMNS_DDL,
+        "PRIMARY KEY (id), UNIQUE (photo_card_id)",
+        SESSION_INDEXES,
+    ))
+    op.execute(_to_plain("reviews", REVIEW_COLUMNS, REVIEW_COLUMNS_DDL, "PRIMARY KEY (id)", REVIEW_INDEXES))
+    # 보관(archive)된 리뷰의 이미지 행이 남아 있을 수 있어 기존 행은 검사하지 않음
+    op.execute(
+        "ALTER TABLE review_images ADD CONSTRAINT review_images_review_id_fkey "
+        "FOREIGN KEY (review_id) REFERENCES reviews(id) ON DELETE CASCADE NOT VALID"
+    )
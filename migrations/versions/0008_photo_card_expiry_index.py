@@ -0,0 +1,31 @@
+"""포토카드 만료 정리용 부분 인덱스
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+- idx_photo_cards_expiring: 만료 정리(deactivate_expired_photo_cards)가 만료 시각이 지난 활성 카드만 찾음
+운영 중 테이블 잠금을 피하려고 CONCURRENTLY로 만들고 지웁니다 (트랜잭션 밖에서 실행).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_photo_cards_expiring "
+            "ON photo_cards (expires_at) WHERE is_active = TRUE AND expires_at IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_photo_cards_expiring")
@@ -0,0 +1,41 @@
+"""추천 작업 outbox 테이블
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+포토카드 + 세션 생성 트랜잭션에 추천 작업을 함께 기록합니다 (create_photo_card_with_session).
+백그라운드 디스패처(services/recommendation_outbox.py)가 가져가 처리하고 삭제합니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS recommendation_jobs (
+            session_id VARCHAR(36) PRIMARY KEY,
+            query TEXT NOT NULL,
+            area_code VARCHAR(10),
+            sigungu_code VARCHAR(10),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_recommendation_jobs_next_attempt "
+        "ON recommendation_jobs (next_attempt_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS recommendation_jobs")
@@ -0,0 +1,26 @@
+"""추천 작업 결과 공유 세션 컬럼
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+포토카드 일괄 생성(POST /api/v1/photo_cards:batch)에서 쿼리/지역이 같은 카드는 추천을 한 번만 실행하고
+결과를 shared_session_ids의 세션에 복사합니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE recommendation_jobs ADD COLUMN IF NOT EXISTS shared_session_ids VARCHAR(36)[]")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE recommendation_jobs DROP COLUMN IF EXISTS shared_session_ids")
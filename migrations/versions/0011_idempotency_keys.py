@@ -0,0 +1,40 @@
+"""Idempotency-Key 저장소 테이블
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+Idempotency-Key 헤더가 있는 쓰기 요청의 첫 응답을 저장해 재시도에 그대로 돌려줍니다
+(services/idempotency.py). 만료된 행은 만료 정리 작업이 배치로 삭제합니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            key VARCHAR(64) PRIMARY KEY,
+            status VARCHAR(20) NOT NULL,
+            response_status INTEGER,
+            content_type VARCHAR(100),
+            response_body BYTEA,
+            locked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at "
+        "ON idempotency_keys (expires_at)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS idempotency_keys")
@@ -0,0 +1,46 @@
+"""presigned 업로드 발급 기록 테이블 + review_images.image_url 인덱스
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+
+finalize(POST /reviews/{id}/images)는 그 리뷰에 발급된, 만료 전 키만 연결합니다.
+다른 사람이 올린 객체를 자기 리뷰에 연결했다가 리뷰 삭제로 지우는 것을 막습니다.
+이미 연결된 이미지인지는 image_url 인덱스로 확인합니다 (CONCURRENTLY, 트랜잭션 밖에서 실행).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS review_image_uploads (
+            s3_key VARCHAR(500) PRIMARY KEY,
+            review_id VARCHAR(36) NOT NULL,
+            content_type VARCHAR(50) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_review_image_uploads_expires_at "
+        "ON review_image_uploads (expires_at)"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_review_images_image_url "
+            "ON review_images (image_url)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_review_images_image_url")
+    op.execute("DROP TABLE IF EXISTS review_image_uploads")
@@ -0,0 +1,40 @@
+"""포토카드당 세션 하나 보장 (session_by_card)
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19
+
+0007에서 세션 UNIQUE (photo_card_id)가 (photo_card_id, created_at)로 바뀌어
+같은 카드의 세션이 다른 시각에 또 만들어질 수 있습니다.
+파티션이 아닌 가드 테이블(photo_card_id PK)에 세션과 같은 트랜잭션으로 기록해 카드당 하나를 보장합니다.
+기존 세션은 카드별 가장 먼저 만든 세션으로 채웁니다.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS session_by_card (
+            photo_card_id VARCHAR(36) PRIMARY KEY REFERENCES photo_cards(id) ON DELETE CASCADE,
+            session_id VARCHAR(36) NOT NULL
+        )
+    """)
+    op.execute("""
+        INSERT INTO session_by_card (photo_card_id, session_id)
+        SELECT DISTINCT ON (photo_card_id) photo_card_id, id
+        FROM meeting_platform_sessions
+        ORDER BY photo_card_id, created_at, id
+        ON CONFLICT (photo_card_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS session_by_card")
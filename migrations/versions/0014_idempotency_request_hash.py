@@ -0,0 +1,27 @@
+"""Idempotency-Key 요청 본문 지문 (request_hash)
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19
+
+JSON 요청은 본문의 SHA-256을 키와 함께 저장하고,
+같은 키로 다른 본문이 오면 첫 응답을 재생하지 않고 422로 거절합니다 (services/idempotency.py).
+기존 행과 multipart 요청은 NULL (비교하지 않음).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0014"
+down_revision: Union[str, None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS request_hash VARCHAR(64)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE idempotency_keys DROP COLUMN IF EXISTS request_hash")
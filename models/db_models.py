@@ -1,15 +1,16 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Integer
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, Integer, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
+from models.ids import uuid7
 import uuid
 
 
 class PhotoCard(Base):
     __tablename__ = "photo_cards"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=uuid7)
     user_id = Column(String(100), nullable=True, index=True)
     province = Column(String(50), nullable=False)
     city = Column(String(50), nullable=False)
@@ -19,7 +20,17 @@ class PhotoCard(Base):
     image_path = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     expires_at = Column(DateTime(timezone=True), nullable=True)
-    is_active = Column(Boolean, default=True, index=True)
+    is_active = Column(Boolean, default=True)
+
+    __table_args__ = (
+        # verify: 활성 카드 ID만 담는 부분 인덱스 (index-only scan)
+        Index("idx_photo_cards_active_id", "id", postgresql_where=(is_active == True)),  # noqa: E712
+        # 만료 정리: 만료 시각이 있는 활성 카드만
+        Index(
+            "idx_photo_cards_expiring", expires_at,
+            postgresql_where=(is_active == True) & expires_at.isnot(None),  # noqa: E712
+        ),
+    )
 
 
 class MeetingPlatformSession(Base):
@@ -31,18 +42,22 @@ class MeetingPlatformSession(Base):
     - processing: LLM 처리중
     - completed: 완료
     - failed: 실패
+
+    DB에서는 created_at 월별 RANGE 파티션 (init.sql, migrations/0007 참고)
+    - PK (id, created_at), UNIQUE (photo_card_id, created_at)
+    - UNIQUE에 created_at이 들어가 카드당 세션 하나는 보장되지 않음 → SessionByCard가 보장
+    - ID 조회는 crud.created_at_window로 해당 월 파티션만 읽음
     """
     __tablename__ = "meeting_platform_sessions"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=uuid7)
     photo_card_id = Column(
         String(36),
         ForeignKey("photo_cards.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
-        unique=True  # 포토카드당 하나의 세션만
+        unique=True  # 포토카드당 하나의 세션만 (DB: session_by_card가 보장, UNIQUE 제약 인덱스로 조회)
     )
-    status = Column(String(20), default="pending", nullable=False, index=True)
+    status = Column(String(20), default="pending", nullable=False)
     query = Column(Text, nullable=True)
     area_code = Column(String(10), nullable=True)
     sigungu_code = Column(String(10), nullable=True)
@@ -56,14 +71,38 @@ class MeetingPlatformSession(Base):
         onupdate=func.now()
     )
 
+    __table_args__ = (
+        # 미완료 작업 조회 (오래된 순) - 완료/실패 세션은 인덱스에 들어가지 않음
+        Index(
+            "idx_sessions_unfinished_created",
+            created_at,
+            postgresql_where=status.in_(["pending", "processing"]),
+        ),
+    )
+
+
+class SessionByCard(Base):
+    """
+    포토카드 → 세션 가드 (파티션이 아닌 테이블, 포토카드당 세션 하나 보장)
+
+    세션과 같은 트랜잭션에 INSERT ... ON CONFLICT (photo_card_id)로 기록합니다.
+    세션을 지울 때(유휴 정리, 파티션 보관) 가드 행도 함께 지웁니다.
+    """
+    __tablename__ = "session_by_card"
+
+    photo_card_id = Column(String(36), ForeignKey("photo_cards.id", ondelete="CASCADE"), primary_key=True)
+    session_id = Column(String(36), nullable=False)
+
 
 class Review(Base):
     """
     리뷰 테이블 - 장소별 사용자 리뷰
+
+    DB에서는 created_at 월별 RANGE 파티션, PK (id, created_at) (init.sql, migrations/0007 참고)
     """
     __tablename__ = "reviews"
 
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String(36), primary_key=True, default=uuid7)
     place_id = Column(String(100), nullable=False, index=True)  # 관광 API content_id 또는 커스텀
     place_name = Column(String(200), nullable=False)
     rating = Column(Integer, nullable=False)  # 1~5
@@ -77,10 +116,57 @@ class Review(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     is_deleted = Column(Boolean, default=False)
+    # 검색용 글자 bigram tsvector (place_name + content, 쓰기 시 갱신)
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text, "sqlite"), nullable=True))
 
     # Relationship
     images = relationship("ReviewImage", back_populates="review", cascade="all, delete-orphan")
 
+    # 목록 커서 페이지네이션용 (created_at, id) 복합 인덱스 (삭제되지 않은 리뷰만)
+    __table_args__ = (
+        Index(
+            "idx_reviews_place_created_id",
+            "place_id", created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False),
+        ),
+        Index(
+            "idx_reviews_user_created_id",
+            "user_id", created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False),
+        ),
+        Index(
+            "idx_reviews_created_id",
+            created_at.desc(), id.desc(),
+            postgresql_where=(is_deleted == False),
+        ),
+        Index(
+            "idx_reviews_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=(is_deleted == False),
+        ),
+    )
+
+
+class PlaceRatingStats(Base):
+    """
+    장소별 평점 집계 테이블 - 리뷰 생성/수정/삭제 트랜잭션에서 증분 갱신
+
+    평점 조회는 reviews 스캔 대신 place_id 기본키 조회 한 번으로 끝납니다.
+    """
+    __tablename__ = "place_rating_stats"
+
+    place_id = Column(String(100), primary_key=True)
+    rating_sum = Column(Integer, default=0, nullable=False)
+    rating_count = Column(Integer, default=0, nullable=False)
+    # 별점 분포 (1~5점별 리뷰 수)
+    count_1 = Column(Integer, default=0, nullable=False)
+    count_2 = Column(Integer, default=0, nullable=False)
+    count_3 = Column(Integer, default=0, nullable=False)
+    count_4 = Column(Integer, default=0, nullable=False)
+    count_5 = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 
 class ReviewImage(Base):
     """
@@ -91,13 +177,84 @@ class ReviewImage(Base):
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     review_id = Column(
         String(36),
+        # ORM 관계용 (DB에는 FK 없음, reviews가 파티션 테이블) - 고아 행은 만료 정리 작업이 삭제
         ForeignKey("reviews.id", ondelete="CASCADE"),
         nullable=False,
         index=True
     )
-    image_url = Column(String(500), nullable=False)  # S3 URL
+    image_url = Column(String(500), nullable=False, index=True)  # S3 URL (finalize 중복 확인)
     image_order = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationship
     review = relationship("Review", back_populates="images")
+
+
+class ReviewImageUpload(Base):
+    """
+    presigned 업로드 발급 기록 - finalize는 이 리뷰에 발급된 키만 연결
+
+    finalize 시 행을 지우며(1회용), 연결되지 않고 만료된 행은 만료 정리(sweeper)가 삭제합니다.
+    (S3 객체는 고아 객체 정리가 삭제)
+    """
+    __tablename__ = "review_image_uploads"
+
+    s3_key = Column(String(500), primary_key=True)
+    review_id = Column(String(36), nullable=False)
+    content_type = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+class S3PendingDeletion(Base):
+    """
+    S3 삭제 대기열 - 백그라운드 워커가 delete_objects로 묶어서 삭제
+
+    DB 변경과 같은 트랜잭션에 기록되므로 서버가 죽어도 삭제할 객체를 잃지 않습니다.
+    """
+    __tablename__ = "s3_pending_deletions"
+
+    s3_key = Column(String(500), primary_key=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class RecommendationJob(Base):
+    """
+    추천 작업 outbox - 포토카드/세션과 같은 트랜잭션에 기록
+
+    백그라운드 디스패처가 FOR UPDATE SKIP LOCKED로 가져가 처리하고, 끝나면 행을 지웁니다.
+    처리 중 서버가 죽으면 next_attempt_at(임대 만료) 이후 다른 프로세스가 다시 가져갑니다.
+    """
+    __tablename__ = "recommendation_jobs"
+
+    session_id = Column(String(36), primary_key=True)
+    query = Column(Text, nullable=False)
+    area_code = Column(String(10), nullable=True)
+    sigungu_code = Column(String(10), nullable=True)
+    # 같은 추천 결과를 복사받을 세션 (일괄 생성에서 쿼리가 같은 카드들)
+    shared_session_ids = Column(ARRAY(String(36)), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Key 저장소 - POST 재시도(모바일 네트워크 끊김)에 첫 응답을 재생
+
+    key는 (메서드, 경로, 클라이언트, 헤더 값)의 SHA-256. 만료된 행은 만료 정리(sweeper)가 삭제합니다.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(64), primary_key=True)
+    status = Column(String(20), nullable=False)  # processing / completed
+    response_status = Column(Integer, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    locked_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    request_hash = Column(String(64), nullable=True)  # JSON 요청 본문 SHA-256 (multipart는 NULL)
@@ -3,3 +3,4 @@ from .recommend import router as recommend_router
 from .photo_card import router as photo_card_router
 from .session import router as session_router
 from .review import router as review_router
+from .debug import router as debug_router
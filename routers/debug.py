@@ -0,0 +1,133 @@
+"""
+디버그 API - 내부 통계 조회
+
+상태를 바꾸는 API(정리 즉시 실행, 캐시 비우기)는 require_admin으로 보호합니다.
+"""
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from services.llm_metrics import llm_stats
+from services.s3_deletion import s3_deletion_queue
+from services.partition_maintenance import partition_maintenance
+from services.expiry_sweeper import expiry_sweeper
+from services.photo_card_cache import photo_card_cache
+from services.recommendation_outbox import recommendation_outbox
+from services.idempotency import idempotency_store
+from database import get_pool_stats, get_pool_prometheus
+from config import get_settings
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    X-Admin-Token 헤더가 admin_token과 같아야 허용
+    (admin_token이 설정돼 있지 않으면 debug 설정과 관계없이 거부)
+    """
+    admin_token = get_settings().admin_token
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="관리자 토큰(admin_token)이 설정돼 있지 않습니다")
+    if not secrets.compare_digest(x_admin_token or "", admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다")
+
+
+@router.get("/llm-stats")
+async def get_llm_stats(format: str = "json"):
+    """
+    LLM 작업별 토큰/지연 통계
+
+    - **format**: json (요약, 기본값) 또는 prometheus (히스토그램 텍스트)
+    - 작업: generate_hashtags, extract_search_params, parse_travel_query, curate_and_explain, mcp_query
+    """
+    if format == "prometheus":
+        return PlainTextResponse(llm_stats.prometheus())
+    return llm_stats.summary()
+
+
+@router.delete("/llm-stats", dependencies=[Depends(require_admin)])
+async def reset_llm_stats():
+    """LLM 통계 초기화 (관리자)"""
+    llm_stats.reset()
+    return {"success": True}
+
+
+@router.get("/s3-deletions")
+async def get_s3_deletion_stats():
+    """S3 삭제 대기열 워커 통계 (삭제/실패/배치 수, 고아 객체 추가 수)"""
+    return s3_deletion_queue.stats
+
+
+@router.post("/s3-deletions/sweep", dependencies=[Depends(require_admin)])
+async def sweep_s3_orphans():
+    """고아 객체 정리 즉시 실행 (관리자, 다른 프로세스가 정리 중이면 enqueued=0)"""
+    enqueued = await s3_deletion_queue.sweep_orphans()
+    return {"success": True, "enqueued": enqueued}
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats(format: str = "json"):
+    """
+    DB 커넥션 풀 상태
+
+    - checked_out / overflow: 현재 사용 중 커넥션, 초과 커넥션 수
+    - wait_seconds: 커넥션 체크아웃 대기 시간 (풀 고갈 시 증가)
+    - timeouts: db_pool_timeout 초과로 실패한 체크아웃 수
+    """
+    if format == "prometheus":
+        return PlainTextResponse(get_pool_prometheus())
+    return get_pool_stats()
+
+
+@router.get("/partitions")
+async def get_partition_stats():
+    """월별 파티션 작업 통계 + 현재 보관 대상 파티션"""
+    due = await partition_maintenance.due_partitions()
+    return {**partition_maintenance.stats, "due": [name for _, name in due]}
+
+
+@router.get("/sweeper")
+async def get_sweeper_stats(format: str = "json"):
+    """
+    만료 정리 통계 (작업별 처리 행 수, 배치 수, 소요 시간)
+
+    - **format**: json (기본값) 또는 prometheus
+    - 작업: photo_cards_deactivated (만료 포토카드 비활성화), sessions_purged (유휴 세션 삭제),
+      idempotency_keys_purged (만료 Idempotency-Key 삭제)
+    """
+    if format == "prometheus":
+        return PlainTextResponse(expiry_sweeper.prometheus())
+    return expiry_sweeper.summary()
+
+
+@router.post("/sweeper/run", dependencies=[Depends(require_admin)])
+async def run_sweeper():
+    """만료 정리 즉시 실행 (관리자)"""
+    result = await expiry_sweeper.run_once()
+    return {"success": True, **result}
+
+
+@router.get("/photo-card-cache")
+async def get_photo_card_cache_stats():
+    """포토카드 검증 캐시 통계 (적중/음성 적중/블룸 필터 거절/DB 조회 수)"""
+    return photo_card_cache.summary()
+
+
+@router.delete("/photo-card-cache", dependencies=[Depends(require_admin)])
+async def clear_photo_card_cache():
+    """포토카드 캐시 비우기 (관리자, DB를 직접 고친 뒤, 블룸 필터는 유지)"""
+    photo_card_cache.clear()
+    return {"success": True}
+
+
+@router.get("/recommendation-jobs")
+async def get_recommendation_job_stats():
+    """추천 작업 디스패처 통계 (시작/완료/재시도/포기 수, 실행 중, 대기(due)/임대 중(leased) 작업 수)"""
+    return await recommendation_outbox.summary()
+
+
+@router.get("/idempotency")
+async def get_idempotency_stats():
+    """Idempotency-Key 통계 (저장/재생/대기/409/해제 수, 프로세스 캐시 항목 수, 처리 중 키 수)"""
+    return idempotency_store.summary()
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from database import get_db
-from schemas.models import PhotoCardCreate, PhotoCardResponse
-from crud import photo_card_crud, create_session
-from services import start_recommendation_task
+from config import get_settings
+from database import get_db, get_read_db
+from schemas.models import PhotoCardCreate, PhotoCardResponse, PhotoCardBatchRequest, PhotoCardBatchResponse
+from crud import create_photo_card_with_session, create_photo_cards_with_sessions
+from services.recommendation_outbox import recommendation_outbox
+from services.photo_card_cache import photo_card_cache, serialize, verify_body
 
 router = APIRouter(
     prefix="/api/v1/photo_cards",
@@ -30,35 +33,56 @@ async def create_photo_card(
     포토카드 생성 시 자동으로 추천 요청이 백그라운드에서 시작됩니다.
     session_id를 사용해서 추천 상태를 조회할 수 있습니다.
     """
-    # 1. 포토카드 생성
-    db_photo_card = await photo_card_crud.create_photo_card(db, photo_card)
-
-    # 2. 추천 쿼리 생성
+    # 1. 포토카드 + 세션(area_code, sigungu_code가 있을 때만) + 추천 작업을 한 트랜잭션으로 생성
     query = _build_recommendation_query(photo_card)
+    db_photo_card, session_id = await create_photo_card_with_session(db, photo_card, query)
+    photo_card_cache.add(db_photo_card.id, serialize(db_photo_card))
+
+    # 2. 커밋된 추천 작업을 디스패처가 바로 가져가도록 깨움
+    if session_id:
+        recommendation_outbox.notify()
+        print(f"[PhotoCard] Created {db_photo_card.id}, session {session_id} queued")
+
+    # 3. 응답 반환
+    return _photo_card_response(db_photo_card, session_id)
 
-    # 3. 세션 생성 (area_code, sigungu_code가 있을 때만)
-    session_id = None
-    if photo_card.area_code and photo_card.sigungu_code:
-        session = await create_session(
-            db=db,
-            photo_card_id=db_photo_card.id,
-            query=query,
-            area_code=photo_card.area_code,
-            sigungu_code=photo_card.sigungu_code
-        )
-        session_id = session.id
-
-        # 4. 백그라운드 추천 요청 시작
-        start_recommendation_task(
-            session_id=session.id,
-            query=query,
-            area_code=photo_card.area_code,
-            sigungu_code=photo_card.sigungu_code
-        )
-        print(f"[PhotoCard] Created {db_photo_card.id}, session {session_id} started")
 
-    # 5. 응답 반환
-    response_data = PhotoCardResponse(
+@router.post(":batch", response_model=PhotoCardBatchResponse)
+async def create_photo_cards_batch(
+    request: PhotoCardBatchRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    PhotoCard 일괄 생성 + 추천 요청 시작 (단체 여행 등)
+
+    - **items**: PhotoCard 생성 요청 목록 (최대 500개, 각 항목은 POST /api/v1/photo_cards와 같음)
+    - 카드/세션/추천 작업을 한 트랜잭션으로 생성 (전부 생성되거나 전부 실패)
+    - 쿼리와 지역 코드가 같은 카드들은 추천을 한 번만 실행하고 결과를 함께 받음
+    - 응답 items는 요청 순서와 같음
+    """
+    max_items = get_settings().photo_card_batch_max_items
+    if not request.items:
+        raise HTTPException(status_code=400, detail="포토카드가 없습니다")
+    if len(request.items) > max_items:
+        raise HTTPException(status_code=400, detail=f"포토카드는 한 번에 최대 {max_items}개까지 생성 가능합니다")
+
+    queries = [_build_recommendation_query(item) for item in request.items]
+    created, job_count = await create_photo_cards_with_sessions(db, request.items, queries)
+    for db_photo_card, _ in created:
+        photo_card_cache.add(db_photo_card.id, serialize(db_photo_card))
+
+    if job_count:
+        recommendation_outbox.notify()
+    print(f"[PhotoCard] Batch created {len(created)} cards, {job_count} recommendation jobs queued")
+
+    return PhotoCardBatchResponse(
+        items=[_photo_card_response(db_photo_card, session_id) for db_photo_card, session_id in created],
+        recommendation_jobs=job_count,
+    )
+
+
+def _photo_card_response(db_photo_card, session_id) -> PhotoCardResponse:
+    return PhotoCardResponse(
         id=db_photo_card.id,
         province=db_photo_card.province,
         city=db_photo_card.city,
@@ -70,8 +94,6 @@ async def create_photo_card(
         session_id=session_id
     )
 
-    return response_data
-
 
 def _build_recommendation_query(photo_card: PhotoCardCreate) -> str:
     """포토카드 정보로 추천 쿼리 생성"""
@@ -86,38 +108,25 @@ def _build_recommendation_query(photo_card: PhotoCardCreate) -> str:
 @router.get("/{photo_card_id}", response_model=PhotoCardResponse)
 async def get_photo_card(
     photo_card_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """PhotoCard 조회"""
-    photo_card = await photo_card_crud.get_photo_card(db, photo_card_id)
-    if not photo_card:
+    """PhotoCard 조회 (캐시에 미리 직렬화된 응답)"""
+    body = await photo_card_cache.get_body(db, photo_card_id)
+    if body is None:
         raise HTTPException(status_code=404, detail="PhotoCard not found")
-
-    # Convert datetime to string for response
-    response_data = PhotoCardResponse(
-        id=photo_card.id,
-        province=photo_card.province,
-        city=photo_card.city,
-        message=photo_card.message,
-        hashtags=photo_card.hashtags,
-        ai_quote=photo_card.ai_quote,
-        created_at=photo_card.created_at.isoformat(),
-        is_active=photo_card.is_active
-    )
-
-    return response_data
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{photo_card_id}/verify")
 async def verify_photo_card(
     photo_card_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """PhotoCard 검증 (만남승강장 접근 전)"""
-    is_valid = await photo_card_crud.verify_photo_card(db, photo_card_id)
+    """PhotoCard 검증 (만남승강장 접근 전, 캐시 → DB)"""
+    is_valid = await photo_card_cache.verify(db, photo_card_id)
     if not is_valid:
         raise HTTPException(
             status_code=404,
             detail="Invalid or inactive PhotoCard"
         )
-    return {"valid": True, "photo_card_id": photo_card_id}
+    return Response(content=verify_body(photo_card_id), media_type="application/json")
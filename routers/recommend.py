@@ -2,13 +2,16 @@ import logging
 import time
 import json
 from datetime import datetime
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 from schemas import (
     RecommendRequest, RecommendResponse, Course, Spot,
     AskRequest, AskResponse, SpotWithLocation, CourseStop, RecommendedCourse
 )
-from services import LLMClient, TourAPIService
+from config import get_settings
+from database import read_session
+from services import LLMClient, TourAPIService, resolve_search_params
+from services.rating_cache import attach_ratings
 
 # 로거 설정
 logger = logging.getLogger("recommend")
@@ -35,33 +38,47 @@ async def get_recommendation(request: RecommendRequest):
         session_data = sessions[request.session_id]
         session_context = f"이전 설명: {session_data['description']}, 해시태그: {session_data['hashtags']}"
 
-    llm = LLMClient()
     tour_api = TourAPIService()
 
-    # 1. LLM으로 검색 파라미터 추출
     preferences_dict = {}
     if request.preferences:
         preferences_dict = request.preferences.model_dump(exclude_none=True)
 
-    try:
-        search_params = await llm.extract_search_params(
-            session_context,
-            request.destination,
-            preferences_dict
-        )
-    except Exception:
-        # LLM 실패시 기본값
-        search_params = {
-            "area": request.destination,
-            "keyword": preferences_dict.get("theme", "관광")
-        }
+    # 1. 검색 파라미터 추출
+    #    목적지/테마가 코드표·테마 사전에 바로 매칭되면 규칙으로 (LLM 생략)
+    #    애매한 자유 입력일 때만 LLM 사용
+    search_params = None
+    param_source = "llm"
+    if get_settings().recommend_rule_fast_path:
+        search_params = resolve_search_params(request.destination, preferences_dict)
+        if search_params is not None:
+            param_source = "rule"
+
+    if search_params is None:
+        try:
+            llm = LLMClient()
+            search_params = await llm.extract_search_params(
+                session_context,
+                request.destination,
+                preferences_dict
+            )
+        except Exception:
+            # LLM 실패시 기본값
+            param_source = "fallback"
+            search_params = {
+                "area": request.destination,
+                "keyword": preferences_dict.get("theme", "관광")
+            }
+
+    logger.info(f"[recommend] 검색 파라미터 ({param_source}): {search_params}")
 
     # 2. 관광 API로 데이터 조회
     keyword = search_params.get("keyword", "관광")
     area = search_params.get("area", request.destination)
     sigungu = search_params.get("sigungu")
+    content_type = search_params.get("content_type")
 
-    combined = await tour_api.get_combined_results(keyword, area, sigungu)
+    combined = await tour_api.get_combined_results(keyword, area, sigungu, content_type)
 
     keyword_results = combined["keyword_results"]
     related_results = combined["related_results"]
@@ -69,7 +86,8 @@ async def get_recommendation(request: RecommendRequest):
     if not keyword_results and not related_results:
         return RecommendResponse(
             courses=[],
-            message=f"'{request.destination}'에서 '{keyword}' 관련 정보를 찾지 못했습니다."
+            message=f"'{request.destination}'에서 '{keyword}' 관련 정보를 찾지 못했습니다.",
+            param_source=param_source,
         )
 
     # 3. 코스 생성
@@ -77,7 +95,8 @@ async def get_recommendation(request: RecommendRequest):
 
     return RecommendResponse(
         courses=courses,
-        message=f"'{request.destination}' {keyword} 테마 여행 코스입니다."
+        message=f"'{request.destination}' {keyword} 테마 여행 코스입니다.",
+        param_source=param_source,
     )
 
 
@@ -139,13 +158,14 @@ def _build_courses(keyword_results: list, related_results: list, theme: str) ->
 
 
 @router.post("/ask", response_model=AskResponse)
-async def ask_travel(request: AskRequest):
+async def ask_travel(request: AskRequest, http_request: Request):
     """
     자연어로 여행 추천 요청 (MCP 통합)
 
     - **query**: 자연어 질의 (예: "바닷가 근처에서 바다뷰 보이는 카페에 갔다가 저녁은 삼겹살을 먹고싶어")
     - **area_code**: 모바일에서 선택한 도 코드 (예: "32" for 강원)
     - **sigungu_code**: 모바일에서 선택한 시/군/구 코드 (선택)
+    - **include_ratings**: true면 spots에 리뷰 평점(average_rating, review_count) 포함
 
     응답 구조:
     - **spots**: 리스트 뷰용 (전체 검색 결과, 지도 좌표 포함)
@@ -210,6 +230,10 @@ async def ask_travel(request: AskRequest):
                 content_id=s.get("content_id")
             ))
         logger.info(f"[{request_id}] spots 변환 완료: {len(spots)}개")
+        if request.include_ratings:
+            # 평점 조회 구간에서만 DB 세션 사용 (LLM 응답을 기다리는 동안 커넥션을 잡지 않음)
+            async with read_session(http_request) as db:
+                await attach_ratings(db, spots)
         for i, spot in enumerate(spots[:5]):  # 처음 5개만 로그
             logger.debug(f"[{request_id}]   - spot[{i}]: {spot.name} ({spot.category})")
 
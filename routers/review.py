@@ -1,36 +1,103 @@
 """
 리뷰 API - CRUD + S3 이미지 업로드
 """
+import logging
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from database import get_db
+from database import get_db, get_read_db
 from crud import (
     create_review,
     get_review_by_id,
     get_reviews_by_place,
     get_reviews_by_user,
     get_all_reviews,
-    get_place_average_rating,
+    encode_review_cursor,
+    decode_review_cursor,
+    get_place_rating_stats,
     update_review,
     delete_review,
+    record_image_uploads,
+    attach_uploaded_images,
+    encode_search_cursor,
+    decode_search_cursor,
 )
 from schemas.models import (
     ReviewResponse,
     ReviewListResponse,
     ReviewUpdate,
     PlaceRatingResponse,
+    PlaceRatingBatchRequest,
+    PlaceRatingBatchResponse,
+    PlaceRatingSummary,
+    ReviewSearchResult,
+    ReviewSearchResponse,
+    ImageUploadRequest,
+    PresignedUpload,
+    PresignedUploadResponse,
+    ReviewImageAttachRequest,
 )
-from services.s3_service import s3_service
+from services.s3_service import (
+    s3_service,
+    ImageNotFoundError,
+    ImageTooLargeError,
+    UnsupportedImageError,
+)
+from services.image_variants import image_variant_service, variant_url, variant_urls
+from services.s3_deletion import s3_deletion_queue
+from services.rating_cache import rating_cache
+from services.review_search import review_search_service
+from config import get_settings
+
+logger = logging.getLogger("review")
 
 router = APIRouter(
     prefix="/api/v1/reviews",
     tags=["reviews"]
 )
 
+# 리뷰당 최대 이미지 수
+MAX_REVIEW_IMAGES = 5
+
+
+def _parse_cursor(cursor: Optional[str]):
+    """쿼리 파라미터 커서 → (created_at, id), 잘못되면 400"""
+    if not cursor:
+        return None
+    try:
+        return decode_review_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _next_cursor(reviews: list, limit: int) -> Optional[str]:
+    """페이지가 가득 찼으면 마지막 리뷰 기준 다음 커서"""
+    if limit > 0 and len(reviews) == limit:
+        return encode_review_cursor(reviews[-1])
+    return None
+
+
+def _after_commit(name: str, fn, *args) -> None:
+    """
+    커밋 뒤 부가 작업 (캐시 무효화, 검색 색인, 파생본 예약)
+
+    리뷰는 이미 저장됐으므로 실패해도 로그만 남기고 응답/이미지에는 영향을 주지 않음
+    """
+    try:
+        fn(*args)
+    except Exception as e:
+        logger.error(f"[review] {name} 실패: {type(e).__name__}: {e}")
+
 
 def _review_to_response(review) -> ReviewResponse:
     """DB Review 모델을 Response로 변환"""
+    image_urls = [img.image_url for img in sorted(review.images, key=lambda x: x.image_order)]
+    if get_settings().image_variants_enabled:
+        thumbnail_urls = [variant_url(url, "thumb") for url in image_urls]
+        webp_urls = [variant_url(url, "w1080") for url in image_urls]
+    else:
+        # 파생본을 만들지 않으면 항상 404인 URL 대신 원본
+        thumbnail_urls = webp_urls = image_urls
     return ReviewResponse(
         id=review.id,
         place_id=review.place_id,
@@ -39,7 +106,9 @@ def _review_to_response(review) -> ReviewResponse:
         content=review.content,
         user_id=review.user_id,
         photo_card_id=review.photo_card_id,
-        image_urls=[img.image_url for img in sorted(review.images, key=lambda x: x.image_order)],
+        image_urls=image_urls,
+        thumbnail_urls=thumbnail_urls,
+        webp_urls=webp_urls,
         created_at=review.created_at.isoformat() if review.created_at else "",
         updated_at=review.updated_at.isoformat() if review.updated_at else None,
     )
@@ -63,7 +132,7 @@ async def create_review_endpoint(
     - images: 최대 5장까지 이미지 업로드 가능
     """
     # 이미지 개수 제한
-    if len(images) > 5:
+    if len(images) > MAX_REVIEW_IMAGES:
         raise HTTPException(status_code=400, detail="이미지는 최대 5장까지 업로드 가능합니다")
 
     # S3에 이미지 업로드
@@ -71,6 +140,10 @@ async def create_review_endpoint(
     if images:
         try:
             image_urls = await s3_service.upload_images(images, folder="reviews")
+        except ImageTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except UnsupportedImageError as e:
+            raise HTTPException(status_code=415, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"이미지 업로드 실패: {str(e)}")
 
@@ -86,18 +159,152 @@ async def create_review_endpoint(
             user_id=user_id,
             photo_card_id=photo_card_id,
         )
-        return _review_to_response(review)
     except Exception as e:
-        # 실패시 업로드된 이미지 삭제
+        # 실패시 업로드된 이미지 삭제 (요청 세션은 실패 상태일 수 있어 별도 세션으로 기록)
         if image_urls:
-            s3_service.delete_images(image_urls)
+            await s3_deletion_queue.enqueue_urls(image_urls)
         raise HTTPException(status_code=500, detail=f"리뷰 생성 실패: {str(e)}")
 
+    _after_commit("평점 캐시 무효화", rating_cache.invalidate, place_id)
+    _after_commit("검색 색인", review_search_service.index_review, review)
+    # 썸네일/WebP 파생본은 응답 후 백그라운드 생성
+    _after_commit("파생본 예약", image_variant_service.schedule, image_urls)
+    return _review_to_response(review)
+
+
+@router.post("/{review_id}/uploads", response_model=PresignedUploadResponse)
+async def create_image_uploads_endpoint(
+    review_id: str,
+    request: ImageUploadRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    리뷰 이미지 presigned 업로드 발급
+
+    1. 이 API로 이미지별 upload_url + fields 발급 (최대 5장)
+    2. 클라이언트가 upload_url로 S3에 직접 multipart POST (fields 먼저, 마지막에 file)
+    3. POST /reviews/{review_id}/images 로 key 전달 → 리뷰에 연결
+
+    이미지 바이트가 API 서버를 거치지 않습니다.
+    발급한 키는 이 리뷰에만, s3_orphan_grace_hours 안에 한 번 연결할 수 있습니다.
+    """
+    if not request.content_types:
+        raise HTTPException(status_code=400, detail="업로드할 이미지 형식을 입력해주세요")
+    if len(request.content_types) > MAX_REVIEW_IMAGES:
+        raise HTTPException(status_code=400, detail="이미지는 최대 5장까지 업로드 가능합니다")
+
+    review = await get_review_by_id(db, review_id)
+    if not review:
+        raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다")
+
+    try:
+        uploads = [
+            PresignedUpload(**s3_service.create_presigned_upload(content_type, folder="reviews"))
+            for content_type in request.content_types
+        ]
+    except UnsupportedImageError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    # 고아 객체 정리가 지우기 전까지만 finalize 허용
+    await record_image_uploads(
+        db,
+        review_id,
+        [(upload.key, content_type) for upload, content_type in zip(uploads, request.content_types)],
+        valid_seconds=get_settings().s3_orphan_grace_hours * 3600,
+    )
+    return PresignedUploadResponse(uploads=uploads)
+
+
+@router.post("/{review_id}/images", response_model=ReviewResponse)
+async def attach_review_images_endpoint(
+    review_id: str,
+    request: ReviewImageAttachRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    presigned로 업로드한 이미지를 리뷰에 연결 (finalize)
+
+    - 이 리뷰에 발급된, 만료 전, 아직 연결되지 않은 키만 허용
+    - S3 HEAD로 객체 존재 확인 (크기/형식은 업로드 정책이 강제)
+    - 기존 이미지 포함 최대 5장 (리뷰 행 잠금으로 동시 요청에도 보장)
+    """
+    if not request.keys:
+        raise HTTPException(status_code=400, detail="연결할 이미지가 없습니다")
+    if len(set(request.keys)) != len(request.keys):
+        raise HTTPException(status_code=400, detail="중복된 이미지가 있습니다")
+    if len(request.keys) > MAX_REVIEW_IMAGES:
+        raise HTTPException(status_code=400, detail="이미지는 최대 5장까지 업로드 가능합니다")
+
+    try:
+        image_urls = await s3_service.verify_uploaded_images(request.keys, folder="reviews")
+    except ImageNotFoundError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        attached = await attach_uploaded_images(
+            db, review_id, dict(zip(request.keys, image_urls)), max_images=MAX_REVIEW_IMAGES
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if attached is None:
+        raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다")
+    _after_commit("파생본 예약", image_variant_service.schedule, image_urls)
+
+    review = await get_review_by_id(db, review_id)
+    if not review:
+        raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다")
+    return _review_to_response(review)
+
+
+@router.get("/search", response_model=ReviewSearchResponse)
+async def search_reviews_endpoint(
+    q: str,
+    place_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    리뷰 검색 (장소 이름 + 내용)
+
+    - **q**: 검색어 (예: "주차", "웨이팅") - 글자 bigram 단위로 모두 포함하는 리뷰
+    - **place_id**, **user_id**: 필터 (선택)
+    - 정렬: 관련도(이름 일치 > 내용 일치, 빈도) → 최신순
+    - 다음 페이지는 응답의 next_cursor를 cursor로 전달
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="검색어를 입력해주세요")
+    limit = max(1, min(limit, 100))
+
+    search_cursor = None
+    if cursor:
+        try:
+            search_cursor = decode_search_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    hits = await review_search_service.search(db, q, place_id, user_id, limit, search_cursor)
+
+    next_cursor = None
+    if len(hits) == limit:
+        last_review, last_score = hits[-1]
+        next_cursor = encode_search_cursor(last_score, last_review)
+
+    return ReviewSearchResponse(
+        query=q,
+        reviews=[
+            ReviewSearchResult(**_review_to_response(review).model_dump(), score=round(score, 4))
+            for review, score in hits
+        ],
+        next_cursor=next_cursor,
+    )
+
 
 @router.get("/{review_id}", response_model=ReviewResponse)
 async def get_review_endpoint(
     review_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """리뷰 단건 조회"""
     review = await get_review_by_id(db, review_id)
@@ -111,16 +318,24 @@ async def get_reviews_by_place_endpoint(
     place_id: str,
     limit: int = 50,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """장소별 리뷰 목록 조회"""
-    reviews = await get_reviews_by_place(db, place_id, limit, offset)
-    avg_rating, total_count = await get_place_average_rating(db, place_id)
+    """
+    장소별 리뷰 목록 조회
+
+    - 무한 스크롤은 응답의 next_cursor를 cursor로 전달 (깊이와 무관하게 일정한 속도)
+    - offset은 하위 호환용 (cursor가 있으면 무시)
+    """
+    reviews, total_count, avg_rating = await get_reviews_by_place(
+        db, place_id, limit, offset, cursor=_parse_cursor(cursor)
+    )
 
     return ReviewListResponse(
         reviews=[_review_to_response(r) for r in reviews],
         total_count=total_count,
         average_rating=round(avg_rating, 1),
+        next_cursor=_next_cursor(reviews, limit),
     )
 
 
@@ -129,21 +344,19 @@ async def get_reviews_by_user_endpoint(
     user_id: str,
     limit: int = 50,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """사용자별 리뷰 목록 조회 (내 리뷰)"""
-    reviews = await get_reviews_by_user(db, user_id, limit, offset)
-
-    # 사용자 리뷰의 평균 별점 계산
-    if reviews:
-        avg_rating = sum(r.rating for r in reviews) / len(reviews)
-    else:
-        avg_rating = 0.0
+    reviews, total_count, avg_rating = await get_reviews_by_user(
+        db, user_id, limit, offset, cursor=_parse_cursor(cursor)
+    )
 
     return ReviewListResponse(
         reviews=[_review_to_response(r) for r in reviews],
-        total_count=len(reviews),
+        total_count=total_count,
         average_rating=round(avg_rating, 1),
+        next_cursor=_next_cursor(reviews, limit),
     )
 
 
@@ -151,38 +364,71 @@ async def get_reviews_by_user_endpoint(
 async def get_all_reviews_endpoint(
     limit: int = 50,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """전체 리뷰 목록 조회"""
-    reviews = await get_all_reviews(db, limit, offset)
-
-    # 전체 리뷰의 평균 별점 계산
-    if reviews:
-        avg_rating = sum(r.rating for r in reviews) / len(reviews)
-    else:
-        avg_rating = 0.0
+    reviews, total_count, avg_rating = await get_all_reviews(
+        db, limit, offset, cursor=_parse_cursor(cursor)
+    )
 
     return ReviewListResponse(
         reviews=[_review_to_response(r) for r in reviews],
-        total_count=len(reviews),
+        total_count=total_count,
         average_rating=round(avg_rating, 1),
+        next_cursor=_next_cursor(reviews, limit),
     )
 
 
 @router.get("/place/{place_id}/rating", response_model=PlaceRatingResponse)
 async def get_place_rating_endpoint(
     place_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """장소별 평점 조회"""
-    avg_rating, review_count = await get_place_average_rating(db, place_id)
+    """장소별 평점 조회 (별점 분포 포함)"""
+    stats = await get_place_rating_stats(db, place_id)
+    if not stats or stats.rating_count <= 0:
+        return PlaceRatingResponse(
+            place_id=place_id,
+            average_rating=0.0,
+            review_count=0,
+            rating_distribution={r: 0 for r in range(1, 6)},
+        )
     return PlaceRatingResponse(
         place_id=place_id,
-        average_rating=round(avg_rating, 1),
-        review_count=review_count,
+        average_rating=round(stats.rating_sum / stats.rating_count, 1),
+        review_count=stats.rating_count,
+        rating_distribution={r: getattr(stats, f"count_{r}") for r in range(1, 6)},
     )
 
 
+@router.post("/ratings", response_model=PlaceRatingBatchResponse)
+async def get_place_ratings_endpoint(
+    request: PlaceRatingBatchRequest,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    여러 장소 평점 일괄 조회
+
+    - **place_ids**: 장소 ID 목록 (관광 API content_id, 최대 500개)
+    - 한 번의 집계 테이블 조회 + 짧은 캐시, 요청 순서 유지
+    """
+    max_ids = get_settings().rating_batch_max_ids
+    if len(request.place_ids) > max_ids:
+        raise HTTPException(status_code=400, detail=f"장소는 최대 {max_ids}개까지 조회 가능합니다")
+
+    place_ids = list(dict.fromkeys(request.place_ids))
+    ratings = await rating_cache.get_many(db, place_ids)
+    return PlaceRatingBatchResponse(ratings=[
+        PlaceRatingSummary(
+            place_id=place_id,
+            average_rating=round(ratings[place_id][0], 1),
+            review_count=ratings[place_id][1],
+        )
+        for place_id in place_ids
+    ])
+
+
 @router.patch("/{review_id}", response_model=ReviewResponse)
 async def update_review_endpoint(
     review_id: str,
@@ -198,6 +444,8 @@ async def update_review_endpoint(
     )
     if not review:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다")
+    _after_commit("평점 캐시 무효화", rating_cache.invalidate, review.place_id)
+    _after_commit("검색 색인", review_search_service.index_review, review)
     return _review_to_response(review)
 
 
@@ -207,20 +455,22 @@ async def delete_review_endpoint(
     db: AsyncSession = Depends(get_db)
 ):
     """리뷰 삭제"""
-    # 삭제 전 이미지 URL 수집
-    review = await get_review_by_id(db, review_id)
-    if not review:
+    # UPDATE ... RETURNING으로 삭제하면서 장소/이미지 URL 수집 (커밋은 대기열 기록 후)
+    deleted = await delete_review(db, review_id, commit=False)
+    if deleted is None:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다")
+    place_id, image_urls = deleted
 
-    image_urls = [img.image_url for img in review.images]
-
-    # DB에서 삭제
-    success = await delete_review(db, review_id)
-    if not success:
-        raise HTTPException(status_code=500, detail="리뷰 삭제 실패")
+    # S3 삭제는 대기열에 기록만 (리뷰 삭제와 같은 트랜잭션으로 커밋, 워커가 일괄 삭제)
+    if image_urls:
+        await s3_deletion_queue.enqueue(
+            db, image_urls + [v for url in image_urls for v in variant_urls(url)], commit=False
+        )
+    await db.commit()
 
-    # S3에서 이미지 삭제
+    _after_commit("평점 캐시 무효화", rating_cache.invalidate, place_id)
+    _after_commit("검색 색인 제거", review_search_service.remove_review, review_id)
     if image_urls:
-        s3_service.delete_images(image_urls)
+        s3_deletion_queue.notify()
 
     return {"success": True, "message": "리뷰가 삭제되었습니다"}
@@ -8,7 +8,7 @@ import time
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from database import get_db
+from database import get_read_db, writable_session
 from schemas.models import (
     SessionStatusResponse,
     SessionRecommendationResponse,
@@ -20,7 +20,10 @@ from crud import (
     get_session_by_photo_card_id,
     get_session_by_id,
     update_last_accessed,
+    requeue_compacted_session,
 )
+from services.rating_cache import attach_ratings
+from services.recommendation_outbox import recommendation_outbox
 
 # 로거 설정
 logger = logging.getLogger("session")
@@ -35,7 +38,7 @@ router = APIRouter(
 @router.get("/status/{photo_card_id}", response_model=SessionStatusResponse)
 async def get_session_status(
     photo_card_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     포토카드 ID로 세션 상태 조회 (polling용)
@@ -59,8 +62,9 @@ async def get_session_status(
 
     logger.info(f"[{request_id}] 세션 조회 성공: session_id={session.id}, status={session.status}")
 
-    # 접근 시간 업데이트
-    await update_last_accessed(db, session.id)
+    # 접근 시간 업데이트 (복제본 세션이면 primary에 기록)
+    async with writable_session(db) as write_db:
+        await update_last_accessed(write_db, session.id)
 
     # 상태별 메시지
     status_messages = {
@@ -84,14 +88,17 @@ async def get_session_status(
 @router.get("/recommendation/{photo_card_id}", response_model=SessionRecommendationResponse)
 async def get_session_recommendation(
     photo_card_id: str,
-    db: AsyncSession = Depends(get_db)
+    include_ratings: bool = False,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     포토카드 ID로 추천 결과 조회
 
+    - **include_ratings**: true면 spots에 리뷰 평점(average_rating, review_count) 포함
     - status가 "completed"일 때만 spots, course 데이터가 있음
     - status가 "pending" 또는 "processing"이면 빈 결과
     - status가 "failed"면 에러 메시지
+    - 오래 조회되지 않아 결과가 정리된 세션은 다시 추천을 요청하고 "pending"으로 응답
     """
     request_id = f"recommend_{int(time.time() * 1000)}"
     start_time = time.time()
@@ -114,8 +121,9 @@ async def get_session_recommendation(
     logger.info(f"[{request_id}]   - status: {session.status}")
     logger.info(f"[{request_id}]   - created_at: {session.created_at}")
 
-    # 접근 시간 업데이트
-    await update_last_accessed(db, session.id)
+    # 접근 시간 업데이트 (복제본 세션이면 primary에 기록)
+    async with writable_session(db) as write_db:
+        await update_last_accessed(write_db, session.id)
 
     # 기본 응답
     response = SessionRecommendationResponse(
@@ -139,6 +147,18 @@ async def get_session_recommendation(
     elif session.status == "failed":
         response.message = session.error_message or "추천 요청 실패"
         logger.warning(f"[{request_id}] 상태: failed - {response.message}")
+    elif session.status == "completed" and not session.recommendation_data:
+        # 유휴 세션 정리로 추천 결과가 비워진 세션 (카드가 활성이면 다시 추천)
+        async with writable_session(db) as write_db:
+            requeued = await requeue_compacted_session(write_db, session)
+        if requeued:
+            recommendation_outbox.notify()
+            response.status = "pending"
+            response.completed_at = None
+            response.message = "추천 결과를 다시 만들고 있어요..."
+        else:
+            response.message = "추천 결과가 만료되었습니다."
+        logger.info(f"[{request_id}] 상태: completed - 정리된 결과, 재요청={requeued}")
     elif session.status == "completed" and session.recommendation_data:
         logger.info(f"[{request_id}] 상태: completed - 데이터 변환 시작")
 
@@ -159,6 +179,8 @@ async def get_session_recommendation(
                 tel=s.get("tel"),
                 content_id=s.get("content_id")
             ))
+        if include_ratings:
+            await attach_ratings(db, spots)
         response.spots = spots
         logger.info(f"[{request_id}] spots 변환 완료: {len(spots)}개")
 
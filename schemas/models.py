@@ -69,6 +69,7 @@ class Course(BaseModel):
 class RecommendResponse(BaseModel):
     courses: list[Course]
     message: Optional[str] = None
+    param_source: Optional[str] = None  # 검색 파라미터 출처: rule, llm, fallback
 
 
 # === 자연어 질의 API ===
@@ -77,6 +78,7 @@ class AskRequest(BaseModel):
     query: str  # "바닷가 근처에서 바다뷰 보이는 카페에 갔다가 저녁은 삼겹살을 먹고싶어"
     area_code: Optional[str] = None      # 모바일에서 선택한 도 (예: "32" for 강원)
     sigungu_code: Optional[str] = None   # 모바일에서 선택한 시/군/구
+    include_ratings: bool = False        # spots에 리뷰 평점 포함
 
     model_config = {
         "json_schema_extra": {
@@ -101,6 +103,8 @@ class SpotWithLocation(BaseModel):
     mapy: Optional[str] = None           # 위도 (지도 API용)
     tel: Optional[str] = None            # 전화번호
     content_id: Optional[str] = None     # 상세정보 조회용
+    average_rating: Optional[float] = None  # include_ratings 요청 시에만 채움
+    review_count: Optional[int] = None
 
 
 # 코스 뷰용 - 동선이 정리된 각 정차지
@@ -199,6 +203,17 @@ class PhotoCardResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class PhotoCardBatchRequest(BaseModel):
+    """포토카드 일괄 생성 요청 (단체 여행 등)"""
+    items: list[PhotoCardCreate]
+
+
+class PhotoCardBatchResponse(BaseModel):
+    """포토카드 일괄 생성 응답 (요청 순서 유지)"""
+    items: list[PhotoCardResponse]
+    recommendation_jobs: int  # 실행할 추천 수 (쿼리/지역이 같은 카드는 하나로 묶음)
+
+
 # === Session API (만남승강장 추천 상태) ===
 
 class SessionStatusResponse(BaseModel):
@@ -274,6 +289,8 @@ class ReviewResponse(BaseModel):
     user_id: Optional[str] = None
     photo_card_id: Optional[str] = None
     image_urls: list[str] = []  # 이미지 URL 리스트
+    thumbnail_urls: list[str] = []  # 목록용 썸네일 (image_urls와 같은 순서, 생성 전에는 404 → 원본 사용, 파생본 비활성 시 원본)
+    webp_urls: list[str] = []  # 상세용 WebP (image_urls와 같은 순서, 파생본 비활성 시 원본)
     created_at: str
     updated_at: Optional[str] = None
 
@@ -285,6 +302,51 @@ class ReviewListResponse(BaseModel):
     reviews: list[ReviewResponse]
     total_count: int
     average_rating: float
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+
+
+class ReviewSearchResult(ReviewResponse):
+    """리뷰 검색 결과 (관련도 점수 포함)"""
+    score: float
+
+
+class ReviewSearchResponse(BaseModel):
+    """리뷰 검색 응답"""
+    query: str
+    reviews: list[ReviewSearchResult]
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+
+
+class ImageUploadRequest(BaseModel):
+    """presigned 업로드 URL 발급 요청"""
+    content_types: list[str]  # 이미지별 Content-Type (최대 5개)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {"content_types": ["image/jpeg", "image/heic"]}
+            ]
+        }
+    }
+
+
+class PresignedUpload(BaseModel):
+    """presigned 업로드 정보 (클라이언트가 upload_url로 직접 multipart POST)"""
+    key: str                  # 완료 처리(finalize) 시 전달할 S3 키
+    upload_url: str
+    image_url: str
+    fields: dict[str, str]    # POST 폼에 파일(file)보다 먼저 넣어야 하는 필드 (정책, 서명 등)
+    expires_in: int
+
+
+class PresignedUploadResponse(BaseModel):
+    """presigned 업로드 URL 발급 응답"""
+    uploads: list[PresignedUpload]
+
+
+class ReviewImageAttachRequest(BaseModel):
+    """업로드 완료된 이미지를 리뷰에 연결"""
+    keys: list[str]
 
 
 class PlaceRatingResponse(BaseModel):
@@ -292,3 +354,21 @@ class PlaceRatingResponse(BaseModel):
     place_id: str
     average_rating: float
     review_count: int
+    rating_distribution: dict[int, int] = {}  # 별점별 리뷰 수 {1: n, ..., 5: n}
+
+
+class PlaceRatingBatchRequest(BaseModel):
+    """여러 장소 평점 일괄 조회 요청"""
+    place_ids: list[str]
+
+
+class PlaceRatingSummary(BaseModel):
+    """장소 평점 요약 (일괄 조회용)"""
+    place_id: str
+    average_rating: float
+    review_count: int
+
+
+class PlaceRatingBatchResponse(BaseModel):
+    """여러 장소 평점 일괄 조회 응답 (요청 순서 유지, 중복 제거)"""
+    ratings: list[PlaceRatingSummary]
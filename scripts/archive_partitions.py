@@ -0,0 +1,46 @@
+"""
+월별 파티션 생성 / 오래된 파티션 보관 수동 실행
+
+서버의 주기 작업(partition_maintenance)과 같은 작업을 한 번 실행합니다.
+보관 기준은 ARCHIVE_SESSIONS_AFTER_MONTHS, ARCHIVE_REVIEWS_AFTER_MONTHS (0이면 보관 안 함).
+
+    python -m scripts.archive_partitions --dry-run      # 보관 대상만 출력
+    python -m scripts.archive_partitions --ensure-only  # 파티션 생성만
+    python -m scripts.archive_partitions
+"""
+import argparse
+import asyncio
+
+from database import engine
+from services.partition_maintenance import partition_maintenance
+
+
+async def run(dry_run: bool, ensure_only: bool) -> None:
+    try:
+        if ensure_only:
+            created = await partition_maintenance.ensure()
+            print(f"[partitions] 생성: {', '.join(created) or '없음'}")
+            return
+        result = await partition_maintenance.run_once(dry_run=dry_run)
+    finally:
+        await engine.dispose()
+
+    print(f"[partitions] 생성: {', '.join(result['created']) or '없음'}")
+    print(f"[partitions] 보관 대상: {', '.join(result['due']) or '없음'}")
+    if not dry_run:
+        print(f"[partitions] 보관 완료: {', '.join(result['archived']) or '없음'}")
+        failed = set(result["due"]) - set(result["archived"])
+        if failed:
+            raise SystemExit(f"[partitions] 보관 실패: {', '.join(sorted(failed))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="보관 대상만 출력 (생성/보관 안 함)")
+    parser.add_argument("--ensure-only", action="store_true", help="앞으로 몇 달치 파티션 생성만")
+    args = parser.parse_args()
+    asyncio.run(run(args.dry_run, args.ensure_only))
+
+
+if __name__ == "__main__":
+    main()
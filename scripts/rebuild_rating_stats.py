@@ -0,0 +1,31 @@
+"""
+장소별 평점 집계(place_rating_stats) 재계산
+
+집계 테이블을 처음 만든 뒤 기존 리뷰를 백필하거나, 수동으로 DB를 고친 뒤 보정할 때 실행합니다.
+
+    python -m scripts.rebuild_rating_stats
+    python -m scripts.rebuild_rating_stats --place-id 126508
+"""
+import argparse
+import asyncio
+
+from database import AsyncSessionLocal
+from crud import rebuild_place_rating_stats
+
+
+async def run(place_id: str | None) -> None:
+    async with AsyncSessionLocal() as db:
+        count = await rebuild_place_rating_stats(db, place_id=place_id)
+    target = place_id or "전체"
+    print(f"[rating-stats] {target}: {count}개 장소 재계산 완료")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--place-id", default=None, help="이 장소만 재계산 (생략하면 전체)")
+    args = parser.parse_args()
+    asyncio.run(run(args.place_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+리뷰 검색 컬럼(reviews.search_vector) 백필
+
+마이그레이션 0005가 기존 리뷰를 채우므로 보통은 필요 없고,
+0005를 --sql(오프라인)로 적용했거나 토큰 규칙을 바꿨을 때 실행합니다.
+새로 작성/수정되는 리뷰는 쓰기 시 자동으로 갱신됩니다.
+
+    python -m scripts.rebuild_search_index
+"""
+import argparse
+import asyncio
+
+from database import AsyncSessionLocal
+from crud import rebuild_review_search_vectors
+
+
+async def run(batch_size: int) -> None:
+    async with AsyncSessionLocal() as db:
+        count = await rebuild_review_search_vectors(db, batch_size=batch_size)
+    print(f"[search-index] {count}개 리뷰 색인 완료")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="커밋 단위 리뷰 수")
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
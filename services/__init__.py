@@ -1,5 +1,6 @@
 from .llm_client import LLMClient
 from .tour_api import TourAPIService
+from .param_resolver import resolve_search_params
 from .recommendation_service import (
     process_recommendation_background,
     start_recommendation_task,
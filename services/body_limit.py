@@ -0,0 +1,71 @@
+"""
+요청 본문 크기 제한 (ASGI 미들웨어)
+
+multipart 요청은 라우터에 닿기 전에 본문 전체가 임시 파일로 풀리므로,
+업로드 크기 검사(s3_service)만으로는 큰 요청이 디스크/대역폭을 다 쓴 뒤에야 거절됩니다.
+- Content-Length가 request_max_body_mb를 넘으면 본문을 읽지 않고 바로 413
+- Content-Length가 없는(chunked) 본문은 받은 바이트를 세다가 넘는 순간 413을 보내고 읽기 중단
+"""
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """max_bytes보다 큰 요청 본문을 413으로 거절"""
+
+    def __init__(self, app: ASGIApp, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    def _too_large(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"요청 본문은 최대 {self.max_bytes // (1024 * 1024)}MB입니다"},
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                too_large = int(content_length) > self.max_bytes
+            except ValueError:
+                too_large = False  # 잘못된 헤더는 서버(uvicorn)가 거절
+            if too_large:
+                await self._too_large()(scope, receive, send)
+                return
+
+        received = 0
+        response_started = False
+        rejected = False
+        replied = False
+
+        async def limited_receive() -> Message:
+            # 제한을 넘으면 413을 먼저 보내고 앱에는 연결이 끊긴 것으로 알림
+            # (예외를 던지면 FastAPI가 본문 파싱 오류 400으로 바꿈)
+            nonlocal received, rejected, replied
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    rejected = True
+                    if not response_started:
+                        await self._too_large()(scope, receive, send)
+                        replied = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if replied:
+                return  # 413을 이미 보냄, 앱의 오류 응답은 버림
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        await self.app(scope, limited_receive, tracking_send)
@@ -0,0 +1,240 @@
+"""
+만료 정리 작업 (sweeper)
+
+- expires_at이 지난 포토카드 비활성화 (+ 그 카드 세션의 추천 결과 JSONB 비우기)
+- session_idle_ttl_days 동안 조회되지 않은 세션 중 카드가 비활성/만료된 세션 삭제
+  (활성 카드의 세션은 남기고 추천 결과 JSONB만 비움 → 다시 조회하면 새로 추천)
+- 만료된 Idempotency-Key 삭제
+- finalize 없이 만료된 presigned 업로드 발급 기록 삭제
+- 리뷰가 없는 review_images 행 삭제 (+ S3 이미지/파생본을 삭제 대기열에 기록)
+
+작업은 sweep_batch_size행씩 별도 트랜잭션으로 나눠 처리하고 배치 사이에 잠시 쉽니다.
+한 번에 수십만 행을 지우며 잠금을 오래 잡거나 복제 지연을 만들지 않고,
+지운 공간은 autovacuum이 조금씩 회수해 테이블/인덱스 팽창이 쌓이지 않습니다.
+작업별 처리 행 수, 배치 수, 소요 시간은 /debug/sweeper에서 확인합니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from database import AsyncSessionLocal
+from crud import (
+    deactivate_expired_photo_cards,
+    session_sweep_targets,
+    purge_idle_sessions,
+    compact_idle_sessions,
+    purge_expired_idempotency_keys,
+    purge_expired_image_uploads,
+    purge_orphan_review_images,
+)
+from services.photo_card_cache import photo_card_cache
+from services.image_variants import variant_urls
+from services.s3_deletion import s3_deletion_queue
+
+logger = logging.getLogger("sweeper")
+
+TASKS = (
+    "photo_cards_deactivated",
+    "sessions_purged",
+    "sessions_compacted",
+    "idempotency_keys_purged",
+    "image_uploads_purged",
+    "orphan_review_images_purged",
+)
+
+
+class ExpirySweeper:
+    """만료 포토카드/유휴 세션 배치 정리 + 백그라운드 워커"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.last_run: Optional[str] = None
+        self.tasks = {
+            name: {"rows": 0, "batches": 0, "seconds": 0.0, "last_rows": 0, "last_seconds": 0.0}
+            for name in TASKS
+        }
+
+    async def _batched(
+        self,
+        step: Callable[[AsyncSession, int], Awaitable[int | list[str]]],
+        on_commit: Optional[Callable[[list[str]], None]] = None,
+    ) -> tuple[int, int]:
+        """
+        step(db, limit)을 배치마다 커밋하며 반복, (처리 행 수, 배치 수) 반환
+
+        step이 처리한 ID 목록을 반환하면 커밋 후 on_commit(ids) 호출 (캐시 무효화)
+        """
+        batch_size = self.settings.sweep_batch_size
+        pause = self.settings.sweep_batch_pause_ms / 1000
+        rows = batches = 0
+        while batches < self.settings.sweep_max_batches:
+            async with AsyncSessionLocal() as db:
+                result = await step(db, batch_size)
+                await db.commit()
+            if isinstance(result, list):
+                count = len(result)
+                if on_commit is not None:
+                    on_commit(result)
+            else:
+                count = result
+            rows += count
+            batches += 1
+            if count < batch_size:
+                break
+            await asyncio.sleep(pause)
+        return rows, batches
+
+    def _record(self, name: str, rows: int, batches: int, seconds: float) -> None:
+        task = self.tasks[name]
+        task["rows"] += rows
+        task["batches"] += batches
+        task["seconds"] += seconds
+        task["last_rows"] = rows
+        task["last_seconds"] = round(seconds, 3)
+        if rows:
+            logger.info(f"[sweeper] {name}: {rows}행 ({batches}배치, {seconds:.2f}초)")
+
+    async def sweep_photo_cards(self) -> int:
+        started = time.perf_counter()
+        rows, batches = await self._batched(
+            deactivate_expired_photo_cards,
+            on_commit=lambda ids: photo_card_cache.invalidate(*ids),
+        )
+        self._record("photo_cards_deactivated", rows, batches, time.perf_counter() - started)
+        return rows
+
+    async def sweep_sessions(self) -> int:
+        idle_days = self.settings.session_idle_ttl_days
+        if idle_days <= 0:
+            return 0
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            targets = await session_sweep_targets(db)
+        rows = batches = 0
+        for target in targets:
+            count, n = await self._batched(
+                lambda db, limit, target=target: purge_idle_sessions(db, target, idle_days, limit)
+            )
+            rows += count
+            batches += n
+        self._record("sessions_purged", rows, batches, time.perf_counter() - started)
+        return rows
+
+    async def compact_sessions(self) -> int:
+        """sweep_sessions 후 남은 유휴 세션(활성 카드)의 추천 결과 비우기"""
+        idle_days = self.settings.session_idle_ttl_days
+        if idle_days <= 0:
+            return 0
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            targets = await session_sweep_targets(db)
+        rows = batches = 0
+        for target in targets:
+            count, n = await self._batched(
+                lambda db, limit, target=target: compact_idle_sessions(db, target, idle_days, limit)
+            )
+            rows += count
+            batches += n
+        self._record("sessions_compacted", rows, batches, time.perf_counter() - started)
+        return rows
+
+    async def sweep_idempotency_keys(self) -> int:
+        started = time.perf_counter()
+        rows, batches = await self._batched(purge_expired_idempotency_keys)
+        self._record("idempotency_keys_purged", rows, batches, time.perf_counter() - started)
+        return rows
+
+    async def sweep_image_uploads(self) -> int:
+        started = time.perf_counter()
+        rows, batches = await self._batched(purge_expired_image_uploads)
+        self._record("image_uploads_purged", rows, batches, time.perf_counter() - started)
+        return rows
+
+    async def _purge_orphan_images(self, db: AsyncSession, limit: int) -> list[str]:
+        """고아 이미지 행 삭제 + 같은 트랜잭션에 S3 원본/파생본 삭제 대기열 기록"""
+        image_urls = await purge_orphan_review_images(db, limit)
+        if image_urls:
+            await s3_deletion_queue.enqueue(
+                db, image_urls + [v for url in image_urls for v in variant_urls(url)], commit=False
+            )
+        return image_urls
+
+    async def sweep_orphan_review_images(self) -> int:
+        started = time.perf_counter()
+        rows, batches = await self._batched(
+            self._purge_orphan_images,
+            on_commit=lambda urls: s3_deletion_queue.notify() if urls else None,
+        )
+        self._record("orphan_review_images_purged", rows, batches, time.perf_counter() - started)
+        return rows
+
+    async def run_once(self) -> dict:
+        """모든 정리 작업 1회 실행, 작업별 처리 행 수 반환"""
+        result = {
+            "photo_cards_deactivated": await self.sweep_photo_cards(),
+            "sessions_purged": await self.sweep_sessions(),
+            "sessions_compacted": await self.compact_sessions(),
+            "idempotency_keys_purged": await self.sweep_idempotency_keys(),
+            "image_uploads_purged": await self.sweep_image_uploads(),
+            "orphan_review_images_purged": await self.sweep_orphan_review_images(),
+        }
+        self.runs += 1
+        self.last_run = time.strftime("%Y-%m-%dT%H:%M:%S")
+        return result
+
+    def summary(self) -> dict:
+        return {
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "tasks": {
+                name: {**task, "seconds": round(task["seconds"], 3)}
+                for name, task in self.tasks.items()
+            },
+        }
+
+    def prometheus(self) -> str:
+        lines = [f"sweeper_runs_total {self.runs}"]
+        for name, task in self.tasks.items():
+            labels = f'{{task="{name}"}}'
+            lines += [
+                f"sweeper_rows_total{labels} {task['rows']}",
+                f"sweeper_batches_total{labels} {task['batches']}",
+                f"sweeper_duration_seconds_sum{labels} {round(task['seconds'], 6)}",
+                f"sweeper_last_rows{labels} {task['last_rows']}",
+                f"sweeper_last_duration_seconds{labels} {task['last_seconds']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.sweep_interval_seconds)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[sweeper] 정리 오류: {type(e).__name__}: {e}")
+
+    def start(self) -> None:
+        """워커 시작 (서버 시작 시 1회, 첫 정리는 한 주기 뒤)"""
+        if self.settings.sweep_interval_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 싱글톤 인스턴스
+expiry_sweeper = ExpirySweeper()
@@ -0,0 +1,271 @@
+"""
+Idempotency-Key 처리 (모바일 재시도 흡수)
+
+열차 Wi-Fi처럼 응답이 끊기는 환경에서 앱이 POST를 다시 보내도
+같은 Idempotency-Key면 처음 요청의 응답을 그대로 돌려줍니다.
+포토카드가 두 번 만들어져 LLM 추천이 두 번 돌거나, 리뷰 이미지가 다시 업로드되지 않습니다.
+
+- 저장소: idempotency_keys 테이블(TTL idempotency_ttl_hours) + 프로세스 LRU (완료된 응답)
+- 같은 키가 동시에 들어오면 나중 요청은 첫 요청이 끝날 때까지 기다렸다가 그 응답을 받음
+  (같은 프로세스: 이벤트 대기, 다른 프로세스: DB 확인 반복, idempotency_wait_seconds 넘으면 409)
+- 5xx/예외로 끝난 요청은 키를 지워 재시도가 새로 처리되게 함 (4xx는 저장해 재생)
+- 키 범위는 (메서드, 경로, X-Client-Id, 키): X-Client-Id(앱 설치 ID)를 보내면 다른 앱이 같은 키를
+  보내도 서로의 응답을 받지 않음. 접속 IP는 쓰지 않음 (Wi-Fi→LTE 전환/NAT 재바인딩 뒤 재시도도 같은 키)
+- JSON 요청은 본문 SHA-256을 함께 저장하고, 같은 키로 다른 본문이 오면 422
+  (multipart 재전송은 boundary가 달라져 본문이 바이트 단위로 같지 않으므로 비교하지 않음)
+- 저장소(DB)에 문제가 있으면 키 없이 처리 (요청 자체를 막지 않음)
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from config import get_settings
+from database import AsyncSessionLocal
+from crud import (
+    claim_idempotency_key,
+    get_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key,
+)
+
+logger = logging.getLogger("idempotency")
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+CLIENT_ID_HEADER = "X-Client-Id"
+REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENT_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+MAX_KEY_LENGTH = 255
+
+# (상태 코드, Content-Type, 본문)
+StoredResponse = tuple[int, Optional[str], bytes]
+
+
+class _RequestMismatch(Exception):
+    """같은 키로 본문이 다른 요청이 들어옴 (422)"""
+
+
+class IdempotencyStore:
+    """Idempotency-Key → 첫 응답 (DB + 프로세스 LRU), 동시 중복 요청 대기"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        # 키 → (만료 시각, 요청 본문 해시, 응답)
+        self._cache: OrderedDict[str, tuple[float, Optional[str], StoredResponse]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Event] = {}
+        self.stats = {
+            "stored": 0, "replayed": 0, "waited": 0, "conflicts": 0, "mismatches": 0, "released": 0, "errors": 0,
+        }
+
+    @staticmethod
+    def scoped_key(method: str, path: str, client: str, key: str) -> str:
+        return hashlib.sha256(f"{method} {path}\n{client}\n{key}".encode()).hexdigest()
+
+    @staticmethod
+    def client_id(request: Request) -> str:
+        """키 범위를 나누는 클라이언트 식별자 (X-Client-Id, 없으면 키만으로 구분)"""
+        return request.headers.get(CLIENT_ID_HEADER, "")
+
+    @staticmethod
+    async def request_hash(request: Request) -> Optional[str]:
+        """JSON 요청 본문의 SHA-256 (그 외 요청은 None - 비교하지 않음)"""
+        content_type = request.headers.get("content-type", "")
+        if not content_type.startswith("application/json"):
+            return None
+        return hashlib.sha256(await request.body()).hexdigest()
+
+    @staticmethod
+    def _check_request(stored_hash: Optional[str], request_hash: Optional[str]) -> None:
+        if stored_hash is not None and request_hash is not None and stored_hash != request_hash:
+            raise _RequestMismatch()
+
+    async def handle(
+        self,
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """미들웨어 본체: 키가 없거나 대상 메서드가 아니면(또는 /debug) 그대로 통과"""
+        raw_key = request.headers.get(IDEMPOTENCY_HEADER)
+        if (
+            raw_key is None
+            or request.method not in IDEMPOTENT_METHODS
+            or request.url.path.startswith("/debug")
+        ):
+            return await call_next(request)
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            return JSONResponse(
+                status_code=400,
+                content={"detail": f"{IDEMPOTENCY_HEADER}는 1~{MAX_KEY_LENGTH}자여야 합니다"},
+            )
+
+        key = self.scoped_key(request.method, request.url.path, self.client_id(request), raw_key)
+        request_hash = await self.request_hash(request)
+        try:
+            return await self._handle_key(key, request_hash, request, call_next)
+        except _RequestMismatch:
+            self.stats["mismatches"] += 1
+            return JSONResponse(
+                status_code=422,
+                content={"detail": f"같은 {IDEMPOTENCY_HEADER}로 내용이 다른 요청을 보냈습니다. 새 키를 사용하세요"},
+            )
+
+    async def _handle_key(
+        self,
+        key: str,
+        request_hash: Optional[str],
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """범위가 정해진 키로 재생/대기/첫 처리 (본문이 다르면 _RequestMismatch)"""
+        # 같은 프로세스에서 처리 중인 같은 키 → 끝날 때까지 대기
+        event = self._inflight.get(key)
+        if event is not None:
+            self.stats["waited"] += 1
+            try:
+                await asyncio.wait_for(event.wait(), timeout=self.settings.idempotency_wait_seconds)
+            except asyncio.TimeoutError:
+                return self._conflict()
+
+        stored = self._cached(key, request_hash)
+        if stored is not None:
+            return self._replay(stored)
+
+        try:
+            async with AsyncSessionLocal() as db:
+                claimed = await claim_idempotency_key(
+                    db,
+                    key,
+                    ttl_seconds=self.settings.idempotency_ttl_hours * 3600,
+                    lock_seconds=self.settings.idempotency_lock_seconds,
+                    request_hash=request_hash,
+                )
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"[idempotency] 저장소 오류, 키 없이 처리: {type(e).__name__}: {e}")
+            return await call_next(request)
+
+        if not claimed:
+            # 완료된 키(재생) 또는 다른 프로세스가 처리 중인 키(대기)
+            stored = await self._wait_for_other(key, request_hash)
+            if stored is None:
+                return self._conflict()
+            self._remember(key, request_hash, stored)
+            return self._replay(stored)
+
+        event = asyncio.Event()
+        self._inflight[key] = event
+        try:
+            return await self._run_first(key, request_hash, request, call_next)
+        finally:
+            del self._inflight[key]
+            event.set()
+
+    async def _run_first(
+        self,
+        key: str,
+        request_hash: Optional[str],
+        request: Request,
+        call_next: Callable[[Request], Awaitable[Response]],
+    ) -> Response:
+        """선점한 요청 처리 → 응답 저장 (5xx/예외/너무 큰 응답이면 키 해제)"""
+        try:
+            response = await call_next(request)
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        except BaseException:
+            await self._release(key)
+            raise
+
+        content_type = response.headers.get("content-type")
+        if response.status_code >= 500 or len(body) > self.settings.idempotency_max_body_kb * 1024:
+            await self._release(key)
+        else:
+            stored = (response.status_code, content_type, body)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await complete_idempotency_key(db, key, *stored)
+                self._remember(key, request_hash, stored)
+                self.stats["stored"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"[idempotency] 응답 저장 실패: {type(e).__name__}: {e}")
+
+        # 본문을 다 읽었으므로 같은 내용으로 응답 다시 만들기 (쿠키 등 헤더 유지)
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers={k: v for k, v in response.headers.items() if k.lower() != "content-length"},
+        )
+
+    async def _wait_for_other(self, key: str, request_hash: Optional[str]) -> Optional[StoredResponse]:
+        """DB에서 완료될 때까지 확인 반복 (다른 프로세스가 처리 중인 키), 시간 초과면 None"""
+        deadline = time.monotonic() + self.settings.idempotency_wait_seconds
+        waited = False
+        while True:
+            async with AsyncSessionLocal() as db:
+                record = await get_idempotency_key(db, key)
+            if record is not None:
+                self._check_request(record.request_hash, request_hash)
+            if record is not None and record.status == "completed":
+                return record.response_status, record.content_type, record.response_body or b""
+            if time.monotonic() >= deadline:
+                return None
+            if not waited:
+                self.stats["waited"] += 1
+                waited = True
+            await asyncio.sleep(0.2)
+
+    async def _release(self, key: str) -> None:
+        self.stats["released"] += 1
+        try:
+            async with AsyncSessionLocal() as db:
+                await release_idempotency_key(db, key)
+        except Exception as e:
+            # 해제하지 못해도 idempotency_lock_seconds 뒤에 재시도가 이어받음
+            self.stats["errors"] += 1
+            logger.error(f"[idempotency] 키 해제 실패: {type(e).__name__}: {e}")
+
+    def _cached(self, key: str, request_hash: Optional[str]) -> Optional[StoredResponse]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires, stored_hash, stored = entry
+        if expires <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._check_request(stored_hash, request_hash)
+        self._cache.move_to_end(key)
+        return stored
+
+    def _remember(self, key: str, request_hash: Optional[str], stored: StoredResponse) -> None:
+        expires = time.monotonic() + self.settings.idempotency_ttl_hours * 3600
+        self._cache[key] = (expires, request_hash, stored)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.settings.idempotency_cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _replay(self, stored: StoredResponse) -> Response:
+        status_code, content_type, body = stored
+        self.stats["replayed"] += 1
+        return Response(
+            content=body,
+            status_code=status_code,
+            media_type=content_type,
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    def _conflict(self) -> Response:
+        self.stats["conflicts"] += 1
+        return JSONResponse(
+            status_code=409,
+            content={"detail": "같은 Idempotency-Key 요청이 아직 처리 중입니다. 잠시 후 다시 시도하세요"},
+        )
+
+    def summary(self) -> dict:
+        return {**self.stats, "cached": len(self._cache), "inflight": len(self._inflight)}
+
+
+# 싱글톤 인스턴스
+idempotency_store = IdempotencyStore()
@@ -0,0 +1,180 @@
+"""
+이미지 파생본(썸네일/WebP) 생성 서비스
+
+리뷰/포토카드 원본 이미지 옆에 결정적인 키로 리사이즈된 WebP 파생본을 저장합니다.
+    reviews/abc.jpg → reviews/abc_thumb.webp (목록용 썸네일)
+                    → reviews/abc_w1080.webp (상세용 WebP)
+
+이미지 디코딩/리사이즈는 CPU 작업이라 ProcessPoolExecutor에서 실행하고,
+S3 입출력은 S3Service의 스레드 풀을 사용합니다.
+이미 파생본이 있으면 건너뛰므로 같은 작업을 여러 번 실행해도 안전합니다.
+"""
+import asyncio
+import io
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from config import get_settings
+from services.s3_service import S3Service, s3_service
+
+logger = logging.getLogger("image_variants")
+
+# 파생본 이름 → 긴 변 최대 픽셀
+VARIANTS = {
+    "thumb": 320,
+    "w1080": 1080,
+}
+
+WEBP_QUALITY = 80
+
+_heif_registered = False
+
+
+def variant_key(original_key: str, name: str) -> str:
+    """원본 키 → 파생본 키 (확장자 교체)"""
+    stem = original_key.rsplit(".", 1)[0]
+    return f"{stem}_{name}.webp"
+
+
+def variant_url(image_url: str, name: str) -> str:
+    """원본 URL → 파생본 URL (생성 전에는 404일 수 있음 → 클라이언트는 원본으로 폴백)"""
+    base, _, filename = image_url.rpartition("/")
+    return f"{base}/{variant_key(filename, name)}"
+
+
+def variant_urls(image_url: str) -> list[str]:
+    """원본 URL의 모든 파생본 URL (삭제용)"""
+    return [variant_url(image_url, name) for name in VARIANTS]
+
+
+def register_heif_opener() -> None:
+    """HEIC/HEIF(아이폰 기본 형식) 디코딩 등록 - Pillow만으로는 열 수 없음 (프로세스마다 1회)"""
+    global _heif_registered
+    if not _heif_registered:
+        from pillow_heif import register_heif_opener as register
+        register()
+        _heif_registered = True
+
+
+def render_variants(data: bytes, variants: dict[str, int], quality: int = WEBP_QUALITY) -> dict[str, bytes]:
+    """
+    원본 바이트 → {파생본 이름: WebP 바이트}
+
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 둡니다.
+    """
+    from PIL import Image, ImageOps
+
+    register_heif_opener()
+    results = {}
+    with Image.open(io.BytesIO(data)) as original:
+        # JPEG은 필요한 크기 근처까지 축소 디코딩 (DCT 스케일링, 전체 디코딩 대비 수 배 빠름)
+        largest = max(variants.values())
+        original.draft("RGB", (largest, largest))
+        # 휴대폰 사진의 EXIF 회전 반영
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        # 큰 것부터 줄여가며 재사용 (매번 원본에서 리사이즈하지 않음)
+        for name, max_side in sorted(variants.items(), key=lambda v: -v[1]):
+            if max(image.size) > max_side:
+                image = image.copy()
+                image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format="WEBP", quality=quality, method=4)
+            results[name] = buffer.getvalue()
+
+    return results
+
+
+class ImageVariantService:
+    """S3 원본 이미지의 썸네일/WebP 파생본 생성"""
+
+    def __init__(self, storage: S3Service):
+        self.settings = get_settings()
+        self.storage = storage
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.settings.image_worker_processes)
+        return self._pool
+
+    async def _exists(self, key: str) -> bool:
+        try:
+            await self.storage._run_in_executor(
+                self.storage.s3_client.head_object, Bucket=self.storage.bucket_name, Key=key
+            )
+            return True
+        except Exception:
+            return False
+
+    async def generate(self, image_url: str) -> list[str]:
+        """
+        원본 이미지 하나의 파생본 생성 (이미 있으면 건너뜀)
+
+        Returns:
+            새로 생성한 파생본 키 목록
+        """
+        key = self.storage._key_from_url(image_url)
+        targets = {name: variant_key(key, name) for name in VARIANTS}
+
+        exists = await asyncio.gather(*(self._exists(k) for k in targets.values()))
+        missing = {name: VARIANTS[name] for (name, _), ok in zip(targets.items(), exists) if not ok}
+        if not missing:
+            return []
+
+        obj = await self.storage._run_in_executor(
+            self.storage.s3_client.get_object, Bucket=self.storage.bucket_name, Key=key
+        )
+        data = await self.storage._run_in_executor(obj["Body"].read)
+
+        loop = asyncio.get_running_loop()
+        rendered = await loop.run_in_executor(self.pool, render_variants, data, missing)
+
+        await asyncio.gather(*(
+            self.storage._run_in_executor(
+                self.storage.s3_client.put_object,
+                Bucket=self.storage.bucket_name,
+                Key=targets[name],
+                Body=body,
+                ContentType="image/webp",
+                CacheControl="public, max-age=31536000, immutable",
+            )
+            for name, body in rendered.items()
+        ))
+        return [targets[name] for name in rendered]
+
+    async def generate_many(self, image_urls: list[str]) -> None:
+        """여러 이미지 파생본 생성 (실패는 로그만 남김 - 원본은 그대로 사용 가능)"""
+        results = await asyncio.gather(
+            *(self.generate(url) for url in image_urls), return_exceptions=True
+        )
+        for url, result in zip(image_urls, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"[variants] 파생본 생성 실패: {url} ({type(result).__name__}: {result})")
+            elif result:
+                logger.info(f"[variants] 파생본 {len(result)}개 생성: {url}")
+
+    def schedule(self, image_urls: list[str]) -> None:
+        """백그라운드로 파생본 생성 시작 (응답을 기다리게 하지 않음)"""
+        if not image_urls or not self.settings.image_variants_enabled:
+            return
+        task = asyncio.create_task(self.generate_many(list(image_urls)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        """진행 중인 생성 작업 취소 + 프로세스 풀 종료 (서버 종료 시, 빠진 파생본은 404 → 원본 폴백)"""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            await asyncio.to_thread(self._pool.shutdown, wait=True, cancel_futures=True)
+            self._pool = None
+
+
+# 싱글톤 인스턴스
+image_variant_service = ImageVariantService(s3_service)
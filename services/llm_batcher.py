@@ -0,0 +1,96 @@
+"""
+LLM 마이크로배처
+
+짧은 시간(수 ms) 동안 들어온 요청을 모아 한 번의 LLM 호출로 처리하고,
+결과를 각 호출자에게 다시 나눠줍니다.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+from services.llm_metrics import llm_stats
+
+logger = logging.getLogger("llm_client")
+
+
+class MicroBatcher:
+    """요청을 모아서 batch_fn 한 번으로 처리하는 배처"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[Any]], Awaitable[list[Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: int = 10,
+        operation: Optional[str] = None,
+    ):
+        """
+        Args:
+            batch_fn: 입력 리스트를 받아 같은 길이/순서의 결과 리스트를 반환하는 코루틴
+                (결과 자리에 예외 객체를 넣으면 그 호출자에게만 예외로 전달)
+            max_batch_size: 한 배치의 최대 요청 수 (도달 즉시 전송)
+            max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 시간
+            operation: 대기 시간 통계 라벨 (없으면 기록 안 함)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000
+        self.operation = operation
+        self._pending: list[tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """요청 하나를 배치에 추가하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """대기 중인 요청을 배치로 전송"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        # 태스크가 GC되지 않도록 참조 유지
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future, float]]) -> None:
+        """batch_fn 실행 후 결과를 각 Future에 분배"""
+        items = [item for item, _, _ in batch]
+        logger.debug(f"[batch] {len(items)}건 배치 전송")
+
+        if self.operation:
+            now = time.perf_counter()
+            for _, _, enqueued_at in batch:
+                llm_stats.record_queue(self.operation, now - enqueued_at)
+
+        try:
+            results = await self.batch_fn(items)
+            if len(results) != len(batch):
+                raise ValueError(f"배치 결과 수 불일치: {len(results)} != {len(batch)}")
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
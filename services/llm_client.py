@@ -1,14 +1,78 @@
+import asyncio
 import httpx
 import json
 import logging
 import time
-from typing import Optional
+from typing import Any, Optional
 from config import get_settings
+from services import llm_json, prompt_builder
+from services.llm_batcher import MicroBatcher
+from services.llm_json import JSONTask, JSONStreamExtractor
+from services.llm_metrics import llm_stats
 
 # 로거 설정
 logger = logging.getLogger("llm_client")
 logger.setLevel(logging.DEBUG)
 
+HASHTAG_SYSTEM_PROMPT = """당신은 SNS 해시태그 전문가입니다.
+사용자의 여행 설명을 보고 재밌고 트렌디한 해시태그 5개를 생성합니다.
+반드시 JSON 배열 형식으로만 응답하세요.
+예시: ["#강릉여행", "#바다스타그램", "#커피는사랑", "#여기어디게", "#인생뷰"]"""
+
+# 400 응답 본문에 이 단어가 있으면 서버가 구조화 출력을 지원하지 않는 것으로 판단
+STRUCTURED_OUTPUT_ERROR_MARKERS = ("response_format", "guided_json")
+
+DEFAULT_HASHTAGS = ["#여행스타그램", "#여행에미치다", "#여기어디", "#인생샷", "#추억저장"]
+
+SEARCH_PARAMS_SYSTEM_PROMPT = """당신은 여행 검색 전문가입니다.
+사용자의 여행 정보를 분석하여 관광 API 검색에 필요한 파라미터를 추출합니다.
+반드시 JSON 형식으로만 응답하세요.
+예시: {"area": "강원특별자치도", "sigungu": "강릉시", "keyword": "해변", "content_type": "12"}
+
+content_type 코드:
+- 12: 관광지
+- 14: 문화시설
+- 15: 축제공연행사
+- 32: 숙박
+- 39: 음식점"""
+
+TRAVEL_QUERY_SYSTEM_PROMPT = """당신은 여행 질의 분석 전문가입니다.
+사용자의 자연어 여행 요청을 분석하여 검색에 필요한 정보를 추출합니다.
+반드시 JSON 형식으로만 응답하세요.
+
+예시 입력: "강릉 바다 근처 맛집이랑 카페 추천해줘"
+예시 출력: {"destination": "강릉", "area": "강원", "keyword": "바다", "content_types": ["음식점", "카페"]}
+
+예시 입력: "제주도 혼자 여행 갈건데 조용한 곳 추천"
+예시 출력: {"destination": "제주", "area": "제주", "keyword": "조용한", "style": "혼자", "content_types": ["관광지"]}
+
+content_types 가능 값: 관광지, 문화시설, 축제, 숙박, 음식점, 카페, 쇼핑"""
+
+CURATION_SYSTEM_PROMPT = """당신은 전문 여행 큐레이터입니다.
+관광 API 데이터를 분석하여 사용자 맞춤 여행 코스를 설계합니다.
+
+반드시 아래 JSON 형식으로만 응답하세요:
+{
+  "course_title": "코스 제목",
+  "spots": [
+    {
+      "name": "장소명",
+      "time": "오전 10시",
+      "duration": "1시간",
+      "reason": "이 장소를 추천하는 이유",
+      "tip": "방문 팁"
+    }
+  ],
+  "overall_tip": "전체 여행 팁",
+  "summary": "코스 요약 설명"
+}
+
+주의사항:
+- 사용자의 취향(동행, 스타일)을 반영하세요
+- 동선이 효율적이도록 순서를 정하세요
+- 각 장소별 추천 이유와 팁을 구체적으로 작성하세요
+- API 데이터에 없는 장소는 추천하지 마세요"""
+
 
 class LLMClient:
     """DIGITS PC의 EXAONE LLM 서버와 통신"""
@@ -18,82 +82,277 @@ class LLMClient:
         self.base_url = self.settings.llm_base_url
         self.timeout = self.settings.llm_timeout
 
-    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    # 서버가 response_format을 거부하면(400, 본문에 response_format/guided_json)
+    # llm_structured_retry_seconds 동안 스키마 없이 요청하고, 그 뒤 다시 시도 (time.monotonic 기준)
+    _structured_disabled_until = 0.0
+
+    @staticmethod
+    def _rejects_structured_output(error: httpx.HTTPStatusError) -> bool:
+        if error.response.status_code != 400:
+            return False
+        body = error.response.text.lower()
+        return any(marker in body for marker in STRUCTURED_OUTPUT_ERROR_MARKERS)
+
+    def _build_payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        response_format: Optional[dict] = None,
+    ) -> dict:
+        # OpenAI 호환 API 형식 (vLLM, text-generation-inference 등)
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        payload = {
+            "model": "exaone",  # DIGITS 서버 설정에 맞게 수정
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": max_tokens,
+        }
+        if response_format:
+            payload["response_format"] = response_format
+        return payload
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 1024,
+        response_format: Optional[dict] = None,
+        operation: str = "generate",
+    ) -> str:
         """LLM에 텍스트 생성 요청"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            # OpenAI 호환 API 형식 (vLLM, text-generation-inference 등)
-            messages = []
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            messages.append({"role": "user", "content": prompt})
-
-            response = await client.post(
-                f"{self.base_url}/v1/chat/completions",
-                json={
-                    "model": "exaone",  # DIGITS 서버 설정에 맞게 수정
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 1024,
-                }
+        start = time.perf_counter()
+        ttfb = None
+        usage = {}
+        error = True
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/v1/chat/completions",
+                    json=self._build_payload(prompt, system_prompt, max_tokens, response_format),
+                ) as response:
+                    ttfb = time.perf_counter() - start
+                    await response.aread()
+                response.raise_for_status()
+                data = response.json()
+                usage = data.get("usage") or {}
+                content = data["choices"][0]["message"]["content"]
+                error = False
+                return content
+        finally:
+            llm_stats.record_call(
+                operation,
+                latency=time.perf_counter() - start,
+                ttfb=ttfb,
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens"),
+                error=error,
             )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+
+    async def _generate_json_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        task: JSONTask,
+        response_format: Optional[dict],
+        operation: str,
+    ) -> JSONStreamExtractor:
+        """스트리밍으로 생성하다가 최상위 JSON 값이 닫히면 즉시 연결 종료 (남은 생성 중단)"""
+        extractor = JSONStreamExtractor(task.opener)
+        payload = self._build_payload(prompt, system_prompt, task.max_tokens, response_format)
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+        if self.settings.llm_stream_continuous_usage:
+            # 조기 종료해도 마지막으로 받은 chunk의 usage가 남도록 (vLLM 확장, 다른 서버는 400)
+            payload["stream_options"]["continuous_usage_stats"] = True
+
+        start = time.perf_counter()
+        ttfb = None
+        usage = {}
+        chunks = 0  # 조기 종료로 usage를 못 받으면 delta 수로 완성 토큰 근사
+        error = True
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                async with client.stream(
+                    "POST", f"{self.base_url}/v1/chat/completions", json=payload
+                ) as response:
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        try:
+                            chunk = json.loads(data)
+                        except json.JSONDecodeError:
+                            chunk = None
+                        if not isinstance(chunk, dict):
+                            # 프록시가 끊어 보낸 줄 등 형식이 깨진 SSE 이벤트는 건너뜀
+                            logger.warning(f"[{operation}] 잘못된 SSE 이벤트 무시: {data[:100]!r}")
+                            continue
+                        usage = chunk.get("usage") or usage
+                        choices = chunk.get("choices") or [{}]
+                        delta = choices[0].get("delta", {}).get("content")
+                        if not delta:
+                            continue
+                        if ttfb is None:
+                            ttfb = time.perf_counter() - start
+                        chunks += 1
+                        if extractor.feed(delta):
+                            break
+            error = False
+        finally:
+            llm_stats.record_call(
+                operation,
+                latency=time.perf_counter() - start,
+                ttfb=ttfb,
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens", chunks),
+                error=error,
+            )
+
+        return extractor
+
+    async def generate_json(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        task: JSONTask,
+        operation: Optional[str] = None,
+    ) -> Optional[Any]:
+        """
+        작업별 구조화 출력 요청
+
+        - llm_structured_output: response_format(JSON 스키마)으로 가이드 디코딩
+        - llm_stream_json: 스트리밍 중 JSON이 닫히면 생성 중단
+        - max_tokens는 작업별로 제한
+
+        Returns:
+            파싱된 JSON 값 (실패시 None)
+        """
+        operation = operation or task.name
+        use_schema = (
+            self.settings.llm_structured_output
+            and time.monotonic() >= LLMClient._structured_disabled_until
+        )
+        response_format = llm_json.response_format(task) if use_schema else None
+
+        try:
+            if self.settings.llm_stream_json:
+                extractor = await self._generate_json_stream(
+                    prompt, system_prompt, task, response_format, operation
+                )
+                parsed = extractor.result()
+            else:
+                result = await self.generate(
+                    prompt, system_prompt, task.max_tokens, response_format, operation
+                )
+                parsed = llm_json.extract_json(result, task.opener)
+        except httpx.HTTPStatusError as e:
+            if response_format is None or not self._rejects_structured_output(e):
+                raise
+            retry_seconds = self.settings.llm_structured_retry_seconds
+            logger.warning(
+                f"[{task.name}] 서버가 response_format을 지원하지 않음, "
+                f"{retry_seconds}초 동안 스키마 없이 요청"
+            )
+            LLMClient._structured_disabled_until = time.monotonic() + retry_seconds
+            return await self.generate_json(prompt, system_prompt, task, operation)
+
+        llm_stats.record_parse(operation, parsed is not None)
+        return parsed
 
     async def generate_hashtags(self, description: str) -> list[str]:
         """설명을 기반으로 재밌는 해시태그 생성"""
-        system_prompt = """당신은 SNS 해시태그 전문가입니다.
-사용자의 여행 설명을 보고 재밌고 트렌디한 해시태그 5개를 생성합니다.
-반드시 JSON 배열 형식으로만 응답하세요.
-예시: ["#강릉여행", "#바다스타그램", "#커피는사랑", "#여기어디게", "#인생뷰"]"""
+        if self.settings.llm_hashtag_batch_enabled:
+            return await _get_hashtag_batcher().submit(description)
+        return await self._generate_hashtags_single(description)
 
+    async def _generate_hashtags_single(self, description: str) -> list[str]:
+        """요청 1건 = chat completion 1회"""
         prompt = f"다음 여행 설명에 어울리는 해시태그 5개를 만들어주세요:\n\n{description}"
 
-        result = await self.generate(prompt, system_prompt)
-
-        # JSON 파싱 시도
-        try:
-            # 응답에서 JSON 배열 추출
-            start = result.find("[")
-            end = result.rfind("]") + 1
-            if start != -1 and end > start:
-                hashtags = json.loads(result[start:end])
-                return hashtags
-        except json.JSONDecodeError:
-            pass
+        hashtags = await self.generate_json(
+            prompt, HASHTAG_SYSTEM_PROMPT, llm_json.HASHTAGS, "generate_hashtags"
+        )
+        if _valid_hashtags(hashtags):
+            return hashtags
 
         # 파싱 실패시 기본값
-        return ["#여행스타그램", "#여행에미치다", "#여기어디", "#인생샷", "#추억저장"]
+        return list(DEFAULT_HASHTAGS)
 
-    async def extract_search_params(self, session_context: str, destination: str, preferences: dict) -> dict:
-        """자연어 입력을 관광 API 검색 파라미터로 변환"""
-        system_prompt = """당신은 여행 검색 전문가입니다.
-사용자의 여행 정보를 분석하여 관광 API 검색에 필요한 파라미터를 추출합니다.
-반드시 JSON 형식으로만 응답하세요.
-예시: {"area": "강원특별자치도", "sigungu": "강릉시", "keyword": "해변", "content_type": "12"}
-
-content_type 코드:
-- 12: 관광지
-- 14: 문화시설
-- 15: 축제공연행사
-- 32: 숙박
-- 39: 음식점"""
+    async def generate_hashtags_batch(self, descriptions: list[str]) -> list[Any]:
+        """
+        여러 설명을 하나의 프롬프트로 묶어 해시태그 생성
 
-        prompt = f"""이전 대화 컨텍스트: {session_context}
-목적지: {destination}
-선호사항: {preferences}
+        응답은 입력 순서대로의 JSON 배열의 배열이어야 합니다.
+        - LLM 서버 오류(HTTP/연결)는 건별 요청과 같이 그대로 발생
+        - 묶음 응답 형식이 틀리거나 항목이 문자열 목록이 아니면 해당 설명만 건별 요청으로 다시 생성
+        - 건별 재요청이 실패한 자리에는 예외 객체를 담아 반환 (MicroBatcher가 그 호출자에게만 전달)
+        """
+        if len(descriptions) == 1:
+            return [await self._generate_hashtags_single(descriptions[0])]
 
-위 정보를 바탕으로 관광 API 검색 파라미터를 추출해주세요."""
+        numbered = "\n".join(
+            f"{i + 1}. {desc.replace(chr(10), ' ')}" for i, desc in enumerate(descriptions)
+        )
+        prompt = f"""다음 {len(descriptions)}개의 여행 설명 각각에 어울리는 해시태그 5개씩을 만들어주세요.
+설명 순서대로 JSON 배열의 배열로만 응답하세요.
+예시: [["#강릉여행", "#바다스타그램", "#커피는사랑", "#여기어디게", "#인생뷰"], ["#제주살이", ...]]
 
-        result = await self.generate(prompt, system_prompt)
+{numbered}"""
 
         try:
-            start = result.find("{")
-            end = result.rfind("}") + 1
-            if start != -1 and end > start:
-                return json.loads(result[start:end])
+            parsed = await self.generate_json(
+                prompt,
+                HASHTAG_SYSTEM_PROMPT,
+                llm_json.hashtag_batch_task(len(descriptions)),
+                "generate_hashtags_batch",
+            )
         except json.JSONDecodeError:
-            pass
+            parsed = None
+
+        if isinstance(parsed, list) and len(parsed) == len(descriptions):
+            results: list[Any] = [tags if _valid_hashtags(tags) else None for tags in parsed]
+        else:
+            results = [None] * len(descriptions)
+
+        missing = [i for i, tags in enumerate(results) if tags is None]
+        if missing:
+            logger.warning(
+                f"[batch] 해시태그 배치 응답 형식 불일치 ({len(missing)}/{len(descriptions)}건), 건별 요청으로 폴백"
+            )
+            retried = await asyncio.gather(
+                *(self._generate_hashtags_single(descriptions[i]) for i in missing),
+                return_exceptions=True,
+            )
+            for i, tags in zip(missing, retried):
+                results[i] = tags
+        return results
+
+    async def extract_search_params(self, session_context: str, destination: str, preferences: dict) -> dict:
+        """자연어 입력을 관광 API 검색 파라미터로 변환"""
+        lines = []
+        context = prompt_builder.compact_context(session_context)
+        if context:
+            lines.append(f"이전 대화: {context}")
+        lines.append(f"목적지: {destination}")
+        lines.append(f"선호: {prompt_builder.format_preferences(preferences)}")
+        prompt = "\n".join(lines) + "\n\n위 정보로 관광 API 검색 파라미터를 추출해주세요."
+
+        params = await self.generate_json(
+            prompt, SEARCH_PARAMS_SYSTEM_PROMPT, llm_json.SEARCH_PARAMS, "extract_search_params"
+        )
+        if isinstance(params, dict):
+            return params
 
         # 기본값
         return {"area": destination, "keyword": preferences.get("theme", "관광")}
@@ -108,7 +367,7 @@ content_type 코드:
         logger.info(f"[{request_id}] 쿼리: {query}")
         logger.info(f"[{request_id}] area_code: {area_code}, sigungu_code: {sigungu_code}")
 
-        async with httpx.AsyncClient(timeout=600) as client:  # 10분 (MCP + LLM 처리시간 - 느린 응답 대응)
+        async with httpx.AsyncClient(timeout=self.settings.llm_mcp_timeout) as client:
             payload = {"query": query}
             if area_code:
                 payload["area_code"] = area_code
@@ -117,12 +376,19 @@ content_type 코드:
 
             logger.debug(f"[{request_id}] 요청 payload: {json.dumps(payload, ensure_ascii=False)}")
 
+            perf_start = time.perf_counter()
+            ttfb = None
+            usage = {}
+            error = True
             try:
                 logger.info(f"[{request_id}] HTTP POST 요청 전송 중...")
-                response = await client.post(
+                async with client.stream(
+                    "POST",
                     f"{self.base_url}/v1/mcp/query",
                     json=payload
-                )
+                ) as response:
+                    ttfb = time.perf_counter() - perf_start
+                    await response.aread()
 
                 elapsed = time.time() - start_time
                 logger.info(f"[{request_id}] HTTP 응답 수신 (status: {response.status_code}, 소요시간: {elapsed:.2f}초)")
@@ -130,6 +396,9 @@ content_type 코드:
                 response.raise_for_status()
 
                 result = response.json()
+                usage = result.get("usage") or {}
+                error = False
+                llm_stats.record_parse("mcp_query", bool(result.get("success")))
 
                 # 응답 요약 로그
                 logger.info(f"[{request_id}] MCP 응답 파싱 완료:")
@@ -164,99 +433,55 @@ content_type 코드:
                 logger.error(f"[{request_id}] 에러 메시지: {str(e)}")
                 raise
 
+            finally:
+                llm_stats.record_call(
+                    "mcp_query",
+                    latency=time.perf_counter() - perf_start,
+                    ttfb=ttfb,
+                    prompt_tokens=usage.get("prompt_tokens"),
+                    completion_tokens=usage.get("completion_tokens"),
+                    error=error,
+                )
+
     async def parse_travel_query(self, query: str, area_code: Optional[str] = None, sigungu_code: Optional[str] = None) -> dict:
         """자연어 여행 질의를 파라미터로 파싱"""
-        system_prompt = """당신은 여행 질의 분석 전문가입니다.
-사용자의 자연어 여행 요청을 분석하여 검색에 필요한 정보를 추출합니다.
-반드시 JSON 형식으로만 응답하세요.
-
-예시 입력: "강릉 바다 근처 맛집이랑 카페 추천해줘"
-예시 출력: {"destination": "강릉", "area": "강원", "keyword": "바다", "content_types": ["음식점", "카페"]}
-
-예시 입력: "제주도 혼자 여행 갈건데 조용한 곳 추천"
-예시 출력: {"destination": "제주", "area": "제주", "keyword": "조용한", "style": "혼자", "content_types": ["관광지"]}
-
-content_types 가능 값: 관광지, 문화시설, 축제, 숙박, 음식점, 카페, 쇼핑"""
-
-        result = await self.generate(query, system_prompt)
-
-        try:
-            start = result.find("{")
-            end = result.rfind("}") + 1
-            if start != -1 and end > start:
-                return json.loads(result[start:end])
-        except json.JSONDecodeError:
-            pass
+        parsed = await self.generate_json(
+            query, TRAVEL_QUERY_SYSTEM_PROMPT, llm_json.TRAVEL_QUERY, "parse_travel_query"
+        )
+        if isinstance(parsed, dict):
+            return parsed
 
         # 기본값: 쿼리에서 키워드 추출 시도
         return {"keyword": query, "content_types": ["관광지"]}
 
     async def curate_and_explain(self, query: str, api_results: dict, parsed_params: dict) -> dict:
         """API 결과를 큐레이션하고 코스/설명/팁 생성"""
-        system_prompt = """당신은 전문 여행 큐레이터입니다.
-관광 API 데이터를 분석하여 사용자 맞춤 여행 코스를 설계합니다.
-
-반드시 아래 JSON 형식으로만 응답하세요:
-{
-  "course_title": "코스 제목",
-  "spots": [
-    {
-      "name": "장소명",
-      "time": "오전 10시",
-      "duration": "1시간",
-      "reason": "이 장소를 추천하는 이유",
-      "tip": "방문 팁"
-    }
-  ],
-  "overall_tip": "전체 여행 팁",
-  "summary": "코스 요약 설명"
-}
-
-주의사항:
-- 사용자의 취향(동행, 스타일)을 반영하세요
-- 동선이 효율적이도록 순서를 정하세요
-- 각 장소별 추천 이유와 팁을 구체적으로 작성하세요
-- API 데이터에 없는 장소는 추천하지 마세요"""
-
-        # API 결과 요약 (토큰 절약)
-        spots_summary = []
-        for item in api_results.get("keyword_results", [])[:10]:
-            spots_summary.append({
-                "name": item.get("title", ""),
-                "addr": item.get("addr1", ""),
-                "type": item.get("contenttypeid", ""),
-                "overview": item.get("overview", "")[:100] if item.get("overview") else ""
-            })
-
-        for item in api_results.get("related_results", [])[:10]:
-            spots_summary.append({
-                "name": item.get("rlteTatsNm", ""),
-                "category": item.get("rlteCtgrySclsNm", ""),
-                "rank": item.get("rlteRank", "")
-            })
+        keyword = parsed_params.get("keyword", "")
+        content_types = parsed_params.get("content_types") or ["관광지"]
+        if isinstance(content_types, (list, tuple)):
+            content_types = "/".join(str(t) for t in content_types)
+
+        # API 결과는 압축 표로 (토큰 예산 내 관련도 순)
+        spots_table = prompt_builder.build_spots_table(
+            api_results,
+            keyword=keyword,
+            query=query,
+            token_budget=self.settings.llm_curation_spots_token_budget,
+        )
 
         prompt = f"""사용자 요청: {query}
-
-분석된 정보:
-- 목적지: {parsed_params.get('destination', '미정')}
-- 키워드: {parsed_params.get('keyword', '')}
-- 스타일: {parsed_params.get('style', '일반')}
-- 원하는 장소 유형: {parsed_params.get('content_types', ['관광지'])}
+목적지: {parsed_params.get('destination', '미정')} / 키워드: {keyword} / 스타일: {parsed_params.get('style', '일반')} / 장소 유형: {content_types}
 
 API에서 찾은 장소들:
-{json.dumps(spots_summary, ensure_ascii=False, indent=2)}
+{spots_table}
 
 위 데이터를 바탕으로 최적의 여행 코스를 설계해주세요."""
 
-        result = await self.generate(prompt, system_prompt)
-
-        try:
-            start = result.find("{")
-            end = result.rfind("}") + 1
-            if start != -1 and end > start:
-                return json.loads(result[start:end])
-        except json.JSONDecodeError:
-            pass
+        curated = await self.generate_json(
+            prompt, CURATION_SYSTEM_PROMPT, llm_json.CURATION, "curate_and_explain"
+        )
+        if isinstance(curated, dict):
+            return curated
 
         # 파싱 실패시 기본 응답
         return {
@@ -269,3 +494,24 @@ API에서 찾은 장소들:
 
 # 싱글톤 인스턴스
 llm_client = LLMClient()
+
+# 해시태그 마이크로배처 (llm_hashtag_batch_enabled일 때만 생성)
+_hashtag_batcher: Optional[MicroBatcher] = None
+
+
+def _valid_hashtags(tags: Any) -> bool:
+    """비어 있지 않은 문자열 목록인지 (스키마 없이 생성한 응답도 검사)"""
+    return isinstance(tags, list) and bool(tags) and all(isinstance(tag, str) for tag in tags)
+
+
+def _get_hashtag_batcher() -> MicroBatcher:
+    global _hashtag_batcher
+    if _hashtag_batcher is None:
+        settings = get_settings()
+        _hashtag_batcher = MicroBatcher(
+            llm_client.generate_hashtags_batch,
+            max_batch_size=settings.llm_hashtag_batch_max_size,
+            max_wait_ms=settings.llm_hashtag_batch_window_ms,
+            operation="generate_hashtags",
+        )
+    return _hashtag_batcher
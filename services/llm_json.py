@@ -0,0 +1,221 @@
+"""
+LLM 구조화 출력(JSON) 유틸
+
+- 작업별 JSON 스키마 / max_tokens 정의 (vLLM response_format 가이드 디코딩용)
+- 스트리밍 응답을 조각 단위로 받아 최상위 JSON 값이 닫히는 순간을 감지하는 추출기
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class JSONTask:
+    """작업별 구조화 출력 설정"""
+    name: str
+    opener: str          # 최상위 JSON 시작 문자 ("[" 또는 "{")
+    schema: dict
+    max_tokens: int
+
+
+_STRING = {"type": "string"}
+
+HASHTAGS = JSONTask(
+    name="hashtags",
+    opener="[",
+    schema={"type": "array", "items": _STRING, "minItems": 1, "maxItems": 5},
+    max_tokens=128,
+)
+
+SEARCH_PARAMS = JSONTask(
+    name="search_params",
+    opener="{",
+    schema={
+        "type": "object",
+        "properties": {
+            "area": _STRING,
+            "sigungu": _STRING,
+            "keyword": _STRING,
+            "content_type": _STRING,
+        },
+        "required": ["keyword"],
+    },
+    max_tokens=128,
+)
+
+TRAVEL_QUERY = JSONTask(
+    name="travel_query",
+    opener="{",
+    schema={
+        "type": "object",
+        "properties": {
+            "destination": _STRING,
+            "area": _STRING,
+            "keyword": _STRING,
+            "style": _STRING,
+            "content_types": {"type": "array", "items": _STRING},
+        },
+        "required": ["keyword"],
+    },
+    max_tokens=192,
+)
+
+CURATION = JSONTask(
+    name="curation",
+    opener="{",
+    schema={
+        "type": "object",
+        "properties": {
+            "course_title": _STRING,
+            "spots": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": _STRING,
+                        "time": _STRING,
+                        "duration": _STRING,
+                        "reason": _STRING,
+                        "tip": _STRING,
+                    },
+                    "required": ["name"],
+                },
+            },
+            "overall_tip": _STRING,
+            "summary": _STRING,
+        },
+        "required": ["course_title", "spots"],
+    },
+    max_tokens=1024,
+)
+
+
+def hashtag_batch_task(size: int) -> JSONTask:
+    """해시태그 배치용 (배열의 배열, 길이 = 요청 수)"""
+    return JSONTask(
+        name="hashtags_batch",
+        opener="[",
+        schema={
+            "type": "array",
+            "items": HASHTAGS.schema,
+            "minItems": size,
+            "maxItems": size,
+        },
+        max_tokens=HASHTAGS.max_tokens * size,
+    )
+
+
+def response_format(task: JSONTask) -> dict:
+    """OpenAI 호환 response_format (vLLM json_schema 가이드 디코딩)"""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": task.name, "schema": task.schema},
+    }
+
+
+_CLOSERS = {"[": "]", "{": "}"}
+_TRAILING_COMMA = re.compile(r",\s*([\]}])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+
+
+class JSONStreamExtractor:
+    """
+    스트리밍 텍스트에서 최상위 JSON 값 하나를 추출
+
+    feed()로 조각을 넣다가 True가 반환되면 값이 닫힌 것이므로
+    더 이상 생성을 기다릴 필요가 없습니다.
+    앞뒤 설명문, 코드펜스, trailing comma, 잘린 응답(max_tokens 도달)도 허용합니다.
+    """
+
+    def __init__(self, opener: str = "{"):
+        self.opener = opener
+        self._buffer: list[str] = []
+        self._text = ""
+        self._start = -1
+        self._end = -1
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._scanned = 0
+
+    @property
+    def done(self) -> bool:
+        return self._end != -1
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> bool:
+        """텍스트 조각 추가. 최상위 값이 닫혔으면 True"""
+        if self.done:
+            return True
+        self._text += chunk
+
+        i = self._scanned
+        text = self._text
+        while i < len(text):
+            ch = text[i]
+            if self._start == -1:
+                if ch == self.opener:
+                    self._start = i
+                    self._stack.append(ch)
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in _CLOSERS:
+                self._stack.append(ch)
+            elif ch in ("]", "}") and self._stack:
+                self._stack.pop()
+                if not self._stack:
+                    self._end = i + 1
+                    self._scanned = self._end
+                    return True
+            i += 1
+
+        self._scanned = i
+        return False
+
+    def result(self) -> Optional[Any]:
+        """추출된 JSON 값 (실패시 None)"""
+        if self._start == -1:
+            return None
+
+        if self.done:
+            candidate = self._text[self._start:self._end]
+        else:
+            # 잘린 응답: 열린 문자열/괄호를 닫아서 복구 시도
+            candidate = self._text[self._start:]
+            if self._in_string:
+                candidate += '"'
+            candidate = candidate.rstrip().rstrip(",").rstrip(":")
+            candidate += "".join(_CLOSERS[c] for c in reversed(self._stack))
+
+        return _loads_tolerant(candidate)
+
+
+def _loads_tolerant(candidate: str) -> Optional[Any]:
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+
+    repaired = _TRAILING_COMMA.sub(r"\1", candidate.translate(_SMART_QUOTES))
+    try:
+        return json.loads(repaired)
+    except json.JSONDecodeError:
+        return None
+
+
+def extract_json(text: str, opener: str = "{") -> Optional[Any]:
+    """완성된 응답 텍스트에서 JSON 값 추출 (비스트리밍용)"""
+    extractor = JSONStreamExtractor(opener)
+    extractor.feed(text)
+    return extractor.result()
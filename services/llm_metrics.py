@@ -0,0 +1,161 @@
+"""
+LLM 토큰/지연 통계
+
+작업(operation)별로 프롬프트/완성 토큰 수, 대기 시간, 첫 바이트까지 시간(TTFB),
+전체 지연, JSON 파싱 성공 여부를 히스토그램으로 누적합니다.
+/debug/llm-stats 에서 요약(JSON) 또는 Prometheus 텍스트 형식으로 조회합니다.
+"""
+import bisect
+import threading
+from collections import deque
+from typing import Optional
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 + 최근 샘플 기반 분위수"""
+
+    def __init__(self, buckets: tuple, window: int = 1024):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # 마지막 = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self._recent.append(value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 4)
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "avg": round(self.sum / self.count, 4) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class OperationStats:
+    """작업 하나(generate_hashtags 등)의 통계"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.parse_ok = 0
+        self.parse_failed = 0
+        self.histograms = {
+            "prompt_tokens": Histogram(TOKEN_BUCKETS),
+            "completion_tokens": Histogram(TOKEN_BUCKETS),
+            "queue_seconds": Histogram(LATENCY_BUCKETS),
+            "ttfb_seconds": Histogram(LATENCY_BUCKETS),
+            "latency_seconds": Histogram(LATENCY_BUCKETS),
+        }
+
+    def summary(self) -> dict:
+        parsed = self.parse_ok + self.parse_failed
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "parse_ok": self.parse_ok,
+            "parse_failed": self.parse_failed,
+            "parse_success_rate": round(self.parse_ok / parsed, 4) if parsed else None,
+            **{name: h.summary() for name, h in self.histograms.items()},
+        }
+
+
+class LLMStats:
+    """작업별 LLM 통계 저장소 (프로세스 단위)"""
+
+    def __init__(self):
+        self._ops: dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def _op(self, operation: str) -> OperationStats:
+        stats = self._ops.get(operation)
+        if stats is None:
+            stats = self._ops.setdefault(operation, OperationStats())
+        return stats
+
+    def record_call(
+        self,
+        operation: str,
+        latency: float,
+        ttfb: Optional[float] = None,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        error: bool = False,
+    ) -> None:
+        """HTTP 호출 1회 기록"""
+        with self._lock:
+            stats = self._op(operation)
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+            stats.histograms["latency_seconds"].observe(latency)
+            if ttfb is not None:
+                stats.histograms["ttfb_seconds"].observe(ttfb)
+            if prompt_tokens is not None:
+                stats.histograms["prompt_tokens"].observe(prompt_tokens)
+            if completion_tokens is not None:
+                stats.histograms["completion_tokens"].observe(completion_tokens)
+
+    def record_queue(self, operation: str, seconds: float) -> None:
+        """요청이 LLM 서버로 나가기 전 대기 시간 (마이크로배치 대기 등)"""
+        with self._lock:
+            self._op(operation).histograms["queue_seconds"].observe(seconds)
+
+    def record_parse(self, operation: str, ok: bool) -> None:
+        """응답 파싱 성공 여부"""
+        with self._lock:
+            stats = self._op(operation)
+            if ok:
+                stats.parse_ok += 1
+            else:
+                stats.parse_failed += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self._ops.items())}
+
+    def prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        with self._lock:
+            for metric in ("prompt_tokens", "completion_tokens", "queue_seconds", "ttfb_seconds", "latency_seconds"):
+                name = f"llm_{metric}"
+                lines.append(f"# TYPE {name} histogram")
+                for operation, stats in sorted(self._ops.items()):
+                    h = stats.histograms[metric]
+                    cumulative = 0
+                    for bound, n in zip(h.buckets + ("+Inf",), h.bucket_counts):
+                        cumulative += n
+                        lines.append(f'{name}_bucket{{operation="{operation}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{operation="{operation}"}} {h.sum}')
+                    lines.append(f'{name}_count{{operation="{operation}"}} {h.count}')
+
+            for metric in ("calls", "errors", "parse_ok", "parse_failed"):
+                name = f"llm_{metric}_total"
+                lines.append(f"# TYPE {name} counter")
+                for operation, stats in sorted(self._ops.items()):
+                    lines.append(f'{name}{{operation="{operation}"}} {getattr(stats, metric)}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._ops.clear()
+
+
+# 싱글톤 인스턴스
+llm_stats = LLMStats()
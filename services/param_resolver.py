@@ -0,0 +1,160 @@
+"""
+규칙 기반 검색 파라미터 해석기
+
+/recommend 요청의 목적지와 테마가 지역 코드표/테마 사전에 그대로 매칭되면
+LLM(extract_search_params) 없이 관광 API 검색 파라미터를 만듭니다.
+애매한 자유 입력이면 None을 반환하고, 호출자가 LLM 경로로 넘깁니다.
+"""
+import re
+from typing import Optional
+from services.tour_api import TourAPIService
+
+# 정식 명칭 → AREA_CODE_MAP 키 (접미어 제거로 안 되는 경우만)
+AREA_ALIASES = {
+    "충청북": "충북",
+    "충청남": "충남",
+    "경상북": "경북",
+    "경상남": "경남",
+    "전라북": "전북",
+    "전라남": "전남",
+}
+
+# 테마 → (검색 키워드, 관광 API 콘텐츠 유형)
+THEME_KEYWORDS = {
+    "바다": ("바다", "관광지"),
+    "해변": ("해변", "관광지"),
+    "해수욕장": ("해수욕장", "관광지"),
+    "산": ("산", "관광지"),
+    "등산": ("산", "관광지"),
+    "자연": ("자연", "관광지"),
+    "힐링": ("공원", "관광지"),
+    "공원": ("공원", "관광지"),
+    "야경": ("야경", "관광지"),
+    "역사": ("유적", "관광지"),
+    "유적": ("유적", "관광지"),
+    "드라이브": ("드라이브", "관광지"),
+    "온천": ("온천", "관광지"),
+    "카페": ("카페", "음식점"),
+    "맛집": ("맛집", "음식점"),
+    "음식": ("맛집", "음식점"),
+    "먹방": ("맛집", "음식점"),
+    "문화": ("박물관", "문화시설"),
+    "박물관": ("박물관", "문화시설"),
+    "미술관": ("미술관", "문화시설"),
+    "전시": ("전시", "문화시설"),
+    "축제": ("축제", "축제"),
+    "공연": ("공연", "축제"),
+    "숙박": ("숙박", "숙박"),
+    "호텔": ("호텔", "숙박"),
+    "펜션": ("펜션", "숙박"),
+    "쇼핑": ("시장", "쇼핑"),
+    "시장": ("시장", "쇼핑"),
+    "캠핑": ("캠핑", "레포츠"),
+    "레포츠": ("레포츠", "레포츠"),
+    "서핑": ("서핑", "레포츠"),
+}
+
+DEFAULT_KEYWORD = "관광"
+
+# 목적지 문자열에서 무시해도 되는 단어
+_STOPWORDS = {"여행", "근처", "주변", "일대", "쪽", "당일치기"}
+_SUFFIXES = ("특별자치도", "특별자치시", "특별시", "광역시", "도", "시", "군")
+_WORD = re.compile(r"[가-힣A-Za-z0-9]+")
+
+# KorService 지역코드 → AREA_CODE_MAP 키
+_AREA_BY_CODE = {codes[0]: name for name, codes in TourAPIService.AREA_CODE_MAP.items()}
+
+
+def _normalize(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) > len(suffix) + 1:
+            word = word[: -len(suffix)]
+            break
+    return AREA_ALIASES.get(word, word)
+
+
+def resolve_destination(destination: str) -> Optional[tuple[str, Optional[str]]]:
+    """
+    목적지 → (지역명, 시군구명)
+
+    "강릉", "강원도 강릉시", "제주도 여행" 같이 코드표에 정확히 대응되는 경우만 해석합니다.
+    모르는 단어가 있거나 지역/시군구가 서로 맞지 않으면 None.
+    """
+    area: Optional[str] = None
+    sigungu: Optional[str] = None
+
+    words = [w for w in _WORD.findall(destination or "") if w not in _STOPWORDS]
+    if not words or len(words) > 2:
+        return None
+
+    for word in words:
+        name = _normalize(word)
+
+        if name in TourAPIService.AREA_CODE_MAP and area is None:
+            area = name
+            continue
+
+        matches = [
+            (_AREA_BY_CODE[kor_code], key)
+            for kor_code, sigungus in TourAPIService.SIGUNGU_MAP.items()
+            for key in sigungus
+            if key == name
+        ]
+        if len(matches) != 1 or sigungu is not None:
+            return None
+        sigungu_area, sigungu = matches[0]
+        if area is not None and area != sigungu_area:
+            return None
+        area = sigungu_area
+
+    if area is None:
+        return None
+    return area, sigungu
+
+
+def resolve_theme(theme: Optional[str]) -> Optional[tuple[str, Optional[str]]]:
+    """
+    테마 → (키워드, 콘텐츠 유형)
+
+    사전에 있는 테마, 사전 단어 하나만 포함한 테마("바다여행"),
+    공백 없는 짧은 단어는 그대로 키워드로 씁니다. 문장형 입력은 None.
+    """
+    if not theme or not theme.strip():
+        return DEFAULT_KEYWORD, None
+
+    theme = theme.strip()
+    if theme in THEME_KEYWORDS:
+        return THEME_KEYWORDS[theme]
+
+    contained = {THEME_KEYWORDS[key] for key in THEME_KEYWORDS if len(key) > 1 and key in theme}
+    if len(contained) == 1:
+        return contained.pop()
+
+    if not contained and " " not in theme and len(theme) <= 6:
+        return theme, None
+    return None
+
+
+def resolve_search_params(destination: str, preferences: dict) -> Optional[dict]:
+    """
+    /recommend 검색 파라미터를 규칙으로 해석
+
+    Returns:
+        extract_search_params와 같은 형태의 dict, 해석할 수 없으면 None (LLM 경로)
+    """
+    place = resolve_destination(destination)
+    if place is None:
+        return None
+
+    theme = resolve_theme(preferences.get("theme"))
+    if theme is None:
+        return None
+
+    area, sigungu = place
+    keyword, content_type = theme
+    params = {"area": area, "keyword": keyword}
+    if sigungu:
+        params["sigungu"] = sigungu
+    if content_type:
+        params["content_type"] = content_type
+    return params
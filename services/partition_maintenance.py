@@ -0,0 +1,227 @@
+"""
+월별 파티션 관리 / 오래된 파티션 보관 작업
+
+- 서버 시작 시, 이후 partition_maintenance_hours마다 앞으로 몇 달치 파티션 생성
+- 보관 기준(archive_*_after_months)보다 오래된 파티션은
+    1. DETACH PARTITION ... CONCURRENTLY (부모 테이블 쓰기를 막지 않음)
+    2. row_to_json으로 한 줄씩 NDJSON + gzip 파일로 내보내기 (행 수 검증)
+    3. 로컬 디렉터리 또는 S3 archive/ 폴더에 저장
+    4. DROP TABLE
+  내보내기/업로드가 실패하면 파티션을 다시 연결합니다.
+- 활성 테이블에는 최근 파티션만 남아 인덱스/VACUUM 대상이 작게 유지됩니다.
+
+Parquet 대신 NDJSON(gzip)을 쓰는 이유: 추가 의존성 없이 JSONB/tsvector를 손실 없이 담고,
+필요하면 DuckDB 등에서 바로 읽을 수 있습니다.
+리뷰 파티션을 보관해도 review_images 행과 S3 이미지는 남지만(고아 객체로 보지 않음),
+장소 평점 집계(place_rating_stats)에서는 그 리뷰들을 뺍니다 (목록의 total/평균이 조회 가능한 리뷰와 일치).
+세션 파티션을 보관하면 그 세션들의 카드 → 세션 가드(session_by_card) 행은 삭제합니다.
+집계/가드 정리와 DROP은 한 트랜잭션이라 중간에 실패해도 다음 실행에서 두 번 빼지 않습니다.
+보관은 advisory lock으로 한 번에 한 프로세스만 실행합니다.
+"""
+import asyncio
+import gzip
+import logging
+import os
+import time
+from datetime import date
+from typing import Optional
+from sqlalchemy import text
+from config import get_settings
+from database import AsyncSessionLocal, engine
+from crud.partition_crud import (
+    PARTITIONED_TABLES,
+    add_months,
+    attach_partition,
+    detach_partition,
+    drop_table,
+    ensure_partitions,
+    is_partitioned,
+    list_detached_partitions,
+    list_partitions,
+    month_start,
+    release_session_guards,
+    subtract_review_ratings,
+)
+from crud.lock_crud import advisory_unlock, try_advisory_lock
+from services.s3_service import S3Service, s3_service
+
+logger = logging.getLogger("partitions")
+
+# 보관 파일 S3 폴더 (고아 객체 정리 대상인 reviews/와 분리)
+ARCHIVE_PREFIX = "archive"
+
+
+class PartitionMaintenance:
+    """파티션 생성 + 오래된 파티션 보관 (백그라운드 주기 작업)"""
+
+    def __init__(self, storage: S3Service):
+        self.settings = get_settings()
+        self.storage = storage
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"created": 0, "archived": 0, "archived_rows": 0, "failed": 0, "last_run": None}
+
+    def retention_months(self, table: str) -> int:
+        return {
+            "meeting_platform_sessions": self.settings.archive_sessions_after_months,
+            "reviews": self.settings.archive_reviews_after_months,
+        }.get(table, 0)
+
+    async def ensure(self) -> list[str]:
+        """앞으로 partition_months_ahead개월 파티션 생성 (파티션 테이블이 아니면 건너뜀)"""
+        created = []
+        async with AsyncSessionLocal() as db:
+            for table in PARTITIONED_TABLES:
+                if await is_partitioned(db, table):
+                    created += await ensure_partitions(db, table, months_ahead=self.settings.partition_months_ahead)
+            await db.commit()
+        if created:
+            self.stats["created"] += len(created)
+            logger.info(f"[partitions] 생성: {', '.join(created)}")
+        return created
+
+    async def due_partitions(self) -> list[tuple[str, str]]:
+        """보관 대상 [(부모 테이블, 파티션 이름)] - 분리 후 중단된 테이블 포함"""
+        cutoff_base = month_start(date.today())
+        due = []
+        async with AsyncSessionLocal() as db:
+            for table in PARTITIONED_TABLES:
+                months = self.retention_months(table)
+                if months <= 0 or not await is_partitioned(db, table):
+                    continue
+                cutoff = add_months(cutoff_base, -months)
+                due += [(table, name) for name in await list_detached_partitions(db, table)]
+                due += [(table, name) for name, month in await list_partitions(db, table) if month < cutoff]
+        return due
+
+    def _archive_path(self, table: str, name: str) -> str:
+        return os.path.join(self.settings.partition_archive_dir, table, f"{name}.ndjson.gz")
+
+    async def _export(self, name: str, path: str) -> int:
+        """파티션 → NDJSON(gzip), 기록한 행 수 반환 (서버측 커서로 메모리 일정)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = path + ".partial"
+        rows = 0
+        async with engine.connect() as conn:
+            expected = (await conn.execute(text(f'SELECT count(*) FROM "{name}"'))).scalar()
+            result = await conn.stream(text(f'SELECT row_to_json(t)::text FROM "{name}" t'))
+            with gzip.open(partial, "wt", encoding="utf-8") as out:
+                async for (line,) in result:
+                    out.write(line)
+                    out.write("\n")
+                    rows += 1
+        if rows != expected:
+            os.remove(partial)
+            raise RuntimeError(f"{name}: 내보낸 행 수 불일치 ({rows} != {expected})")
+        os.replace(partial, path)
+        return rows
+
+    async def archive_partition(self, table: str, name: str) -> Optional[int]:
+        """
+        파티션 하나 분리 → 내보내기 → 저장 → 삭제, 보관한 행 수 반환
+
+        여러 서버 프로세스가 같은 파티션을 동시에 분리/삭제하지 않도록 advisory lock을 잡고,
+        다른 프로세스가 보관 중이면 건너뛰고 None 반환 (다음 주기에 다시 확인).
+        """
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if not await try_advisory_lock(conn, "partition_archive"):
+                logger.info(f"[partitions] 다른 프로세스가 보관 중, 건너뜀: {name}")
+                return None
+            try:
+                rows = await self._archive_locked(conn, table, name)
+            finally:
+                await advisory_unlock(conn, "partition_archive")
+        if rows is None:
+            return None
+
+        self.stats["archived"] += 1
+        self.stats["archived_rows"] += rows
+        logger.info(f"[partitions] 보관 완료: {name} ({rows}행 → {self.settings.partition_archive_target})")
+        return rows
+
+    async def _archive_locked(self, conn, table: str, name: str) -> Optional[int]:
+        # 대상 목록을 만든 뒤 다른 프로세스가 이미 보관했으면 None
+        detached = name in await list_detached_partitions(conn, table)
+        if not detached and name not in {partition for partition, _ in await list_partitions(conn, table)}:
+            return None
+
+        detached_now = False
+        if not detached:
+            try:
+                await detach_partition(conn, table, name)
+            except Exception as e:
+                if "FINALIZE" not in str(e):
+                    raise
+                # 이전 실행에서 CONCURRENTLY 분리가 중단된 파티션
+                await detach_partition(conn, table, name, finalize=True)
+            detached_now = True
+
+        path = self._archive_path(table, name)
+        try:
+            rows = await self._export(name, path)
+            if self.settings.partition_archive_target == "s3":
+                key = f"{ARCHIVE_PREFIX}/{table}/{os.path.basename(path)}"
+                await self.storage._run_in_executor(self.storage.upload_file, path, key, "application/gzip")
+                os.remove(path)
+        except Exception:
+            if detached_now:
+                await attach_partition(conn, table, name)
+            raise
+
+        async with engine.begin() as tx:
+            if table == "meeting_platform_sessions":
+                await release_session_guards(tx, name)
+            elif table == "reviews":
+                await subtract_review_ratings(tx, name)
+            await drop_table(tx, name)
+        return rows
+
+    async def run_once(self, dry_run: bool = False) -> dict:
+        """파티션 생성 + 보관 대상 처리"""
+        created = [] if dry_run else await self.ensure()
+        due = await self.due_partitions()
+        archived = []
+        if not dry_run:
+            for table, name in due:
+                try:
+                    if await self.archive_partition(table, name) is not None:
+                        archived.append(name)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.error(f"[partitions] 보관 실패 {name}: {type(e).__name__}: {e}")
+        self.stats["last_run"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        return {"created": created, "due": [name for _, name in due], "archived": archived}
+
+    async def _run(self) -> None:
+        interval = self.settings.partition_maintenance_hours * 3600
+        # 재배포가 잦아도 보관이 밀리지 않도록 첫 실행은 시작 직후(부하가 가라앉은 뒤)
+        delay = min(interval, 300)
+        while True:
+            await asyncio.sleep(delay)
+            delay = interval
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[partitions] 작업 오류: {type(e).__name__}: {e}")
+
+    def start(self) -> None:
+        """주기 작업 시작 (서버 시작 시 ensure() 이후 1회)"""
+        if self.settings.partition_maintenance_hours <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 싱글톤 인스턴스
+partition_maintenance = PartitionMaintenance(s3_service)
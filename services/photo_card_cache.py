@@ -0,0 +1,266 @@
+"""
+포토카드 조회/검증 캐시
+
+만남승강장에 들어올 때마다 호출되는 verify와 카드 조회는 거의 바뀌지 않는 데이터라
+프로세스 메모리에서 응답합니다.
+- 활성 카드: TTL(photo_card_cache_ttl_seconds) LRU, 카드 조회 응답은 JSON 바이트로 미리 직렬화
+- 없는/비활성 카드: 짧은 TTL(photo_card_negative_ttl_seconds) 음성 캐시
+- 블룸 필터: 활성 카드 ID 전체로 주기적으로 다시 만들고, 필터에 없는 ID는 DB 없이 404
+  → 임의 ID를 대량으로 보내도 DB까지 가지 않음
+
+필터를 만든 뒤 생성된 카드(다른 워커 프로세스에서 만든 카드 포함)는 필터에 없을 수 있으므로
+UUIDv7 생성 시각이 필터 생성 시각 이후(또는 최근)인 ID는 필터와 음성 캐시를 건너뛰고 DB에서 확인합니다.
+복제본 지연으로 방금 만든 카드가 잠깐 안 보여도 404가 캐시되지 않습니다.
+
+비활성화(만료 정리)는 같은 프로세스면 바로 무효화되고, 다른 프로세스는 TTL 안에 반영됩니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict
+from datetime import timezone
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from database import AsyncSessionLocal
+from crud import (
+    count_active_photo_cards,
+    get_photo_card,
+    stream_active_photo_card_ids,
+    verify_photo_card,
+)
+from models.ids import id_timestamp
+from schemas.models import PhotoCardResponse
+
+logger = logging.getLogger("photo_card")
+
+# 생성 직후(복제 지연 + 시계 차이) ID는 항상 DB에서 확인
+RECENT_ID_SECONDS = 60
+
+
+class BloomFilter:
+    """ID 집합 블룸 필터 (없다고 하면 확실히 없음, 있다고 하면 error_rate 확률로 오답)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class PhotoCardCache:
+    """포토카드 ID → 미리 직렬화한 응답 (활성 카드 LRU + 음성 캐시 + 블룸 필터)"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        # id → (만료 시각, 카드 응답 JSON 또는 None(검증만 된 카드))
+        self._active: OrderedDict[str, tuple[float, Optional[bytes]]] = OrderedDict()
+        # id → 만료 시각
+        self._missing: OrderedDict[str, float] = OrderedDict()
+        self._bloom: Optional[BloomFilter] = None
+        self._bloom_built_at = 0.0  # 필터를 만들기 시작한 시각 (Unix)
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "hits": 0, "negative_hits": 0, "bloom_rejects": 0, "invalid_ids": 0, "misses": 0, "bloom_rebuilds": 0,
+        }
+
+    # === 조회 ===
+
+    async def verify(self, db: AsyncSession, photo_card_id: str) -> bool:
+        """활성 카드인지 (캐시 → DB)"""
+        cached = self._lookup(photo_card_id)
+        if cached is not None:
+            return cached is not False
+        self.stats["misses"] += 1
+        valid = await verify_photo_card(db, photo_card_id)
+        self._store(photo_card_id, None if valid else False)
+        return valid
+
+    async def get_body(self, db: AsyncSession, photo_card_id: str) -> Optional[bytes]:
+        """카드 조회 응답 JSON (없거나 비활성이면 None)"""
+        cached = self._lookup(photo_card_id)
+        if cached is False:
+            return None
+        if isinstance(cached, bytes):
+            return cached
+        self.stats["misses"] += 1
+        photo_card = await get_photo_card(db, photo_card_id)
+        body = serialize(photo_card) if photo_card else False
+        self._store(photo_card_id, body)
+        return body or None
+
+    def _lookup(self, photo_card_id: str):
+        """캐시 결과: bytes(카드 응답) / True(검증만 됨) / False(없음 확실) / None(DB 확인 필요)"""
+        try:
+            uuid.UUID(photo_card_id)
+        except ValueError:
+            # 카드 ID는 모두 UUID 문자열
+            self.stats["invalid_ids"] += 1
+            return False
+        now = time.monotonic()
+        entry = self._active.get(photo_card_id)
+        if entry is not None:
+            if entry[0] > now:
+                self._active.move_to_end(photo_card_id)
+                self.stats["hits"] += 1
+                return entry[1] or True
+            del self._active[photo_card_id]
+
+        if self._is_recent(photo_card_id):
+            return None
+        expires_at = self._missing.get(photo_card_id)
+        if expires_at is not None:
+            if expires_at > now:
+                self.stats["negative_hits"] += 1
+                return False
+            del self._missing[photo_card_id]
+        if self._bloom is not None and photo_card_id not in self._bloom:
+            self.stats["bloom_rejects"] += 1
+            return False
+        return None
+
+    def _is_recent(self, photo_card_id: str) -> bool:
+        """필터 생성 이후(또는 최근)에 만든 UUIDv7 ID인지 - 필터/음성 캐시로 판단하면 안 됨"""
+        created = id_timestamp(photo_card_id)
+        if created is None:
+            return False
+        since = self._bloom_built_at if self._bloom is not None else time.time()
+        return created.replace(tzinfo=timezone.utc).timestamp() >= since - RECENT_ID_SECONDS
+
+    def _store(self, photo_card_id: str, body) -> None:
+        """body: bytes/None(활성) 또는 False(없음)"""
+        now = time.monotonic()
+        limit = self.settings.photo_card_cache_max_entries
+        if body is False:
+            if self._is_recent(photo_card_id):
+                return
+            self._missing[photo_card_id] = now + self.settings.photo_card_negative_ttl_seconds
+            self._missing.move_to_end(photo_card_id)
+            while len(self._missing) > limit:
+                self._missing.popitem(last=False)
+            return
+        self._missing.pop(photo_card_id, None)
+        self._active[photo_card_id] = (now + self.settings.photo_card_cache_ttl_seconds, body)
+        self._active.move_to_end(photo_card_id)
+        while len(self._active) > limit:
+            self._active.popitem(last=False)
+
+    # === 변경 반영 ===
+
+    def add(self, photo_card_id: str, body: Optional[bytes] = None) -> None:
+        """새 카드 등록 (이 프로세스에서 생성한 카드)"""
+        if self._bloom is not None:
+            self._bloom.add(photo_card_id)
+        self._store(photo_card_id, body)
+
+    def invalidate(self, *photo_card_ids: str) -> None:
+        """비활성화/만료된 카드 제거 (블룸 필터에는 다음 재생성까지 남지만 DB에서 걸러짐)"""
+        for photo_card_id in photo_card_ids:
+            self._active.pop(photo_card_id, None)
+
+    def clear(self) -> None:
+        self._active.clear()
+        self._missing.clear()
+
+    # === 블룸 필터 ===
+
+    async def rebuild_bloom(self) -> int:
+        """활성 카드 ID 전체로 필터를 새로 만들어 교체, 담은 ID 수 반환"""
+        started = time.time()
+        async with AsyncSessionLocal() as db:
+            active = await count_active_photo_cards(db)
+            # 다음 재생성까지 늘어날 카드를 감안해 여유 있게
+            bloom = BloomFilter(max(active * 2, 100_000), self.settings.photo_card_bloom_error_rate)
+            async for photo_card_id in await stream_active_photo_card_ids(db):
+                bloom.add(photo_card_id)
+        self._bloom = bloom
+        self._bloom_built_at = started
+        self.stats["bloom_rebuilds"] += 1
+        logger.info(
+            f"[photo-card-cache] 블룸 필터 재생성: {bloom.count}개, "
+            f"{len(bloom.bits) / 1024:.0f}KB, {time.time() - started:.2f}초"
+        )
+        return bloom.count
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild_bloom()
+                delay = self.settings.photo_card_bloom_rebuild_seconds
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 필터가 없으면 캐시에 없는 ID는 DB에서 확인 (정확성은 그대로)
+                logger.error(f"[photo-card-cache] 블룸 필터 생성 실패: {type(e).__name__}: {e}")
+                delay = min(60, self.settings.photo_card_bloom_rebuild_seconds)
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        """블룸 필터 주기 재생성 시작 (서버 시작 시 1회, 첫 생성은 바로 백그라운드에서)"""
+        if not self.settings.photo_card_bloom_enabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> dict:
+        lookups = sum(self.stats[key] for key in ("hits", "negative_hits", "bloom_rejects", "invalid_ids", "misses"))
+        served = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(served / lookups, 4) if lookups else None,
+            "active_entries": len(self._active),
+            "negative_entries": len(self._missing),
+            "bloom_ids": self._bloom.count if self._bloom else None,
+            "bloom_built_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self._bloom_built_at))
+            if self._bloom else None,
+        }
+
+
+def serialize(photo_card) -> bytes:
+    """PhotoCard → 카드 조회 응답 JSON"""
+    return PhotoCardResponse(
+        id=photo_card.id,
+        province=photo_card.province,
+        city=photo_card.city,
+        message=photo_card.message,
+        hashtags=photo_card.hashtags,
+        ai_quote=photo_card.ai_quote,
+        created_at=photo_card.created_at.isoformat(),
+        is_active=photo_card.is_active,
+    ).model_dump_json().encode()
+
+
+def verify_body(photo_card_id: str) -> bytes:
+    return json.dumps({"valid": True, "photo_card_id": photo_card_id}).encode()
+
+
+# 싱글톤 인스턴스
+photo_card_cache = PhotoCardCache()
@@ -0,0 +1,222 @@
+"""
+LLM 프롬프트 빌더
+
+- 관광 API 결과를 들여쓰기 JSON 대신 압축된 표(파이프 구분) 형식으로 인코딩
+- 공통 주소 접두어, 빈 컬럼, 중복 장소 제거
+- 관련도 순으로 정렬 후 토큰 예산을 넘지 않는 만큼만 포함
+- 선호사항/세션 컨텍스트를 짧은 key=value 형식으로 변환
+
+시스템 프롬프트는 llm_client의 모듈 상수로 고정되어 있고(서버 prefix cache 재사용),
+요청마다 달라지는 내용은 모두 여기서 만든 user 메시지에만 들어갑니다.
+"""
+import math
+import re
+from typing import Optional
+
+# KorService2 contenttypeid → 이름
+CONTENT_TYPE_NAMES = {
+    "12": "관광지",
+    "14": "문화시설",
+    "15": "축제",
+    "25": "여행코스",
+    "28": "레포츠",
+    "32": "숙박",
+    "38": "쇼핑",
+    "39": "음식점",
+}
+
+PREFERENCE_LABELS = {
+    "theme": "테마",
+    "with_whom": "동행",
+    "style": "스타일",
+}
+
+_OVERVIEW_CHARS = 100
+_WS = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 토큰 수 근사치
+
+    ASCII는 약 4글자당 1토큰, 한글 등 비ASCII는 글자당 약 0.8토큰으로 계산합니다.
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) * 0.8)
+
+
+def _clean(value) -> str:
+    """표 셀용 문자열 (개행/구분자 제거, 공백 압축)"""
+    if value is None:
+        return ""
+    return _WS.sub(" ", str(value).replace("|", "/")).strip()
+
+
+def _terms(*texts: Optional[str]) -> list[str]:
+    terms = []
+    for text in texts:
+        for word in _WS.split(text or ""):
+            if len(word) >= 2 and word not in terms:
+                terms.append(word)
+    return terms
+
+
+def _score(terms: list[str], name: str, detail: str) -> int:
+    return sum(2 for t in terms if t in name) + sum(1 for t in terms if t in detail)
+
+
+def _common_prefix(addresses: list[str]) -> str:
+    """모든 주소가 공유하는 앞부분 (단어 단위, 최대 시/도 + 시/군/구)"""
+    split = [a.split(" ") for a in addresses if a]
+    if len(split) < 2:
+        return ""
+    prefix: list[str] = []
+    for words in zip(*split):
+        if len(set(words)) != 1:
+            break
+        prefix.append(words[0])
+    return " ".join(prefix[:2])
+
+
+def _rows_within_budget(header: str, rows: list[tuple[int, str]], budget: int) -> list[str]:
+    """(점수, 행) 목록을 점수 순으로 예산 안에서 선택 (예산에 안 들어가는 행은 건너뜀)"""
+    used = estimate_tokens(header)
+    selected = []
+    for _, row in sorted(rows, key=lambda r: -r[0]):
+        cost = estimate_tokens(row) + 1
+        if used + cost > budget:
+            continue
+        selected.append(row)
+        used += cost
+    return selected
+
+
+def build_spots_table(
+    api_results: dict,
+    keyword: str = "",
+    query: str = "",
+    token_budget: int = 1200,
+    max_items: int = 10,
+) -> str:
+    """
+    관광 API 결과를 압축된 표로 인코딩
+
+    Args:
+        api_results: {"keyword_results": [...], "related_results": [...]}
+        keyword, query: 관련도 정렬용 검색어
+        token_budget: 표 전체(두 섹션 합산)의 토큰 예산
+        max_items: 섹션별 최대 후보 수
+
+    Returns:
+        예: "[검색 결과] 주소 공통: 강원특별자치도 강릉시\\n이름|유형|주소|설명\\n경포해변|관광지|창해로 514|..."
+    """
+    terms = _terms(keyword, query)
+    seen: set[str] = set()
+
+    # 1. 키워드 검색 결과
+    keyword_items = []
+    for item in api_results.get("keyword_results", [])[:max_items]:
+        name = _clean(item.get("title"))
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        keyword_items.append({
+            "name": name,
+            "type": CONTENT_TYPE_NAMES.get(str(item.get("contenttypeid", "")), _clean(item.get("contenttypeid"))),
+            "addr": _clean(item.get("addr1")),
+            "overview": _clean(item.get("overview"))[:_OVERVIEW_CHARS],
+        })
+
+    # 2. 연관 관광지 (Tmap 이동 데이터 순위)
+    related_items = []
+    for item in api_results.get("related_results", [])[:max_items]:
+        name = _clean(item.get("rlteTatsNm"))
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        related_items.append({
+            "name": name,
+            "category": _clean(item.get("rlteCtgrySclsNm")),
+            "rank": _clean(item.get("rlteRank")),
+        })
+
+    sections = []
+    remaining = token_budget
+
+    if keyword_items:
+        labels = {"name": "이름", "type": "유형", "addr": "주소", "overview": "설명"}
+        title = "[검색 결과]"
+
+        # 공통 주소 접두어는 헤더로 한 번만
+        prefix = _common_prefix([s["addr"] for s in keyword_items])
+        if prefix:
+            title += f" 주소 공통: {prefix}"
+            for s in keyword_items:
+                if s["addr"].startswith(prefix):
+                    s["addr"] = s["addr"][len(prefix):].strip()
+
+        # 모든 행의 유형이 같으면 헤더로 올림
+        types = {s["type"] for s in keyword_items}
+        columns = ["name", "type", "addr", "overview"]
+        if len(types) == 1 and len(keyword_items) > 1:
+            shared_type = types.pop()
+            if shared_type:
+                title += f" 유형 공통: {shared_type}"
+            columns.remove("type")
+
+        # 모든 행이 비어있는 컬럼 제외
+        columns = [c for c in columns if any(s[c] for s in keyword_items)]
+        header = title + "\n" + "|".join(labels[c] for c in columns)
+
+        rows = [
+            (_score(terms, s["name"], s["overview"]), "|".join(s[c] for c in columns))
+            for s in keyword_items
+        ]
+
+        # 연관 결과가 있으면 예산의 2/3까지만 사용
+        budget = remaining * 2 // 3 if related_items else remaining
+        selected = _rows_within_budget(header, rows, budget)
+        if selected:
+            section = header + "\n" + "\n".join(selected)
+            sections.append(section)
+            remaining -= estimate_tokens(section)
+
+    if related_items:
+        columns = [c for c in ("name", "category", "rank") if any(s[c] for s in related_items)]
+        labels = {"name": "이름", "category": "분류", "rank": "순위"}
+        header = "[연관 장소]\n" + "|".join(labels[c] for c in columns)
+
+        rows = []
+        for s in related_items:
+            row = "|".join(s[c] for c in columns)
+            rank = int(s["rank"]) if s["rank"].isdigit() else 99
+            # 관련도 우선, 같은 점수면 이동 데이터 순위
+            rows.append((_score(terms, s["name"], s["category"]) * 100 - rank, row))
+
+        selected = _rows_within_budget(header, rows, remaining)
+        if selected:
+            sections.append(header + "\n" + "\n".join(selected))
+
+    return "\n\n".join(sections) if sections else "(검색 결과 없음)"
+
+
+def format_preferences(preferences: dict) -> str:
+    """선호사항 dict → "테마=바다, 동행=연인" (빈 값 제외)"""
+    parts = []
+    for key, value in preferences.items():
+        if value in (None, "", [], {}):
+            continue
+        if isinstance(value, (list, tuple)):
+            value = "/".join(str(v) for v in value)
+        parts.append(f"{PREFERENCE_LABELS.get(key, key)}={_clean(value)}")
+    return ", ".join(parts) or "없음"
+
+
+def compact_context(session_context: str, max_chars: int = 300) -> str:
+    """세션 컨텍스트의 리스트 repr/따옴표/중복 공백 제거 후 길이 제한"""
+    text = session_context or ""
+    text = re.sub(r"[\[\]']", "", text)
+    text = _WS.sub(" ", text).strip()
+    if len(text) > max_chars:
+        text = text[:max_chars].rstrip() + "…"
+    return text
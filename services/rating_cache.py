@@ -0,0 +1,71 @@
+"""
+장소 평점 일괄 조회 캐시
+
+추천 결과 리스트(수십 개 장소)에 평점을 붙일 때 장소마다 요청하지 않도록
+place_rating_stats를 한 번에 조회하고, 결과를 짧게(rating_cache_ttl_seconds) 캐시합니다.
+리뷰 생성/수정/삭제 시 해당 장소 항목은 바로 무효화됩니다.
+"""
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from crud import get_place_ratings
+from schemas.models import SpotWithLocation
+
+
+class PlaceRatingCache:
+    """place_id → (평균 별점, 리뷰 수) TTL 캐시"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, tuple[float, int]]] = {}
+
+    async def get_many(
+        self,
+        db: AsyncSession,
+        place_ids: list[str],
+    ) -> dict[str, tuple[float, int]]:
+        """캐시에 없는 장소만 DB에서 한 번에 조회"""
+        now = time.monotonic()
+        ratings: dict[str, tuple[float, int]] = {}
+        missing = []
+        for place_id in dict.fromkeys(place_ids):
+            entry = self._entries.get(place_id)
+            if entry and entry[0] > now:
+                ratings[place_id] = entry[1]
+            else:
+                missing.append(place_id)
+
+        if missing:
+            fetched = await get_place_ratings(db, missing)
+            expires_at = now + self.ttl_seconds
+            for place_id, rating in fetched.items():
+                self._entries[place_id] = (expires_at, rating)
+                ratings[place_id] = rating
+            self._evict(now)
+
+        return ratings
+
+    def invalidate(self, place_id: str) -> None:
+        """리뷰 변경 시 해당 장소 캐시 제거"""
+        self._entries.pop(place_id, None)
+
+    def _evict(self, now: float) -> None:
+        if len(self._entries) > 10000:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+
+
+async def attach_ratings(db: AsyncSession, spots: list[SpotWithLocation]) -> None:
+    """spots의 content_id로 평점을 조회해 average_rating/review_count를 채움"""
+    place_ids = [spot.content_id for spot in spots if spot.content_id]
+    if not place_ids:
+        return
+    ratings = await rating_cache.get_many(db, place_ids)
+    for spot in spots:
+        if spot.content_id in ratings:
+            average, count = ratings[spot.content_id]
+            spot.average_rating = round(average, 1)
+            spot.review_count = count
+
+
+# 싱글톤 인스턴스
+rating_cache = PlaceRatingCache(ttl_seconds=get_settings().rating_cache_ttl_seconds)
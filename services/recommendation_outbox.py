@@ -0,0 +1,186 @@
+"""
+추천 작업 디스패처 (outbox)
+
+포토카드 생성 트랜잭션에 함께 기록된 recommendation_jobs를 가져와 추천을 실행합니다.
+- 요청 처리 프로세스는 커밋 후 notify()로 디스패처를 깨움 → 지연은 기존 create_task와 같음
+- 커밋과 작업 시작 사이에 서버가 죽어도 작업은 테이블에 남아 재시작 후(또는 다른 프로세스가) 처리
+- 임대 시간은 MCP 타임아웃(llm_mcp_timeout) + recommendation_job_lease_margin_seconds,
+  실행 중에는 recommendation_job_heartbeat_seconds마다 연장하고 이 프로세스가 실행 중인 작업은 다시 가져오지 않음
+- 처리 중 죽으면 임대가 끝난 뒤 다시 시도,
+  recommendation_job_max_attempts번 넘으면 세션을 failed로 기록하고 작업 삭제
+- 디스패처 쪽 오류(DB 등)는 last_error에 기록하고 recommendation_job_retry_seconds 뒤 재시도
+- 정상 종료(stop) 시 실행 중이던 작업은 바로 다시 가져갈 수 있게 되돌림 (임대 만료를 기다리지 않음)
+- 일괄 생성에서 묶인 작업은 추천을 한 번 실행하고 결과를 shared_session_ids 세션에 복사
+- 동시에 실행하는 추천 수는 recommendation_max_concurrency로 제한 (LLM 서버 보호)
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+from config import get_settings
+from database import AsyncSessionLocal
+from crud import (
+    claim_recommendation_jobs,
+    complete_recommendation_job,
+    copy_session_result,
+    count_recommendation_jobs,
+    fail_recommendation_job,
+    release_recommendation_jobs,
+    renew_recommendation_jobs,
+    update_session_status,
+)
+from services.recommendation_service import process_recommendation_background
+
+logger = logging.getLogger("recommendation")
+
+
+class RecommendationOutbox:
+    """DB outbox 기반 추천 작업 디스패처"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: dict[asyncio.Task, str] = {}  # 실행 중 작업 → session_id
+        self._next_heartbeat = 0.0
+        self.stats = {"started": 0, "completed": 0, "retried": 0, "abandoned": 0}
+
+    @property
+    def lease_seconds(self) -> int:
+        """작업 임대 시간 (MCP 타임아웃 + 여유)"""
+        return self.settings.llm_mcp_timeout + self.settings.recommendation_job_lease_margin_seconds
+
+    def notify(self) -> None:
+        """디스패처 깨우기 (작업을 기록한 트랜잭션이 커밋된 뒤 호출)"""
+        self._wake.set()
+
+    async def dispatch(self) -> int:
+        """빈 실행 슬롯만큼 작업을 가져와 시작, 시작한 작업 수 반환"""
+        free = self.settings.recommendation_max_concurrency - len(self._running)
+        if free <= 0:
+            return 0
+        async with AsyncSessionLocal() as db:
+            jobs = await claim_recommendation_jobs(
+                db, limit=free, lease_seconds=self.lease_seconds, running=list(self._running.values())
+            )
+        for job in jobs:
+            task = asyncio.create_task(self._process(job))
+            self._running[task] = job["session_id"]
+            task.add_done_callback(self._finished)
+        return len(jobs)
+
+    async def heartbeat(self) -> None:
+        """실행 중인 작업의 임대 연장"""
+        running = list(self._running.values())
+        if not running:
+            return
+        async with AsyncSessionLocal() as db:
+            await renew_recommendation_jobs(db, running, self.lease_seconds)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.pop(task, None)
+        # 슬롯이 비었으니 밀린 작업 확인
+        self._wake.set()
+
+    async def _process(self, job: dict) -> None:
+        try:
+            await self._process_job(job)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.error(f"[recommendation] {job['session_id']}: 작업 오류, 재시도 예정 - {error}")
+            try:
+                async with AsyncSessionLocal() as db:
+                    await fail_recommendation_job(
+                        db, job["session_id"], error, self.settings.recommendation_job_retry_seconds
+                    )
+            except Exception as record_error:
+                # 기록하지 못해도 임대가 끝나면 다시 가져감
+                logger.error(
+                    f"[recommendation] {job['session_id']}: 오류 기록 실패: "
+                    f"{type(record_error).__name__}: {record_error}"
+                )
+
+    async def _process_job(self, job: dict) -> None:
+        session_id = job["session_id"]
+        shared = job.get("shared_session_ids") or []
+        if job["attempts"] > self.settings.recommendation_job_max_attempts:
+            # 이전 시도들이 처리 중 중단됨 (서버 재시작 등)
+            async with AsyncSessionLocal() as db:
+                # 추천은 저장됐고 복사/삭제만 실패했던 작업이면 completed를 덮어쓰지 않음
+                await update_session_status(
+                    db, session_id, "failed", error_message="추천 작업이 반복해서 중단됨", keep_completed=True
+                )
+                await copy_session_result(db, session_id, shared)
+                await complete_recommendation_job(db, session_id)
+            self.stats["abandoned"] += 1
+            logger.error(
+                f"[recommendation] {session_id}: {job['attempts'] - 1}회 중단, 포기 (마지막 오류: {job.get('last_error')})"
+            )
+            return
+
+        if job["attempts"] > 1:
+            self.stats["retried"] += 1
+        self.stats["started"] += 1
+        # 결과(completed/failed)는 세션에 기록됨, 예외도 내부에서 failed로 처리
+        await process_recommendation_background(
+            session_id=session_id,
+            query=job["query"],
+            area_code=job["area_code"],
+            sigungu_code=job["sigungu_code"],
+        )
+        async with AsyncSessionLocal() as db:
+            await copy_session_result(db, session_id, shared)
+            await complete_recommendation_job(db, session_id)
+        self.stats["completed"] += 1
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.settings.recommendation_outbox_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                if time.monotonic() >= self._next_heartbeat:
+                    self._next_heartbeat = time.monotonic() + self.settings.recommendation_job_heartbeat_seconds
+                    await self.heartbeat()
+                await self.dispatch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[recommendation] 디스패처 오류: {type(e).__name__}: {e}")
+
+    def start(self) -> None:
+        """디스패처 시작 (서버 시작 시 1회, 이전 실행에서 남은 작업 바로 처리)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            self._wake.set()
+
+    async def stop(self) -> None:
+        """디스패처 종료 (실행 중이던 작업은 되돌려 다른 프로세스/재시작 후 바로 처리)"""
+        interrupted = list(self._running.values())
+        tasks = [t for t in (self._task, *self._running) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._running.clear()
+        if not interrupted:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await release_recommendation_jobs(db, interrupted, "서버 종료로 중단")
+            logger.info(f"[recommendation] 종료로 중단한 작업 {len(interrupted)}개 되돌림")
+        except Exception as e:
+            # 되돌리지 못해도 임대가 끝나면 다시 처리됨
+            logger.error(f"[recommendation] 중단 작업 되돌리기 실패: {type(e).__name__}: {e}")
+
+    async def summary(self) -> dict:
+        async with AsyncSessionLocal() as db:
+            queued = await count_recommendation_jobs(db)
+        return {**self.stats, "running": len(self._running), **queued}
+
+
+# 싱글톤 인스턴스
+recommendation_outbox = RecommendationOutbox()
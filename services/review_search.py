@@ -0,0 +1,165 @@
+"""
+리뷰 검색 서비스
+
+- postgres: reviews.search_vector(글자 bigram tsvector) GIN 인덱스 검색 (기본)
+- memory: 같은 토큰화를 쓰는 프로세스 내 역색인 (pg 확장/PostgreSQL 없는 테스트용)
+
+memory 백엔드는 서버 시작 시 DB에서 색인을 만들고, 리뷰 생성/수정/삭제 때 라우터가 갱신합니다.
+"""
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from crud import search_reviews, get_reviews_by_ids
+from crud.review_search_crud import text_grams, search_terms
+from models.db_models import Review
+
+# postgres 백엔드의 가중치(A=1.0, D=0.1)와 같은 비율
+NAME_WEIGHT = 1.0
+CONTENT_WEIGHT = 0.1
+
+
+@dataclass
+class _Doc:
+    place_id: str
+    user_id: Optional[str]
+    created_at: datetime
+    term_freq: dict[str, float] = field(default_factory=dict)
+
+
+class InMemoryReviewIndex:
+    """글자 bigram 역색인 (토큰 → 리뷰 ID 집합)"""
+
+    def __init__(self):
+        self._docs: dict[str, _Doc] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, review) -> None:
+        """리뷰 색인 (이미 있으면 교체)"""
+        self.remove(review.id)
+        freq: dict[str, float] = {}
+        for gram in text_grams(review.place_name):
+            freq[gram] = freq.get(gram, 0) + NAME_WEIGHT
+        for gram in text_grams(review.content):
+            freq[gram] = freq.get(gram, 0) + CONTENT_WEIGHT
+
+        self._docs[review.id] = _Doc(review.place_id, review.user_id, review.created_at, freq)
+        for gram in freq:
+            self._postings.setdefault(gram, set()).add(review.id)
+
+    def remove(self, review_id: str) -> None:
+        doc = self._docs.pop(review_id, None)
+        if doc is None:
+            return
+        for gram in doc.term_freq:
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(review_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def _candidates(self, terms: list[str]) -> set[str]:
+        sets = []
+        for term in terms:
+            if len(term) == 1:
+                # 한 글자는 접두어 매칭 (postgres의 'x':* 와 동일)
+                ids = set().union(*(ids for gram, ids in self._postings.items() if gram.startswith(term)))
+            else:
+                ids = self._postings.get(term, set())
+            sets.append(ids)
+        sets.sort(key=len)
+        return set.intersection(*sets) if sets else set()
+
+    def search(
+        self,
+        terms: list[str],
+        place_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[tuple[float, datetime, str]] = None,
+    ) -> list[tuple[str, float]]:
+        """[(리뷰 ID, 점수)] - 점수 → 최신순, search_reviews와 같은 정렬/커서 규칙"""
+        if not terms:
+            return []
+
+        hits = []
+        for review_id in self._candidates(terms):
+            doc = self._docs[review_id]
+            if place_id and doc.place_id != place_id:
+                continue
+            if user_id and doc.user_id != user_id:
+                continue
+            score = sum(
+                math.log1p(sum(f for g, f in doc.term_freq.items() if g.startswith(t)) if len(t) == 1
+                           else doc.term_freq.get(t, 0))
+                for t in terms
+            ) / len(terms)
+            key = (round(score, 6), doc.created_at, review_id)
+            if cursor is not None and key >= cursor:
+                continue
+            hits.append(key)
+
+        hits.sort(reverse=True)
+        return [(review_id, score) for score, _, review_id in hits[:limit]]
+
+
+class ReviewSearchService:
+    """설정된 백엔드로 리뷰 검색"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.index = InMemoryReviewIndex()
+
+    @property
+    def in_memory(self) -> bool:
+        return self.settings.review_search_backend == "memory"
+
+    async def load(self, db: AsyncSession) -> None:
+        """memory 백엔드: 삭제되지 않은 리뷰 전체 색인 (서버 시작 시)"""
+        if not self.in_memory:
+            return
+        result = await db.execute(
+            select(Review.id, Review.place_id, Review.place_name, Review.content, Review.user_id, Review.created_at)
+            .where(Review.is_deleted == False)
+        )
+        for row in result.all():
+            self.index.add(row)
+
+    def index_review(self, review) -> None:
+        """리뷰 생성/수정 후 호출 (postgres 백엔드는 쓰기 시 컬럼이 갱신되므로 무시)"""
+        if self.in_memory:
+            self.index.add(review)
+
+    def remove_review(self, review_id: str) -> None:
+        """리뷰 삭제 후 호출"""
+        if self.in_memory:
+            self.index.remove(review_id)
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        place_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[tuple[float, datetime, str]] = None,
+    ) -> list[tuple[Review, float]]:
+        """검색어 → [(리뷰, 점수)] (관련도 → 최신순)"""
+        terms = search_terms(query)
+        if not self.in_memory:
+            return await search_reviews(db, terms, place_id, user_id, limit, cursor)
+
+        hits = self.index.search(terms, place_id, user_id, limit, cursor)
+        scores = dict(hits)
+        reviews = await get_reviews_by_ids(db, [review_id for review_id, _ in hits])
+        return [(review, scores[review.id]) for review in reviews]
+
+
+# 싱글톤 인스턴스
+review_search_service = ReviewSearchService()
@@ -0,0 +1,194 @@
+"""
+S3 삭제 대기열 워커
+
+삭제할 S3 키는 s3_pending_deletions 테이블에 먼저 기록하고(요청 트랜잭션과 함께 커밋),
+백그라운드 워커가 delete_objects로 최대 1000개씩 묶어서 삭제합니다.
+- 응답 지연이 S3 삭제에 묶이지 않음
+- 실패한 키는 지수 백오프로 재시도, 서버가 재시작돼도 테이블에 남아 있음
+- 주기적으로 버킷의 reviews/ 객체와 review_images를 비교해 고아 객체를 대기열에 추가
+여러 서버 프로세스가 함께 돌아도 대기열 항목은 행 잠금(SKIP LOCKED)으로 나눠 처리하고,
+버킷 전체를 훑는 고아 객체 정리는 advisory lock으로 한 프로세스만 실행합니다.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from database import AsyncSessionLocal, engine
+from crud import (
+    enqueue_s3_deletions,
+    get_due_s3_deletions,
+    remove_s3_deletions,
+    reschedule_s3_deletions,
+    get_referenced_image_urls,
+)
+from crud.lock_crud import advisory_unlock, try_advisory_lock
+from services.s3_service import S3Service, s3_service
+from services.image_variants import VARIANTS, variant_key
+
+logger = logging.getLogger("s3_deletion")
+
+# 고아 객체 정리 대상 폴더
+SWEEP_PREFIXES = ("reviews/",)
+
+
+class S3DeletionQueue:
+    """DB 기반 S3 삭제 대기열 + 백그라운드 워커"""
+
+    def __init__(self, storage: S3Service):
+        self.settings = get_settings()
+        self.storage = storage
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_sweep = 0.0
+        self.stats = {"deleted": 0, "failed": 0, "batches": 0, "orphans_enqueued": 0}
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        image_urls: list[str],
+        commit: bool = True,
+    ) -> None:
+        """
+        삭제할 이미지 URL 기록 후 워커 깨우기
+
+        commit=False면 호출자의 트랜잭션과 함께 커밋됩니다.
+        롤백되면 아무것도 삭제되지 않고, 커밋 후 notify()로 워커를 깨웁니다.
+        """
+        await enqueue_s3_deletions(db, [self.storage._key_from_url(url) for url in image_urls], commit=commit)
+        if commit:
+            self.notify()
+
+    def notify(self) -> None:
+        """워커 깨우기 (다음 주기를 기다리지 않고 바로 처리)"""
+        self._wake.set()
+
+    async def enqueue_urls(self, image_urls: list[str]) -> None:
+        """별도 세션으로 기록 (요청 세션이 실패 상태일 때)"""
+        async with AsyncSessionLocal() as db:
+            await self.enqueue(db, image_urls)
+
+    async def drain(self) -> int:
+        """재시도 시각이 지난 항목을 모두 처리, 삭제된 객체 수 반환"""
+        total = 0
+        batch_size = min(self.settings.s3_delete_batch_size, 1000)
+
+        while True:
+            async with AsyncSessionLocal() as db:
+                items = await get_due_s3_deletions(db, limit=batch_size)
+                if not items:
+                    return total
+
+                keys = [item.s3_key for item in items]
+                deleted, errors = await self.storage._run_in_executor(self.storage.delete_keys, keys)
+
+                # 삭제/재예약을 한 번에 커밋해야 그 전까지 행 잠금이 유지됨
+                await remove_s3_deletions(db, deleted, commit=False)
+                await reschedule_s3_deletions(
+                    db,
+                    errors,
+                    base_delay_seconds=self.settings.s3_delete_interval_seconds,
+                    max_delay_seconds=self.settings.s3_delete_max_backoff_seconds,
+                    commit=False,
+                )
+                await db.commit()
+
+            self.stats["batches"] += 1
+            self.stats["deleted"] += len(deleted)
+            self.stats["failed"] += len(errors)
+            total += len(deleted)
+            if errors:
+                logger.warning(f"[s3-delete] {len(errors)}개 삭제 실패, 재시도 예약 ({next(iter(errors.values()))})")
+            if len(items) < batch_size:
+                return total
+
+    def _list_old_keys(self, prefix: str, before: datetime) -> list[str]:
+        return [key for key, modified in self.storage.list_keys(prefix) if modified < before]
+
+    async def sweep_orphans(self) -> int:
+        """
+        버킷 객체 중 어떤 리뷰도 참조하지 않는 객체를 대기열에 추가
+
+        presigned 업로드 후 아직 finalize 전인 객체를 지우지 않도록
+        s3_orphan_grace_hours보다 오래된 객체만 대상으로 합니다.
+        다른 프로세스가 정리 중이면 건너뛰고 0 반환.
+        """
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if not await try_advisory_lock(conn, "s3_orphan_sweep"):
+                logger.info("[s3-delete] 다른 프로세스가 고아 객체 정리 중, 건너뜀")
+                return 0
+            try:
+                return await self._sweep_orphans_locked()
+            finally:
+                await advisory_unlock(conn, "s3_orphan_sweep")
+
+    async def _sweep_orphans_locked(self) -> int:
+        before = datetime.now(timezone.utc) - timedelta(hours=self.settings.s3_orphan_grace_hours)
+
+        async with AsyncSessionLocal() as db:
+            referenced_urls = await get_referenced_image_urls(db)
+            referenced = set()
+            for url in referenced_urls:
+                key = self.storage._key_from_url(url)
+                referenced.add(key)
+                referenced.update(variant_key(key, name) for name in VARIANTS)
+
+            orphans = []
+            for prefix in SWEEP_PREFIXES:
+                keys = await self.storage._run_in_executor(self._list_old_keys, prefix, before)
+                orphans.extend(key for key in keys if key not in referenced)
+
+            await enqueue_s3_deletions(db, orphans)
+
+        self.stats["orphans_enqueued"] += len(orphans)
+        if orphans:
+            logger.info(f"[s3-delete] 고아 객체 {len(orphans)}개 대기열 추가")
+            self._wake.set()
+        return len(orphans)
+
+    def _sweep_due(self) -> bool:
+        hours = self.settings.s3_orphan_sweep_hours
+        return hours > 0 and time.monotonic() - self._last_sweep >= hours * 3600
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.settings.s3_delete_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+            try:
+                await self.drain()
+                if self._sweep_due():
+                    self._last_sweep = time.monotonic()
+                    await self.sweep_orphans()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[s3-delete] 워커 오류: {type(e).__name__}: {e}")
+
+    def start(self) -> None:
+        """워커 시작 (서버 시작 시 1회)"""
+        if self._task is None or self._task.done():
+            # 재시작 직후 첫 정리는 한 주기 뒤에
+            self._last_sweep = time.monotonic()
+            self._task = asyncio.create_task(self._run())
+            self._wake.set()  # 이전 실행에서 남은 대기열 바로 처리
+
+    async def stop(self) -> None:
+        """워커 종료 (남은 항목은 테이블에 유지 → 다음 시작 때 처리)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# 싱글톤 인스턴스
+s3_deletion_queue = S3DeletionQueue(s3_service)
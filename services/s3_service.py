@@ -2,14 +2,100 @@
 S3 이미지 업로드 서비스
 
 리뷰 이미지를 AWS S3에 업로드하고 URL을 반환합니다.
+boto3 호출은 전용 스레드 풀에서 실행되어 이벤트 루프를 막지 않고,
+업로드 파일은 조각 단위로 읽어 멀티파트 파트로 바로 전송합니다.
 """
+import asyncio
 import boto3
+import functools
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from fastapi import UploadFile
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from config import get_settings
 
+MB = 1024 * 1024
+
+# S3 멀티파트 업로드의 최소 파트 크기 (마지막 파트 제외)
+MIN_PART_SIZE = 5 * MB
+
+
+class ImageValidationError(Exception):
+    """업로드 이미지 검증 실패 (라우터에서 4xx로 변환)"""
+
+
+class ImageTooLargeError(ImageValidationError):
+    """파일/요청 크기 제한 초과"""
+
+
+class UnsupportedImageError(ImageValidationError):
+    """이미지 형식이 아님 (매직 바이트 기준)"""
+
+
+class ImageNotFoundError(ImageValidationError):
+    """presigned 업로드 후 S3에 객체가 없음"""
+
+
+# Content-Type → 확장자 (presigned 업로드 허용 형식)
+IMAGE_CONTENT_TYPES = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/heic": "heic",
+}
+
+
+def sniff_image_type(head: bytes) -> Optional[tuple[str, str]]:
+    """
+    파일 앞부분의 매직 바이트로 이미지 형식 판별
+
+    Returns:
+        (확장자, Content-Type) 또는 None
+    """
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg", "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png", "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif", "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp", "image/webp"
+    # HEIC/HEIF (iPhone 기본 포맷): ....ftyp + brand
+    if head[4:8] == b"ftyp" and head[8:12] in (b"heic", b"heix", b"mif1", b"msf1", b"heif"):
+        return "heic", "image/heic"
+    return None
+
+
+class _ByteCounter:
+    """파일별 / 요청 전체 업로드 바이트 제한"""
+
+    def __init__(self, file_limit: int, request_budget: Optional["_RequestByteBudget"] = None):
+        self.file_limit = file_limit
+        self.request_budget = request_budget
+        self.total = 0
+
+    def add(self, n: int) -> None:
+        self.total += n
+        if self.total > self.file_limit:
+            raise ImageTooLargeError(f"이미지 크기는 {self.file_limit // MB}MB 이하여야 합니다")
+        if self.request_budget is not None:
+            self.request_budget.consume(n)
+
+
+class _RequestByteBudget:
+    """요청 하나의 전체 업로드 바이트 예산 (동시 업로드가 공유)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+
+    def consume(self, n: int) -> None:
+        self.used += n
+        if self.used > self.limit:
+            raise ImageTooLargeError(f"이미지 전체 크기는 {self.limit // MB}MB 이하여야 합니다")
+
 
 class S3Service:
     """AWS S3 이미지 업로드 서비스"""
@@ -21,95 +107,273 @@ class S3Service:
             aws_access_key_id=self.settings.aws_access_key_id,
             aws_secret_access_key=self.settings.aws_secret_access_key,
             region_name=self.settings.aws_region,
+            endpoint_url=self.settings.s3_endpoint_url or None,
         )
         self.bucket_name = self.settings.s3_bucket_name
         self.region = self.settings.aws_region
 
+        # boto3 client는 thread-safe → 전송은 전용 풀에서
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.settings.s3_max_workers,
+            thread_name_prefix="s3",
+        )
+        # 업로드는 이 크기 단위로 읽어서 그대로 멀티파트 파트로 전송
+        self.chunk_size = max(MIN_PART_SIZE, self.settings.s3_multipart_chunk_mb * MB)
+
+    def _object_url(self, s3_key: str) -> str:
+        """S3 키 → 공개 URL"""
+        if self.settings.s3_endpoint_url:
+            return f"{self.settings.s3_endpoint_url.rstrip('/')}/{self.bucket_name}/{s3_key}"
+        return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
+
+    def _key_from_url(self, image_url: str) -> str:
+        """공개 URL → S3 키"""
+        if self.settings.s3_endpoint_url:
+            return image_url.split(f"/{self.bucket_name}/", 1)[-1]
+        # https://bucket.s3.region.amazonaws.com/folder/filename.jpg
+        return image_url.split(f"{self.bucket_name}.s3.{self.region}.amazonaws.com/")[-1]
+
+    async def _run_in_executor(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
     async def upload_image(
         self,
         file: UploadFile,
         folder: str = "reviews",
-        custom_filename: Optional[str] = None
+        custom_filename: Optional[str] = None,
+        request_budget: Optional[_RequestByteBudget] = None,
     ) -> str:
         """
-        이미지를 S3에 업로드하고 URL 반환
+        이미지를 S3에 스트리밍 업로드하고 URL 반환
+
+        파일을 chunk_size 단위로 읽어 바로 멀티파트 파트로 보내므로
+        이미지 크기와 관계없이 요청당 메모리 사용량이 일정합니다.
+        한 조각에 다 들어가는 작은 파일은 put_object 한 번으로 보냅니다.
 
         Args:
             file: FastAPI UploadFile 객체
             folder: S3 폴더 경로 (기본: reviews)
             custom_filename: 커스텀 파일명 (없으면 UUID 생성)
+            request_budget: 요청 전체 바이트 예산 (upload_images에서 공유)
 
         Returns:
             S3 이미지 URL
+
+        Raises:
+            ImageTooLargeError: 파일/요청 크기 제한 초과
+            UnsupportedImageError: 이미지 형식이 아님
         """
-        # 파일 확장자 추출
-        original_filename = file.filename or "image.jpg"
-        extension = original_filename.rsplit(".", 1)[-1].lower()
-        if extension not in ["jpg", "jpeg", "png", "gif", "webp"]:
-            extension = "jpg"
-
-        # 파일명 생성
-        if custom_filename:
-            filename = f"{custom_filename}.{extension}"
-        else:
-            filename = f"{uuid.uuid4()}.{extension}"
-
-        # S3 키 (경로)
-        s3_key = f"{folder}/{filename}"
-
-        # Content-Type 설정
-        content_type_map = {
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "png": "image/png",
-            "gif": "image/gif",
-            "webp": "image/webp",
-        }
-        content_type = content_type_map.get(extension, "image/jpeg")
+        counter = _ByteCounter(self.settings.upload_max_file_mb * MB, request_budget)
 
+        # 크기를 미리 알면 전송 전에 거절
+        if file.size is not None and file.size > counter.file_limit:
+            raise ImageTooLargeError(f"이미지 크기는 {counter.file_limit // MB}MB 이하여야 합니다")
+
+        await file.seek(0)
         try:
-            # 파일 읽기
-            contents = await file.read()
+            first = await file.read(self.chunk_size)
 
-            # S3 업로드
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=s3_key,
-                Body=contents,
-                ContentType=content_type,
-            )
+            # 확장자가 아니라 매직 바이트로 형식 판별
+            image_type = sniff_image_type(first)
+            if image_type is None:
+                raise UnsupportedImageError(f"지원하지 않는 이미지 형식입니다: {file.filename}")
+            extension, content_type = image_type
 
-            # URL 생성
-            url = f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
-            return url
+            # 파일명 생성
+            if custom_filename:
+                filename = f"{custom_filename}.{extension}"
+            else:
+                filename = f"{uuid.uuid4()}.{extension}"
 
-        except ClientError as e:
+            # S3 키 (경로)
+            s3_key = f"{folder}/{filename}"
+
+            counter.add(len(first))
+            following = await file.read(self.chunk_size)
+            counter.add(len(following))
+
+            if not following:
+                await self._run_in_executor(
+                    self.s3_client.put_object,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    Body=first,
+                    ContentType=content_type,
+                )
+            else:
+                await self._multipart_upload(file, s3_key, content_type, first, following, counter)
+
+            return self._object_url(s3_key)
+
+        except (ClientError, BotoCoreError) as e:
             print(f"[S3] Upload error: {e}")
             raise Exception(f"S3 업로드 실패: {str(e)}")
         finally:
             # 파일 포인터 리셋
             await file.seek(0)
 
+    async def _multipart_upload(
+        self,
+        file: UploadFile,
+        s3_key: str,
+        content_type: str,
+        first: bytes,
+        following: bytes,
+        counter: _ByteCounter,
+    ) -> None:
+        """이미 읽은 두 조각 + 나머지를 파트 단위로 전송 (실패시 abort)"""
+        upload = await self._run_in_executor(
+            self.s3_client.create_multipart_upload,
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            ContentType=content_type,
+        )
+        upload_id = upload["UploadId"]
+        parts = []
+
+        try:
+            chunk, part_number = first, 1
+            while chunk:
+                response = await self._run_in_executor(
+                    self.s3_client.upload_part,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
+                )
+                parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+                chunk, part_number = following, part_number + 1
+                if following:
+                    following = await file.read(self.chunk_size)
+                    counter.add(len(following))
+
+            await self._run_in_executor(
+                self.s3_client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            # abort 실패가 원래 오류를 가리지 않도록 기록만 하고 원래 예외를 다시 발생
+            try:
+                await self._run_in_executor(
+                    self.s3_client.abort_multipart_upload,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                )
+            except Exception as e:
+                print(f"[S3] Multipart abort error: {s3_key} ({upload_id}): {e}")
+            raise
+
     async def upload_images(
         self,
         files: list[UploadFile],
         folder: str = "reviews"
     ) -> list[str]:
         """
-        여러 이미지를 S3에 업로드
+        여러 이미지를 S3에 동시 업로드
+
+        요청당 동시 업로드 수는 s3_upload_concurrency로, 전체 바이트는
+        upload_max_request_mb로 제한합니다.
+        하나라도 실패하면 이미 올라간 이미지는 삭제하고 예외를 다시 발생시킵니다.
 
         Args:
             files: UploadFile 리스트
             folder: S3 폴더 경로
 
         Returns:
-            S3 이미지 URL 리스트
+            S3 이미지 URL 리스트 (입력 순서 유지)
+        """
+        semaphore = asyncio.Semaphore(self.settings.s3_upload_concurrency)
+        budget = _RequestByteBudget(self.settings.upload_max_request_mb * MB)
+
+        async def _upload(file: UploadFile) -> str:
+            async with semaphore:
+                return await self.upload_image(file, folder, request_budget=budget)
+
+        results = await asyncio.gather(*(_upload(f) for f in files), return_exceptions=True)
+
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            uploaded = [r for r in results if isinstance(r, str)]
+            if uploaded:
+                await self._run_in_executor(self.delete_images, uploaded)
+            # 검증 오류를 우선 전달 (4xx)
+            validation = [e for e in errors if isinstance(e, ImageValidationError)]
+            raise (validation or errors)[0]
+
+        return list(results)
+
+    def create_presigned_upload(self, content_type: str, folder: str = "reviews") -> dict:
+        """
+        클라이언트가 S3로 직접 올릴 수 있는 presigned POST 발급
+
+        서명은 로컬 계산이라 S3 왕복이 없습니다.
+        정책(policy)에 Content-Type과 content-length-range(1B ~ upload_max_file_mb)를 넣어
+        형식/크기 위반 업로드는 S3가 거절합니다.
+        클라이언트는 반환된 fields를 파일보다 먼저 넣어 upload_url로 multipart POST 해야 합니다.
+
+        Returns:
+            {"key", "upload_url", "image_url", "fields", "expires_in"}
         """
-        urls = []
-        for file in files:
-            url = await self.upload_image(file, folder)
-            urls.append(url)
-        return urls
+        extension = IMAGE_CONTENT_TYPES.get(content_type)
+        if extension is None:
+            raise UnsupportedImageError(f"지원하지 않는 이미지 형식입니다: {content_type}")
+
+        s3_key = f"{folder}/{uuid.uuid4()}.{extension}"
+        expires_in = self.settings.s3_presign_expires_seconds
+        presigned = self.s3_client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=s3_key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, self.settings.upload_max_file_mb * MB],
+            ],
+            ExpiresIn=expires_in,
+        )
+        return {
+            "key": s3_key,
+            "upload_url": presigned["url"],
+            "image_url": self._object_url(s3_key),
+            "fields": presigned["fields"],
+            "expires_in": expires_in,
+        }
+
+    async def verify_uploaded_images(self, keys: list[str], folder: str = "reviews") -> list[str]:
+        """
+        presigned로 올라온 객체가 있는지 HEAD로 확인하고 URL 반환
+
+        크기/형식은 업로드 정책이 이미 강제하므로 존재만 확인합니다.
+        키 발급 대상(리뷰) 확인은 호출자가 발급 기록으로 합니다 (attach_uploaded_images).
+
+        Raises:
+            ImageNotFoundError
+        """
+        for key in keys:
+            if not key.startswith(f"{folder}/") or ".." in key:
+                raise ImageNotFoundError(f"허용되지 않은 이미지 키입니다: {key}")
+
+        async def _exists(key: str) -> bool:
+            try:
+                await self._run_in_executor(self.s3_client.head_object, Bucket=self.bucket_name, Key=key)
+                return True
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                    return False
+                raise
+
+        found = await asyncio.gather(*(_exists(k) for k in keys))
+        for key, exists in zip(keys, found):
+            if not exists:
+                raise ImageNotFoundError(f"업로드된 이미지를 찾을 수 없습니다: {key}")
+
+        return [self._object_url(k) for k in keys]
 
     def delete_image(self, image_url: str) -> bool:
         """
@@ -123,8 +387,7 @@ class S3Service:
         """
         try:
             # URL에서 S3 키 추출
-            # https://bucket.s3.region.amazonaws.com/folder/filename.jpg
-            s3_key = image_url.split(f"{self.bucket_name}.s3.{self.region}.amazonaws.com/")[-1]
+            s3_key = self._key_from_url(image_url)
 
             self.s3_client.delete_object(
                 Bucket=self.bucket_name,
@@ -136,9 +399,38 @@ class S3Service:
             print(f"[S3] Delete error: {e}")
             return False
 
+    def delete_keys(self, s3_keys: list[str]) -> tuple[list[str], dict[str, str]]:
+        """
+        S3 객체 일괄 삭제 (delete_objects, 요청당 최대 1000개)
+
+        Returns:
+            (삭제된 키 목록, {실패한 키: 에러 메시지})
+        """
+        deleted: list[str] = []
+        errors: dict[str, str] = {}
+        batch_size = min(self.settings.s3_delete_batch_size, 1000)
+
+        for start in range(0, len(s3_keys), batch_size):
+            batch = s3_keys[start:start + batch_size]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except (BotoCoreError, ClientError) as e:
+                errors.update({key: str(e) for key in batch})
+                continue
+
+            # Quiet 모드: 실패한 키만 Errors로 돌아옴
+            failed = {err["Key"]: f"{err.get('Code')}: {err.get('Message')}" for err in response.get("Errors", [])}
+            errors.update(failed)
+            deleted.extend(key for key in batch if key not in failed)
+
+        return deleted, errors
+
     def delete_images(self, image_urls: list[str]) -> int:
         """
-        여러 이미지 삭제
+        여러 이미지 삭제 (delete_objects 일괄 요청)
 
         Args:
             image_urls: S3 이미지 URL 리스트
@@ -146,11 +438,26 @@ class S3Service:
         Returns:
             삭제된 이미지 수
         """
-        deleted_count = 0
-        for url in image_urls:
-            if self.delete_image(url):
-                deleted_count += 1
-        return deleted_count
+        deleted, errors = self.delete_keys([self._key_from_url(url) for url in image_urls])
+        if errors:
+            print(f"[S3] Delete error: {len(errors)} objects ({next(iter(errors.values()))})")
+        return len(deleted)
+
+    def upload_file(self, path: str, s3_key: str, content_type: str = "application/octet-stream") -> None:
+        """로컬 파일 업로드 (파티션 보관 파일 등, 큰 파일은 boto3가 멀티파트로 전송)"""
+        self.s3_client.upload_file(path, self.bucket_name, s3_key, ExtraArgs={"ContentType": content_type})
+
+    def list_keys(self, prefix: str):
+        """
+        prefix 아래 객체 순회 (고아 객체 정리용)
+
+        Yields:
+            (S3 키, LastModified)
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"], obj["LastModified"]
 
 
 # 싱글톤 인스턴스
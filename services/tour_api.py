@@ -76,6 +76,17 @@ class TourAPIService:
                 return codes
         return None, None
 
+    def _find_content_type_id(self, content_type: Optional[str]) -> Optional[str]:
+        """콘텐츠 유형 이름("관광지") 또는 코드("12") → contentTypeId"""
+        if not content_type:
+            return None
+        content_type = str(content_type)  # LLM이 숫자로 줄 때
+        if content_type in self.CONTENT_TYPES:
+            return self.CONTENT_TYPES[content_type]
+        if content_type in self.CONTENT_TYPES.values():
+            return content_type
+        return None
+
     async def search_keyword(
         self,
         keyword: str,
@@ -103,8 +114,9 @@ class TourAPIService:
                     if sigungu_kor:
                         params["sigunguCode"] = sigungu_kor
 
-        if content_type and content_type in self.CONTENT_TYPES:
-            params["contentTypeId"] = self.CONTENT_TYPES[content_type]
+        content_type_id = self._find_content_type_id(content_type)
+        if content_type_id:
+            params["contentTypeId"] = content_type_id
 
         async with httpx.AsyncClient(timeout=30) as client:
             response = await client.get(
@@ -183,9 +195,10 @@ class TourAPIService:
         keyword: str,
         area: Optional[str] = None,
         sigungu: Optional[str] = None,
+        content_type: Optional[str] = None,
     ) -> dict:
-        """두 API 결과 통합"""
-        keyword_results = await self.search_keyword(keyword, area, sigungu)
+        """두 API 결과 통합 (content_type은 키워드 검색에만 적용, 연관 관광지 API는 유형 필터 없음)"""
+        keyword_results = await self.search_keyword(keyword, area, sigungu, content_type)
         related_results = await self.search_related(keyword, area, sigungu)
 
         return {
@@ -0,0 +1,24 @@
+"""
+테스트 공통 설정
+
+config.Settings의 필수 값(외부 API 주소 등)은 테스트에서 쓰지 않으므로 기본값만 채웁니다.
+DB가 필요한 테스트는 DATABASE_URL이 있을 때만 실행됩니다 (tests/test_query_plans.py 등).
+"""
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("TOUR_API_KEY", "test")
+os.environ.setdefault("KORSERVICE_URL", "http://localhost")
+os.environ.setdefault("TARRLTE_URL", "http://localhost")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
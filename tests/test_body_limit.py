@@ -0,0 +1,69 @@
+"""
+요청 본문 크기 제한 미들웨어 (services/body_limit.py)
+"""
+import httpx
+import pytest
+from fastapi import FastAPI, Request, UploadFile
+
+from services.body_limit import BodySizeLimitMiddleware
+
+LIMIT = 1024
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.state.calls = 0
+
+    # main.py처럼 BaseHTTPMiddleware 미들웨어를 거쳐도 413으로 바뀌는지
+    @app.middleware("http")
+    async def passthrough(request: Request, call_next):
+        return await call_next(request)
+
+    @app.post("/upload")
+    async def upload(image: UploadFile):
+        app.state.calls += 1
+        return {"size": len(await image.read())}
+
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=LIMIT)
+    return app
+
+
+@pytest.fixture
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.anyio
+async def test_small_body_passes(client):
+    response = await client.post("/upload", files={"image": ("a.jpg", b"x" * 100)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+@pytest.mark.anyio
+async def test_content_length_rejected_before_handler(client, app):
+    response = await client.post("/upload", files={"image": ("a.jpg", b"x" * (LIMIT * 2))})
+    assert response.status_code == 413
+    assert app.state.calls == 0
+
+
+@pytest.mark.anyio
+async def test_streamed_body_without_content_length(client, app):
+    body = (
+        b"--b\r\nContent-Disposition: form-data; name=\"image\"; filename=\"a.jpg\"\r\n\r\n"
+        + b"x" * (LIMIT * 4) + b"\r\n--b--\r\n"
+    )
+
+    async def chunks():
+        for start in range(0, len(body), 512):
+            yield body[start:start + 512]
+
+    response = await client.post(
+        "/upload", content=chunks(), headers={"content-type": "multipart/form-data; boundary=b"}
+    )
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+    assert app.state.calls == 0
@@ -0,0 +1,91 @@
+"""
+디버그 API 관리자 보호 (routers/debug.py require_admin)
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routers.debug as debug
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+class _Settings:
+    def __init__(self, debug_mode: bool, admin_token: str = ""):
+        self.debug = debug_mode
+        self.admin_token = admin_token
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def sweep_orphans():
+        return 3
+
+    monkeypatch.setattr(debug.s3_deletion_queue, "sweep_orphans", sweep_orphans)
+    app = FastAPI()
+    app.include_router(debug.router)
+    return TestClient(app)
+
+
+def _use(monkeypatch, settings: _Settings) -> None:
+    monkeypatch.setattr(debug, "get_settings", lambda: settings)
+
+
+def test_default_settings_keep_debug_off():
+    fields = type(debug.get_settings()).model_fields
+    assert fields["debug"].default is False
+    assert fields["admin_token"].default == ""
+
+
+@pytest.mark.parametrize("debug_mode", [True, False])
+def test_sweep_forbidden_without_configured_token(client, monkeypatch, debug_mode):
+    _use(monkeypatch, _Settings(debug_mode=debug_mode))
+    assert client.post("/debug/s3-deletions/sweep").status_code == 403
+    assert client.post("/debug/s3-deletions/sweep", headers={"X-Admin-Token": ""}).status_code == 403
+
+
+def test_sweep_requires_matching_admin_token(client, monkeypatch):
+    _use(monkeypatch, _Settings(debug_mode=True, admin_token="secret"))
+    assert client.post("/debug/s3-deletions/sweep").status_code == 403
+    assert client.post("/debug/s3-deletions/sweep", headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+    response = client.post("/debug/s3-deletions/sweep", headers=ADMIN)
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "enqueued": 3}
+
+
+def test_sweeper_run_requires_admin(client, monkeypatch):
+    async def run_once():
+        return {"photo_cards_deactivated": 0}
+
+    monkeypatch.setattr(debug.expiry_sweeper, "run_once", run_once)
+    _use(monkeypatch, _Settings(debug_mode=True))
+    assert client.post("/debug/sweeper/run").status_code == 403
+
+    _use(monkeypatch, _Settings(debug_mode=False, admin_token="secret"))
+    response = client.post("/debug/sweeper/run", headers=ADMIN)
+    assert response.json() == {"success": True, "photo_cards_deactivated": 0}
+
+
+def test_photo_card_cache_clear_requires_admin(client, monkeypatch):
+    cleared = []
+    monkeypatch.setattr(debug.photo_card_cache, "clear", lambda: cleared.append(True))
+    _use(monkeypatch, _Settings(debug_mode=True))
+    assert client.delete("/debug/photo-card-cache").status_code == 403
+    assert cleared == []
+
+    _use(monkeypatch, _Settings(debug_mode=False, admin_token="secret"))
+    assert client.delete("/debug/photo-card-cache", headers=ADMIN).status_code == 200
+    assert cleared == [True]
+
+
+def test_llm_stats_reset_requires_admin(client, monkeypatch):
+    resets = []
+    monkeypatch.setattr(debug.llm_stats, "reset", lambda: resets.append(True))
+    _use(monkeypatch, _Settings(debug_mode=True))
+    assert client.delete("/debug/llm-stats").status_code == 403
+    assert resets == []
+
+    _use(monkeypatch, _Settings(debug_mode=False, admin_token="secret"))
+    assert client.delete("/debug/llm-stats", headers=ADMIN).status_code == 200
+    assert resets == [True]
@@ -0,0 +1,120 @@
+"""
+Idempotency-Key 미들웨어 (services/idempotency.py) - 키 저장소(crud)는 메모리 dict로 대체
+"""
+import contextlib
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from services import idempotency
+from services.idempotency import IdempotencyStore
+
+
+@pytest.fixture
+def app(monkeypatch):
+    rows = {}
+
+    async def claim(db, key, ttl_seconds, lock_seconds, request_hash=None):
+        if key in rows:
+            return False
+        rows[key] = SimpleNamespace(status="processing", request_hash=request_hash)
+        return True
+
+    async def get(db, key):
+        return rows.get(key)
+
+    async def complete(db, key, response_status, content_type, response_body):
+        rows[key] = SimpleNamespace(
+            status="completed", request_hash=rows[key].request_hash,
+            response_status=response_status, content_type=content_type, response_body=response_body,
+        )
+
+    async def release(db, key):
+        rows.pop(key, None)
+
+    monkeypatch.setattr(idempotency, "AsyncSessionLocal", contextlib.nullcontext)
+    monkeypatch.setattr(idempotency, "claim_idempotency_key", claim)
+    monkeypatch.setattr(idempotency, "get_idempotency_key", get)
+    monkeypatch.setattr(idempotency, "complete_idempotency_key", complete)
+    monkeypatch.setattr(idempotency, "release_idempotency_key", release)
+
+    app = FastAPI()
+    app.state.calls = 0
+    store = IdempotencyStore()
+
+    @app.middleware("http")
+    async def middleware(request: Request, call_next):
+        return await store.handle(request, call_next)
+
+    @app.post("/items")
+    async def create_item(request: Request):
+        app.state.calls += 1
+        return {"call": app.state.calls, "size": len(await request.body())}
+
+    return app
+
+
+def _client(app, ip: str = "127.0.0.1") -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(ip, 50000)), base_url="http://test")
+
+
+@pytest.fixture
+async def client(app):
+    async with _client(app) as client:
+        yield client
+
+
+@pytest.mark.anyio
+async def test_same_request_is_replayed(client):
+    headers = {"Idempotency-Key": "k1", "X-Client-Id": "device-a"}
+    first = await client.post("/items", json={"name": "a"}, headers=headers)
+    second = await client.post("/items", json={"name": "a"}, headers=headers)
+
+    # 미들웨어가 지문용으로 읽은 본문이 핸들러에도 그대로 전달됨
+    assert second.json() == first.json() == {"call": 1, "size": len(first.request.content)}
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.anyio
+async def test_key_is_scoped_per_client(client):
+    first = await client.post("/items", json={}, headers={"Idempotency-Key": "k1", "X-Client-Id": "device-a"})
+    second = await client.post("/items", json={}, headers={"Idempotency-Key": "k1", "X-Client-Id": "device-b"})
+
+    assert first.json()["call"] == 1
+    assert second.json()["call"] == 2
+    assert "Idempotent-Replayed" not in second.headers
+
+
+@pytest.mark.anyio
+async def test_different_json_body_is_rejected(client, app):
+    headers = {"Idempotency-Key": "k1", "X-Client-Id": "device-a"}
+    await client.post("/items", json={"name": "a"}, headers=headers)
+    response = await client.post("/items", json={"name": "b"}, headers=headers)
+
+    assert response.status_code == 422
+    assert app.state.calls == 1
+
+
+@pytest.mark.anyio
+async def test_multipart_body_is_not_compared(client):
+    headers = {"Idempotency-Key": "k1", "X-Client-Id": "device-a"}
+    first = await client.post("/items", files={"image": ("a.jpg", b"first")}, headers=headers)
+    second = await client.post("/items", files={"image": ("a.jpg", b"retried")}, headers=headers)
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+
+
+@pytest.mark.anyio
+async def test_retry_after_network_change_is_replayed(app):
+    # Wi-Fi → LTE 전환으로 접속 IP가 바뀌어도 같은 키면 재생
+    for headers in ({"Idempotency-Key": "k-net"}, {"Idempotency-Key": "k-net-id", "X-Client-Id": "device-a"}):
+        async with _client(app, "10.0.0.1") as wifi:
+            first = await wifi.post("/items", json={"name": "a"}, headers=headers)
+        async with _client(app, "203.0.113.7") as lte:
+            second = await lte.post("/items", json={"name": "a"}, headers=headers)
+        assert second.json() == first.json()
+        assert second.headers.get("Idempotent-Replayed") == "true"
+    assert app.state.calls == 2
@@ -0,0 +1,55 @@
+"""
+이미지 파생본 생성 (services/image_variants.py) - 외부 서비스 없이 실행
+"""
+import io
+
+import pytest
+from PIL import Image
+
+from services.image_variants import VARIANTS, ImageVariantService, render_variants, variant_key
+from services.s3_service import s3_service
+
+
+def _encode(format: str, size=(2000, 1500)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 120, 40)).save(buffer, format=format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("format", ["JPEG", "PNG", "HEIF"])
+def test_render_variants_sizes(format):
+    if format == "HEIF":
+        from pillow_heif import register_heif_opener
+        register_heif_opener()  # 인코딩용 (디코딩은 render_variants가 등록)
+
+    rendered = render_variants(_encode(format), VARIANTS)
+
+    assert set(rendered) == set(VARIANTS)
+    for name, body in rendered.items():
+        with Image.open(io.BytesIO(body)) as image:
+            assert image.format == "WEBP"
+            assert max(image.size) == VARIANTS[name]
+
+
+def test_render_variants_keeps_small_images():
+    rendered = render_variants(_encode("JPEG", size=(200, 100)), VARIANTS)
+    for body in rendered.values():
+        with Image.open(io.BytesIO(body)) as image:
+            assert image.size == (200, 100)
+
+
+def test_variant_key():
+    assert variant_key("reviews/abc.heic", "thumb") == "reviews/abc_thumb.webp"
+
+
+@pytest.mark.anyio
+async def test_stop_shuts_down_pool():
+    service = ImageVariantService(s3_service)
+    pool = service.pool
+    assert pool.submit(sum, [1, 2]).result() == 3
+
+    await service.stop()
+
+    assert service._pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(sum, [1])
@@ -0,0 +1,174 @@
+"""
+LLM 클라이언트 (services/llm_client.py) - httpx MockTransport로 LLM 서버 흉내
+"""
+import asyncio
+import functools
+import json
+
+import httpx
+import pytest
+
+from services import llm_json
+from services.llm_batcher import MicroBatcher
+from services.llm_client import LLMClient
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """handler(request, payload) -> httpx.Response 를 등록하면 그 응답을 돌려주는 클라이언트"""
+    calls = []
+
+    def install(handler):
+        def transport(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            calls.append(payload)
+            return handler(payload)
+
+        client_class = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx, "AsyncClient",
+            functools.partial(client_class, transport=httpx.MockTransport(transport)),
+        )
+        return calls
+
+    monkeypatch.setattr(LLMClient, "_structured_disabled_until", 0.0)
+    client = LLMClient()
+    client.settings = client.settings.model_copy(update={"llm_structured_output": True, "llm_stream_json": True})
+    return client, install
+
+
+def _sse(*events: str) -> httpx.Response:
+    body = "".join(f"data: {event}\n\n" for event in events)
+    return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+
+def _delta(content: str) -> str:
+    return json.dumps({"choices": [{"delta": {"content": content}}]})
+
+
+@pytest.mark.anyio
+async def test_stream_skips_malformed_events(llm):
+    client, install = llm
+    install(lambda payload: _sse('{"choi', "1", _delta('["#a", '), _delta('"#b"]'), "[DONE]"))
+
+    assert await client.generate_json("p", None, llm_json.HASHTAGS) == ["#a", "#b"]
+
+
+@pytest.mark.anyio
+async def test_unrelated_400_keeps_structured_output(llm):
+    client, install = llm
+    calls = install(lambda payload: httpx.Response(400, json={"message": "max_tokens is too large"}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.generate_json("p", None, llm_json.HASHTAGS)
+
+    assert len(calls) == 1
+    assert LLMClient._structured_disabled_until == 0.0
+
+
+@pytest.mark.anyio
+async def test_response_format_400_falls_back_then_reprobes(llm, monkeypatch):
+    client, install = llm
+
+    def handler(payload):
+        if "response_format" in payload:
+            return httpx.Response(400, json={"message": "guided_json is not supported"})
+        return _sse(_delta('["#a"]'), "[DONE]")
+
+    calls = install(handler)
+
+    assert await client.generate_json("p", None, llm_json.HASHTAGS) == ["#a"]
+    assert ["response_format" in payload for payload in calls] == [True, False]
+
+    # 대기 시간 동안은 스키마 없이 바로 요청
+    await client.generate_json("p", None, llm_json.HASHTAGS)
+    assert "response_format" not in calls[-1]
+
+    # 대기 시간이 지나면 다시 스키마로 시도
+    monkeypatch.setattr(LLMClient, "_structured_disabled_until", 0.0)
+    await client.generate_json("p", None, llm_json.HASHTAGS)
+    assert "response_format" in calls[-2]
+
+
+@pytest.mark.anyio
+async def test_continuous_usage_only_when_configured(llm):
+    client, install = llm
+    calls = install(lambda payload: _sse(_delta('["#a"]'), "[DONE]"))
+
+    await client.generate_json("p", None, llm_json.HASHTAGS)
+    assert calls[-1]["stream_options"] == {"include_usage": True}
+
+    client.settings = client.settings.model_copy(update={"llm_stream_continuous_usage": True})
+    await client.generate_json("p", None, llm_json.HASHTAGS)
+    assert calls[-1]["stream_options"] == {"include_usage": True, "continuous_usage_stats": True}
+
+
+@pytest.mark.anyio
+async def test_stream_options_400_keeps_structured_output(llm):
+    client, install = llm
+    calls = install(lambda payload: httpx.Response(
+        400, json={"message": "unknown field stream_options.continuous_usage_stats"}
+    ))
+    client.settings = client.settings.model_copy(update={"llm_stream_continuous_usage": True})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.generate_json("p", None, llm_json.HASHTAGS)
+
+    assert len(calls) == 1
+    assert LLMClient._structured_disabled_until == 0.0
+
+
+# === 해시태그 배치 ===
+
+def _is_batch(payload) -> bool:
+    return payload["response_format"]["json_schema"]["name"] == "hashtags_batch"
+
+
+@pytest.mark.anyio
+async def test_batch_server_error_raises_like_single_call(llm):
+    client, install = llm
+    calls = install(lambda payload: httpx.Response(503, json={"message": "overloaded"}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.generate_hashtags_batch(["a", "b"])
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._generate_hashtags_single("a")
+
+    # 건별 요청으로 부하를 늘리지 않음
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_batch_retries_only_invalid_items(llm):
+    client, install = llm
+
+    def handler(payload):
+        if _is_batch(payload):
+            return _sse(_delta('[["#a"], ["#b", 3], []]'), "[DONE]")
+        return _sse(_delta('["#single"]'), "[DONE]")
+
+    calls = install(handler)
+
+    assert await client.generate_hashtags_batch(["a", "b", "c"]) == [["#a"], ["#single"], ["#single"]]
+    assert [_is_batch(payload) for payload in calls] == [True, False, False]
+
+
+@pytest.mark.anyio
+async def test_batch_fallback_error_reaches_only_that_caller(llm):
+    client, install = llm
+
+    def handler(payload):
+        if _is_batch(payload):
+            return _sse(_delta('"not a list"'), "[DONE]")
+        if "실패" in payload["messages"][-1]["content"]:
+            return httpx.Response(500, json={"message": "boom"})
+        return _sse(_delta('["#ok"]'), "[DONE]")
+
+    install(handler)
+    batcher = MicroBatcher(client.generate_hashtags_batch, max_batch_size=2)
+
+    ok, failed = await asyncio.gather(
+        batcher.submit("성공"), batcher.submit("실패"), return_exceptions=True
+    )
+    assert ok == ["#ok"]
+    assert isinstance(failed, httpx.HTTPStatusError)
@@ -0,0 +1,98 @@
+"""
+규칙 기반 검색 파라미터 해석 (services/param_resolver.py) + 관광 API 콘텐츠 유형 전달
+"""
+import pytest
+
+from services.param_resolver import DEFAULT_KEYWORD, resolve_destination, resolve_search_params, resolve_theme
+from services.tour_api import TourAPIService
+
+
+# === 목적지 ===
+
+@pytest.mark.parametrize("destination, expected", [
+    ("강릉", ("강원", "강릉")),
+    ("강원도 강릉시", ("강원", "강릉")),
+    ("강원특별자치도", ("강원", None)),
+    ("제주도 여행", ("제주", None)),
+    ("서귀포 근처", ("제주", "서귀포")),
+    ("경상북도", ("경북", None)),
+    ("부산광역시", ("부산", None)),
+])
+def test_resolve_destination(destination, expected):
+    assert resolve_destination(destination) == expected
+
+
+@pytest.mark.parametrize("destination", [
+    "",
+    "여행",
+    "바다 보이는 조용한 곳",       # 단어가 너무 많음
+    "제주 강릉",                   # 지역과 시군구가 맞지 않음
+    "부산 강릉",
+    "강릉 속초",                   # 시군구 두 개
+    "아무데나",
+])
+def test_resolve_destination_ambiguous(destination):
+    assert resolve_destination(destination) is None
+
+
+# === 테마 ===
+
+@pytest.mark.parametrize("theme, expected", [
+    (None, (DEFAULT_KEYWORD, None)),
+    ("  ", (DEFAULT_KEYWORD, None)),
+    ("바다", ("바다", "관광지")),
+    ("카페", ("카페", "음식점")),
+    ("바다여행", ("바다", "관광지")),   # 사전 단어 하나만 포함
+    ("등산", ("산", "관광지")),
+    ("벚꽃", ("벚꽃", None)),           # 사전에 없는 짧은 단어는 그대로 키워드
+])
+def test_resolve_theme(theme, expected):
+    assert resolve_theme(theme) == expected
+
+
+@pytest.mark.parametrize("theme", [
+    "바다 보이는 카페",       # 여러 테마
+    "조용하고 한적한 곳",     # 문장형
+])
+def test_resolve_theme_ambiguous(theme):
+    assert resolve_theme(theme) is None
+
+
+def test_resolve_search_params():
+    assert resolve_search_params("강릉", {"theme": "카페"}) == {
+        "area": "강원", "sigungu": "강릉", "keyword": "카페", "content_type": "음식점",
+    }
+    assert resolve_search_params("제주", {}) == {"area": "제주", "keyword": DEFAULT_KEYWORD}
+    assert resolve_search_params("어딘가 멋진 곳", {"theme": "바다"}) is None
+    assert resolve_search_params("강릉", {"theme": "바다 보이는 카페"}) is None
+
+
+# === 관광 API 콘텐츠 유형 ===
+
+def test_content_type_name_or_code():
+    service = TourAPIService()
+    assert service._find_content_type_id("음식점") == "39"
+    assert service._find_content_type_id("12") == "12"
+    assert service._find_content_type_id(12) == "12"
+    assert service._find_content_type_id("카페") is None
+    assert service._find_content_type_id(None) is None
+
+
+@pytest.mark.anyio
+async def test_combined_results_pass_content_type_to_keyword_search(monkeypatch):
+    service = TourAPIService()
+    calls = []
+
+    async def search_keyword(keyword, area=None, sigungu=None, content_type=None):
+        calls.append(("keyword", content_type))
+        return []
+
+    async def search_related(keyword, area=None, sigungu=None):
+        calls.append(("related", None))
+        return []
+
+    monkeypatch.setattr(service, "search_keyword", search_keyword)
+    monkeypatch.setattr(service, "search_related", search_related)
+
+    await service.get_combined_results("카페", "강원", "강릉", "음식점")
+    assert calls == [("keyword", "음식점"), ("related", None)]
@@ -0,0 +1,102 @@
+"""
+리뷰 파티션 보관 (services/partition_maintenance.py) - PostgreSQL 필요, DATABASE_URL이 없으면 건너뜀
+
+검사용 스키마(partition_check)에 마이그레이션을 적용하고 오래된 월/최근 월에 리뷰를 넣은 뒤,
+오래된 파티션을 보관하면 평점 집계(place_rating_stats)와 목록 total이 남은 리뷰와 맞는지 확인합니다.
+"""
+import os
+from datetime import date, datetime
+
+import pytest
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from conftest import ROOT
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+SCHEMA = "partition_check"
+
+pytestmark = [
+    pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL(PostgreSQL)이 없어 건너뜁니다"),
+    pytest.mark.anyio,
+]
+
+import crud  # noqa: E402
+from crud.partition_crud import PARTITIONED_TABLES, add_months, ensure_partitions, month_start  # noqa: E402
+from services import partition_maintenance as maintenance_module  # noqa: E402
+from services.partition_maintenance import PartitionMaintenance  # noqa: E402
+
+
+def _apply_migrations(sync_conn) -> None:
+    cfg = AlembicConfig(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "migrations"))
+    cfg.attributes["connection"] = sync_conn
+    command.upgrade(cfg, "head")
+
+
+@pytest.fixture
+async def schema_engine():
+    admin_engine = create_async_engine(DATABASE_URL)
+    engine = create_async_engine(DATABASE_URL, connect_args={"server_settings": {"search_path": SCHEMA}})
+    try:
+        async with admin_engine.begin() as conn:
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+            await conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+        async with engine.connect() as conn:
+            await conn.run_sync(_apply_migrations)
+        yield engine
+    finally:
+        await engine.dispose()
+        async with admin_engine.begin() as conn:
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        await admin_engine.dispose()
+
+
+async def test_archiving_review_partition_updates_rating_stats(schema_engine, monkeypatch, tmp_path):
+    session_factory = sessionmaker(schema_engine, class_=AsyncSession, expire_on_commit=False)
+    this_month = month_start(date.today())
+    old_month = add_months(this_month, -12)
+
+    async with session_factory() as db:
+        for table in PARTITIONED_TABLES:
+            await ensure_partitions(db, table, since=old_month)
+        await db.commit()
+        rows = [
+            ("old-1", old_month, 5, False),
+            ("old-2", old_month, 1, False),
+            ("old-deleted", old_month, 3, True),
+            ("new-1", this_month, 4, False),
+        ]
+        for review_id, month, rating, deleted in rows:
+            await db.execute(
+                text("""
+                    INSERT INTO reviews (id, place_id, place_name, rating, content, created_at, is_deleted)
+                    VALUES (:id, 'p1', '경포대', :rating, '리뷰', :created_at, :deleted)
+                """),
+                {"id": review_id, "rating": rating, "created_at": datetime(month.year, month.month, 2), "deleted": deleted},
+            )
+        await db.commit()
+        await crud.rebuild_place_rating_stats(db)
+
+    maintenance = PartitionMaintenance(storage=None)
+    maintenance.settings = maintenance.settings.model_copy(update={
+        "archive_reviews_after_months": 6,
+        "archive_sessions_after_months": 0,
+        "partition_archive_target": "local",
+        "partition_archive_dir": str(tmp_path),
+    })
+    monkeypatch.setattr(maintenance_module, "engine", schema_engine)
+    monkeypatch.setattr(maintenance_module, "AsyncSessionLocal", session_factory)
+
+    result = await maintenance.run_once()
+    assert f"reviews_p{old_month:%Y%m}" in result["archived"]
+
+    async with session_factory() as db:
+        stats = await crud.get_place_rating_stats(db, "p1")
+        assert (stats.rating_count, stats.rating_sum, stats.count_1, stats.count_4, stats.count_5) == (1, 4, 0, 1, 0)
+        reviews, total, average = await crud.get_reviews_by_place(db, "p1")
+        assert [review.id for review in reviews] == ["new-1"]
+        assert (total, average) == (1, 4.0)
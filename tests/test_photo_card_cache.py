@@ -0,0 +1,177 @@
+"""
+포토카드 조회/검증 캐시 (services/photo_card_cache.py) - 카드 조회(crud)는 dict로 대체, 시계는 직접 조작
+"""
+import contextlib
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from models.ids import uuid7
+from services import photo_card_cache as cache_module
+from services.photo_card_cache import PhotoCardCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(
+        monotonic=lambda: now[0], time=time.time, strftime=time.strftime, localtime=time.localtime,
+    ))
+    return now
+
+
+@pytest.fixture
+def db_cards(monkeypatch):
+    """DB에 있는 활성 카드 ID 집합, 조회된 ID는 queries에 기록"""
+    cards: set[str] = set()
+    queries: list[str] = []
+
+    async def verify(db, photo_card_id):
+        queries.append(photo_card_id)
+        return photo_card_id in cards
+
+    async def count(db):
+        return len(cards)
+
+    async def stream(db):
+        async def ids():
+            for photo_card_id in sorted(cards):
+                yield photo_card_id
+        return ids()
+
+    monkeypatch.setattr(cache_module, "verify_photo_card", verify)
+    monkeypatch.setattr(cache_module, "count_active_photo_cards", count)
+    monkeypatch.setattr(cache_module, "stream_active_photo_card_ids", stream)
+    monkeypatch.setattr(cache_module, "AsyncSessionLocal", contextlib.nullcontext)
+    return SimpleNamespace(cards=cards, queries=queries)
+
+
+@pytest.fixture
+def cache():
+    cache = PhotoCardCache()
+    cache.settings = cache.settings.model_copy(update={
+        "photo_card_cache_ttl_seconds": 300,
+        "photo_card_negative_ttl_seconds": 30,
+        "photo_card_cache_max_entries": 2,
+    })
+    return cache
+
+
+def _old_id() -> str:
+    # 기존 uuid4 ID는 생성 시각을 알 수 없어 항상 필터/음성 캐시 대상
+    return str(uuid.uuid4())
+
+
+async def test_active_entry_expires_after_ttl(cache, db_cards, clock):
+    card = _old_id()
+    cache.add(card, b'{"id": "card"}')
+
+    assert await cache.get_body(None, card) == b'{"id": "card"}'
+    clock[0] += 299
+    assert await cache.verify(None, card) is True
+    assert db_cards.queries == []
+
+    # TTL이 지나면 DB에서 다시 확인 (그 사이 비활성화된 카드)
+    clock[0] += 2
+    assert await cache.verify(None, card) is False
+    assert db_cards.queries == [card]
+
+
+async def test_least_recently_used_entry_is_evicted(cache, db_cards, clock):
+    first, second, third = _old_id(), _old_id(), _old_id()
+    db_cards.cards.update({first, second, third})
+    cache.add(first)
+    cache.add(second)
+    assert await cache.verify(None, first) is True
+
+    cache.add(third)
+
+    assert await cache.verify(None, first) is True
+    assert await cache.verify(None, third) is True
+    assert db_cards.queries == []
+    assert await cache.verify(None, second) is True
+    assert db_cards.queries == [second]
+    assert cache.summary()["active_entries"] == 2
+
+
+async def test_negative_entry_is_replaced_on_create(cache, db_cards, clock):
+    card = _old_id()
+    assert await cache.verify(None, card) is False
+    assert await cache.verify(None, card) is False
+    assert db_cards.queries == [card]
+    assert cache.stats["negative_hits"] == 1
+
+    # 이 프로세스에서 같은 ID로 카드가 생성되면 음성 캐시 대신 활성 항목으로
+    db_cards.cards.add(card)
+    cache.add(card, b'{"id": "card"}')
+
+    assert await cache.verify(None, card) is True
+    assert await cache.get_body(None, card) == b'{"id": "card"}'
+    assert db_cards.queries == [card]
+    assert cache.summary()["negative_entries"] == 0
+
+
+async def test_negative_entry_expires(cache, db_cards, clock):
+    card = _old_id()
+    assert await cache.verify(None, card) is False
+
+    # 다른 워커에서 생성된 카드도 음성 TTL이 지나면 보임
+    db_cards.cards.add(card)
+    clock[0] += 31
+    assert await cache.verify(None, card) is True
+    assert db_cards.queries == [card, card]
+
+
+async def test_invalidate_drops_active_entry(cache, db_cards, clock):
+    card = _old_id()
+    db_cards.cards.add(card)
+    cache.add(card)
+
+    db_cards.cards.discard(card)
+    cache.invalidate(card)
+
+    assert await cache.verify(None, card) is False
+    assert db_cards.queries == [card]
+
+
+async def test_bloom_filter_rejects_unknown_old_id(cache, db_cards, clock):
+    known = _old_id()
+    db_cards.cards.add(known)
+    assert await cache.rebuild_bloom() == 1
+
+    assert await cache.verify(None, _old_id()) is False
+    assert db_cards.queries == []
+    assert cache.stats["bloom_rejects"] == 1
+
+    assert await cache.verify(None, known) is True
+    assert db_cards.queries == [known]
+
+
+async def test_recent_id_bypasses_bloom_filter(cache, db_cards, clock):
+    await cache.rebuild_bloom()
+
+    # 필터를 만든 뒤 다른 워커에서 생성된 카드: 필터에는 "확실히 없음"이어도 DB에서 확인
+    created_elsewhere = uuid7()
+    db_cards.cards.add(created_elsewhere)
+    assert created_elsewhere not in cache._bloom
+    assert await cache.verify(None, created_elsewhere) is True
+    assert cache.stats["bloom_rejects"] == 0
+
+    # 복제 지연으로 아직 안 보이는 최근 카드는 404를 캐시하지 않음
+    lagging = uuid7()
+    assert await cache.verify(None, lagging) is False
+    db_cards.cards.add(lagging)
+    assert await cache.verify(None, lagging) is True
+    assert db_cards.queries == [created_elsewhere, lagging, lagging]
+    assert cache.summary()["negative_entries"] == 0
+
+
+async def test_invalid_id_is_rejected_without_db(cache, db_cards, clock):
+    assert await cache.verify(None, "not-a-uuid") is False
+    assert await cache.get_body(None, "not-a-uuid") is None
+    assert db_cards.queries == []
+    assert cache.stats["invalid_ids"] == 2
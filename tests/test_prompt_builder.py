@@ -0,0 +1,117 @@
+"""
+LLM 프롬프트 빌더 (services/prompt_builder.py)
+"""
+import pytest
+
+from services import prompt_builder
+from services.llm_client import LLMClient
+from services.prompt_builder import build_spots_table, compact_context, estimate_tokens, format_preferences
+
+
+def _spot(title: str, overview: str = "", addr: str = "강원특별자치도 강릉시 창해로 514", type_id: str = "12") -> dict:
+    return {"title": title, "contenttypeid": type_id, "addr1": addr, "overview": overview}
+
+
+def _rows(table: str) -> list[str]:
+    return [line.split("|")[0] for line in table.splitlines()[2:]]
+
+
+def test_empty_results():
+    assert build_spots_table({}) == "(검색 결과 없음)"
+    assert build_spots_table({"keyword_results": [], "related_results": []}) == "(검색 결과 없음)"
+    assert build_spots_table({"keyword_results": [{"title": ""}, {"title": None}]}) == "(검색 결과 없음)"
+
+
+def test_shared_prefix_and_type_move_to_header():
+    table = build_spots_table({"keyword_results": [
+        _spot("경포해변", addr="강원특별자치도 강릉시 창해로 514"),
+        _spot("오죽헌", addr="강원특별자치도 강릉시 율곡로 3139번길 24"),
+        _spot("경포해변", addr="강원특별자치도 강릉시 중복"),
+    ]})
+
+    header, columns, *rows = table.splitlines()
+    assert header == "[검색 결과] 주소 공통: 강원특별자치도 강릉시 유형 공통: 관광지"
+    # 유형은 헤더로 올라가고 설명은 모두 비어 있어 컬럼에서 빠짐
+    assert columns == "이름|주소"
+    assert rows == ["경포해변|창해로 514", "오죽헌|율곡로 3139번길 24"]
+
+
+def test_budget_keeps_most_relevant_rows():
+    spots = [_spot(f"장소{i}", overview="조용한 산책로와 카페가 있는 곳") for i in range(8)]
+    spots.append(_spot("경포 바다 전망대", overview="바다가 한눈에 보이는 전망대"))
+    full = build_spots_table({"keyword_results": spots}, keyword="바다")
+
+    budget = estimate_tokens(full) // 2
+    table = build_spots_table({"keyword_results": spots}, keyword="바다", token_budget=budget)
+
+    assert estimate_tokens(table) <= budget
+    assert 0 < len(_rows(table)) < len(_rows(full))
+    assert _rows(table)[0] == "경포 바다 전망대"
+
+
+def test_related_section_gets_remaining_budget():
+    api_results = {
+        "keyword_results": [_spot(f"장소{i}", overview="해변 산책로") for i in range(10)],
+        "related_results": [
+            {"rlteTatsNm": "안목해변", "rlteCtgrySclsNm": "해수욕장", "rlteRank": "2"},
+            {"rlteTatsNm": "장소0", "rlteCtgrySclsNm": "중복", "rlteRank": "1"},
+        ],
+    }
+    table = build_spots_table(api_results, token_budget=150)
+
+    keyword_section, related_section = table.split("\n\n")
+    # 연관 장소가 있으면 키워드 결과는 예산의 2/3까지만
+    assert estimate_tokens(keyword_section) <= 100
+    assert related_section.splitlines() == ["[연관 장소]", "이름|분류|순위", "안목해변|해수욕장|2"]
+    assert estimate_tokens(table) <= 150
+
+
+def test_row_longer_than_budget_is_skipped():
+    spots = [
+        _spot("바다" * 60, overview="바다 " * 50, type_id="39"),
+        _spot("경포해변", type_id="12"),
+        _spot("오죽헌", type_id="14"),
+    ]
+    table = build_spots_table({"keyword_results": spots}, keyword="바다", token_budget=60)
+
+    # 관련도가 가장 높아도 혼자 예산을 넘는 행은 빠지고 나머지는 그대로 포함
+    assert _rows(table) == ["경포해변", "오죽헌"]
+    assert estimate_tokens(table) <= 60
+
+
+def test_only_row_too_long_leaves_no_section():
+    table = build_spots_table({"keyword_results": [_spot("바다" * 60)]}, token_budget=20)
+    assert table == "(검색 결과 없음)"
+
+
+def test_format_preferences():
+    assert format_preferences({}) == "없음"
+    assert format_preferences({"theme": ["바다", "카페"], "with_whom": "연인", "style": "", "budget": "10만원"}) == (
+        "테마=바다/카페, 동행=연인, budget=10만원"
+    )
+
+
+def test_compact_context():
+    assert compact_context("['강릉', '바다']  \n 여행") == "강릉, 바다 여행"
+    assert compact_context("가" * 10, max_chars=4) == "가가가가…"
+    assert compact_context(None) == ""
+
+
+@pytest.mark.anyio
+async def test_curation_prompt_uses_spot_table_budget(monkeypatch):
+    prompts = []
+
+    async def generate_json(prompt, system_prompt, schema, name):
+        prompts.append(prompt)
+        return {"course_title": "강릉", "spots": []}
+
+    client = LLMClient()
+    client.settings = client.settings.model_copy(update={"llm_curation_spots_token_budget": 60})
+    monkeypatch.setattr(client, "generate_json", generate_json)
+    api_results = {"keyword_results": [_spot(f"장소{i}", overview="바다 산책로") for i in range(10)]}
+
+    await client.curate_and_explain("강릉 바다", api_results, {"keyword": "바다"})
+
+    table = prompt_builder.build_spots_table(api_results, keyword="바다", query="강릉 바다", token_budget=60)
+    assert f"API에서 찾은 장소들:\n{table}\n" in prompts[0]
+    assert estimate_tokens(table) <= 60
@@ -0,0 +1,466 @@
+"""
+쿼리 실행 계획 회귀 테스트 (PostgreSQL 필요, DATABASE_URL이 없으면 건너뜀)
+
+검사용 스키마(PLAN_CHECK_SCHEMA, 기본 plan_check)에 Alembic 마이그레이션(0001 → head)을 적용하고
+실제 규모에 가까운 데이터(PLAN_CHECK_SCALE, 기본 1 → 리뷰 30만)를 채운 뒤,
+crud/ 함수를 호출하며 실행된 SQL을 모두 잡아 EXPLAIN (읽기는 ANALYZE 포함)으로 확인합니다.
+
+- 기대한 인덱스를 쓰는지 (예: 장소별 목록 → idx_reviews_place_created_id)
+- 큰 테이블을 Seq Scan 하지 않는지 (행이 SEQ_SCAN_MIN_ROWS 미만인 빈 파티션 등은 제외)
+- 실행 시간이 예산(ms) 안인지
+
+ID는 운영과 같은 UUIDv7(앞 48비트 = created_at)이라 파티션 프루닝도 운영과 같게 검사됩니다.
+검사용 스키마는 끝나면 삭제됩니다 (PLAN_CHECK_KEEP=1이면 유지).
+
+    DATABASE_URL=postgresql+asyncpg://user:pw@localhost/travel python -m pytest tests/test_query_plans.py
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Awaitable, Callable
+
+import pytest
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from conftest import ROOT
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+SCHEMA = os.environ.get("PLAN_CHECK_SCHEMA", "plan_check")
+SCALE = int(os.environ.get("PLAN_CHECK_SCALE", "1"))
+KEEP = os.environ.get("PLAN_CHECK_KEEP") == "1"
+
+pytestmark = [
+    pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL(PostgreSQL)이 없어 플랜 검사를 건너뜁니다"),
+    pytest.mark.anyio,
+]
+
+import crud  # noqa: E402
+from crud.partition_crud import PARTITIONED_TABLES, add_months, ensure_partitions, month_start  # noqa: E402
+from crud.review_search_crud import search_terms, search_vector_literal  # noqa: E402
+
+# Seq Scan이 나오면 안 되는 테이블 (검사 데이터 기준 수만~수십만 행)
+LARGE_TABLES = {"photo_cards", "meeting_platform_sessions", "reviews", "review_images", "s3_pending_deletions"}
+# 이보다 작은 relation(비어 있는 미래 파티션 등)은 Seq Scan이 정상
+SEQ_SCAN_MIN_ROWS = 1000
+
+REVIEW_TEXTS = [
+    "주차 편해요 웨이팅 30분 있었지만 맛있어요",
+    "뷰가 정말 좋아요 사진 찍기 좋은 곳",
+    "아이랑 가기 좋아요 화장실 깨끗해요",
+    "커피 맛있고 디저트도 괜찮아요",
+    "주말엔 사람 많아요 평일 추천",
+    "바다 보이는 산책로 최고",
+    "직원분들 친절하고 가격 적당해요",
+    "야경 예쁘고 데이트 코스로 추천",
+]
+
+
+# === 검사 데이터 ===
+
+def _apply_migrations(sync_conn) -> None:
+    """빈 스키마에 기준 리비전(최초 init.sql 스키마)부터 head까지 적용"""
+    cfg = AlembicConfig(str(ROOT / "alembic.ini"))
+    cfg.set_main_option("script_location", str(ROOT / "migrations"))
+    cfg.attributes["connection"] = sync_conn
+    command.upgrade(cfg, "head")
+
+
+async def create_schema(admin_engine, engine) -> None:
+    async with admin_engine.begin() as conn:
+        await conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        await conn.execute(text(f'CREATE SCHEMA "{SCHEMA}"'))
+    async with engine.connect() as conn:
+        await conn.run_sync(_apply_migrations)
+    # 시드 데이터(최근 1년) 범위의 월 파티션
+    since = add_months(month_start(date.today()), -13)
+    async with AsyncSession(engine) as db:
+        for table in PARTITIONED_TABLES:
+            await ensure_partitions(db, table, since=since)
+        await db.commit()
+
+
+async def seed(engine, scale: int) -> dict:
+    """generate_series로 데이터 생성 (규모: scale=1 → 리뷰 30만, 포토카드 10만)"""
+    sizes = {
+        "photo_cards": 100_000 * scale,
+        "reviews": 300_000 * scale,
+        "places": 5_000 * scale,
+        "users": 30_000 * scale,
+        "s3_pending_deletions": 20_000 * scale,
+    }
+    async with engine.begin() as conn:
+        # 시각 ts의 UUIDv7 문자열 (kind: 테이블 구분, n: 같은 시각 안에서 구분)
+        await conn.execute(text("""
+            CREATE FUNCTION plan_uuid7(ts timestamp, kind int, n bigint) RETURNS varchar
+            LANGUAGE sql IMMUTABLE AS $$
+                SELECT substr(h, 1, 8) || '-' || substr(h, 9, 4) || '-7' || lpad(to_hex(kind), 3, '0')
+                       || '-8' || substr(r, 1, 3) || '-' || substr(r, 4, 12)
+                FROM (SELECT lpad(to_hex((extract(epoch FROM ts) * 1000)::bigint), 12, '0') AS h,
+                             lpad(to_hex(n), 15, '0') AS r) parts
+            $$
+        """))
+
+        await conn.execute(text("""
+            INSERT INTO photo_cards (id, user_id, province, city, message, hashtags, created_at, expires_at, is_active)
+            SELECT plan_uuid7(created, 1, g), 'u' || (g % :users), '강원도', '강릉시', '바다 보러 가요',
+                   '["#여행"]'::jsonb, created, expires,
+                   g % 10 <> 0 AND (expires IS NULL OR expires > (now() AT TIME ZONE 'UTC') - interval '1 day')
+            FROM generate_series(1, :n) g,
+                 LATERAL (SELECT (now() AT TIME ZONE 'UTC') - (g % 365) * interval '1 day' AS created) t,
+                 -- 5%는 30일 만료 카드, 하루 넘게 지난 것은 이미 정리된 상태 (운영처럼 최근 만료분만 남음)
+                 LATERAL (SELECT CASE WHEN g % 100 BETWEEN 5 AND 9 THEN created + interval '30 days' END AS expires) e
+        """), {"n": sizes["photo_cards"], "users": sizes["users"]})
+
+        # 세션: 카드와 같은 시각, 대부분 completed, 1%만 pending/processing
+        await conn.execute(text("""
+            INSERT INTO meeting_platform_sessions (id, photo_card_id, status, query, recommendation_data, created_at)
+            SELECT plan_uuid7(created, 2, g), plan_uuid7(created, 1, g),
+                   CASE WHEN g % 200 = 0 THEN 'pending' WHEN g % 200 = 1 THEN 'processing'
+                        WHEN g % 20 = 2 THEN 'failed' ELSE 'completed' END,
+                   '강릉 데이트 코스', '{"spots": []}'::jsonb, created
+            FROM generate_series(1, :n) g, LATERAL (SELECT (now() AT TIME ZONE 'UTC') - (g % 365) * interval '1 day' AS created) t
+        """), {"n": sizes["photo_cards"]})
+        await conn.execute(text(
+            "INSERT INTO session_by_card (photo_card_id, session_id) SELECT photo_card_id, id FROM meeting_platform_sessions"
+        ))
+
+        # 리뷰: 본문 종류별로 나눠 넣고 search_vector도 같이 기록 (5%는 소프트 삭제)
+        for k, content in enumerate(REVIEW_TEXTS):
+            await conn.execute(text("""
+                INSERT INTO reviews (id, place_id, place_name, rating, content, user_id,
+                                     created_at, updated_at, is_deleted, search_vector)
+                SELECT plan_uuid7(created, 3, g), 'p' || (g % :places), '장소 ' || (g % :places),
+                       1 + g % 5, :content, 'u' || (g % :users),
+                       created, created, g % 20 = 0, CAST(:vector AS tsvector)
+                FROM generate_series(1, :n) g, LATERAL (SELECT (now() AT TIME ZONE 'UTC') - g * interval '30 seconds' AS created) t
+                WHERE g % :kinds = :k
+            """), {
+                "n": sizes["reviews"], "places": sizes["places"], "users": sizes["users"],
+                "content": content, "vector": search_vector_literal("", content),
+                "kinds": len(REVIEW_TEXTS), "k": k,
+            })
+
+        await conn.execute(text("""
+            INSERT INTO review_images (id, review_id, image_url, image_order)
+            SELECT plan_uuid7(created, 4, g), plan_uuid7(created, 3, g),
+                   'https://bench.example.com/reviews/' || g || '.jpg', 0
+            FROM generate_series(3, :n, 3) g, LATERAL (SELECT (now() AT TIME ZONE 'UTC') - g * interval '30 seconds' AS created) t
+        """), {"n": sizes["reviews"]})
+
+        await conn.execute(text("""
+            INSERT INTO place_rating_stats (place_id, rating_sum, rating_count,
+                                            count_1, count_2, count_3, count_4, count_5)
+            SELECT place_id, sum(rating), count(*),
+                   count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+                   count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+                   count(*) FILTER (WHERE rating = 5)
+            FROM reviews WHERE is_deleted = FALSE GROUP BY place_id
+        """))
+
+        # 삭제 대기열: 약 5%만 재시도 시각 도래
+        await conn.execute(text("""
+            INSERT INTO s3_pending_deletions (s3_key, next_attempt_at)
+            SELECT 'reviews/old-' || g || '.jpg', now() + ((g % 100) - 5) * interval '1 minute'
+            FROM generate_series(1, :n) g
+        """), {"n": sizes["s3_pending_deletions"]})
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.exec_driver_sql("VACUUM ANALYZE")
+    return sizes
+
+
+async def sample_ids(engine) -> dict:
+    """검사에 쓸 실제 행 ID (검사 전에 조회, 검사 대상 SQL에는 포함되지 않음)"""
+    async with engine.connect() as conn:
+        card, session = (await conn.execute(text("""
+            SELECT photo_card_id, id FROM meeting_platform_sessions
+            WHERE status = 'completed' ORDER BY created_at DESC OFFSET 42 LIMIT 1
+        """))).one()
+        pending = (await conn.execute(text(
+            "SELECT id FROM meeting_platform_sessions WHERE status = 'pending' LIMIT 1"
+        ))).scalar_one()
+        reviews = (await conn.execute(text(
+            "SELECT id FROM reviews WHERE is_deleted = FALSE ORDER BY created_at DESC OFFSET 100 LIMIT 2"
+        ))).scalars().all()
+        image = (await conn.execute(text("SELECT id FROM review_images LIMIT 1"))).scalar_one()
+    return {
+        "photo_card": card, "session": session, "pending_session": pending,
+        "reviews": list(reviews), "review_image": image, "place": "p42", "user": "u42",
+    }
+
+
+# === 검사 항목 ===
+
+@dataclass
+class PlanCase:
+    name: str
+    run: Callable[[AsyncSession, dict], Awaitable[object]]
+    indexes: set[str] = field(default_factory=set)    # 이 중 하나 이상 사용해야 함
+    allow_seq_scan: set[str] = field(default_factory=set)
+    max_ms: float = 20.0                              # 읽기 문장 실행 시간 합계 예산
+
+
+async def _place_pages(db: AsyncSession, ids: dict) -> None:
+    reviews, _, _ = await crud.get_reviews_by_place(db, ids["place"], limit=20)
+    await crud.get_reviews_by_place(db, ids["place"], limit=20, cursor=(reviews[-1].created_at, reviews[-1].id))
+
+
+async def _user_pages(db: AsyncSession, ids: dict) -> None:
+    reviews, _, _ = await crud.get_reviews_by_user(db, ids["user"], limit=5)
+    await crud.get_reviews_by_user(db, ids["user"], limit=5, cursor=(reviews[-1].created_at, reviews[-1].id))
+
+
+async def _all_pages(db: AsyncSession, ids: dict) -> None:
+    reviews, _, _ = await crud.get_all_reviews(db, limit=20)
+    await crud.get_all_reviews(db, limit=20, cursor=(reviews[-1].created_at, reviews[-1].id))
+
+
+async def _write_cycle(db: AsyncSession, ids: dict) -> None:
+    review = await crud.create_review(
+        db, ids["place"], "장소 42", 5, "검사용 리뷰", ["https://bench.example.com/reviews/new.jpg"],
+        user_id=ids["user"],
+    )
+    await crud.update_review(db, review.id, rating=3, content="검사용 리뷰 수정")
+    await crud.add_review_images(db, review.id, ["https://bench.example.com/reviews/new2.jpg"], start_order=1)
+    await crud.record_image_uploads(db, review.id, [("reviews/new3.jpg", "image/jpeg")], valid_seconds=600)
+    attached = await crud.attach_uploaded_images(
+        db, review.id, {"reviews/new3.jpg": "https://bench.example.com/reviews/new3.jpg"}, max_images=5
+    )
+    assert [image.image_order for image in attached] == [2]
+    await crud.delete_review(db, review.id)
+
+
+async def _purge_sessions(db: AsyncSession, ids: dict) -> None:
+    for target in await crud.session_sweep_targets(db):
+        await crud.purge_idle_sessions(db, target, idle_days=30, limit=1000)
+
+
+async def _compact_sessions(db: AsyncSession, ids: dict) -> None:
+    for target in await crud.session_sweep_targets(db):
+        await crud.compact_idle_sessions(db, target, idle_days=30, limit=1000)
+
+
+async def _requeue_session(db: AsyncSession, ids: dict) -> None:
+    session = await crud.get_session_by_id(db, ids["session"])
+    await crud.requeue_compacted_session(db, session)
+
+
+async def _s3_queue(db: AsyncSession, ids: dict) -> None:
+    await crud.enqueue_s3_deletions(db, ["reviews/check-1.jpg", "reviews/check-2.jpg"])
+    due = await crud.get_due_s3_deletions(db, limit=1000)
+    await crud.reschedule_s3_deletions(db, {due[0].s3_key: "check"})
+    await crud.remove_s3_deletions(db, ["reviews/check-1.jpg", "reviews/check-2.jpg"])
+
+
+async def _abandon_completed(db: AsyncSession, ids: dict) -> None:
+    session = await crud.update_session_status(db, ids["session"], "failed", error_message="검사", keep_completed=True)
+    assert session.status == "completed"
+
+
+async def _recommendation_jobs(db: AsyncSession, ids: dict) -> None:
+    await crud.enqueue_recommendation_job(db, "job-check", "강릉 데이트 코스")
+    await db.commit()
+    claimed = await crud.claim_recommendation_jobs(db, limit=10, lease_seconds=0)
+    assert "job-check" in [job["session_id"] for job in claimed]
+    # 임대가 끝났어도 실행 중(running)이면 다시 가져가지 않음
+    again = await crud.claim_recommendation_jobs(db, limit=10, lease_seconds=0, running=["job-check"])
+    assert "job-check" not in [job["session_id"] for job in again]
+    await crud.renew_recommendation_jobs(db, ["job-check"], lease_seconds=600)
+    await crud.complete_recommendation_job(db, "job-check")
+
+
+CASES = [
+    PlanCase("get_photo_card", lambda db, ids: crud.get_photo_card(db, ids["photo_card"]),
+             {"photo_cards_pkey", "idx_photo_cards_active_id"}),
+    PlanCase("verify_photo_card", lambda db, ids: crud.verify_photo_card(db, ids["photo_card"]),
+             {"idx_photo_cards_active_id"}),
+    PlanCase("get_session_by_photo_card_id",
+             lambda db, ids: crud.get_session_by_photo_card_id(db, ids["photo_card"]),
+             {"meeting_platform_sessions_photo_card_id_key"}),
+    # 이미 세션이 있는 카드 → 가드(session_by_card) 충돌 후 기존 세션 반환
+    PlanCase("create_session (기존 카드)",
+             lambda db, ids: crud.create_session(db, ids["photo_card"], "강릉 데이트 코스"),
+             {"session_by_card_pkey"}),
+    PlanCase("get_session_by_id", lambda db, ids: crud.get_session_by_id(db, ids["session"]),
+             {"meeting_platform_sessions_pkey"}),
+    PlanCase("get_unfinished_sessions", lambda db, ids: crud.get_unfinished_sessions(db, limit=100),
+             {"idx_sessions_unfinished_created"}),
+    PlanCase("update_last_accessed", lambda db, ids: crud.update_last_accessed(db, ids["session"]),
+             {"meeting_platform_sessions_pkey"}),
+    PlanCase("update_session_status",
+             lambda db, ids: crud.update_session_status(db, ids["pending_session"], "processing"),
+             {"meeting_platform_sessions_pkey"}),
+    # 작업 포기 시 이미 completed인 세션은 그대로
+    PlanCase("update_session_status (keep_completed)", _abandon_completed, {"meeting_platform_sessions_pkey"}),
+    PlanCase("requeue_compacted_session", _requeue_session, {"meeting_platform_sessions_pkey"}),
+    PlanCase("get_review_by_id", lambda db, ids: crud.get_review_by_id(db, ids["reviews"][0]), {"reviews_pkey"}),
+    PlanCase("get_reviews_by_place (첫 페이지 + 커서)", _place_pages, {"idx_reviews_place_created_id"}),
+    PlanCase("get_reviews_by_user (첫 페이지 + 커서)", _user_pages, {"idx_reviews_user_created_id"}),
+    # 전체 목록의 총 개수/평균은 place_rating_stats 합계 (리뷰 스캔 없음)
+    PlanCase("get_all_reviews (첫 페이지 + 커서)", _all_pages, {"idx_reviews_created_id"}),
+    PlanCase("get_place_rating_stats", lambda db, ids: crud.get_place_rating_stats(db, ids["place"]),
+             {"place_rating_stats_pkey"}),
+    PlanCase("get_place_average_rating", lambda db, ids: crud.get_place_average_rating(db, ids["place"]),
+             {"place_rating_stats_pkey"}),
+    # 관광지 목록 한 화면 분량
+    PlanCase("get_place_ratings", lambda db, ids: crud.get_place_ratings(db, [f"p{i}" for i in range(20)]),
+             {"place_rating_stats_pkey"}),
+    PlanCase("search_reviews",
+             lambda db, ids: crud.search_reviews(db, search_terms("야경 데이트"), place_id=ids["place"]),
+             {"idx_reviews_search_vector", "idx_reviews_place_created_id"}, max_ms=100),
+    PlanCase("get_reviews_by_ids", lambda db, ids: crud.get_reviews_by_ids(db, ids["reviews"]), {"reviews_pkey"}),
+    PlanCase("review write cycle (create/update/images/finalize/delete)", _write_cycle, {"reviews_pkey"}),
+    PlanCase("delete_review_image", lambda db, ids: crud.delete_review_image(db, ids["review_image"]),
+             {"review_images_pkey"}),
+    PlanCase("s3 deletion queue", _s3_queue, {"idx_s3_pending_deletions_next_attempt"}),
+    # 작업 테이블은 대기 중인 작업만 있어 작음 → 인덱스 기대 없이 SQL(running 제외, 임대 연장)만 확인
+    PlanCase("recommendation job lease (claim/renew/complete)", _recommendation_jobs, set()),
+    # 고아 객체 정리는 참조 URL 전체가 필요 → 전체 스캔이 정상
+    PlanCase("get_referenced_image_urls", lambda db, ids: crud.get_referenced_image_urls(db),
+             allow_seq_scan={"reviews", "review_images"}, max_ms=2000),
+    # 리뷰가 없는 이미지 행 찾기는 전체 anti-join이 정상
+    PlanCase("purge_orphan_review_images", lambda db, ids: crud.purge_orphan_review_images(db, limit=1000),
+             allow_seq_scan={"reviews", "review_images"}, max_ms=2000),
+    # 만료 정리 (데이터를 바꾸므로 마지막에)
+    PlanCase("deactivate_expired_photo_cards",
+             lambda db, ids: crud.deactivate_expired_photo_cards(db, limit=1000),
+             {"idx_photo_cards_expiring"}),
+    PlanCase("purge_idle_sessions (파티션별)", _purge_sessions, {"idx_sessions_last_accessed"}),
+    PlanCase("compact_idle_sessions (파티션별)", _compact_sessions, {"idx_sessions_last_accessed"}),
+]
+
+
+# === EXPLAIN ===
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def _root(parents: dict[str, str], name):
+    while name in parents:
+        name = parents[name]
+    return name
+
+
+@dataclass
+class PlanEnv:
+    engine: object
+    session_factory: Callable
+    captured: list
+    parents: dict[str, str]     # 파티션/파티션 인덱스 → 부모 (플랜에는 파티션 이름이 나옴)
+    rows: dict[str, float]      # relation → 추정 행 수 (pg_class.reltuples)
+    ids: dict
+
+    async def explain(self, statement: str, parameters) -> tuple[list[dict], float]:
+        """(플랜 노드 목록, 실행 시간 ms) - 쓰기 문장은 실행하지 않고 계획만 확인"""
+        read_only = statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "WITH")
+        prefix = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " if read_only else "EXPLAIN (FORMAT JSON) "
+        async with self.engine.connect() as conn:
+            raw = (await conn.exec_driver_sql(prefix + statement, parameters)).scalar()
+            await conn.rollback()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+        return list(_walk(plan["Plan"])), plan.get("Execution Time", 0.0)
+
+    async def check(self, case: PlanCase) -> tuple[list[str], str]:
+        """(문제 목록, 요약 한 줄)"""
+        self.captured.clear()
+        started = time.perf_counter()
+        async with self.session_factory() as db:
+            await case.run(db, self.ids)
+        wall_ms = (time.perf_counter() - started) * 1000
+        statements = list(self.captured)
+        self.captured.clear()
+
+        used_indexes: set[str] = set()
+        problems: list[str] = []
+        total_ms = 0.0
+        for statement, parameters in statements:
+            verb = statement.lstrip().split(None, 1)[0].upper()
+            if verb not in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+                continue
+            nodes, ms = await self.explain(statement, parameters)
+            total_ms += ms
+            for node in nodes:
+                if "Index Name" in node:
+                    used_indexes.add(_root(self.parents, node["Index Name"]))
+                relation = node.get("Relation Name")
+                if (
+                    node["Node Type"] == "Seq Scan"
+                    and _root(self.parents, relation) in LARGE_TABLES - case.allow_seq_scan
+                    and self.rows.get(relation, 0) >= SEQ_SCAN_MIN_ROWS
+                ):
+                    problems.append(f"Seq Scan on {relation}: {statement.split(chr(10))[0][:80]}...")
+
+        if case.indexes and not case.indexes & used_indexes:
+            problems.append(f"기대 인덱스 미사용: {sorted(case.indexes)} (사용: {sorted(used_indexes) or '-'})")
+        if total_ms > case.max_ms:
+            problems.append(f"실행 시간 {total_ms:.1f}ms > 예산 {case.max_ms:.0f}ms")
+
+        summary = f"{len(statements)}문장, {total_ms:.2f}ms (wall {wall_ms:.1f}ms), 인덱스: {', '.join(sorted(used_indexes))}"
+        return problems, summary
+
+
+async def _catalog(engine) -> tuple[dict[str, str], dict[str, float]]:
+    async with engine.connect() as conn:
+        parents = (await conn.execute(text("""
+            SELECT child.relname, parent.relname
+            FROM pg_inherits i
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            WHERE child.relnamespace = current_schema()::regnamespace
+        """))).all()
+        rows = (await conn.execute(text("""
+            SELECT relname, greatest(reltuples, 0) FROM pg_class
+            WHERE relnamespace = current_schema()::regnamespace AND relkind = 'r'
+        """))).all()
+    return dict(parents), dict(rows)
+
+
+@pytest.fixture(scope="session")
+async def plan_env():
+    admin_engine = create_async_engine(DATABASE_URL)
+    engine = create_async_engine(
+        DATABASE_URL,
+        pool_size=2,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    captured: list = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            captured.append((statement, parameters[0] if executemany else parameters))
+
+    try:
+        await create_schema(admin_engine, engine)
+        await seed(engine, SCALE)
+        parents, rows = await _catalog(engine)
+        yield PlanEnv(
+            engine=engine,
+            session_factory=sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+            captured=captured,
+            parents=parents,
+            rows=rows,
+            ids=await sample_ids(engine),
+        )
+    finally:
+        await engine.dispose()
+        if not KEEP:
+            async with admin_engine.begin() as conn:
+                await conn.execute(text(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE'))
+        await admin_engine.dispose()
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case.name for case in CASES])
+async def test_query_plan(plan_env: PlanEnv, case: PlanCase):
+    problems, summary = await plan_env.check(case)
+    assert not problems, f"{case.name}: {summary}\n" + "\n".join(f"  ! {p}" for p in problems)
@@ -0,0 +1,98 @@
+"""
+읽기 복제본 라우팅 (database.py) - 복제본 접속 없이 캐시된 상태만 검사
+"""
+import os
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+import database
+from database import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER, ReplicaMonitor, _recently_wrote
+
+
+def _request(headers: dict) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.mark.parametrize("headers", [
+    {READ_YOUR_WRITES_HEADER: "{now}"},
+    {"Cookie": f"{READ_YOUR_WRITES_COOKIE}={{now}}"},
+])
+def test_recent_write_from_header_or_cookie(headers):
+    now = str(int(time.time()))
+    assert _recently_wrote(_request({k: v.format(now=now) for k, v in headers.items()}))
+
+
+def test_old_or_missing_write_marker():
+    assert not _recently_wrote(_request({READ_YOUR_WRITES_HEADER: str(int(time.time()) - 3600)}))
+    assert not _recently_wrote(_request({READ_YOUR_WRITES_HEADER: "garbage"}))
+    assert not _recently_wrote(_request({}))
+
+
+def test_available_reads_cached_state(monkeypatch):
+    monkeypatch.setattr(database, "read_engine", object())
+    monitor = ReplicaMonitor()
+
+    async def fail_check():
+        raise AssertionError("요청 경로에서 지연을 확인하면 안 됨")
+
+    monitor._check = fail_check
+    monitor.healthy, monitor.lag_seconds, monitor.checked_at = True, 0.0, time.monotonic()
+    assert monitor.available()
+
+    monitor.lag_seconds = database.settings.db_replica_max_lag_seconds + 1
+    assert not monitor.available()
+
+    # 확인 작업이 멈춰 결과가 오래되면 primary
+    monitor.lag_seconds = 0.0
+    monitor.checked_at = time.monotonic() - database.settings.db_replica_lag_check_seconds * 4
+    assert not monitor.available()
+    assert monitor.fallbacks == 2
+
+
+class _FakeReplica:
+    """read_engine.connect() → scalar(lag)"""
+
+    def __init__(self, lag):
+        self.lag = lag
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def scalar(self, statement):
+        return self.lag
+
+
+@pytest.mark.anyio
+async def test_unknown_lag_is_unhealthy(monkeypatch):
+    monitor = ReplicaMonitor()
+
+    monkeypatch.setattr(database, "read_engine", _FakeReplica(0.5))
+    await monitor._check()
+    assert monitor.available()
+
+    # WAL 수신이 끊긴 복제본 → 지연 NULL → primary
+    monkeypatch.setattr(database, "read_engine", _FakeReplica(None))
+    await monitor._check()
+    assert (monitor.healthy, monitor.lag_seconds) == (False, None)
+    assert not monitor.available()
+
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not os.environ.get("DATABASE_URL"), reason="DATABASE_URL(PostgreSQL)이 없어 건너뜁니다")
+async def test_lag_sql_runs_on_primary():
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    try:
+        async with engine.connect() as conn:
+            assert await conn.scalar(database._REPLICA_LAG_SQL) == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,48 @@
+"""
+/ask 엔드포인트 (routers/recommend.py) - LLM/DB는 가짜로 대체
+"""
+import contextlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routers.recommend as recommend
+
+
+@pytest.fixture
+def client(monkeypatch):
+    opened, rated = [], []
+
+    async def mcp_query(self, query, area_code=None, sigungu_code=None):
+        return {"success": True, "spots": [{"name": "경포대", "content_id": "c1"}]}
+
+    @contextlib.asynccontextmanager
+    async def read_session(request):
+        opened.append(True)
+        yield "db"
+
+    async def attach_ratings(db, spots):
+        rated.append((db, [spot.content_id for spot in spots]))
+
+    monkeypatch.setattr(recommend.LLMClient, "mcp_query", mcp_query)
+    monkeypatch.setattr(recommend, "read_session", read_session)
+    monkeypatch.setattr(recommend, "attach_ratings", attach_ratings)
+    app = FastAPI()
+    app.include_router(recommend.router)
+    client = TestClient(app)
+    client.opened, client.rated = opened, rated
+    return client
+
+
+def test_ask_without_ratings_opens_no_session(client):
+    response = client.post("/api/v1/ask", json={"query": "바다 카페"})
+    assert response.json()["success"] is True
+    assert client.opened == []
+
+
+def test_ask_with_ratings_uses_session_only_for_ratings(client):
+    response = client.post("/api/v1/ask", json={"query": "바다 카페", "include_ratings": True})
+    assert response.json()["success"] is True
+    assert client.opened == [True]
+    assert client.rated == [("db", ["c1"])]
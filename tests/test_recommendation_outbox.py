@@ -0,0 +1,135 @@
+"""
+추천 작업 디스패처 (services/recommendation_outbox.py) - 작업 테이블(crud)은 기록만 하는 가짜로 대체
+"""
+import asyncio
+import contextlib
+
+import pytest
+
+from services import recommendation_outbox as outbox_module
+from services.recommendation_outbox import RecommendationOutbox
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = {"released": [], "failed": [], "completed": [], "claimed": [], "renewed": []}
+
+    async def claim(db, limit, lease_seconds, running=()):
+        calls["claimed"].append(list(running))
+        if "s1" in running:
+            return []
+        return [{
+            "session_id": "s1", "query": "강릉", "area_code": None, "sigungu_code": None,
+            "shared_session_ids": None, "attempts": 1, "last_error": None,
+        }]
+
+    async def release(db, session_ids, reason):
+        calls["released"].append(session_ids)
+
+    async def fail(db, session_id, error, retry_seconds):
+        calls["failed"].append((session_id, error))
+
+    async def renew(db, session_ids, lease_seconds):
+        calls["renewed"].append((session_ids, lease_seconds))
+
+    async def complete(db, session_id):
+        calls["completed"].append(session_id)
+
+    async def copy(db, session_id, target_session_ids):
+        pass
+
+    monkeypatch.setattr(outbox_module, "AsyncSessionLocal", contextlib.nullcontext)
+    monkeypatch.setattr(outbox_module, "claim_recommendation_jobs", claim)
+    monkeypatch.setattr(outbox_module, "release_recommendation_jobs", release)
+    monkeypatch.setattr(outbox_module, "fail_recommendation_job", fail)
+    monkeypatch.setattr(outbox_module, "renew_recommendation_jobs", renew)
+    monkeypatch.setattr(outbox_module, "complete_recommendation_job", complete)
+    monkeypatch.setattr(outbox_module, "copy_session_result", copy)
+    return calls
+
+
+@pytest.mark.anyio
+async def test_stop_releases_running_jobs(calls, monkeypatch):
+    started = asyncio.Event()
+
+    async def never_finishes(**kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(outbox_module, "process_recommendation_background", never_finishes)
+    outbox = RecommendationOutbox()
+
+    assert await outbox.dispatch() == 1
+    await started.wait()
+    await outbox.stop()
+
+    assert calls["released"] == [["s1"]]
+    assert calls["completed"] == []
+
+
+@pytest.mark.anyio
+async def test_dispatcher_error_is_recorded(calls, monkeypatch):
+    async def finishes(**kwargs):
+        pass
+
+    async def broken_copy(db, session_id, target_session_ids):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(outbox_module, "process_recommendation_background", finishes)
+    monkeypatch.setattr(outbox_module, "copy_session_result", broken_copy)
+    outbox = RecommendationOutbox()
+
+    await outbox.dispatch()
+    await asyncio.gather(*outbox._running)
+
+    assert calls["failed"] == [("s1", "ConnectionError: db down")]
+    await outbox.stop()
+    assert calls["released"] == []
+
+
+@pytest.mark.anyio
+async def test_running_job_is_renewed_and_not_claimed_again(calls, monkeypatch):
+    started = asyncio.Event()
+
+    async def slow(**kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(outbox_module, "process_recommendation_background", slow)
+    outbox = RecommendationOutbox()
+    assert outbox.lease_seconds == outbox.settings.llm_mcp_timeout + outbox.settings.recommendation_job_lease_margin_seconds
+
+    await outbox.dispatch()
+    await started.wait()
+    # 임대가 끝나 DB에서는 다시 가져갈 수 있어도 이 프로세스가 실행 중이면 제외
+    assert await outbox.dispatch() == 0
+    assert calls["claimed"] == [[], ["s1"]]
+
+    await outbox.heartbeat()
+    assert calls["renewed"] == [(["s1"], outbox.lease_seconds)]
+    await outbox.stop()
+
+
+@pytest.mark.anyio
+async def test_abandon_keeps_completed_session(calls, monkeypatch):
+    updates = []
+
+    async def claim(db, limit, lease_seconds, running=()):
+        return [{
+            "session_id": "s1", "query": "강릉", "area_code": None, "sigungu_code": None,
+            "shared_session_ids": ["s2"], "attempts": 99, "last_error": "ConnectionError: db down",
+        }]
+
+    async def update_status(db, session_id, status, **kwargs):
+        updates.append((session_id, status, kwargs.get("keep_completed")))
+
+    monkeypatch.setattr(outbox_module, "claim_recommendation_jobs", claim)
+    monkeypatch.setattr(outbox_module, "update_session_status", update_status)
+    outbox = RecommendationOutbox()
+
+    await outbox.dispatch()
+    await asyncio.gather(*outbox._running)
+
+    assert updates == [("s1", "failed", True)]
+    assert calls["completed"] == ["s1"]
+    assert outbox.stats["abandoned"] == 1
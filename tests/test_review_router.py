@@ -0,0 +1,98 @@
+"""
+리뷰 API (routers/review.py) - DB/S3는 가짜로 대체
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routers.review as review_router
+from database import get_db
+
+URL = "https://bucket.example.com/reviews/a.jpg"
+
+
+def _review(image_urls: list[str]):
+    return SimpleNamespace(
+        id="r1", place_id="p1", place_name="경포대", rating=5, content="좋아요",
+        user_id=None, photo_card_id=None, created_at=datetime(2026, 10, 1), updated_at=None,
+        images=[SimpleNamespace(image_url=url, image_order=i) for i, url in enumerate(image_urls)],
+    )
+
+
+@pytest.fixture
+def client(monkeypatch):
+    cleaned = []
+
+    async def upload_images(images, folder):
+        return [URL]
+
+    async def create_review(db, image_urls, **kwargs):
+        return _review(image_urls)
+
+    async def enqueue_urls(urls):
+        cleaned.append(urls)
+
+    async def no_db():
+        yield None
+
+    monkeypatch.setattr(review_router.s3_service, "upload_images", upload_images)
+    monkeypatch.setattr(review_router, "create_review", create_review)
+    monkeypatch.setattr(review_router.s3_deletion_queue, "enqueue_urls", enqueue_urls)
+    app = FastAPI()
+    app.include_router(review_router.router)
+    app.dependency_overrides[get_db] = no_db
+    client = TestClient(app)
+    client.cleaned = cleaned
+    return client
+
+
+def _post(client):
+    return client.post(
+        "/api/v1/reviews",
+        data={"place_id": "p1", "place_name": "경포대", "rating": "5", "content": "좋아요"},
+        files=[("images", ("a.jpg", b"\xff\xd8\xff", "image/jpeg"))],
+    )
+
+
+def test_side_effect_failure_after_commit_keeps_review_and_images(client, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("index down")
+
+    monkeypatch.setattr(review_router.review_search_service, "index_review", broken)
+    monkeypatch.setattr(review_router.rating_cache, "invalidate", broken)
+    monkeypatch.setattr(review_router.image_variant_service, "schedule", broken)
+
+    response = _post(client)
+
+    assert response.status_code == 200
+    assert response.json()["image_urls"] == [URL]
+    assert client.cleaned == []
+
+
+def test_db_failure_cleans_up_uploaded_images(client, monkeypatch):
+    async def failing_create(db, image_urls, **kwargs):
+        raise ConnectionError("db down")
+
+    monkeypatch.setattr(review_router, "create_review", failing_create)
+
+    response = _post(client)
+
+    assert response.status_code == 500
+    assert client.cleaned == [[URL]]
+
+
+def test_variant_urls_follow_setting(monkeypatch):
+    settings = review_router.get_settings()
+    review = _review([URL])
+
+    monkeypatch.setattr(review_router, "get_settings", lambda: settings.model_copy(update={"image_variants_enabled": True}))
+    enabled = review_router._review_to_response(review)
+    assert enabled.thumbnail_urls == ["https://bucket.example.com/reviews/a_thumb.webp"]
+    assert enabled.webp_urls == ["https://bucket.example.com/reviews/a_w1080.webp"]
+
+    monkeypatch.setattr(review_router, "get_settings", lambda: settings.model_copy(update={"image_variants_enabled": False}))
+    disabled = review_router._review_to_response(review)
+    assert disabled.thumbnail_urls == disabled.webp_urls == [URL]
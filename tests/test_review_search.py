@@ -0,0 +1,177 @@
+"""
+리뷰 검색 토큰화 / 메모리 역색인 / 커서 (crud/review_search_crud.py, services/review_search.py)
+
+PostgreSQL 검사(tsvector 리터럴 파싱, 매칭/순위)는 DATABASE_URL이 있을 때만 실행합니다.
+"""
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from crud.review_crud import decode_review_cursor, encode_review_cursor
+from crud.review_search_crud import (
+    _tsquery,
+    decode_search_cursor,
+    encode_search_cursor,
+    search_terms,
+    search_vector_expr,
+    search_vector_literal,
+    text_grams,
+)
+from services.review_search import InMemoryReviewIndex
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+BASE = datetime(2026, 10, 1, 12, 0)
+
+
+def _review(review_id: str, place_name: str, content: str, minutes: int = 0, place_id="p1", user_id="u1"):
+    return SimpleNamespace(
+        id=review_id, place_id=place_id, user_id=user_id,
+        place_name=place_name, content=content, created_at=BASE + timedelta(minutes=minutes),
+    )
+
+
+# === 토큰화 ===
+
+def test_text_grams_bigrams_and_single_characters():
+    assert text_grams("주차 편해요") == ["주차", "편해", "해요"]
+    assert text_grams("a 카페") == ["a", "카페"]
+    assert text_grams(None) == []
+
+
+def test_text_grams_normalizes_width_and_case():
+    # NFKC: 전각 영숫자 → 반각, 대소문자 무시
+    assert text_grams("ＣＡＦＥ") == text_grams("cafe") == ["ca", "af", "fe"]
+
+
+def test_search_terms_deduplicates_in_order():
+    assert search_terms("웨이팅 30분!") == ["웨이", "이팅", "30", "0분"]
+    assert search_terms("하하하하") == ["하하"]
+    assert search_terms("  !!  ") == []
+
+
+def test_search_vector_literal_weights_and_positions():
+    literal = search_vector_literal("해변 카페", "카페 좋아요")
+    assert literal == "'해변':1A '카페':2A,3 '좋아':4 '아요':5"
+
+
+def test_search_vector_literal_drops_punctuation():
+    # 따옴표/백슬래시는 토큰에 들어가지 않음 (PostgreSQL 파싱은 아래 DB 테스트에서 확인)
+    assert search_vector_literal("it's", "\\") == "'it':1A 's':2A"
+    assert search_vector_literal("", "") == ""
+
+
+# === 메모리 역색인 ===
+
+@pytest.fixture
+def index():
+    index = InMemoryReviewIndex()
+    index.add(_review("r1", "경포 해변", "바다 카페가 좋아요", minutes=1))
+    index.add(_review("r2", "카페 해변", "조용한 바다", minutes=2))
+    index.add(_review("r3", "시장", "해변 근처 카페 맛집", minutes=3, place_id="p2", user_id="u2"))
+    index.add(_review("r4", "박물관", "전시가 좋아요", minutes=4))
+    return index
+
+
+def test_index_requires_all_terms(index):
+    ids = [review_id for review_id, _ in index.search(search_terms("해변 카페"))]
+    assert sorted(ids) == ["r1", "r2", "r3"]
+    assert index.search(search_terms("없는말")) == []
+
+
+def test_index_ranks_name_match_first(index):
+    hits = index.search(search_terms("카페"))
+    # 이름에 카페가 있는 r2가 본문에만 있는 r1/r3보다 위, 같은 점수는 최신순
+    assert [review_id for review_id, _ in hits] == ["r2", "r3", "r1"]
+
+
+def test_index_single_character_prefix(index):
+    assert {review_id for review_id, _ in index.search(["전"])} == {"r4"}
+
+
+def test_index_filters(index):
+    assert [r for r, _ in index.search(search_terms("카페"), place_id="p2")] == ["r3"]
+    assert [r for r, _ in index.search(search_terms("카페"), user_id="u1")] == ["r2", "r1"]
+
+
+def test_index_replace_and_remove(index):
+    index.add(_review("r4", "박물관", "카페도 있어요", minutes=4))
+    assert "r4" in {r for r, _ in index.search(search_terms("카페"))}
+    assert index.search(search_terms("전시")) == []
+
+    index.remove("r4")
+    index.remove("missing")
+    assert len(index) == 3
+    assert "r4" not in {r for r, _ in index.search(search_terms("카페"))}
+
+
+def test_index_cursor_paging_visits_every_hit_once(index):
+    for i in range(10):
+        index.add(_review(f"x{i}", "카페", "카페", minutes=10 + i // 3))  # 같은 점수/시각 묶음 포함
+    terms = search_terms("카페")
+    expected = [r for r, _ in index.search(terms, limit=100)]
+
+    seen, cursor = [], None
+    while True:
+        page = index.search(terms, limit=4, cursor=cursor)
+        if not page:
+            break
+        seen += [r for r, _ in page]
+        review_id, score = page[-1]
+        review = SimpleNamespace(id=review_id, created_at=index._docs[review_id].created_at)
+        cursor = decode_search_cursor(encode_search_cursor(score, review))
+
+    assert seen == expected
+    assert len(seen) == 13
+
+
+# === 커서 ===
+
+def test_review_cursor_round_trip():
+    review = SimpleNamespace(id="0190f000-0000-7000-8000-000000000001", created_at=BASE)
+    assert decode_review_cursor(encode_review_cursor(review)) == (BASE, review.id)
+
+
+def test_search_cursor_round_trip():
+    review = SimpleNamespace(id="r1", created_at=BASE)
+    assert decode_search_cursor(encode_search_cursor(0.123456, review)) == (0.123456, BASE, "r1")
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "W10", "WyJ4Il0"])
+def test_bad_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_search_cursor(cursor)
+    with pytest.raises(ValueError):
+        decode_review_cursor(cursor)
+
+
+# === PostgreSQL ===
+
+@pytest.mark.anyio
+@pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL(PostgreSQL)이 없어 건너뜁니다")
+async def test_postgres_parses_literal_and_matches_like_index():
+    engine = create_async_engine(DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            name_hit = search_vector_expr("카페 해변", "조용한 바다")
+            body_hit = search_vector_expr("경포 해변", "바다 카페가 좋아요")
+            miss = search_vector_expr("박물관", "전시가 좋아요")
+            quoted = search_vector_expr("it's \\ ok", "'따옴표'")
+            query = _tsquery(search_terms("카페"))
+
+            matches = (await conn.execute(select(
+                name_hit.op("@@")(query), body_hit.op("@@")(query), miss.op("@@")(query),
+                quoted.op("@@")(_tsquery(search_terms("따옴표"))),
+                miss.op("@@")(_tsquery(["전"])),
+            ))).one()
+            assert tuple(matches) == (True, True, False, True, True)
+
+            name_rank, body_rank = (await conn.execute(select(
+                func.ts_rank(name_hit, query), func.ts_rank(body_hit, query),
+            ))).one()
+            assert name_rank > body_rank
+    finally:
+        await engine.dispose()
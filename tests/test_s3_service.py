@@ -0,0 +1,140 @@
+"""
+S3 업로드 서비스 (services/s3_service.py) - moto로 S3 흉내
+"""
+import io
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi import UploadFile
+from moto import mock_aws
+from PIL import Image
+
+from services.s3_service import MB, ImageTooLargeError, S3Service, UnsupportedImageError
+
+
+@pytest.fixture
+def s3():
+    with mock_aws():
+        service = S3Service()
+        service.s3_client.create_bucket(
+            Bucket=service.bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": service.region},
+        )
+        yield service
+        service._executor.shutdown(wait=False)
+
+
+def _jpeg(size: int = 0) -> bytes:
+    """JPEG 헤더 + 뒤에 size바이트 채움 (형식 판별은 매직 바이트만 봄)"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, format="JPEG")
+    return buffer.getvalue() + b"\0" * size
+
+
+def _upload(body: bytes, filename: str = "a.jpg") -> UploadFile:
+    return UploadFile(file=io.BytesIO(body), filename=filename, size=len(body))
+
+
+def _client_error(code: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+
+def _keys(s3: S3Service) -> list[str]:
+    listed = s3.s3_client.list_objects_v2(Bucket=s3.bucket_name)
+    return [item["Key"] for item in listed.get("Contents", [])]
+
+
+@pytest.mark.anyio
+async def test_failed_abort_does_not_mask_upload_error(s3, capsys):
+    def complete(**kwargs):
+        raise _client_error("InternalError", "CompleteMultipartUpload")
+
+    def abort(**kwargs):
+        raise _client_error("NoSuchUpload", "AbortMultipartUpload")
+
+    s3.s3_client.complete_multipart_upload = complete
+    s3.s3_client.abort_multipart_upload = abort
+
+    # chunk_size보다 커서 멀티파트 경로
+    with pytest.raises(Exception, match="InternalError"):
+        await s3.upload_image(_upload(_jpeg(s3.chunk_size + MB)))
+
+    assert "Multipart abort error" in capsys.readouterr().out
+    assert _keys(s3) == []
+
+
+@pytest.mark.anyio
+async def test_upload_images_keeps_order_and_multipart_content(s3):
+    small, large = _jpeg(), _jpeg(s3.chunk_size + MB)
+
+    urls = await s3.upload_images([_upload(small), _upload(large)])
+
+    bodies = [
+        s3.s3_client.get_object(Bucket=s3.bucket_name, Key=s3._key_from_url(url))["Body"].read()
+        for url in urls
+    ]
+    assert bodies == [small, large]
+
+
+@pytest.mark.anyio
+async def test_upload_images_caps_concurrency(s3):
+    lock, active, peak = threading.Lock(), [0], [0]
+    put_object = s3.s3_client.put_object
+
+    def slow_put(**kwargs):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        try:
+            return put_object(**kwargs)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    s3.s3_client.put_object = slow_put
+    s3.settings = s3.settings.model_copy(update={"s3_upload_concurrency": 2})
+
+    urls = await s3.upload_images([_upload(_jpeg()) for _ in range(5)])
+
+    assert len(urls) == 5
+    assert peak[0] == 2
+
+
+@pytest.mark.anyio
+async def test_upload_images_cleans_up_after_invalid_file(s3):
+    with pytest.raises(UnsupportedImageError):
+        await s3.upload_images([_upload(_jpeg()), _upload(b"not an image", "b.jpg"), _upload(_jpeg())])
+
+    assert _keys(s3) == []
+
+
+@pytest.mark.anyio
+async def test_upload_images_cleans_up_after_s3_error(s3):
+    put_object, calls = s3.s3_client.put_object, []
+
+    def flaky_put(**kwargs):
+        calls.append(kwargs["Key"])
+        if len(calls) == 2:
+            raise _client_error("SlowDown", "PutObject")
+        return put_object(**kwargs)
+
+    s3.s3_client.put_object = flaky_put
+
+    with pytest.raises(Exception, match="SlowDown"):
+        await s3.upload_images([_upload(_jpeg()) for _ in range(3)])
+
+    assert len(calls) == 3
+    assert _keys(s3) == []
+
+
+@pytest.mark.anyio
+async def test_upload_images_cleans_up_when_request_budget_exceeded(s3):
+    s3.settings = s3.settings.model_copy(update={"upload_max_request_mb": 1, "s3_upload_concurrency": 1})
+
+    with pytest.raises(ImageTooLargeError):
+        await s3.upload_images([_upload(_jpeg(400 * 1024)) for _ in range(3)])
+
+    assert _keys(s3) == []